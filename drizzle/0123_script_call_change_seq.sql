@@ -0,0 +1,13 @@
+-- Script-journal change counter. `workflow_executions.script_journal_version`
+-- is bumped by every journal upsert in the same statement that writes the row,
+-- and the new value is stamped on the row as `change_seq`. The bump takes the
+-- execution row lock until commit, so for one execution `change_seq` values
+-- become visible in counter order — the evaluate_script journal cursor can read
+-- `change_seq > cursor` without the skew window a wall-clock `updated_at`
+-- cursor needs. Existing rows keep 0 (a full load picks them up).
+ALTER TABLE "workflow_executions"
+  ADD COLUMN IF NOT EXISTS "script_journal_version" integer NOT NULL DEFAULT 0;
+ALTER TABLE "workflow_script_calls"
+  ADD COLUMN IF NOT EXISTS "change_seq" integer NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS "idx_workflow_script_calls_execution_change_seq"
+  ON "workflow_script_calls" ("workflow_execution_id", "change_seq");
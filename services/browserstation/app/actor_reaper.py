@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import math
-from collections.abc import Iterable, Mapping
+from collections.abc import Collection, Iterable, Mapping
 from typing import Optional
 
 
@@ -86,12 +86,17 @@ def stale_actor_ages(
     *,
     now_monotonic: float,
     ttl_seconds: float,
+    exempt: Collection[ActorIdentity] = (),
 ) -> dict[ActorIdentity, float]:
-    """Return actors at or beyond the configured finite lifetime."""
+    """Return actors at or beyond the configured finite lifetime.
+
+    ``exempt`` actors (the warm pool's unleased browsers) are never stale:
+    their lifetime starts when they are handed out.
+    """
     if ttl_seconds <= 0:
         return {}
     return {
         name: max(0.0, now_monotonic - started_at)
         for name, started_at in actor_start_times.items()
-        if max(0.0, now_monotonic - started_at) >= ttl_seconds
+        if name not in exempt and max(0.0, now_monotonic - started_at) >= ttl_seconds
     }
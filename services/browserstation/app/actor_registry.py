@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Generic, Optional, TypeVar
+
+from app.actor_reaper import _record_value
+
+
+InfoT = TypeVar("InfoT")
+
+
+class ActorSnapshot:
+    """One Ray state-API scan, indexed by actor name."""
+
+    def __init__(self, records: Iterable[object], taken_at: float, generation: int = 0):
+        self.records = list(records)
+        self.taken_at = taken_at
+        self.generation = generation
+        self.by_name: dict[str, object] = {}
+        for record in self.records:
+            name = _record_value(record, "name")
+            if isinstance(name, str) and name and name not in self.by_name:
+                self.by_name[name] = record
+
+    def in_states(self, *states: str) -> list[object]:
+        return [r for r in self.records if _record_value(r, "state") in states]
+
+
+class ActorRegistry(Generic[InfoT]):
+    """Short-lived cache of BrowserActor records plus their CDP info.
+
+    Every request used to run one ``list_actors`` query per actor state and
+    scan the result linearly. The registry keeps the last scan for
+    ``refresh_seconds``; concurrent readers share one in-flight refresh, and
+    create/close invalidate it so the next read rescans. A name missing from
+    a snapshot older than ``miss_refresh_seconds`` triggers one rescan, so an
+    actor created by another replica is found without waiting a full interval.
+
+    ``get_info`` results (pod IP + devtools websocket path) are cached per
+    actor for ``info_seconds`` once Chrome reports ready; an actor leaving
+    the snapshot or being closed drops its entry.
+    """
+
+    def __init__(
+        self,
+        query: Callable[[], Iterable[object]],
+        *,
+        refresh_seconds: float,
+        miss_refresh_seconds: float = 1.0,
+        info_seconds: float = 30.0,
+        monotonic: Callable[[], float] = time.monotonic,
+    ):
+        self._query = query
+        self._refresh_seconds = refresh_seconds
+        self._miss_refresh_seconds = miss_refresh_seconds
+        self._info_seconds = info_seconds
+        self._monotonic = monotonic
+        self._snapshot: Optional[ActorSnapshot] = None
+        self._generation = 0
+        self._refresh_lock = asyncio.Lock()
+        self._info: dict[str, tuple[float, InfoT]] = {}
+        self.scans = 0
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        self._generation += 1
+        if name is not None:
+            self._info.pop(name, None)
+
+    def _fresh(self, snapshot: Optional[ActorSnapshot], max_age: float) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.generation == self._generation
+            and self._monotonic() - snapshot.taken_at < max_age
+        )
+
+    async def snapshot(self, *, max_age: Optional[float] = None) -> ActorSnapshot:
+        max_age = self._refresh_seconds if max_age is None else max_age
+        if self._fresh(self._snapshot, max_age):
+            return self._snapshot
+        async with self._refresh_lock:
+            # Another reader may have refreshed while this one waited.
+            if self._fresh(self._snapshot, max_age):
+                return self._snapshot
+            generation = self._generation
+            records = await asyncio.to_thread(self._query)
+            snapshot = ActorSnapshot(records, self._monotonic(), generation)
+            self.scans += 1
+            self._snapshot = snapshot
+            for name in [n for n in self._info if n not in snapshot.by_name]:
+                self._info.pop(name, None)
+            return snapshot
+
+    async def find(self, name: str) -> Optional[object]:
+        snapshot = await self.snapshot()
+        record = snapshot.by_name.get(name)
+        if record is None:
+            snapshot = await self.snapshot(max_age=self._miss_refresh_seconds)
+            record = snapshot.by_name.get(name)
+        return record
+
+    async def info(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[InfoT]],
+        *,
+        ready: Callable[[InfoT], bool],
+    ) -> InfoT:
+        cached = self._info.get(name)
+        if cached is not None and self._monotonic() - cached[0] < self._info_seconds:
+            return cached[1]
+        info = await fetch()
+        if ready(info):
+            self._info[name] = (self._monotonic(), info)
+        else:
+            self._info.pop(name, None)
+        return info
+
+
+async def gather_bounded(
+    items: Iterable[object],
+    worker: Callable[[object], Awaitable[InfoT]],
+    *,
+    limit: int,
+) -> list[InfoT]:
+    """``asyncio.gather`` over ``items`` with at most ``limit`` in flight,
+    preserving input order."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(item: object) -> InfoT:
+        async with semaphore:
+            return await worker(item)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
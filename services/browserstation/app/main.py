@@ -23,14 +23,18 @@ async def lifespan(app: FastAPI):
     # BROWSERSTATION_ACTOR_TTL_SECONDS / BROWSERSTATION_ACTOR_REAPER_
     # INTERVAL_SECONDS env vars (see service.py).
     reaper_task = asyncio.create_task(browser_service.reap_stale_actors())
+    # Pre-warmed BrowserActors for instant leases; disabled unless
+    # BROWSERSTATION_WARM_POOL_SIZE > 0 (see service.py).
+    warm_pool_task = asyncio.create_task(browser_service.maintain_warm_pool())
     try:
         yield
     finally:
-        reaper_task.cancel()
-        try:
-            await reaper_task
-        except asyncio.CancelledError:
-            pass
+        for task in (warm_pool_task, reaper_task):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
 
 app = FastAPI(
@@ -1,9 +1,10 @@
 import asyncio
+from collections import deque
 import logging
 import os
 import secrets
 import time
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
 import uuid
 from urllib.parse import urlsplit
 
@@ -13,6 +14,7 @@ import ray
 from ray.util.state import list_actors
 import websockets
 
+from app.actor_registry import ActorRegistry, gather_bounded
 from app.actor_reaper import (
     ActorIdentity,
     merge_reconciled_actor_times,
@@ -72,15 +74,57 @@ _ACTOR_TTL_SECONDS = int(os.environ.get("BROWSERSTATION_ACTOR_TTL_SECONDS", "180
 _ACTOR_REAPER_INTERVAL_SECONDS = int(
     os.environ.get("BROWSERSTATION_ACTOR_REAPER_INTERVAL_SECONDS", "60")
 )
+# Actor registry: how long one Ray state-API scan serves lookups and listings,
+# how long a ready browser's CDP info is reused, and how many actors
+# list_browsers probes at once.
+_ACTOR_REGISTRY_REFRESH_SECONDS = float(
+    os.environ.get("BROWSERSTATION_ACTOR_REGISTRY_REFRESH_SECONDS", "2.0")
+)
+_ACTOR_INFO_CACHE_SECONDS = float(
+    os.environ.get("BROWSERSTATION_ACTOR_INFO_CACHE_SECONDS", "30.0")
+)
+_LIST_PROBE_CONCURRENCY = int(
+    os.environ.get("BROWSERSTATION_LIST_PROBE_CONCURRENCY", "32")
+)
+# Warm pool: ready BrowserActors handed out by create_browser without waiting
+# for actor scheduling and Chrome start. 0 disables. The pool refills back to
+# the target once ready + warming actors drop to the low-water mark; an actor
+# whose Chrome is not ready within the timeout is killed and replaced.
+_WARM_POOL_SIZE = int(os.environ.get("BROWSERSTATION_WARM_POOL_SIZE", "0"))
+_WARM_POOL_LOW_WATER = int(
+    os.environ.get("BROWSERSTATION_WARM_POOL_LOW_WATER", str(_WARM_POOL_SIZE // 2))
+)
+_WARM_POOL_READY_TIMEOUT_SECONDS = float(
+    os.environ.get("BROWSERSTATION_WARM_POOL_READY_TIMEOUT_SECONDS", "300")
+)
+_WARM_POOL_POLL_SECONDS = float(
+    os.environ.get("BROWSERSTATION_WARM_POOL_POLL_SECONDS", "2.0")
+)
 
 
 @ray.remote(num_cpus=1)
 class BrowserActor:
     """Actor that tracks one dedicated browser worker pod."""
 
-    def __init__(self, browser_id: str):
+    def __init__(self, browser_id: str, warm: bool = False):
         self.browser_id = browser_id
         self.pod_ip = ray.util.get_node_ip_address()
+        # Warm-pool state lives on the actor so every BrowserStation replica's
+        # reaper sees it: an unleased warm actor is never reaped, and a leased
+        # one ages from its handout rather than from its warm-up.
+        self.warm = warm
+        self.leased_at_ms: Optional[float] = None
+
+    def lease(self) -> float:
+        if self.leased_at_ms is None:
+            self.leased_at_ms = time.time() * 1000
+        return self.leased_at_ms
+
+    def pool_state(self) -> dict:
+        return {
+            "warm": self.warm and self.leased_at_ms is None,
+            "leased_at_ms": self.leased_at_ms,
+        }
 
     async def get_info(self):
         ws_url = await fetch_ws(self.pod_ip)
@@ -124,6 +168,21 @@ class BrowserService:
         self._lease_admission_holder_uid: Optional[str] = None
         self._lease_admission_token: Optional[str] = None
         self._lease_admission_expires_at = 0.0
+        # The query is resolved at call time so tests can patch the module
+        # level _query_browser_actors.
+        self._actor_registry: ActorRegistry[BrowserInfo] = ActorRegistry(
+            lambda: _query_browser_actors(REAPABLE_ACTOR_STATES),
+            refresh_seconds=_ACTOR_REGISTRY_REFRESH_SECONDS,
+            info_seconds=_ACTOR_INFO_CACHE_SECONDS,
+            monotonic=monotonic,
+        )
+        # Unleased pool members: ready (Chrome up, FIFO) and warming
+        # (browser_id -> spawn time). Leased pool actors are tracked by lease
+        # time so the reaper's TTL counts from handout, not from warm-up.
+        self._warm_ready: deque[str] = deque()
+        self._warm_pending: dict[str, float] = {}
+        self._warm_refill = asyncio.Event()
+        self._leased_at: dict[ActorIdentity, float] = {}
 
     def _lease_admission_status_locked(self) -> LeaseAdmissionStatus:
         now = self._monotonic()
@@ -197,11 +256,18 @@ class BrowserService:
             self._lease_admission_expires_at = 0.0
 
     async def _find_actor(self, browser_id: str):
-        actors = await asyncio.to_thread(_query_browser_actors, REAPABLE_ACTOR_STATES)
-        for actor in actors:
-            if actor.name == browser_id:
-                return actor
-        return None
+        return await self._actor_registry.find(browser_id)
+
+    async def _browser_info(self, browser_id: str) -> BrowserInfo:
+        async def fetch() -> BrowserInfo:
+            actor = await asyncio.to_thread(
+                ray.get_actor, browser_id, namespace=RAY_NAMESPACE
+            )
+            return await actor.get_info.remote()
+
+        return await self._actor_registry.info(
+            browser_id, fetch, ready=lambda info: bool(info.chrome_ready)
+        )
 
     async def health(self):
         try:
@@ -214,6 +280,8 @@ class BrowserService:
                 "alive": sum(actor.state == "ALIVE" for actor in actors),
                 "pending": sum(actor.state in QUEUED_ACTOR_STATES for actor in actors),
                 "dead": sum(actor.state == "DEAD" for actor in actors),
+                "warm": len(self._warm_ready),
+                "warming": len(self._warm_pending),
             }
 
             try:
@@ -234,45 +302,73 @@ class BrowserService:
         except Exception as exc:
             raise HTTPException(status_code=503, detail=f"Unhealthy: {exc}") from exc
 
+    async def _spawn_actor(self, *, warm: bool = False) -> str:
+        browser_id = str(uuid.uuid4())
+        await asyncio.to_thread(
+            lambda: BrowserActor.options(
+                name=browser_id,
+                namespace=RAY_NAMESPACE,
+                lifetime="detached",
+            ).remote(browser_id, warm=warm)
+        )
+        self._actor_creation_times[(RAY_NAMESPACE, browser_id)] = time.monotonic()
+        self._actor_registry.invalidate(browser_id)
+        return browser_id
+
+    async def _take_warm_browser(self) -> Optional[str]:
+        if not self._warm_ready:
+            return None
+        browser_id = self._warm_ready.popleft()
+        identity = (RAY_NAMESPACE, browser_id)
+        leased_at = time.monotonic()
+        self._leased_at[identity] = leased_at
+        self._actor_creation_times[identity] = leased_at
+        if len(self._warm_ready) + len(self._warm_pending) <= _WARM_POOL_LOW_WATER:
+            self._warm_refill.set()
+        try:
+            actor = await asyncio.to_thread(
+                ray.get_actor, browser_id, namespace=RAY_NAMESPACE
+            )
+            # Fire and forget: the handout does not wait on the actor.
+            actor.lease.remote()
+        except Exception as exc:
+            # Other replicas then age it from its Ray start time.
+            logger.warning("Warm pool: could not record lease on %s: %s", browser_id, exc)
+        return browser_id
+
     async def create_browser(self):
         async with self._lease_admission_lock:
             if not self._lease_admission_status_locked().accepting_new_leases:
                 raise LeaseAdmissionDrainingError(
                     "BrowserStation is temporarily not accepting new leases"
                 )
-            browser_id = str(uuid.uuid4())
-            await asyncio.to_thread(
-                lambda: BrowserActor.options(
-                    name=browser_id,
-                    namespace=RAY_NAMESPACE,
-                    lifetime="detached",
-                ).remote(browser_id)
-            )
-            self._actor_creation_times[(RAY_NAMESPACE, browser_id)] = time.monotonic()
+            browser_id = await self._take_warm_browser() or await self._spawn_actor()
         return ActorInfo(
             browser_id=browser_id,
             proxy_url=f"/ws/browsers/{browser_id}/devtools/browser",
         )
 
     async def list_browsers(self):
-        actors = await asyncio.to_thread(_query_browser_actors, REAPABLE_ACTOR_STATES)
-        alive_actors = [actor for actor in actors if actor.state == "ALIVE"]
-        pending_actors = [
-            actor for actor in actors if actor.state in QUEUED_ACTOR_STATES
-        ]
+        snapshot = await self._actor_registry.snapshot()
+        alive_actors = snapshot.in_states("ALIVE")
+        pending_actors = snapshot.in_states(*QUEUED_ACTOR_STATES)
 
         async def get_browser_info(actor):
-            actor_handle = await asyncio.to_thread(
-                ray.get_actor, actor.name, namespace=RAY_NAMESPACE
-            )
-            info = await actor_handle.get_info.remote()
+            try:
+                info = await self._browser_info(actor.name)
+                websocket_url = info.websocket_url
+            except ValueError:
+                # Killed between the scan and the probe.
+                websocket_url = None
             return {
                 "browser_id": actor.name,
                 "state": "ALIVE",
-                "websocket_url": info.websocket_url,
+                "websocket_url": websocket_url,
             }
 
-        alive_browsers = [await get_browser_info(actor) for actor in alive_actors]
+        alive_browsers = await gather_bounded(
+            alive_actors, get_browser_info, limit=_LIST_PROBE_CONCURRENCY
+        )
         pending_browsers = [
             {"browser_id": actor.name, "state": "PENDING", "websocket_url": None}
             for actor in pending_actors
@@ -296,11 +392,9 @@ class BrowserService:
             raise HTTPException(status_code=404, detail="Browser not found")
 
         try:
-            actor = await asyncio.to_thread(
-                ray.get_actor, browser_id, namespace=RAY_NAMESPACE
-            )
-            return await actor.get_info.remote()
+            return await self._browser_info(browser_id)
         except ValueError as exc:
+            self._actor_registry.invalidate(browser_id)
             raise HTTPException(status_code=404, detail="Browser not found") from exc
 
     async def delete_browser(self, browser_id: str):
@@ -309,17 +403,151 @@ class BrowserService:
                 ray.get_actor, browser_id, namespace=RAY_NAMESPACE
             )
             await asyncio.to_thread(ray.kill, actor)
-            self._actor_creation_times.pop((RAY_NAMESPACE, browser_id), None)
+            self._forget_actor((RAY_NAMESPACE, browser_id))
             return BrowserStatus(browser_id=browser_id, status="closed")
         except ValueError as exc:
+            self._actor_registry.invalidate(browser_id)
             raise HTTPException(status_code=404, detail="Browser not found") from exc
         except Exception as exc:
             raise HTTPException(
                 status_code=500, detail=f"Failed to kill actor {exc}"
             ) from exc
 
+    def _forget_actor(self, identity: ActorIdentity) -> None:
+        namespace, browser_id = identity
+        self._actor_creation_times.pop(identity, None)
+        self._leased_at.pop(identity, None)
+        if namespace == RAY_NAMESPACE:
+            self._warm_pending.pop(browser_id, None)
+            if browser_id in self._warm_ready:
+                self._warm_ready.remove(browser_id)
+        self._actor_registry.invalidate(browser_id)
+
+    def _warm_identities(self) -> set[ActorIdentity]:
+        return {
+            (RAY_NAMESPACE, browser_id)
+            for browser_id in (*self._warm_ready, *self._warm_pending)
+        }
+
+    async def _actor_pool_states(
+        self, identities: Iterable[ActorIdentity]
+    ) -> tuple[set[ActorIdentity], dict[ActorIdentity, float]]:
+        """Warm-pool state recorded on the actors themselves, covering pools
+        run by other replicas (or by this one before a restart): the unleased
+        warm actors, and the epoch-ms lease time of leased ones. Actors that
+        cannot answer are treated as neither."""
+
+        async def probe(identity):
+            namespace, browser_id = identity
+            try:
+                actor = await asyncio.to_thread(
+                    ray.get_actor, browser_id, namespace=namespace
+                )
+                state = await asyncio.wait_for(
+                    actor.pool_state.remote(), timeout=_CHROME_HEALTHCHECK_TIMEOUT
+                )
+            except Exception as exc:
+                logger.debug("Reaper: pool state of %s unavailable: %s", browser_id, exc)
+                return identity, None
+            return identity, state
+
+        warm: set[ActorIdentity] = set()
+        leased: dict[ActorIdentity, float] = {}
+        candidates = [i for i in identities if i[0] == RAY_NAMESPACE]
+        for identity, state in await gather_bounded(
+            candidates, probe, limit=_LIST_PROBE_CONCURRENCY
+        ):
+            if not isinstance(state, dict):
+                continue
+            if state.get("warm"):
+                warm.add(identity)
+            elif isinstance(state.get("leased_at_ms"), (int, float)):
+                leased[identity] = float(state["leased_at_ms"])
+        return warm, leased
+
+    async def _kill_actor(self, browser_id: str) -> None:
+        try:
+            actor = await asyncio.to_thread(
+                ray.get_actor, browser_id, namespace=RAY_NAMESPACE
+            )
+            await asyncio.to_thread(ray.kill, actor)
+        except ValueError:
+            pass
+        self._forget_actor((RAY_NAMESPACE, browser_id))
+
+    async def refill_warm_pool_once(self):
+        """Promote warmed actors, drop dead ones, and top the pool back up."""
+        snapshot = await self._actor_registry.snapshot()
+        for browser_id in [
+            b for b in self._warm_ready
+            if getattr(snapshot.by_name.get(b), "state", None) != "ALIVE"
+        ]:
+            logger.info("Warm pool: dropping ready actor %s (no longer alive)", browser_id)
+            self._forget_actor((RAY_NAMESPACE, browser_id))
+
+        now = self._monotonic()
+        scheduled = [
+            browser_id
+            for browser_id in self._warm_pending
+            if getattr(snapshot.by_name.get(browser_id), "state", None) == "ALIVE"
+        ]
+
+        async def probe(browser_id):
+            try:
+                return browser_id, (await self._browser_info(browser_id)).chrome_ready
+            except Exception as exc:
+                logger.debug("Warm pool: probe of %s failed: %s", browser_id, exc)
+                return browser_id, False
+
+        for browser_id, ready in await gather_bounded(
+            scheduled, probe, limit=_LIST_PROBE_CONCURRENCY
+        ):
+            if ready and self._warm_pending.pop(browser_id, None) is not None:
+                self._warm_ready.append(browser_id)
+        for browser_id, spawned_at in list(self._warm_pending.items()):
+            if now - spawned_at > _WARM_POOL_READY_TIMEOUT_SECONDS:
+                logger.warning("Warm pool: actor %s never became ready; replacing", browser_id)
+                await self._kill_actor(browser_id)
+
+        if len(self._warm_ready) + len(self._warm_pending) > _WARM_POOL_LOW_WATER:
+            return
+        while len(self._warm_ready) + len(self._warm_pending) < _WARM_POOL_SIZE:
+            # One actor per lock hold: a rollout fence or an on-demand create
+            # never waits behind a whole refill.
+            async with self._lease_admission_lock:
+                if not self._lease_admission_status_locked().accepting_new_leases:
+                    return
+                browser_id = await self._spawn_actor(warm=True)
+                self._warm_pending[browser_id] = self._monotonic()
+
+    async def maintain_warm_pool(self):
+        """Background task keeping BROWSERSTATION_WARM_POOL_SIZE actors warm.
+        Started by the FastAPI lifespan next to the reaper; a handout that
+        drops the pool to the low-water mark wakes it early."""
+        if _WARM_POOL_SIZE <= 0:
+            logger.info("Warm browser pool disabled (BROWSERSTATION_WARM_POOL_SIZE=0)")
+            return
+        logger.info(
+            "Warm browser pool started (size=%d, low_water=%d)",
+            _WARM_POOL_SIZE,
+            _WARM_POOL_LOW_WATER,
+        )
+        while True:
+            try:
+                await self.refill_warm_pool_once()
+            except Exception as exc:
+                logger.warning("Warm pool iteration failed: %s", exc)
+            try:
+                await asyncio.wait_for(
+                    self._warm_refill.wait(), timeout=_WARM_POOL_POLL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._warm_refill.clear()
+
     async def reap_stale_actors_once(self):
         now_monotonic = time.monotonic()
+        now_epoch_ms = time.time() * 1000
         scan_start = dict(self._actor_creation_times)
         actors = await asyncio.to_thread(
             _query_browser_actors,
@@ -331,14 +559,39 @@ class BrowserService:
             actors,
             scan_start,
             now_monotonic=now_monotonic,
-            now_epoch_ms=time.time() * 1000,
+            now_epoch_ms=now_epoch_ms,
+        )
+        exempt = self._warm_identities()
+        # Actors over the TTL by this replica's view may belong to another
+        # replica's warm pool; the pool state recorded on the actor decides.
+        overdue = stale_actor_ages(
+            reconciled,
+            now_monotonic=now_monotonic,
+            ttl_seconds=_ACTOR_TTL_SECONDS,
+            exempt=exempt,
         )
+        if overdue:
+            warm, leased = await self._actor_pool_states(overdue)
+            exempt |= warm
+            for identity, leased_at_ms in leased.items():
+                leased_at = now_monotonic - max(0.0, now_epoch_ms - leased_at_ms) / 1000
+                self._leased_at[identity] = max(
+                    leased_at, self._leased_at.get(identity, leased_at)
+                )
+        # Pool actors age from their lease, even when Ray reports an earlier
+        # start time for the warm-up.
+        for identity, leased_at in list(self._leased_at.items()):
+            if identity not in reconciled:
+                self._leased_at.pop(identity, None)
+            elif reconciled[identity] < leased_at:
+                reconciled[identity] = leased_at
         merge_reconciled_actor_times(self._actor_creation_times, scan_start, reconciled)
 
         stale_actors = stale_actor_ages(
             reconciled,
             now_monotonic=now_monotonic,
             ttl_seconds=_ACTOR_TTL_SECONDS,
+            exempt=exempt,
         )
         for (namespace, bid), age in stale_actors.items():
             try:
@@ -352,13 +605,13 @@ class BrowserService:
                 )
             except ValueError:
                 logger.debug("Reaper: actor %s already gone", bid)
-                self._actor_creation_times.pop((namespace, bid), None)
+                self._forget_actor((namespace, bid))
             except Exception as exc:
                 # Retain the original age so a transient Ray failure is
                 # retried on the next pass, not after another full TTL.
                 logger.warning("Reaper failed to kill actor %s: %s", bid, exc)
             else:
-                self._actor_creation_times.pop((namespace, bid), None)
+                self._forget_actor((namespace, bid))
 
     async def reap_stale_actors(self):
         """Periodic background task: kill BrowserActors older than
@@ -181,6 +181,17 @@ class ActorTtlTests(unittest.TestCase):
                     ),
                 )
 
+    def test_exempt_actors_are_never_stale(self):
+        self.assertEqual(
+            {identity("leased"): 90.0},
+            stale_actor_ages(
+                {identity("warm"): 10.0, identity("leased"): 10.0},
+                now_monotonic=100.0,
+                ttl_seconds=60.0,
+                exempt={identity("warm")},
+            ),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
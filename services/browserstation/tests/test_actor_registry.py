@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+import unittest
+
+from app.actor_registry import ActorRegistry, gather_bounded
+
+
+def _actor(name, state="ALIVE"):
+    return SimpleNamespace(name=name, state=state, ray_namespace="browserstation")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class ActorRegistryTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.records = [_actor("a"), _actor("b", "PENDING_CREATION")]
+        self.scans = 0
+
+        def query():
+            self.scans += 1
+            return list(self.records)
+
+        self.registry = ActorRegistry(
+            query, refresh_seconds=2.0, miss_refresh_seconds=0.5, monotonic=self.clock
+        )
+
+    async def test_lookups_within_the_interval_share_one_scan(self):
+        found = await asyncio.gather(*(self.registry.find("a") for _ in range(50)))
+
+        self.assertTrue(all(record.name == "a" for record in found))
+        self.assertEqual(1, self.scans)
+        self.clock.now += 2.0
+        await self.registry.find("a")
+        self.assertEqual(2, self.scans)
+
+    async def test_invalidate_forces_the_next_read_to_rescan(self):
+        await self.registry.snapshot()
+        self.records.append(_actor("c"))
+        self.registry.invalidate("c")
+
+        snapshot = await self.registry.snapshot()
+
+        self.assertIn("c", snapshot.by_name)
+        self.assertEqual(2, self.scans)
+
+    async def test_miss_rescans_only_once_per_miss_interval(self):
+        await self.registry.snapshot()
+        self.clock.now += 0.6
+        self.records.append(_actor("from-other-replica"))
+
+        found = await self.registry.find("from-other-replica")
+        missing = await self.registry.find("never-created")
+
+        self.assertEqual("from-other-replica", found.name)
+        self.assertIsNone(missing)
+        self.assertEqual(2, self.scans)
+
+    async def test_ready_info_is_cached_until_the_actor_leaves(self):
+        fetches = []
+
+        async def fetch():
+            fetches.append(1)
+            return SimpleNamespace(chrome_ready=len(fetches) > 1)
+
+        def ready(info):
+            return info.chrome_ready
+
+        await self.registry.snapshot()
+        self.assertFalse((await self.registry.info("a", fetch, ready=ready)).chrome_ready)
+        self.assertTrue((await self.registry.info("a", fetch, ready=ready)).chrome_ready)
+        await self.registry.info("a", fetch, ready=ready)
+        self.assertEqual(2, len(fetches))
+
+        self.records = []
+        self.registry.invalidate()
+        await self.registry.snapshot()
+        await self.registry.info("a", fetch, ready=ready)
+        self.assertEqual(3, len(fetches))
+
+    async def test_gather_bounded_limits_fan_out_and_keeps_order(self):
+        in_flight = 0
+        peak = 0
+
+        async def work(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return item * 2
+
+        result = await gather_bounded(range(100), work, limit=8)
+
+        self.assertEqual([i * 2 for i in range(100)], result)
+        self.assertEqual(8, peak)
+
+
+if __name__ == "__main__":
+    unittest.main()
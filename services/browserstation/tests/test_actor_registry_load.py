@@ -0,0 +1,114 @@
+"""Load test: list/get over hundreds of simulated BrowserActors."""
+
+import asyncio
+from types import SimpleNamespace
+import time
+import unittest
+from unittest.mock import patch
+
+from app import service as service_module
+from app.models import BrowserInfo
+from app.service import BrowserService
+
+
+ACTOR_COUNT = 400
+PROBE_LATENCY_SECONDS = 0.01
+
+
+class _SimulatedActor:
+    """A Ray actor handle whose ``get_info.remote()`` models a CDP round trip."""
+
+    calls = 0
+
+    def __init__(self, browser_id):
+        self.browser_id = browser_id
+        self.get_info = SimpleNamespace(remote=self._info)
+
+    async def _info(self):
+        type(self).calls += 1
+        await asyncio.sleep(PROBE_LATENCY_SECONDS)
+        return BrowserInfo(
+            browser_id=self.browser_id,
+            pod_ip="10.0.0.1",
+            websocket_url=f"/ws/browsers/{self.browser_id}/devtools/browser/x",
+            chrome_ready=True,
+        )
+
+
+class ActorRegistryLoadTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        _SimulatedActor.calls = 0
+        self.records = [
+            SimpleNamespace(
+                name=f"00000000-0000-4000-8000-{i:012d}",
+                state="ALIVE" if i % 10 else "PENDING_CREATION",
+                ray_namespace=service_module.RAY_NAMESPACE,
+            )
+            for i in range(ACTOR_COUNT)
+        ]
+        self.actors = {r.name: _SimulatedActor(r.name) for r in self.records}
+        self.service = BrowserService()
+        self.service._actor_creation_times = {}
+
+    def _patches(self, query):
+        return (
+            patch.object(service_module, "_query_browser_actors", side_effect=query),
+            patch.object(
+                service_module.ray,
+                "get_actor",
+                side_effect=lambda name, namespace: self.actors[name],
+            ),
+        )
+
+    async def test_list_browsers_probes_hundreds_of_actors_concurrently(self):
+        scans = []
+
+        def query(*_args, **_kwargs):
+            scans.append(1)
+            return list(self.records)
+
+        query_patch, get_actor_patch = self._patches(query)
+        with query_patch, get_actor_patch, patch.object(
+            service_module, "_LIST_PROBE_CONCURRENCY", 32
+        ):
+            started = time.monotonic()
+            listing = await self.service.list_browsers()
+            elapsed = time.monotonic() - started
+
+            alive = [b for b in listing.browsers if b["state"] == "ALIVE"]
+            self.assertEqual(ACTOR_COUNT - ACTOR_COUNT // 10, len(alive))
+            self.assertTrue(all(b["websocket_url"] for b in alive))
+            # Serial probing would take ACTOR_COUNT * latency (>3.6s here).
+            self.assertLess(elapsed, len(alive) * PROBE_LATENCY_SECONDS / 4)
+
+            # Second listing and per-id lookups reuse the scan and cached CDP paths.
+            await self.service.list_browsers()
+            infos = await asyncio.gather(
+                *(self.service.get_browser(b["browser_id"]) for b in alive[:100])
+            )
+
+        self.assertEqual(1, len(scans))
+        self.assertEqual(len(alive), _SimulatedActor.calls)
+        self.assertTrue(all(info.chrome_ready for info in infos))
+
+    async def test_create_and_delete_invalidate_the_registry(self):
+        scans = []
+
+        def query(*_args, **_kwargs):
+            scans.append(1)
+            return list(self.records)
+
+        query_patch, get_actor_patch = self._patches(query)
+        with query_patch, get_actor_patch, patch.object(service_module.ray, "kill"):
+            browser_id = self.records[1].name
+            await self.service._find_actor(browser_id)
+            await self.service.delete_browser(browser_id)
+            self.records = [r for r in self.records if r.name != browser_id]
+
+            self.assertIsNone(await self.service._find_actor(browser_id))
+
+        self.assertEqual(2, len(scans))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -96,7 +96,7 @@ class LeaseAdmissionTests(unittest.IsolatedAsyncioTestCase):
         finish_create = Event()
 
         class ActorOptions:
-            def remote(self, _browser_id):
+            def remote(self, _browser_id, **_kwargs):
                 create_started.set()
                 if not finish_create.wait(timeout=1):
                     raise TimeoutError("test did not release actor creation")
@@ -0,0 +1,208 @@
+"""Warm BrowserActor pool: instant handout, refill, and rollout draining."""
+
+from types import SimpleNamespace
+import time
+import unittest
+from unittest.mock import patch
+
+from app import service as service_module
+from app.models import BrowserInfo
+from app.service import BrowserService, LeaseAdmissionDrainingError
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeRay:
+    """Named actors whose Chrome becomes ready once the test says so."""
+
+    def __init__(self):
+        self.spawned = []
+        self.states = {}
+        self.ready = set()
+        self.killed = []
+        # What BrowserActor itself records, shared by every replica.
+        self.started_ms = {}
+        self.pool = {}
+
+    def spawn(self, browser_id, warm=False):
+        self.spawned.append(browser_id)
+        self.states[browser_id] = "ALIVE"
+        self.started_ms[browser_id] = time.time() * 1000
+        self.pool[browser_id] = {"warm": warm, "leased_at_ms": None}
+
+    def records(self, *_args, **_kwargs):
+        return [
+            SimpleNamespace(
+                name=name,
+                state=state,
+                ray_namespace=service_module.RAY_NAMESPACE,
+                start_time_ms=self.started_ms[name],
+            )
+            for name, state in self.states.items()
+        ]
+
+    def get_actor(self, name, namespace):
+        if name not in self.states:
+            raise ValueError(name)
+
+        async def info():
+            return BrowserInfo(
+                browser_id=name,
+                pod_ip="10.0.0.1",
+                websocket_url=f"/ws/browsers/{name}/devtools/browser/x",
+                chrome_ready=name in self.ready,
+            )
+
+        def lease():
+            state = self.pool[name]
+            if state["leased_at_ms"] is None:
+                state["leased_at_ms"] = time.time() * 1000
+
+        async def pool_state():
+            state = self.pool[name]
+            return {
+                "warm": state["warm"] and state["leased_at_ms"] is None,
+                "leased_at_ms": state["leased_at_ms"],
+            }
+
+        return SimpleNamespace(
+            name=name,
+            get_info=SimpleNamespace(remote=info),
+            lease=SimpleNamespace(remote=lease),
+            pool_state=SimpleNamespace(remote=pool_state),
+        )
+
+    def kill(self, actor):
+        self.killed.append(actor.name)
+        self.states.pop(actor.name, None)
+
+
+class WarmPoolTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.ray = _FakeRay()
+        self.clock = _Clock()
+        self.service = BrowserService(monotonic=self.clock)
+        self.service._actor_creation_times = {}
+        fake_ray = self.ray
+
+        async def spawn(*, warm=False):
+            browser_id = f"00000000-0000-4000-8000-{len(fake_ray.spawned):012d}"
+            fake_ray.spawn(browser_id, warm)
+            self.service._actor_registry.invalidate(browser_id)
+            return browser_id
+
+        for p in (
+            patch.object(self.service, "_spawn_actor", side_effect=spawn),
+            patch.object(service_module, "_query_browser_actors", side_effect=self.ray.records),
+            patch.object(service_module.ray, "get_actor", side_effect=self.ray.get_actor),
+            patch.object(service_module.ray, "kill", side_effect=self.ray.kill),
+            patch.object(service_module, "_WARM_POOL_SIZE", 4),
+            patch.object(service_module, "_WARM_POOL_LOW_WATER", 2),
+            patch.object(service_module, "_WARM_POOL_READY_TIMEOUT_SECONDS", 60.0),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def _warm_up(self):
+        await self.service.refill_warm_pool_once()
+        self.ray.ready.update(self.ray.spawned)
+        self.service._actor_registry.invalidate()
+        await self.service.refill_warm_pool_once()
+
+    async def test_create_hands_out_a_ready_actor_without_spawning(self):
+        await self._warm_up()
+        self.assertEqual(4, len(self.service._warm_ready))
+
+        lease = await self.service.create_browser()
+
+        self.assertEqual(self.ray.spawned[0], str(lease.browser_id))
+        self.assertEqual(4, len(self.ray.spawned))
+        self.assertEqual(3, len(self.service._warm_ready))
+        self.assertNotIn(
+            (service_module.RAY_NAMESPACE, str(lease.browser_id)),
+            self.service._warm_identities(),
+        )
+
+    async def test_handout_records_the_lease_on_the_actor(self):
+        await self._warm_up()
+        self.assertTrue(all(self.ray.pool[b]["warm"] for b in self.ray.spawned))
+
+        lease = await self.service.create_browser()
+
+        self.assertIsNotNone(self.ray.pool[str(lease.browser_id)]["leased_at_ms"])
+        self.assertEqual(
+            [None] * 3,
+            [self.ray.pool[b]["leased_at_ms"] for b in self.ray.spawned[1:]],
+        )
+
+    async def test_other_replicas_reaper_honors_warm_and_lease_state(self):
+        await self._warm_up()
+        lease = await self.service.create_browser()
+        on_demand = await self.service._spawn_actor()
+        # Every actor started two minutes ago by Ray's clock; the TTL is one.
+        for browser_id in self.ray.started_ms:
+            self.ray.started_ms[browser_id] -= 120_000
+        other_replica = BrowserService(monotonic=self.clock)
+        other_replica._actor_creation_times = {}
+
+        with patch.object(service_module, "_ACTOR_TTL_SECONDS", 60):
+            await other_replica.reap_stale_actors_once()
+            await other_replica.reap_stale_actors_once()
+
+        # Its unleased warm actors are exempt and the leased one ages from
+        # its handout; only the on-demand actor is over the TTL.
+        self.assertEqual([on_demand], self.ray.killed)
+        self.assertIn(str(lease.browser_id), self.ray.states)
+
+    async def test_pool_refills_once_it_reaches_the_low_water_mark(self):
+        await self._warm_up()
+        await self.service.create_browser()
+        await self.service.refill_warm_pool_once()
+        self.assertEqual(4, len(self.ray.spawned))  # above low water: no refill
+
+        await self.service.create_browser()
+        self.assertTrue(self.service._warm_refill.is_set())
+        await self.service.refill_warm_pool_once()
+
+        self.assertEqual(6, len(self.ray.spawned))
+        self.assertEqual(2, len(self.service._warm_ready))
+        self.assertEqual(2, len(self.service._warm_pending))
+
+    async def test_empty_pool_falls_back_to_an_on_demand_spawn(self):
+        lease = await self.service.create_browser()
+
+        self.assertEqual([str(lease.browser_id)], self.ray.spawned)
+
+    async def test_actor_that_never_warms_is_replaced(self):
+        await self.service.refill_warm_pool_once()
+        stuck = self.ray.spawned[0]
+        self.ray.ready.update(self.ray.spawned[1:])
+        self.clock.now += 61.0
+        self.service._actor_registry.invalidate()
+
+        await self.service.refill_warm_pool_once()
+
+        self.assertEqual([stuck], self.ray.killed)
+        self.assertEqual(3, len(self.service._warm_ready))
+        self.assertNotIn(stuck, self.service._warm_pending)
+
+    async def test_draining_blocks_handout_and_refill(self):
+        await self._warm_up()
+        await self.service.begin_lease_admission("sha", "rollout-uid", 60, None)
+
+        with self.assertRaises(LeaseAdmissionDrainingError):
+            await self.service.create_browser()
+        self.service._warm_ready.clear()
+        await self.service.refill_warm_pool_once()
+
+        self.assertEqual(4, len(self.ray.spawned))
+
+
+if __name__ == "__main__":
+    unittest.main()
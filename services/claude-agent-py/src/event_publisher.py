@@ -12,8 +12,13 @@ assert the copies match this canonical.
 ``session_events`` is the single authoritative event stream for agent activity.
 The legacy ``workflow.stream`` Dapr pub/sub topic and the ``workflow_agent_events``
 dual-write path are gone; callers POST directly to the SvelteKit BFF's internal
-ingest endpoint. Publishing is fire-and-forget via daemon threads — never blocks
-the agent workflow.
+ingest endpoint. Publishing is fire-and-forget through one bounded per-process
+queue drained by a single worker that batches events per session over a
+keep-alive connection (see ``_IngestPipeline``). Delivery never runs on the
+producer, but a FULL queue applies backpressure: under the default
+``SESSION_EVENTS_OVERFLOW_POLICY=block`` the producer waits up to
+``SESSION_EVENTS_ENQUEUE_TIMEOUT_SECONDS`` (2 s) for room before the event is
+dropped; ``drop_oldest`` / ``drop_newest`` never wait.
 
 CMA-shape translation happens here so call sites can keep passing internal names
 like ``llm_complete`` / ``tool_call_start`` / ``tool_call_end``; the ingest endpoint
@@ -29,15 +34,18 @@ OFF). A runtime whose registry descriptor declares ``incrementalEvents: true``
 runtimes (claude-agent-py / adk-agent-py — ``incrementalEvents: false``) do not
 ship, so the gate keeps this byte-identical copy inert (no per-event import
 failures) on those runtimes. The base path — producer-identity dedup, CMA-shape
-translation, fire-and-forget POST — is identical on every runtime.
+translation, batched fire-and-forget POST — is identical on every runtime.
 """
 
 from __future__ import annotations
 
+import atexit
+import collections
 import contextvars
 import json
 import logging
 import os
+import random
 import socket
 import threading
 import time
@@ -316,47 +324,274 @@ _WORKFLOW_BUILDER_URL = os.environ.get(
 _INTERNAL_API_TOKEN = os.environ.get("INTERNAL_API_TOKEN", "")
 
 
-def _post_ingest(session_id: str, envelope: dict[str, Any]) -> None:
-    """Non-blocking POST of a session event to the SvelteKit BFF's internal
-    ingest endpoint. The BFF assigns the sequence number and writes to
-    `session_events`.
+class _IngestHTTPError(RuntimeError):
+    def __init__(self, status: int, body: str) -> None:
+        super().__init__(f"HTTP {status}: {body[:200]}")
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status >= 500 or self.status in (408, 429)
+
+
+class _IngestConnection:
+    """One keep-alive HTTP/1.1 connection to the BFF, owned by the ingest
+    worker thread. Reconnects lazily after any transport error."""
+
+    def __init__(self) -> None:
+        self._conn: Any = None
+        self._origin: tuple[str, str, int | None] | None = None
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:  # noqa: BLE001
+                pass
+        self._conn = None
+
+    def post(self, url: str, body: bytes, headers: dict[str, str], timeout: float) -> int:
+        import http.client
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname or "", parts.port)
+        if self._conn is None or origin != self._origin:
+            self.close()
+            conn_cls = (
+                http.client.HTTPSConnection
+                if parts.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            self._conn = conn_cls(origin[1], origin[2], timeout=timeout)
+            self._origin = origin
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        try:
+            self._conn.request("POST", path, body=body, headers=headers)
+            resp = self._conn.getresponse()
+            payload = resp.read()  # drain so the connection can be reused
+            if resp.will_close:
+                self.close()
+        except Exception:
+            self.close()
+            raise
+        if resp.status >= 400:
+            raise _IngestHTTPError(resp.status, payload.decode("utf-8", "replace"))
+        return resp.status
+
+
+_ingest_connection = _IngestConnection()
+
+
+def _post_ingest_batch(session_id: str, envelopes: list[dict[str, Any]]) -> None:
+    """POST a batch of session events (in order) to the SvelteKit BFF's
+    internal ingest endpoint over the worker's keep-alive connection. The BFF
+    assigns sequence numbers and writes to `session_events`. A single event
+    keeps the legacy one-envelope body; larger batches send ``{"events": [...]}``.
     """
     if not _INTERNAL_API_TOKEN:
         logger.info(
-            "[session-ingest] skipping %s %s — INTERNAL_API_TOKEN unset",
+            "[session-ingest] skipping %d event(s) for %s — INTERNAL_API_TOKEN unset",
+            len(envelopes),
             session_id,
-            envelope.get("type"),
         )
         return
+    url = f"{_WORKFLOW_BUILDER_URL}/api/internal/sessions/{session_id}/events/ingest"
+    body = envelopes[0] if len(envelopes) == 1 else {"events": envelopes}
+    status = _ingest_connection.post(
+        url,
+        json.dumps(body).encode(),
+        {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {_INTERNAL_API_TOKEN}",
+        },
+        timeout=5,
+    )
+    logger.debug(
+        "[session-ingest] %s %d event(s) -> HTTP %d", session_id, len(envelopes), status
+    )
+
+
+# ---------------------------------------------------------------------------
+# Ingest pipeline
+# ---------------------------------------------------------------------------
+#
+# One bounded, per-process queue drained by ONE daemon worker (instead of a
+# thread + TCP handshake per event). Events are grouped per session and sent
+# as ordered batches over a keep-alive connection; a session's next batch is
+# never sent before the previous one succeeded or exhausted its retries, so
+# per-session order is preserved. Sessions are served round-robin so a chatty
+# session cannot starve the others.
+#
+# SESSION_EVENTS_QUEUE_MAX           (default 10000) — total queued events
+# SESSION_EVENTS_BATCH_MAX           (default 100)   — events per ingest call
+# SESSION_EVENTS_LINGER_MS           (default 20)    — wait to fill a batch
+# SESSION_EVENTS_OVERFLOW_POLICY     block | drop_oldest | drop_newest (default block)
+# SESSION_EVENTS_ENQUEUE_TIMEOUT_SECONDS (default 2) — max producer wait (block)
+# SESSION_EVENTS_MAX_ATTEMPTS        (default 5)     — per batch, jittered backoff
+
+
+def _env_number(name: str, default: float) -> float:
     try:
-        import urllib.request
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
 
-        url = f"{_WORKFLOW_BUILDER_URL}/api/internal/sessions/{session_id}/events/ingest"
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(envelope).encode(),
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {_INTERNAL_API_TOKEN}",
-            },
-            method="POST",
+
+class _IngestPipeline:
+    def __init__(self) -> None:
+        self.queue_max = max(1, int(_env_number("SESSION_EVENTS_QUEUE_MAX", 10000)))
+        self.batch_max = max(1, int(_env_number("SESSION_EVENTS_BATCH_MAX", 100)))
+        self.linger = max(0.0, _env_number("SESSION_EVENTS_LINGER_MS", 20) / 1000)
+        self.overflow = (
+            os.environ.get("SESSION_EVENTS_OVERFLOW_POLICY", "block").strip().lower()
         )
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            logger.info(
-                "[session-ingest] %s %s -> HTTP %d",
+        self.block_timeout = max(0.0, _env_number("SESSION_EVENTS_ENQUEUE_TIMEOUT_SECONDS", 2))
+        self.max_attempts = max(1, int(_env_number("SESSION_EVENTS_MAX_ATTEMPTS", 5)))
+        self.dropped = 0
+        self._cond = threading.Condition()
+        self._pending: collections.OrderedDict[str, collections.deque] = (
+            collections.OrderedDict()
+        )
+        self._inflight: dict[str, int] = {}
+        self._size = 0
+        self._worker: threading.Thread | None = None
+
+    # -- producer side ---------------------------------------------------
+    def submit(self, session_id: str, envelope: dict[str, Any]) -> bool:
+        with self._cond:
+            self._ensure_worker()
+            if self._size >= self.queue_max and not self._make_room():
+                self.dropped += 1
+                logger.warning(
+                    "[session-ingest] queue full (%d); dropped %s %s",
+                    self.queue_max,
+                    session_id,
+                    envelope.get("type"),
+                )
+                return False
+            self._pending.setdefault(session_id, collections.deque()).append(envelope)
+            self._size += 1
+            self._cond.notify_all()
+            return True
+
+    def _make_room(self) -> bool:
+        if self.overflow == "drop_oldest":
+            session_id, events = next(iter(self._pending.items()))
+            dropped = events.popleft()
+            if not events:
+                del self._pending[session_id]
+            self._size -= 1
+            self.dropped += 1
+            logger.warning(
+                "[session-ingest] queue full; dropped oldest %s %s",
                 session_id,
-                envelope.get("type"),
-                resp.status,
+                dropped.get("type"),
             )
-    except Exception as exc:  # noqa: BLE001
+            return True
+        if self.overflow == "block":
+            return self._cond.wait_for(
+                lambda: self._size < self.queue_max, timeout=self.block_timeout
+            )
+        return False
+
+    def flush(self, session_id: str | None = None, timeout: float | None = 10.0) -> bool:
+        """Wait until queued + in-flight events (of ``session_id``, or all)
+        are delivered. Returns False on timeout."""
+
+        def _drained() -> bool:
+            if session_id is None:
+                return self._size == 0 and not self._inflight
+            return session_id not in self._pending and session_id not in self._inflight
+
+        with self._cond:
+            if not _drained():
+                self._ensure_worker()
+            return self._cond.wait_for(_drained, timeout=timeout)
+
+    # -- worker side -----------------------------------------------------
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="session-events-ingest", daemon=True
+            )
+            self._worker.start()
+
+    def _next_batch(self) -> tuple[str, list[dict[str, Any]]]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._size > 0)
+            if self.linger:
+                self._cond.wait_for(
+                    lambda: self._size >= self.batch_max, timeout=self.linger
+                )
+            session_id, events = next(iter(self._pending.items()))
+            batch = [events.popleft() for _ in range(min(self.batch_max, len(events)))]
+            del self._pending[session_id]
+            if events:
+                self._pending[session_id] = events  # round-robin: back of the line
+            self._size -= len(batch)
+            self._inflight[session_id] = len(batch)
+            self._cond.notify_all()
+            return session_id, batch
+
+    def _run(self) -> None:
+        while True:
+            session_id, batch = self._next_batch()
+            try:
+                self._deliver(session_id, batch)
+            finally:
+                with self._cond:
+                    self._inflight.pop(session_id, None)
+                    self._cond.notify_all()
+
+    def _deliver(self, session_id: str, batch: list[dict[str, Any]]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                _post_ingest_batch(session_id, batch)
+                return
+            except _IngestHTTPError as exc:
+                if exc.status == 400 and len(batch) > 1:
+                    # BFF without batch support: fall back to one event per call.
+                    for envelope in batch:
+                        self._deliver(session_id, [envelope])
+                    return
+                if not exc.retryable:
+                    logger.warning(
+                        "[session-ingest] POST rejected %s (%d event(s)): %s",
+                        session_id,
+                        len(batch),
+                        exc,
+                    )
+                    return
+                error: Exception = exc
+            except Exception as exc:  # noqa: BLE001
+                error = exc
+            if attempt < self.max_attempts:
+                time.sleep(random.uniform(0, min(5.0, 0.2 * 2 ** (attempt - 1))))
         logger.warning(
-            "[session-ingest] POST failed %s %s: %s",
+            "[session-ingest] POST failed %s (%d event(s)) after %d attempts: %s",
             session_id,
-            envelope.get("type"),
-            exc,
+            len(batch),
+            self.max_attempts,
+            error,
         )
 
 
+_ingest_pipeline = _IngestPipeline()
+
+
+def flush_session_events(session_id: str | None = None, timeout: float | None = 10.0) -> bool:
+    """Block until queued session events are delivered (or ``timeout``).
+
+    Session-end paths call this so the final events land before the pod or
+    workflow goes away; ``blocking=True`` publishes flush their own session.
+    """
+    return _ingest_pipeline.flush(session_id, timeout)
+
+
+atexit.register(flush_session_events, None, 5.0)
+
+
 def drive_goal_stop_check(session_id: str | None) -> None:
     """Synchronously trigger the BFF goal drive at a real turn-end (the Stop-hook
     equivalent of Claude Code's Stop hook). The BFF runs the ground-truth
@@ -415,8 +650,10 @@ def publish_session_event(
 
     The notification-hook dispatch + audit/usage/trace enrichment are part of
     the incremental tier (gated on INCREMENTAL_EVENTS_ENABLED); the base path
-    (CMA shape + producer-identity envelope + POST) always runs. Lifecycle
-    callers can set blocking=True when database sequence ordering matters.
+    (CMA shape + producer-identity envelope + POST) always runs. Events are
+    queued for the batched ingest worker; lifecycle callers can set
+    blocking=True to wait until this session's queue (this event included)
+    has been delivered, when database sequence ordering matters.
     """
     if not PUBLISH_ENABLED:
         return
@@ -505,9 +742,6 @@ def publish_session_event(
         "producerId": _PRODUCER_ID,
         "producerEpoch": _PRODUCER_EPOCH,
     }
+    _ingest_pipeline.submit(session_id, envelope)
     if blocking:
-        _post_ingest(session_id, envelope)
-        return
-    threading.Thread(
-        target=_post_ingest, args=(session_id, envelope), daemon=True
-    ).start()
+        flush_session_events(session_id)
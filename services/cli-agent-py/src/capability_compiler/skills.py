@@ -7,12 +7,13 @@ NON-byte-unifiable skill emitters:
   * :func:`materialize_skills_local` — writes skill package files (BYTES) to a
     local-FS skills root. Used by the CLI runtimes (claude-code, codex, agy).
   * :func:`skill_package_entries` — returns STR-only entries (no base64, no
-    resolved-path guard). Used by dapr-agent-py, which writes them through the
-    OpenShell sandbox ``runtime.write_text`` API (NOT the local FS), and feeds
-    them back into ``SkillDefinition.package_*`` for the Skill tool. The dapr
-    path is deliberately distinct (see the Pillar-1 holes: it is more
-    restrictive — str-only — and the write loop / SkillDefinition coupling stay
-    in ``main.py``).
+    resolved-path guard). Used by dapr-agent-py, which ships them into the
+    OpenShell sandbox (NOT the local FS), and feeds them back into
+    ``SkillDefinition.package_*`` for the Skill tool. The dapr path is
+    deliberately distinct (see the Pillar-1 holes: it is more restrictive —
+    str-only — and the delivery / SkillDefinition coupling stay in the
+    service). :func:`skill_package_digest` is the content hash of that output,
+    which dapr-agent-py uses to cache and ship each package once.
 
 The caps are kept in lock-step with the BFF ingester
 (``src/lib/server/skill-ingest.ts`` ``PACKAGE_MAX_*``); the BFF rejects
@@ -33,6 +34,7 @@ from __future__ import annotations
 
 import base64
 import binascii
+import hashlib
 import posixpath
 import re
 from pathlib import Path
@@ -206,6 +208,21 @@ def skill_package_entries(item: dict[str, Any]) -> list[dict[str, str]]:
     return entries
 
 
+def skill_package_digest(entries: list[dict[str, str]]) -> str:
+    """Content digest (sha256 hex) of :func:`skill_package_entries` output.
+
+    Order-independent and length-prefixed per field, so byte-identical
+    packages share one digest no matter which agent or instance carries them.
+    """
+    digest = hashlib.sha256()
+    for entry in sorted(entries, key=lambda e: e["path"]):
+        for field in (entry["path"], entry["content"]):
+            data = field.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+    return digest.hexdigest()
+
+
 def render_skills_index(
     agent_config: Mapping[str, Any],
     *,
@@ -39,6 +39,7 @@ _POST_TIMEOUT_SECONDS = int(os.environ.get("CLI_WORKSPACE_DIFF_POST_TIMEOUT_SECO
 _MAX_PATCH_BYTES = int(os.environ.get("CLI_WORKSPACE_DIFF_MAX_BYTES", str(8 * 1024 * 1024)))
 
 _EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+_OUT_FILE = "/tmp/wfb-run-diff.patch"
 
 # Baked noise exclude for greenfield workspaces that ship no .gitignore. Keeps
 # the diff (and `git add`) off dependency/vcs dirs — fast + meaningful. Includes
@@ -69,14 +70,15 @@ _SAFE_DIR = "git config --global --add safe.directory '*' 2>/dev/null || true"
 # Baselines advance via `git write-tree` into a refs/wfb/baseline ref — NEVER
 # commits to the agent's branch, NEVER moves/renames .git (safe). The temp index
 # (GIT_INDEX_FILE) keeps the agent's real index untouched and includes untracked
-# files. Output: "WFB_BASE=per-node", sentinel, then the combined patch.
+# files. The combined patch is appended to $OUTF byte-for-byte (`$(...)` would eat
+# the blank line that ends a binary patch); only WFB_BASE/WFB_BYTES are printed.
 _CAPTURE_SCRIPT = """
 set -e
 SAFE_DIR_CMD
 [ -d "$REPO" ] || { echo "__WFB_NO_REPO__"; exit 0; }
 EMPTY="4b825dc642cb6eb9a060e54bf8d69288fbee4904"
 T=/tmp/wfb-diff-index
-OUT=""
+: > "$OUTF"
 # Nested git repos (their parent dirs), excluding our own snapshot dir.
 NESTED=$(find "$REPO" -mindepth 2 -maxdepth 3 -name .git 2>/dev/null | sed 's:/[.]git$::' | grep -v '/[.]wfb-' || true)
 
@@ -91,10 +93,9 @@ if [ ! -e "$REPO/.git" ]; then
   rm -f "$T"
   PREV=$(GIT_DIR="$GD" git rev-parse -q --verify refs/wfb/baseline 2>/dev/null || echo "$EMPTY")
   GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git add -A --ignore-errors 2>/dev/null || true
-  P=$(GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git diff --cached --find-renames --stat --patch --binary "$PREV" -- 2>/dev/null || true)
+  GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git diff --cached --find-renames --full-index --patch --binary "$PREV" -- >> "$OUTF" 2>/dev/null || true
   NEW=$(GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git write-tree 2>/dev/null || true)
   [ -n "$NEW" ] && GIT_DIR="$GD" git update-ref refs/wfb/baseline "$NEW" 2>/dev/null || true
-  OUT="$OUT$P"
 fi
 
 # --- Each git repo: the root clone (if any) + every nested repo ---
@@ -109,16 +110,14 @@ for R in $REPOS; do
   rm -f "$T"
   PREV=$(git rev-parse -q --verify refs/wfb/baseline 2>/dev/null || git rev-parse -q --verify origin/HEAD^{tree} 2>/dev/null || echo "$EMPTY")
   GIT_INDEX_FILE="$T" git add -A --ignore-errors 2>/dev/null || true
-  P=$(GIT_INDEX_FILE="$T" git diff --cached --find-renames --stat --patch --binary --src-prefix="a/$REL" --dst-prefix="b/$REL" "$PREV" -- 2>/dev/null || true)
+  GIT_INDEX_FILE="$T" git diff --cached --find-renames --full-index --patch --binary --src-prefix="a/$REL" --dst-prefix="b/$REL" "$PREV" -- >> "$OUTF" 2>/dev/null || true
   NEW=$(GIT_INDEX_FILE="$T" git write-tree 2>/dev/null || true)
   [ -n "$NEW" ] && git update-ref refs/wfb/baseline "$NEW" 2>/dev/null || true
   cd "$REPO"
-  OUT="$OUT$P"
 done
 
 echo "WFB_BASE=per-node"
-echo "===WFB_PATCH==="
-printf '%s' "$OUT"
+echo "WFB_BYTES=$(wc -c < "$OUTF" 2>/dev/null || echo 0)"
 """.replace("SAFE_DIR_CMD", _SAFE_DIR)
 
 
@@ -182,7 +181,13 @@ def sync_workspace_diff_activity(
         return {"ok": True, "skipped": "no_run_context"}
 
     repo_dir = _clean_string(data.get("repoPath")) or DEFAULT_REPO_DIR
-    env_extra = {"REPO": repo_dir, "EMPTY": _EMPTY_TREE, "NOISE": _NOISE_EXCLUDE, "NODE": node_id or "?"}
+    env_extra = {
+        "REPO": repo_dir,
+        "EMPTY": _EMPTY_TREE,
+        "NOISE": _NOISE_EXCLUDE,
+        "NODE": node_id or "?",
+        "OUTF": _OUT_FILE,
+    }
 
     try:
         out = _run(_CAPTURE_SCRIPT, env_extra)
@@ -191,15 +196,24 @@ def sync_workspace_diff_activity(
     if out.strip() == "__WFB_NO_REPO__":
         return {"ok": True, "skipped": "no_workspace"}
 
-    # Parse "WFB_BASE=<sha>\n===WFB_PATCH===\n<patch>".
     base = _EMPTY_TREE
-    patch = ""
-    if "===WFB_PATCH===" in out:
-        header, _, patch = out.partition("===WFB_PATCH===\n")
-        for line in header.splitlines():
-            if line.startswith("WFB_BASE="):
-                base = line[len("WFB_BASE="):].strip() or _EMPTY_TREE
+    nbytes = 0
+    for line in out.splitlines():
+        if line.startswith("WFB_BASE="):
+            base = line[len("WFB_BASE="):].strip() or _EMPTY_TREE
+        elif line.startswith("WFB_BYTES="):
+            try:
+                nbytes = int(line[len("WFB_BYTES="):].strip() or "0")
+            except ValueError:
+                nbytes = 0
+    if nbytes <= 0:
+        return {"ok": True, "empty": True, "base": base}
 
+    try:
+        with open(_OUT_FILE, "rb") as fh:
+            patch = fh.read(_MAX_PATCH_BYTES).decode("utf-8", errors="replace")
+    except Exception as exc:  # noqa: BLE001
+        return {"ok": True, "skipped": f"read_failed: {exc}"}
     if not patch.strip():
         return {"ok": True, "empty": True, "base": base}
 
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+
+from src import workspace_diff_sync as wds
+
+
+@pytest.fixture
+def posted(monkeypatch, tmp_path):
+    payloads: list[dict] = []
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "home").mkdir()
+    monkeypatch.setattr(wds, "_INTERNAL_API_TOKEN", "token")
+    monkeypatch.setattr(wds, "_OUT_FILE", str(tmp_path / "run-diff.patch"))
+    monkeypatch.setattr(
+        wds, "_post_run_diff", lambda _id, payload: (payloads.append(payload), (True, "ok"))[1]
+    )
+    return payloads
+
+
+def test_binary_patch_keeps_its_terminator_and_applies(tmp_path, posted):
+    work = tmp_path / "work"
+    work.mkdir()
+    blob = bytes(range(256)) * 8
+    (work / "image.bin").write_bytes(blob)
+    (work / "notes.md").write_text("hello\n")
+
+    result = wds.sync_workspace_diff_activity(
+        {"workflowExecutionId": "exec-1", "nodeId": "n1", "repoPath": str(work)}
+    )
+
+    assert result["posted"] is True
+    (payload,) = posted
+    patch = payload["patch"]
+    assert "GIT binary patch" in patch and " | " not in patch  # no --stat block
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "run.patch").write_text(patch)
+    subprocess.run(["git", "apply", "run.patch"], cwd=target, check=True)
+    assert (target / "image.bin").read_bytes() == blob
+    assert (target / "notes.md").read_text() == "hello\n"
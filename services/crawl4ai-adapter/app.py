@@ -28,9 +28,19 @@ checkpointing:
    for completed work and pure resume for in-flight work. Failed jobs reset
    to PENDING and re-kick on retry.
 
-3. **Cache** (table `crawl4ai_cache`, key=sha256(url|tier-chain|schemaHash)).
+3. **Cache** (table `crawl4ai_cache`, key=sha256(url|tier-chain)).
    On retry after a network success but DB-write failure, the cache hit
-   returns the same result without re-fetching.
+   returns the same result without re-fetching. Concurrent jobs for one key
+   are single-flighted (in-process lock + Postgres advisory lock), so a
+   fan-out over the same page fetches it once; jobs with
+   `cacheTtlSeconds: 0` store nothing a waiter could reuse and fetch
+   directly. An expired entry fetched by
+   the http tier is revalidated with `If-None-Match`/`If-Modified-Since`; a
+   304 only pushes `expires_at` forward.
+
+   Schema extraction results are cached separately (table
+   `crawl4ai_extractions`, key=(sha256(markdown), schema hash)), so a new
+   schema re-runs extraction over the cached page instead of refetching it.
 
 ## Tier escalation
 
@@ -43,6 +53,13 @@ Cloudflare/Akamai interstitial markers). Tier choices:
 - `stealth`  — Playwright with stealth tweaks (navigator.webdriver=false,
                plausible UA, viewport randomization)
 
+Browser tiers share a warm, size-bounded Chromium pool (`BrowserPool`): each
+job gets its own isolated context, browsers are recycled after
+`CRAWL4AI_BROWSER_MAX_PAGES` pages or when they crash, and jobs queue for a
+context slot instead of launching more browsers than the pod can hold. The
+http tier and the extraction call share one HTTP/2 connection pool, each
+through its own short-lived client so no cookie jar is shared between jobs.
+
 ## Schema-driven extraction
 
 If `extractionSchema` (JSON Schema) is provided, the adapter passes the
@@ -61,7 +78,7 @@ import os
 import re
 import time
 import uuid
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 from typing import Any
 
 import asyncpg
@@ -97,6 +114,19 @@ BLOCK_MARKERS = (
 )
 EMPTY_BODY_THRESHOLD_BYTES = 512
 
+# Browser pool: BROWSER_POOL_SIZE warm Chromium processes, each serving up to
+# CONTEXTS_PER_BROWSER concurrent job contexts; further jobs wait for a slot.
+BROWSER_POOL_SIZE = max(1, int(os.environ.get("CRAWL4AI_BROWSER_POOL_SIZE", "2")))
+CONTEXTS_PER_BROWSER = max(1, int(os.environ.get("CRAWL4AI_CONTEXTS_PER_BROWSER", "4")))
+BROWSER_MAX_PAGES = max(1, int(os.environ.get("CRAWL4AI_BROWSER_MAX_PAGES", "100")))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("CRAWL4AI_HTTP_MAX_CONNECTIONS", "64"))
+
+# Single-flight: how long a job waits for another pod's fetch of the same key
+# before fetching anyway, and how many DB connections may hold advisory locks.
+SINGLE_FLIGHT_WAIT_S = float(os.environ.get("CRAWL4AI_SINGLE_FLIGHT_WAIT_S", "120"))
+SINGLE_FLIGHT_CONNECTIONS = max(1, int(os.environ.get("CRAWL4AI_SINGLE_FLIGHT_CONNECTIONS", "8")))
+EXTRACTION_CACHE_TTL_S = int(os.environ.get("CRAWL4AI_EXTRACTION_CACHE_TTL_S", str(7 * 86400)))
+
 # --- DB schema (idempotent on startup) ------------------------------------
 
 DDL = """
@@ -123,6 +153,18 @@ CREATE TABLE IF NOT EXISTS crawl4ai_cache (
 
 CREATE INDEX IF NOT EXISTS crawl4ai_cache_expires_idx
     ON crawl4ai_cache (expires_at);
+
+ALTER TABLE crawl4ai_cache ADD COLUMN IF NOT EXISTS etag text;
+ALTER TABLE crawl4ai_cache ADD COLUMN IF NOT EXISTS last_modified text;
+
+CREATE TABLE IF NOT EXISTS crawl4ai_extractions (
+    content_digest  text NOT NULL,
+    schema_hash     text NOT NULL,
+    payload         jsonb,
+    expires_at      timestamptz NOT NULL,
+    created_at      timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (content_digest, schema_hash)
+);
 """
 
 # --- Pydantic IO ----------------------------------------------------------
@@ -165,6 +207,203 @@ class JobStatus(BaseModel):
 # --- Lifespan -------------------------------------------------------------
 
 POOL: asyncpg.Pool | None = None
+# Dedicated connections for session-level advisory locks, held for the length
+# of a fetch; kept apart so they can't starve the job/status queries on POOL.
+LOCK_POOL: asyncpg.Pool | None = None
+HTTP_TRANSPORT: httpx.AsyncBaseTransport | None = None
+
+
+def _http_transport() -> httpx.AsyncBaseTransport:
+    """Process-wide HTTP/2 connection pool, reused across jobs and hosts."""
+    global HTTP_TRANSPORT
+    if HTTP_TRANSPORT is None:
+        HTTP_TRANSPORT = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=max(1, HTTP_MAX_CONNECTIONS // 2),
+            ),
+        )
+    return HTTP_TRANSPORT
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Borrowed handle on the process transport: closing the client that
+    wraps it leaves the connection pool open (the lifespan closes it)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+
+@asynccontextmanager
+async def _http_client():
+    """Short-lived client over the shared connection pool. Each one has its
+    own cookie jar, so cookies set by one job's origin never reach another
+    job; per-request headers and timeouts are passed at call time."""
+    async with httpx.AsyncClient(
+        transport=_SharedTransport(_http_transport()),
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+        timeout=DEFAULT_TIMEOUT_S,
+    ) as client:
+        yield client
+
+
+class _PooledBrowser:
+    def __init__(self, browser: Any) -> None:
+        self.browser = browser
+        self.in_use = 0
+        self.pages_served = 0
+        self.broken = False
+        browser.on("disconnected", lambda _b: setattr(self, "broken", True))
+
+    @property
+    def retiring(self) -> bool:
+        return self.broken or self.pages_served >= BROWSER_MAX_PAGES
+
+
+class BrowserPool:
+    """Warm Chromium processes shared by the playwright and stealth tiers.
+
+    Every job runs in a fresh `BrowserContext` (own cookies, storage, cache),
+    so jobs stay isolated while the process launch is paid once. A browser
+    that served `BROWSER_MAX_PAGES` pages or disconnected is retired: it takes
+    no new contexts and is closed once its in-flight contexts finish.
+    """
+
+    def __init__(self, size: int, contexts_per_browser: int) -> None:
+        self._size = size
+        self._per_browser = contexts_per_browser
+        self._slots = asyncio.Semaphore(size * contexts_per_browser)
+        self._lock = asyncio.Lock()
+        # Notified (under _lock) whenever a launch started outside the lock
+        # finishes, so jobs waiting on that browser re-check the pool.
+        self._launch_done = asyncio.Condition(self._lock)
+        self._launching = 0
+        self._playwright_lock = asyncio.Lock()
+        self._browsers: list[_PooledBrowser] = []
+        self._playwright: Any = None
+        self.waiting = 0
+        self.launched = 0
+        self.recycled = 0
+
+    async def _launch(self) -> _PooledBrowser:
+        async with self._playwright_lock:
+            if self._playwright is None:
+                # Lazy-import so the http-only path doesn't pay the import cost.
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+        # The automation flag is set on every pooled browser so both tiers can
+        # share it; the stealth tier's remaining tweaks are per context.
+        browser = await self._playwright.chromium.launch(
+            headless=True, args=["--disable-blink-features=AutomationControlled"]
+        )
+        self.launched += 1
+        return _PooledBrowser(browser)
+
+    async def _retire_idle(self) -> None:
+        for pooled in [b for b in self._browsers if b.retiring and b.in_use == 0]:
+            self._browsers.remove(pooled)
+            self.recycled += 1
+            try:
+                await pooled.browser.close()
+            except Exception as exc:
+                logger.debug("browser close failed during recycle: %s", exc)
+
+    async def _acquire(self) -> _PooledBrowser:
+        async with self._lock:
+            while True:
+                await self._retire_idle()
+                candidates = [
+                    b for b in self._browsers if not b.retiring and b.in_use < self._per_browser
+                ]
+                live = self._launching + sum(1 for b in self._browsers if not b.retiring)
+                if candidates and (min(b.in_use for b in candidates) == 0 or live >= self._size):
+                    pooled = min(candidates, key=lambda b: b.in_use)
+                    pooled.in_use += 1
+                    pooled.pages_served += 1
+                    return pooled
+                if not self._launching or live < self._size:
+                    break
+                # The pool is full once the pending launch lands: share it.
+                await self._launch_done.wait()
+            # A retiring browser still draining contexts does not count
+            # against the size: the slot semaphore bounds total pages.
+            self._launching += 1
+        # Launching Chromium takes seconds; releases and acquires of the
+        # browsers already running must not queue behind it.
+        pooled = None
+        try:
+            pooled = await self._launch()
+        finally:
+            async with self._lock:
+                self._launching -= 1
+                if pooled is not None:
+                    self._browsers.append(pooled)
+                    pooled.in_use += 1
+                    pooled.pages_served += 1
+                self._launch_done.notify_all()
+        return pooled
+
+    async def _release(self, pooled: _PooledBrowser) -> None:
+        async with self._lock:
+            pooled.in_use -= 1
+            await self._retire_idle()
+
+    @asynccontextmanager
+    async def context(self, **context_kwargs: Any):
+        """Yield an isolated browser context, waiting for a free slot first."""
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            pooled = await self._acquire()
+            try:
+                context = await pooled.browser.new_context(**context_kwargs)
+            except Exception:
+                pooled.broken = pooled.broken or not pooled.browser.is_connected()
+                await self._release(pooled)
+                raise
+            try:
+                yield context
+            finally:
+                try:
+                    await context.close()
+                except Exception:
+                    pooled.broken = pooled.broken or not pooled.browser.is_connected()
+                await self._release(pooled)
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+            for pooled in browsers:
+                try:
+                    await pooled.browser.close()
+                except Exception:
+                    pass
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "browsers": len(self._browsers),
+            "inUse": sum(b.in_use for b in self._browsers),
+            "waiting": self.waiting,
+            "launched": self.launched,
+            "recycled": self.recycled,
+        }
+
+
+BROWSERS = BrowserPool(BROWSER_POOL_SIZE, CONTEXTS_PER_BROWSER)
 
 
 # Window after which a non-progressing PENDING/RUNNING row is presumed
@@ -173,6 +412,10 @@ POOL: asyncpg.Pool | None = None
 # lazy-recovery in get_job below, so 10s is enough headroom for a normal
 # fetch to update the row at least once.
 ORPHAN_AFTER_SECONDS = int(os.environ.get("CRAWL4AI_ORPHAN_AFTER_SECONDS", "10"))
+# A live job touches its row's updated_at this often, so a job queued behind
+# a single-flight fetch (or running a long tier walk / extraction) is never
+# taken for an orphan.
+JOB_HEARTBEAT_SECONDS = max(1.0, ORPHAN_AFTER_SECONDS / 3)
 
 
 async def _resume_orphaned_jobs() -> int:
@@ -218,13 +461,21 @@ async def _resume_orphaned_jobs() -> int:
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    global POOL
+    global POOL, LOCK_POOL
     POOL = await asyncpg.create_pool(DATABASE_URL, min_size=1, max_size=4)
+    LOCK_POOL = await asyncpg.create_pool(
+        DATABASE_URL, min_size=0, max_size=SINGLE_FLIGHT_CONNECTIONS
+    )
     async with POOL.acquire() as con:
         await con.execute(DDL)
     n = await _resume_orphaned_jobs()
     logger.info("crawl4ai-adapter ready (DB schema ensured, resumed %d orphan job(s))", n)
     yield
+    await BROWSERS.close()
+    if HTTP_TRANSPORT is not None:
+        await HTTP_TRANSPORT.aclose()
+    if LOCK_POOL is not None:
+        await LOCK_POOL.close()
     if POOL is not None:
         await POOL.close()
 
@@ -243,10 +494,29 @@ def _normalize_tiers(tiers: list[str] | None) -> list[str]:
 
 
 def _cache_key(req: CrawlRequest) -> str:
-    schema_blob = json.dumps(req.extractionSchema or {}, sort_keys=True)
-    schema_hash = hashlib.sha256(schema_blob.encode()).hexdigest()[:16]
+    """Fetch cache key. The schema is not part of it: extraction results are
+    cached per (content digest, schema hash) in `crawl4ai_extractions`."""
     tiers_str = "|".join(_normalize_tiers(req.tiers))
-    return hashlib.sha256(f"{req.url}|{tiers_str}|{schema_hash}".encode()).hexdigest()
+    return hashlib.sha256(f"{req.url}|{tiers_str}".encode()).hexdigest()
+
+
+def _schema_hash(req: CrawlRequest) -> str:
+    blob = json.dumps(
+        {
+            "schema": req.extractionSchema or {},
+            "instruction": req.extractionInstruction or "",
+            "model": ANTHROPIC_MODEL,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _jsonb(value: Any) -> Any:
+    # asyncpg returns jsonb as string with some setups; normalise.
+    if isinstance(value, str):
+        return json.loads(value)
+    return dict(value) if value is not None and not isinstance(value, dict) else value
 
 
 def _is_blocked(status: int, body_bytes: int, body_text: str | None) -> str | None:
@@ -264,34 +534,46 @@ def _is_blocked(status: int, body_bytes: int, body_text: str | None) -> str | No
 
 # --- Tier implementations -------------------------------------------------
 
-async def _fetch_http(req: CrawlRequest) -> dict[str, Any]:
+async def _fetch_http(
+    req: CrawlRequest, validators: dict[str, str] | None = None
+) -> dict[str, Any]:
+    """GET + markdownify. With `validators` (a stale cache entry's `etag` /
+    `lastModified`) the request is conditional and a 304 returns a
+    `notModified` stub instead of a body."""
     timeout_s = (req.timeoutMs / 1000.0) if req.timeoutMs else DEFAULT_TIMEOUT_S
     max_bytes = req.maxBodyBytes or MAX_BODY_BYTES
-    headers = {"User-Agent": USER_AGENT}
-    if req.headers:
-        headers.update({k: v for k, v in req.headers.items() if v is not None})
+    headers = {k: v for k, v in (req.headers or {}).items() if v is not None}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("lastModified"):
+            headers["If-Modified-Since"] = validators["lastModified"]
 
     started = time.monotonic()
-    async with httpx.AsyncClient(
-        timeout=timeout_s,
-        follow_redirects=True,
-        headers=headers,
-        limits=httpx.Limits(max_connections=4),
-    ) as client:
-        async with client.stream("GET", req.url) as response:
-            content_type = response.headers.get("content-type", "")
-            chunks: list[bytes] = []
-            received = 0
-            async for chunk in response.aiter_bytes():
-                received += len(chunk)
-                if received > max_bytes:
-                    raise ValueError(
-                        f"response exceeded maxBodyBytes={max_bytes} (got >{received})"
-                    )
-                chunks.append(chunk)
-            body = b"".join(chunks)
-            final_url = str(response.url)
-            status_code = response.status_code
+    async with _http_client() as client, client.stream(
+        "GET", req.url, headers=headers, timeout=timeout_s
+    ) as response:
+        if validators and response.status_code == 304:
+            return {
+                "tier": "http",
+                "notModified": True,
+                "elapsedMs": int((time.monotonic() - started) * 1000),
+            }
+        content_type = response.headers.get("content-type", "")
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        chunks: list[bytes] = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > max_bytes:
+                raise ValueError(
+                    f"response exceeded maxBodyBytes={max_bytes} (got >{received})"
+                )
+            chunks.append(chunk)
+        body = b"".join(chunks)
+        final_url = str(response.url)
+        status_code = response.status_code
 
     html = body.decode("utf-8", errors="replace")
     if "html" in content_type.lower():
@@ -309,75 +591,64 @@ async def _fetch_http(req: CrawlRequest) -> dict[str, Any]:
         "markdown": markdown,
         "elapsedMs": int((time.monotonic() - started) * 1000),
         "_blockReason": _is_blocked(status_code, len(body), html),
+        "_etag": etag,
+        "_lastModified": last_modified,
     }
 
 
 async def _fetch_playwright(req: CrawlRequest, stealth: bool) -> dict[str, Any]:
-    # Lazy-import so the http-only path doesn't pay the import cost.
-    from playwright.async_api import async_playwright
-
     timeout_s = (req.timeoutMs / 1000.0) if req.timeoutMs else DEFAULT_TIMEOUT_S
     started = time.monotonic()
 
-    async with async_playwright() as p:
-        launch_args: list[str] = []
+    context_kwargs: dict[str, Any] = {
+        "user_agent": (
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
+            if stealth
+            else USER_AGENT
+        ),
+        "viewport": {"width": 1280, "height": 800},
+    }
+    if req.headers:
+        context_kwargs["extra_http_headers"] = {
+            k: v for k, v in req.headers.items() if v is not None
+        }
+    async with BROWSERS.context(**context_kwargs) as context:
         if stealth:
-            launch_args = ["--disable-blink-features=AutomationControlled"]
-        browser = await p.chromium.launch(headless=True, args=launch_args)
+            # Remove the most obvious automation tells.
+            await context.add_init_script(
+                """
+                Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+                Object.defineProperty(navigator, 'languages', { get: () => ['en-US','en'] });
+                Object.defineProperty(navigator, 'plugins', { get: () => [1,2,3,4,5] });
+                """
+            )
+        page = await context.new_page()
+        response = await page.goto(req.url, wait_until="domcontentloaded", timeout=timeout_s * 1000)
+        # Brief settle so JS-driven content has a chance to render.
         try:
-            context_kwargs: dict[str, Any] = {
-                "user_agent": (
-                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
-                    if stealth
-                    else USER_AGENT
-                ),
-                "viewport": {"width": 1280, "height": 800},
-            }
-            if req.headers:
-                context_kwargs["extra_http_headers"] = {
-                    k: v for k, v in req.headers.items() if v is not None
-                }
-            context = await browser.new_context(**context_kwargs)
-            if stealth:
-                # Remove the most obvious automation tells.
-                await context.add_init_script(
-                    """
-                    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-                    Object.defineProperty(navigator, 'languages', { get: () => ['en-US','en'] });
-                    Object.defineProperty(navigator, 'plugins', { get: () => [1,2,3,4,5] });
-                    """
-                )
-            page = await context.new_page()
-            response = await page.goto(req.url, wait_until="domcontentloaded", timeout=timeout_s * 1000)
-            # Brief settle so JS-driven content has a chance to render.
-            try:
-                await page.wait_for_load_state("networkidle", timeout=5_000)
-            except Exception:
-                pass
-
-            final_url = page.url
-            status_code = response.status if response else 0
-            content_type = (response.headers.get("content-type", "") if response else "")
-            html = await page.content()
-            body_bytes = len(html.encode("utf-8", errors="replace"))
-            markdown = markdownify(html, heading_style="ATX", strip=["script", "style", "noscript"])
+            await page.wait_for_load_state("networkidle", timeout=5_000)
+        except Exception:
+            pass
 
-            await context.close()
+        final_url = page.url
+        status_code = response.status if response else 0
+        content_type = (response.headers.get("content-type", "") if response else "")
+        html = await page.content()
 
-            return {
-                "tier": "stealth" if stealth else "playwright",
-                "url": req.url,
-                "finalUrl": final_url,
-                "status": status_code,
-                "contentType": content_type,
-                "byteLength": body_bytes,
-                "markdown": markdown,
-                "elapsedMs": int((time.monotonic() - started) * 1000),
-                "_blockReason": _is_blocked(status_code, body_bytes, html),
-            }
-        finally:
-            await browser.close()
+    body_bytes = len(html.encode("utf-8", errors="replace"))
+    markdown = markdownify(html, heading_style="ATX", strip=["script", "style", "noscript"])
+    return {
+        "tier": "stealth" if stealth else "playwright",
+        "url": req.url,
+        "finalUrl": final_url,
+        "status": status_code,
+        "contentType": content_type,
+        "byteLength": body_bytes,
+        "markdown": markdown,
+        "elapsedMs": int((time.monotonic() - started) * 1000),
+        "_blockReason": _is_blocked(status_code, body_bytes, html),
+    }
 
 
 async def _run_tier(tier: str, req: CrawlRequest) -> dict[str, Any]:
@@ -422,9 +693,10 @@ async def _extract_with_schema(
         user_text += f"Extraction instruction:\n{instruction.strip()}\n\n"
     user_text += "Markdown content:\n```\n" + body + "\n```"
 
-    async with httpx.AsyncClient(timeout=120) as client:
+    async with _http_client() as client:
         r = await client.post(
             "https://api.anthropic.com/v1/messages",
+            timeout=120,
             headers={
                 "x-api-key": ANTHROPIC_API_KEY,
                 "anthropic-version": "2023-06-01",
@@ -439,53 +711,150 @@ async def _extract_with_schema(
                 "messages": [{"role": "user", "content": user_text}],
             },
         )
-        r.raise_for_status()
-        data = r.json()
+    r.raise_for_status()
+    data = r.json()
     for block in data.get("content", []):
         if block.get("type") == "tool_use" and block.get("name") == "structured_extract":
             return block.get("input") or {}
     return None
 
 
+# --- Single-flight --------------------------------------------------------
+
+_INFLIGHT: dict[str, asyncio.Lock] = {}
+_INFLIGHT_WAITERS: dict[str, int] = {}
+
+
+@asynccontextmanager
+async def _advisory_lock(cache_key: str):
+    """Session advisory lock on `cache_key` across adapter pods.
+
+    Best-effort: if no lock connection frees up within a second, or the
+    holder does not finish within SINGLE_FLIGHT_WAIT_S, the caller proceeds
+    unlocked — a duplicate fetch beats a stuck job. A connection whose
+    unlock fails is terminated rather than pooled: ending the session is the
+    only sure way to drop a lock it may still hold."""
+    if LOCK_POOL is None:
+        yield
+        return
+    try:
+        con = await asyncio.wait_for(LOCK_POOL.acquire(), timeout=1.0)
+    except Exception as exc:
+        logger.info("single-flight lock unavailable key=%s err=%s", cache_key[:12], exc)
+        yield
+        return
+    locked = False
+    try:
+        deadline = time.monotonic() + SINGLE_FLIGHT_WAIT_S
+        while True:
+            locked = await con.fetchval(
+                "SELECT pg_try_advisory_lock(hashtextextended($1, 0))", cache_key
+            )
+            if locked or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.25)
+        yield
+    finally:
+        try:
+            if locked:
+                await con.execute(
+                    "SELECT pg_advisory_unlock(hashtextextended($1, 0))", cache_key
+                )
+        except BaseException as exc:
+            logger.warning(
+                "single-flight unlock failed key=%s err=%r; terminating lock connection",
+                cache_key[:12],
+                exc,
+            )
+            con.terminate()
+            if not isinstance(exc, Exception):
+                raise
+        finally:
+            await LOCK_POOL.release(con)
+
+
+@asynccontextmanager
+async def _single_flight(cache_key: str):
+    """One fetch per cache key: jobs in this pod queue on an asyncio lock,
+    other pods on the Postgres advisory lock. Callers re-check the cache once
+    inside, where a finished peer's result is already visible."""
+    lock = _INFLIGHT.setdefault(cache_key, asyncio.Lock())
+    _INFLIGHT_WAITERS[cache_key] = _INFLIGHT_WAITERS.get(cache_key, 0) + 1
+    try:
+        async with lock:
+            async with _advisory_lock(cache_key):
+                yield
+    finally:
+        _INFLIGHT_WAITERS[cache_key] -= 1
+        if not _INFLIGHT_WAITERS[cache_key]:
+            del _INFLIGHT_WAITERS[cache_key]
+            _INFLIGHT.pop(cache_key, None)
+
+
 # --- Job lifecycle (durable via PostgreSQL) -------------------------------
 
-async def _kick_job(job_id: str, req: CrawlRequest) -> None:
-    """Run the actual crawl; persist progress + result. Idempotency at the
-    cache_key layer means a retry after partial completion still benefits
-    from any successful fetch."""
+async def _read_cache(cache_key: str) -> tuple[dict[str, Any] | None, dict[str, str] | None]:
+    """(fresh payload, stale validators). Validators are returned only for an
+    expired entry that the http tier produced and that carries an ETag or
+    Last-Modified, i.e. one a conditional GET can revalidate."""
     assert POOL is not None
-    cache_key = _cache_key(req)
-
-    # Cache short-circuit. Any prior run with the same (url, tier_chain,
-    # schema_hash) returns immediately — the orchestrator's activity retry
-    # becomes a no-op.
     async with POOL.acquire() as con:
-        cached = await con.fetchrow(
-            "SELECT payload FROM crawl4ai_cache WHERE cache_key=$1 AND expires_at > now()",
+        row = await con.fetchrow(
+            "SELECT payload, etag, last_modified, expires_at > now() AS fresh "
+            "FROM crawl4ai_cache WHERE cache_key=$1",
             cache_key,
         )
-    if cached is not None:
-        result = dict(cached["payload"]) if not isinstance(cached["payload"], dict) else cached["payload"]
-        if isinstance(result, str):
-            # asyncpg returns jsonb as string with some setups; normalise.
-            result = json.loads(result)
-        result["cacheHit"] = True
-        async with POOL.acquire() as con:
-            await con.execute(
-                "UPDATE crawl4ai_jobs SET state='COMPLETE', result=$2, updated_at=now() WHERE id=$1",
-                job_id,
-                json.dumps(result),
-            )
-        logger.info("cache hit job=%s key=%s", job_id, cache_key[:12])
-        return
-
-    # Mark RUNNING.
+    if row is None:
+        return None, None
+    payload = _jsonb(row["payload"])
+    if row["fresh"]:
+        return payload, None
+    if payload.get("tier") == "http" and (row["etag"] or row["last_modified"]):
+        return None, {"etag": row["etag"], "lastModified": row["last_modified"]}
+    return None, None
+
+
+async def _revalidate(
+    job_id: str, req: CrawlRequest, cache_key: str, validators: dict[str, str], ttl: int
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    """Conditional GET for an expired http-tier entry.
+
+    Returns (cached payload, None) on 304 after extending the entry, or
+    (None, full http-tier result) when the origin sent a new body — the tier
+    walk reuses it instead of fetching the page a second time."""
+    assert POOL is not None
+    try:
+        probe = await _fetch_http(req, validators=validators)
+    except Exception as exc:
+        logger.info("revalidation failed job=%s url=%s err=%s", job_id, req.url, exc)
+        return None, None
+    if not probe.get("notModified"):
+        return None, probe
     async with POOL.acquire() as con:
-        await con.execute(
-            "UPDATE crawl4ai_jobs SET state='RUNNING', updated_at=now() WHERE id=$1",
-            job_id,
+        row = await con.fetchrow(
+            "UPDATE crawl4ai_cache SET expires_at = now() + ($2 || ' seconds')::interval "
+            "WHERE cache_key=$1 RETURNING payload",
+            cache_key,
+            str(ttl if ttl > 0 else DEFAULT_CACHE_TTL_S),
         )
-
+    if row is None:
+        return None, None
+    logger.info("revalidated job=%s key=%s (304)", job_id, cache_key[:12])
+    result = _jsonb(row["payload"])
+    result["revalidated"] = True
+    return result, None
+
+
+async def _fetch_tiers(
+    job_id: str,
+    req: CrawlRequest,
+    cache_key: str,
+    ttl: int,
+    prefetched_http: dict[str, Any] | None = None,
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None, str]:
+    """Walk the tier chain; cache and return (result, None, "") on success or
+    (None, last result, error message) when every tier failed or was blocked."""
+    assert POOL is not None
     tiers = _normalize_tiers(req.tiers)
     last: dict[str, Any] | None = None
     last_error: str | None = None
@@ -493,72 +862,188 @@ async def _kick_job(job_id: str, req: CrawlRequest) -> None:
 
     for tier in tiers:
         try:
-            result = await _run_tier(tier, req)
+            if tier == "http" and prefetched_http is not None:
+                result, prefetched_http = prefetched_http, None
+            else:
+                result = await _run_tier(tier, req)
         except Exception as exc:
             last_error = f"{type(exc).__name__}: {exc}"
             logger.warning("tier=%s job=%s url=%s err=%s", tier, job_id, req.url, last_error)
             continue
+        etag = result.pop("_etag", None)
+        last_modified = result.pop("_lastModified", None)
         last = result
         block = result.pop("_blockReason", None)
         if block:
             block_reasons.append(f"{tier}:{block}")
             # Escalate to next tier.
             continue
-        # Success — try schema extraction if requested.
-        if req.extractionSchema:
-            try:
-                extracted = await _extract_with_schema(
-                    result.get("markdown") or "",
-                    req.extractionSchema,
-                    req.extractionInstruction,
-                )
-                result["extracted"] = extracted
-            except Exception as exc:
-                logger.warning("extract failed job=%s err=%s", job_id, exc)
-                result["extractError"] = f"{type(exc).__name__}: {exc}"
         result["tiersAttempted"] = tiers[: tiers.index(tier) + 1]
         result["blocksObserved"] = block_reasons
-        # Persist + cache.
-        ttl = req.cacheTtlSeconds if req.cacheTtlSeconds is not None else DEFAULT_CACHE_TTL_S
-        async with POOL.acquire() as con:
-            async with con.transaction():
+        if ttl > 0:
+            async with POOL.acquire() as con:
                 await con.execute(
-                    "UPDATE crawl4ai_jobs SET state='COMPLETE', result=$2, error=NULL, "
-                    "cache_key=$3, updated_at=now() WHERE id=$1",
-                    job_id,
-                    json.dumps(result),
+                    "INSERT INTO crawl4ai_cache (cache_key, payload, expires_at, etag, last_modified) "
+                    "VALUES ($1, $2, now() + ($3 || ' seconds')::interval, $4, $5) "
+                    "ON CONFLICT (cache_key) DO UPDATE SET payload=EXCLUDED.payload, "
+                    "expires_at=EXCLUDED.expires_at, etag=EXCLUDED.etag, "
+                    "last_modified=EXCLUDED.last_modified",
                     cache_key,
+                    json.dumps(result),
+                    str(ttl),
+                    etag,
+                    last_modified,
                 )
-                if ttl > 0:
-                    await con.execute(
-                        "INSERT INTO crawl4ai_cache (cache_key, payload, expires_at) "
-                        "VALUES ($1, $2, now() + ($3 || ' seconds')::interval) "
-                        "ON CONFLICT (cache_key) DO UPDATE SET payload=EXCLUDED.payload, "
-                        "expires_at=EXCLUDED.expires_at",
-                        cache_key,
-                        json.dumps(result),
-                        str(ttl),
-                    )
-        logger.info(
-            "ok job=%s url=%s tier=%s status=%s bytes=%s",
-            job_id,
-            req.url,
-            result["tier"],
-            result.get("status"),
-            result.get("byteLength"),
+        return result, None, ""
+
+    return None, last, last_error or "all_tiers_blocked: " + ",".join(block_reasons)
+
+
+async def _cached_extraction(result: dict[str, Any], req: CrawlRequest) -> None:
+    """Attach `extracted` (or `extractError`) to `result`, reusing a prior
+    extraction of the same content with the same schema/instruction/model."""
+    assert POOL is not None and req.extractionSchema is not None
+    markdown = result.get("markdown") or ""
+    content_digest = hashlib.sha256(markdown.encode("utf-8", errors="replace")).hexdigest()
+    schema_hash = _schema_hash(req)
+    async with POOL.acquire() as con:
+        row = await con.fetchrow(
+            "SELECT payload FROM crawl4ai_extractions "
+            "WHERE content_digest=$1 AND schema_hash=$2 AND expires_at > now()",
+            content_digest,
+            schema_hash,
         )
+    if row is not None:
+        result["extracted"] = _jsonb(row["payload"])
+        result["extractionCacheHit"] = True
         return
+    try:
+        extracted = await _extract_with_schema(
+            markdown,
+            req.extractionSchema,
+            req.extractionInstruction,
+        )
+    except Exception as exc:
+        logger.warning("extract failed url=%s err=%s", req.url, exc)
+        result["extractError"] = f"{type(exc).__name__}: {exc}"
+        return
+    result["extracted"] = extracted
+    if extracted is None:
+        return  # no API key / no tool call: don't pin a miss
+    async with POOL.acquire() as con:
+        await con.execute(
+            "INSERT INTO crawl4ai_extractions (content_digest, schema_hash, payload, expires_at) "
+            "VALUES ($1, $2, $3, now() + ($4 || ' seconds')::interval) "
+            "ON CONFLICT (content_digest, schema_hash) DO UPDATE SET "
+            "payload=EXCLUDED.payload, expires_at=EXCLUDED.expires_at",
+            content_digest,
+            schema_hash,
+            json.dumps(extracted),
+            str(EXTRACTION_CACHE_TTL_S),
+        )
+
 
-    # All tiers exhausted without an unblocked response.
-    err_msg = last_error or "all_tiers_blocked: " + ",".join(block_reasons)
+@asynccontextmanager
+async def _heartbeat(job_id: str):
+    """Touch the job's updated_at every JOB_HEARTBEAT_SECONDS while the body
+    runs; finished rows are left alone."""
+
+    async def beat() -> None:
+        assert POOL is not None
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                async with POOL.acquire() as con:
+                    await con.execute(
+                        "UPDATE crawl4ai_jobs SET updated_at=now() "
+                        "WHERE id=$1 AND state IN ('PENDING','RUNNING')",
+                        job_id,
+                    )
+            except Exception as exc:
+                logger.debug("heartbeat failed job=%s err=%s", job_id, exc)
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+async def _kick_job(job_id: str, req: CrawlRequest) -> None:
+    """Run the crawl under a heartbeat, so orphan recovery does not re-kick
+    a job that is alive but waiting on a peer's fetch."""
+    async with _heartbeat(job_id):
+        await _run_job(job_id, req)
+
+
+async def _run_job(job_id: str, req: CrawlRequest) -> None:
+    """Run the actual crawl; persist progress + result. Idempotency at the
+    cache_key layer means a retry after partial completion still benefits
+    from any successful fetch."""
+    assert POOL is not None
+    cache_key = _cache_key(req)
+    ttl = req.cacheTtlSeconds if req.cacheTtlSeconds is not None else DEFAULT_CACHE_TTL_S
+
+    # Cache short-circuit. Any prior run with the same (url, tier_chain)
+    # returns without fetching — the orchestrator's activity retry becomes a
+    # no-op, and a concurrent job for the same key waits for the one fetching.
+    # At ttl 0 nothing is cached for a waiter to reuse, so jobs don't queue.
+    result, _validators = await _read_cache(cache_key)
+    if result is None:
+        async with _single_flight(cache_key) if ttl > 0 else nullcontext():
+            result, validators = await _read_cache(cache_key)
+            if result is None:
+                # Mark RUNNING.
+                async with POOL.acquire() as con:
+                    await con.execute(
+                        "UPDATE crawl4ai_jobs SET state='RUNNING', updated_at=now() WHERE id=$1",
+                        job_id,
+                    )
+                prefetched = None
+                if validators and _normalize_tiers(req.tiers)[0] == "http":
+                    result, prefetched = await _revalidate(
+                        job_id, req, cache_key, validators, ttl
+                    )
+                if result is None:
+                    result, last, err_msg = await _fetch_tiers(
+                        job_id, req, cache_key, ttl, prefetched
+                    )
+                    if result is None:
+                        # All tiers exhausted without an unblocked response.
+                        async with POOL.acquire() as con:
+                            await con.execute(
+                                "UPDATE crawl4ai_jobs SET state='FAILED', error=$2, result=$3, "
+                                "updated_at=now() WHERE id=$1",
+                                job_id,
+                                err_msg,
+                                json.dumps(last) if last else None,
+                            )
+                        logger.warning("failed job=%s url=%s reasons=%s", job_id, req.url, err_msg)
+                        return
+            else:
+                result["cacheHit"] = True
+    else:
+        result["cacheHit"] = True
+
+    if req.extractionSchema:
+        await _cached_extraction(result, req)
     async with POOL.acquire() as con:
         await con.execute(
-            "UPDATE crawl4ai_jobs SET state='FAILED', error=$2, result=$3, updated_at=now() WHERE id=$1",
+            "UPDATE crawl4ai_jobs SET state='COMPLETE', result=$2, error=NULL, "
+            "cache_key=$3, updated_at=now() WHERE id=$1",
             job_id,
-            err_msg,
-            json.dumps(last) if last else None,
+            json.dumps(result),
+            cache_key,
         )
-    logger.warning("failed job=%s url=%s reasons=%s", job_id, req.url, err_msg)
+    logger.info(
+        "ok job=%s url=%s tier=%s status=%s bytes=%s cacheHit=%s",
+        job_id,
+        req.url,
+        result.get("tier"),
+        result.get("status"),
+        result.get("byteLength"),
+        bool(result.get("cacheHit")),
+    )
 
 
 # --- HTTP routes ----------------------------------------------------------
@@ -574,7 +1059,7 @@ async def readyz() -> dict[str, Any]:
         raise HTTPException(503, detail="db pool not ready")
     async with POOL.acquire() as con:
         await con.execute("SELECT 1")
-    return {"status": "ready"}
+    return {"status": "ready", "browserPool": BROWSERS.stats()}
 
 
 @app.post("/crawl/jobs", response_model=JobAck)
@@ -628,8 +1113,8 @@ async def get_job(job_id: str) -> JobStatus:
     died and re-kick. The orchestrator's next poll sees the state move
     forward; from its perspective, "polling carried us through the
     crash" is the only observable behaviour. Combined with the
-    startup watchdog this gives best-effort recovery without needing
-    a heartbeat thread.
+    startup watchdog this gives best-effort recovery; live jobs keep
+    `updated_at` fresh (see `_heartbeat`) so they are never re-kicked.
     """
     assert POOL is not None
     async with POOL.acquire() as con:
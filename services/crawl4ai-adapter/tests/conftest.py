@@ -0,0 +1,14 @@
+"""Test bootstrap: service root on sys.path and a placeholder database URL so
+`app` imports without a live PostgreSQL (tests swap in fake pools)."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVICE_ROOT))
+
+os.environ.setdefault("CRAWL4AI_DATABASE_URL", "postgresql://unused@localhost/crawl4ai")
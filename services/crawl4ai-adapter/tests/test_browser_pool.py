@@ -0,0 +1,418 @@
+"""Warm Chromium pool (BrowserPool) and the shared HTTP/2 connection pool,
+with fake Playwright browsers and an httpx MockTransport origin."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+import app
+
+
+class _FakeResponse:
+    def __init__(self, status: int) -> None:
+        self.status = status
+        self.headers = {"content-type": "text/html"}
+
+
+class _FakePage:
+    def __init__(self, browser: "_FakeBrowser") -> None:
+        self.browser = browser
+        self.url = "about:blank"
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        if self.browser.goto_error is not None:
+            raise self.browser.goto_error
+        self.url = url
+        return _FakeResponse(200)
+
+    async def wait_for_load_state(self, state, timeout=None):
+        return None
+
+    async def content(self) -> str:
+        return "<html><body><h1>Title</h1><p>" + "body text " * 80 + "</p></body></html>"
+
+
+class _FakeContext:
+    def __init__(self, browser: "_FakeBrowser", kwargs: dict) -> None:
+        self.browser = browser
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def add_init_script(self, script: str) -> None:
+        return None
+
+    async def new_page(self) -> _FakePage:
+        return _FakePage(self.browser)
+
+    async def close(self) -> None:
+        self.closed = True
+        if self.browser.fail_close:
+            raise RuntimeError("Target page, context or browser has been closed")
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+        self.closed = False
+        self.contexts: list[_FakeContext] = []
+        self.fail_new_context = False
+        self.fail_close = False
+        self.goto_error: Exception | None = None
+        self._handlers: dict = {}
+
+    def on(self, event, handler) -> None:
+        self._handlers[event] = handler
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def new_context(self, **kwargs) -> _FakeContext:
+        if not self.connected or self.fail_new_context:
+            raise RuntimeError("Browser.new_context: Target closed")
+        context = _FakeContext(self, kwargs)
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        self.closed = True
+        self.connected = False
+
+    def crash(self) -> None:
+        self.connected = False
+        self._handlers["disconnected"](self)
+
+
+class _FakeChromium:
+    def __init__(self) -> None:
+        self.browsers: list[_FakeBrowser] = []
+        self.gate: asyncio.Event | None = None
+
+    async def launch(self, **kwargs) -> _FakeBrowser:
+        if self.gate is not None:
+            await self.gate.wait()
+        browser = _FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+
+class _FakePlaywright:
+    def __init__(self) -> None:
+        self.chromium = _FakeChromium()
+        self.stopped = False
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+def _pool(size: int = 1, per_browser: int = 2) -> tuple[app.BrowserPool, _FakeChromium]:
+    pool = app.BrowserPool(size, per_browser)
+    pool._playwright = _FakePlaywright()
+    return pool, pool._playwright.chromium
+
+
+async def _settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def test_saturated_pool_queues_jobs_for_a_context_slot():
+    async def run():
+        pool, chromium = _pool(size=1, per_browser=2)
+        gate = asyncio.Event()
+        active = peak = 0
+
+        async def job():
+            nonlocal active, peak
+            async with pool.context():
+                active += 1
+                peak = max(peak, active)
+                await gate.wait()
+                active -= 1
+
+        tasks = [asyncio.create_task(job()) for _ in range(5)]
+        await _settle()
+        stats = pool.stats()
+        assert (stats["browsers"], stats["inUse"], stats["waiting"]) == (1, 2, 3)
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert peak == 2
+        assert pool.stats() == {
+            "browsers": 1,
+            "inUse": 0,
+            "waiting": 0,
+            "launched": 1,
+            "recycled": 0,
+        }
+        assert len(chromium.browsers[0].contexts) == 5
+        assert all(context.closed for context in chromium.browsers[0].contexts)
+
+    asyncio.run(run())
+
+
+def test_browser_is_recycled_after_max_pages(monkeypatch):
+    monkeypatch.setattr(app, "BROWSER_MAX_PAGES", 2)
+
+    async def run():
+        pool, chromium = _pool(size=1, per_browser=2)
+        for _ in range(3):
+            async with pool.context():
+                pass
+
+        first, second = chromium.browsers
+        assert first.closed and not second.closed
+        assert (pool.launched, pool.recycled, pool.stats()["browsers"]) == (2, 1, 1)
+
+    asyncio.run(run())
+
+
+def test_retiring_browser_drains_its_contexts_before_closing(monkeypatch):
+    monkeypatch.setattr(app, "BROWSER_MAX_PAGES", 1)
+
+    async def run():
+        pool, chromium = _pool(size=1, per_browser=2)
+        async with pool.context():
+            # The first browser hit its page budget but still serves this
+            # context; a new job gets a fresh browser instead of waiting.
+            async with pool.context():
+                assert len(chromium.browsers) == 2
+            assert not chromium.browsers[0].closed
+        assert chromium.browsers[0].closed
+
+    asyncio.run(run())
+
+
+def test_crashed_browser_is_replaced():
+    async def run():
+        pool, chromium = _pool(size=1, per_browser=2)
+        async with pool.context():
+            chromium.browsers[0].crash()
+
+        async with pool.context():
+            pass
+
+        assert len(chromium.browsers) == 2
+        assert pool.recycled == 1 and pool.stats()["browsers"] == 1
+
+        # A browser that died without the event firing is caught by the
+        # failed new_context, released, and replaced on the next job.
+        chromium.browsers[1].connected = False
+        with pytest.raises(RuntimeError, match="Target closed"):
+            async with pool.context():
+                pass
+        async with pool.context():
+            pass
+        assert len(chromium.browsers) == 3
+        assert pool.stats()["inUse"] == 0
+
+    asyncio.run(run())
+
+
+def test_launch_does_not_block_jobs_on_running_browsers():
+    async def run():
+        pool, chromium = _pool(size=2, per_browser=1)
+        async with pool.context():
+            pass
+
+        chromium.gate = asyncio.Event()
+        first_done = asyncio.Event()
+
+        async def first():
+            async with pool.context():
+                await first_done.wait()
+
+        held = asyncio.create_task(first())
+        await _settle()
+        launching = asyncio.create_task(first())  # no free browser: launches
+        await _settle()
+        assert pool.stats()["browsers"] == 1 and len(chromium.browsers) == 1
+
+        # While Chromium starts, the running browser is still released and
+        # handed to the next job.
+        first_done.set()
+        async with asyncio.timeout(1):
+            await held
+            async with pool.context():
+                assert pool.stats()["inUse"] == 1
+
+        chromium.gate.set()
+        await launching
+        assert pool.launched == 2 and pool.stats()["inUse"] == 0
+
+    asyncio.run(run())
+
+
+def test_jobs_share_a_pending_launch_when_the_pool_is_full():
+    async def run():
+        pool, chromium = _pool(size=1, per_browser=2)
+        chromium.gate = asyncio.Event()
+        gate = asyncio.Event()
+
+        async def job():
+            async with pool.context():
+                await gate.wait()
+
+        tasks = [asyncio.create_task(job()) for _ in range(2)]
+        await _settle()
+        chromium.gate.set()
+        await _settle()
+        assert len(chromium.browsers) == 1
+        assert pool.stats()["inUse"] == 2
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+
+def test_slots_are_released_when_the_job_raises():
+    async def run():
+        pool, chromium = _pool(size=1, per_browser=2)
+        with pytest.raises(ValueError):
+            async with pool.context():
+                raise ValueError("page script failed")
+        assert chromium.browsers[0].contexts[0].closed
+
+        browser = chromium.browsers[0]
+        browser.fail_new_context = True
+        with pytest.raises(RuntimeError):
+            async with pool.context():
+                pass
+        browser.fail_new_context = False
+        assert not browser.closed  # still connected: kept warm
+
+        browser.fail_close = True
+        async with pool.context():
+            pass
+        browser.fail_close = False
+
+        # Every slot is free again: a full wave enters without waiting.
+        entered = asyncio.Event()
+        count = 0
+
+        async def job():
+            nonlocal count
+            async with pool.context():
+                count += 1
+                if count == 2:
+                    entered.set()
+                await entered.wait()
+
+        await asyncio.wait_for(asyncio.gather(job(), job()), timeout=1)
+        assert pool.stats()["inUse"] == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def run():
+        pool, _ = _pool(size=1, per_browser=1)
+        gate = asyncio.Event()
+
+        async def holder():
+            async with pool.context():
+                await gate.wait()
+
+        held = asyncio.create_task(holder())
+        await _settle()
+        waiter = asyncio.create_task(holder())
+        await _settle()
+        assert pool.stats()["waiting"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        gate.set()
+        await held
+        assert pool.stats()["waiting"] == 0
+        async with asyncio.timeout(1):
+            async with pool.context():
+                pass
+
+    asyncio.run(run())
+
+
+def test_playwright_tier_releases_the_context_when_navigation_fails(monkeypatch):
+    async def run():
+        pool, chromium = _pool(size=1, per_browser=1)
+        monkeypatch.setattr(app, "BROWSERS", pool)
+        req = app.CrawlRequest(url="https://example.com/a", tiers=["playwright"])
+
+        result = await app._fetch_playwright(req, stealth=False)
+        assert result["tier"] == "playwright" and result["status"] == 200
+        assert "# Title" in result["markdown"]
+
+        chromium.browsers[0].goto_error = TimeoutError("navigation timeout")
+        with pytest.raises(TimeoutError):
+            await app._fetch_playwright(req, stealth=True)
+        assert all(context.closed for context in chromium.browsers[0].contexts)
+        assert pool.stats()["inUse"] == 0
+        assert chromium.browsers[0].contexts[1].kwargs["user_agent"].startswith("Mozilla/5.0")
+
+    asyncio.run(run())
+
+
+class _CountingTransport(httpx.MockTransport):
+    closed = 0
+
+    async def aclose(self) -> None:
+        self.closed += 1
+
+
+def test_http_tier_reuses_the_shared_transport(monkeypatch):
+    seen: list[httpx.Request] = []
+
+    def origin(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path == "/big":
+            return httpx.Response(200, content=b"x" * 4096)
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "etag": '"v1"'},
+            content=b"<html><body><p>" + b"hello " * 200 + b"</p></body></html>",
+        )
+
+    async def run():
+        transport = _CountingTransport(origin)
+        monkeypatch.setattr(app, "HTTP_TRANSPORT", transport)
+        first = await app._fetch_http(
+            app.CrawlRequest(url="https://example.com/a", headers={"X-Trace": "t1"})
+        )
+        assert app._http_transport() is transport
+        with pytest.raises(ValueError, match="maxBodyBytes"):
+            await app._fetch_http(app.CrawlRequest(url="https://example.com/big", maxBodyBytes=1024))
+        # Closing each job's client leaves the shared pool open.
+        assert transport.closed == 0
+        return first
+
+    first = asyncio.run(run())
+
+    assert first["status"] == 200 and first["_etag"] == '"v1"'
+    assert first["_blockReason"] is None
+    assert seen[0].headers["X-Trace"] == "t1"
+    assert seen[0].headers["User-Agent"] == app.USER_AGENT
+    assert len(seen) == 2
+
+
+def test_cookies_do_not_leak_between_jobs(monkeypatch):
+    seen: list[httpx.Request] = []
+
+    def origin(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "set-cookie": "session=job-a; Path=/"},
+            content=b"<html><body><p>" + b"hello " * 200 + b"</p></body></html>",
+        )
+
+    monkeypatch.setattr(app, "HTTP_TRANSPORT", httpx.MockTransport(origin))
+
+    async def run():
+        await app._fetch_http(app.CrawlRequest(url="https://example.com/account"))
+        await app._fetch_http(app.CrawlRequest(url="https://example.com/account"))
+
+    asyncio.run(run())
+
+    assert len(seen) == 2
+    assert "cookie" not in seen[1].headers
@@ -0,0 +1,346 @@
+"""Single-flight fetches, conditional revalidation and the extraction cache,
+against an in-memory stand-in for the asyncpg pools and an httpx
+MockTransport origin."""
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+
+import app
+
+
+class _FakeDatabase:
+    """The crawl4ai tables plus session advisory locks, with a settable clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+        self.jobs: dict[str, dict] = {}
+        self.cache: dict[str, dict] = {}
+        self.extractions: dict[tuple[str, str], dict] = {}
+        self.locks: dict[str, "_FakeConnection"] = {}
+        self.cache_reads = 0
+
+
+class _FakeConnection:
+    def __init__(self, db: _FakeDatabase) -> None:
+        self.db = db
+        self.fail_unlock = False
+        self.terminated = False
+
+    async def fetchrow(self, sql: str, *args):
+        db = self.db
+        if sql.startswith("SELECT payload, etag, last_modified"):
+            db.cache_reads += 1
+            entry = db.cache.get(args[0])
+            if entry is None:
+                return None
+            return {**entry, "fresh": entry["expires_at"] > db.now}
+        if sql.startswith("UPDATE crawl4ai_cache SET expires_at"):
+            entry = db.cache.get(args[0])
+            if entry is None:
+                return None
+            entry["expires_at"] = db.now + int(args[1])
+            return {"payload": entry["payload"]}
+        if sql.startswith("SELECT payload FROM crawl4ai_extractions"):
+            entry = db.extractions.get((args[0], args[1]))
+            if entry is None or entry["expires_at"] <= db.now:
+                return None
+            return {"payload": entry["payload"]}
+        raise AssertionError(f"unexpected fetchrow: {sql}")
+
+    async def fetchval(self, sql: str, *args):
+        assert sql.startswith("SELECT pg_try_advisory_lock"), sql
+        owner = self.db.locks.get(args[0])
+        if owner is None or owner.terminated:
+            self.db.locks[args[0]] = self
+            return True
+        return owner is self
+
+    async def execute(self, sql: str, *args):
+        db = self.db
+        if sql.startswith("SELECT pg_advisory_unlock"):
+            if self.fail_unlock:
+                raise ConnectionError("connection reset during unlock")
+            if db.locks.get(args[0]) is self:
+                del db.locks[args[0]]
+        elif sql.startswith("UPDATE crawl4ai_jobs SET updated_at=now()"):
+            job = db.jobs.setdefault(args[0], {})
+            if job.get("state", "PENDING") in ("PENDING", "RUNNING"):
+                job["heartbeats"] = job.get("heartbeats", 0) + 1
+        elif sql.startswith("UPDATE crawl4ai_jobs"):
+            job = db.jobs.setdefault(args[0], {})
+            job["state"] = re.search(r"state='(\w+)'", sql).group(1)
+            if "result=$2" in sql:
+                job["result"] = json.loads(args[1])
+            elif "result=$3" in sql and args[2]:
+                job["result"] = json.loads(args[2])
+        elif sql.startswith("INSERT INTO crawl4ai_cache"):
+            key, payload, ttl, etag, last_modified = args
+            db.cache[key] = {
+                "payload": payload,
+                "expires_at": db.now + int(ttl),
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+        elif sql.startswith("INSERT INTO crawl4ai_extractions"):
+            digest, schema_hash, payload, ttl = args
+            db.extractions[(digest, schema_hash)] = {
+                "payload": payload,
+                "expires_at": db.now + int(ttl),
+            }
+        else:
+            raise AssertionError(f"unexpected execute: {sql}")
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+
+class _Acquire:
+    def __init__(self, pool: "_FakePool") -> None:
+        self.pool = pool
+
+    def __await__(self):
+        return self.pool._acquire().__await__()
+
+    async def __aenter__(self):
+        self.con = await self.pool._acquire()
+        return self.con
+
+    async def __aexit__(self, *exc_info):
+        await self.pool.release(self.con)
+
+
+class _FakePool:
+    def __init__(self, db: _FakeDatabase) -> None:
+        self.db = db
+        self.connections: list[_FakeConnection] = []
+        self.released: list[_FakeConnection] = []
+
+    async def _acquire(self) -> _FakeConnection:
+        con = _FakeConnection(self.db)
+        self.connections.append(con)
+        return con
+
+    def acquire(self) -> _Acquire:
+        return _Acquire(self)
+
+    async def release(self, con: _FakeConnection) -> None:
+        self.released.append(con)
+
+
+class _Origin:
+    """httpx MockTransport handler: serves one page and the extraction API."""
+
+    def __init__(self) -> None:
+        self.etag = '"v1"'
+        self.page_fetches = 0
+        self.conditional: list[str | None] = []
+        self.extractions: list[dict] = []
+        self.gate: asyncio.Event | None = None
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.anthropic.com":
+            body = json.loads(request.content)
+            self.extractions.append(body["tools"][0]["input_schema"])
+            fields = sorted(body["tools"][0]["input_schema"].get("properties", {}))
+            return httpx.Response(
+                200,
+                json={
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "name": "structured_extract",
+                            "input": {"fields": fields},
+                        }
+                    ]
+                },
+            )
+        self.page_fetches += 1
+        self.conditional.append(request.headers.get("if-none-match"))
+        if self.gate is not None:
+            await self.gate.wait()
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "etag": self.etag},
+            content=b"<html><body><h1>Pricing</h1><p>" + b"plan " * 200 + b"</p></body></html>",
+        )
+
+
+@pytest.fixture
+def env(monkeypatch):
+    db = _FakeDatabase()
+    origin = _Origin()
+    pool, lock_pool = _FakePool(db), _FakePool(db)
+    monkeypatch.setattr(app, "POOL", pool)
+    monkeypatch.setattr(app, "LOCK_POOL", lock_pool)
+    monkeypatch.setattr(app, "ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(app, "HTTP_TRANSPORT", httpx.MockTransport(origin))
+    return db, origin, lock_pool
+
+
+URL = "https://example.com/pricing"
+
+
+def _request(**overrides) -> app.CrawlRequest:
+    return app.CrawlRequest(url=URL, **overrides)
+
+
+def test_waiter_rereads_the_cache_instead_of_fetching(env):
+    db, origin, _ = env
+
+    async def run():
+        origin.gate = asyncio.Event()
+        first = asyncio.create_task(app._kick_job("job-1", _request()))
+        second = asyncio.create_task(app._kick_job("job-2", _request()))
+        for _ in range(50):
+            await asyncio.sleep(0)
+        # job-1 holds the single-flight lock mid-fetch; job-2 queues on it.
+        assert origin.page_fetches == 1
+        assert app._INFLIGHT_WAITERS[app._cache_key(_request())] == 2
+        origin.gate.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+
+    assert origin.page_fetches == 1
+    assert db.jobs["job-1"]["state"] == db.jobs["job-2"]["state"] == "COMPLETE"
+    assert "cacheHit" not in db.jobs["job-1"]["result"]
+    assert db.jobs["job-2"]["result"]["cacheHit"] is True
+    # Both jobs missed before queueing; each re-read once inside the lock.
+    assert db.cache_reads == 4
+    assert app._INFLIGHT == {} and app._INFLIGHT_WAITERS == {}
+    assert db.locks == {}
+
+
+def test_uncached_jobs_do_not_queue_on_each_other(env):
+    db, origin, lock_pool = env
+    req = _request(cacheTtlSeconds=0)
+
+    async def run():
+        origin.gate = asyncio.Event()
+        jobs = [asyncio.create_task(app._kick_job(f"job-{i}", req)) for i in (1, 2)]
+        for _ in range(50):
+            await asyncio.sleep(0)
+        # Nothing would be cached for a waiter: both fetch at once.
+        assert origin.page_fetches == 2
+        assert app._INFLIGHT_WAITERS == {}
+        origin.gate.set()
+        await asyncio.gather(*jobs)
+
+    asyncio.run(run())
+
+    assert db.jobs["job-1"]["state"] == db.jobs["job-2"]["state"] == "COMPLETE"
+    assert db.cache == {} and lock_pool.connections == []
+
+
+def test_waiting_job_keeps_its_row_fresh(env, monkeypatch):
+    db, origin, _ = env
+    monkeypatch.setattr(app, "JOB_HEARTBEAT_SECONDS", 0.01)
+
+    async def run():
+        origin.gate = asyncio.Event()
+        first = asyncio.create_task(app._kick_job("job-1", _request()))
+        second = asyncio.create_task(app._kick_job("job-2", _request()))
+        await asyncio.sleep(0.1)
+        # job-2 is queued behind job-1's fetch, yet its row is not idle.
+        assert db.jobs["job-2"].get("state") is None
+        assert db.jobs["job-2"]["heartbeats"] >= 2
+        origin.gate.set()
+        await asyncio.gather(first, second)
+        beats = db.jobs["job-2"]["heartbeats"]
+        await asyncio.sleep(0.05)
+        return beats
+
+    beats = asyncio.run(run())
+
+    assert db.jobs["job-2"]["state"] == "COMPLETE"
+    assert db.jobs["job-2"]["heartbeats"] == beats  # stopped with the job
+
+
+def test_not_modified_extends_the_entry_without_refetching(env):
+    db, origin, _ = env
+    req = _request(cacheTtlSeconds=600)
+
+    asyncio.run(app._kick_job("job-1", req))
+    key = app._cache_key(req)
+    payload = db.cache[key]["payload"]
+    db.now += 601  # expired
+
+    asyncio.run(app._kick_job("job-2", req))
+
+    assert origin.conditional == [None, '"v1"']
+    assert db.cache[key]["expires_at"] == db.now + 600
+    assert db.cache[key]["payload"] == payload
+    result = db.jobs["job-2"]["result"]
+    assert result["revalidated"] is True and result["markdown"].startswith("# Pricing")
+
+
+def test_changed_page_replaces_the_entry_with_one_fetch(env):
+    db, origin, _ = env
+    req = _request(cacheTtlSeconds=600)
+    asyncio.run(app._kick_job("job-1", req))
+    db.now += 601
+    origin.etag = '"v2"'
+
+    asyncio.run(app._kick_job("job-2", req))
+
+    # The conditional GET's 200 body is reused by the tier walk.
+    assert origin.page_fetches == 2
+    assert db.cache[app._cache_key(req)]["etag"] == '"v2"'
+    assert "revalidated" not in db.jobs["job-2"]["result"]
+
+
+def test_schema_change_reruns_only_the_extraction(env):
+    db, origin, _ = env
+    schema_a = {"type": "object", "properties": {"plans": {"type": "array"}}}
+    schema_b = {"type": "object", "properties": {"currency": {"type": "string"}}}
+
+    asyncio.run(app._kick_job("job-a", _request(extractionSchema=schema_a)))
+    asyncio.run(app._kick_job("job-b", _request(extractionSchema=schema_b)))
+    asyncio.run(app._kick_job("job-a2", _request(extractionSchema=schema_a)))
+
+    assert origin.page_fetches == 1
+    assert origin.extractions == [schema_a, schema_b]
+    assert db.jobs["job-b"]["result"]["cacheHit"] is True
+    assert db.jobs["job-b"]["result"]["extracted"] == {"fields": ["currency"]}
+    assert db.jobs["job-a2"]["result"]["extractionCacheHit"] is True
+    assert db.jobs["job-a2"]["result"]["extracted"] == {"fields": ["plans"]}
+
+
+def test_failed_unlock_terminates_the_lock_connection(env, monkeypatch):
+    db, _, lock_pool = env
+    original = lock_pool._acquire
+
+    async def acquire_failing():
+        con = await original()
+        con.fail_unlock = True
+        return con
+
+    monkeypatch.setattr(lock_pool, "_acquire", acquire_failing)
+
+    async def run():
+        async with app._advisory_lock("key-1"):
+            assert db.locks["key-1"] is lock_pool.connections[0]
+
+    asyncio.run(run())
+
+    (con,) = lock_pool.connections
+    assert con.terminated
+    assert lock_pool.released == [con]
+
+    # Ending the session dropped its lock: the next holder gets it at once.
+    monkeypatch.setattr(lock_pool, "_acquire", original)
+
+    async def relock():
+        async with asyncio.timeout(1):
+            async with app._advisory_lock("key-1"):
+                return db.locks["key-1"]
+
+    assert asyncio.run(relock()) is lock_pool.connections[1]
+    assert not lock_pool.connections[1].terminated
@@ -15,6 +15,7 @@ from typing import Any
 from urllib.error import HTTPError
 import urllib.request
 
+from src import llm_http, llm_stream
 from src.provider_conformance import (
     build_llm_chat_response,
     ensure_chat_completions_history,
@@ -260,7 +261,9 @@ def _make_alibaba_request(
         data=json.dumps(body).encode("utf-8"),
         headers={
             **auth_headers,
-            "Accept": "application/json",
+            "Accept": (
+                "text/event-stream" if body.get("stream") else "application/json"
+            ),
             "Content-Type": "application/json",
             "User-Agent": _user_agent(),
         },
@@ -425,8 +428,11 @@ def _call_alibaba_chat(
             else messages
         ),
         "max_tokens": output_cap,
-        "stream": False,
+        "stream": llm_stream.provider_streaming_enabled(),
     }
+    if request_body["stream"]:
+        # The final chunk then carries token usage (src/llm_stream.py).
+        request_body["stream_options"] = {"include_usage": True}
     use_response_format = (
         response_format is not None
         and os.environ.get("ALIBABA_USE_RESPONSE_FORMAT", "").strip().lower()
@@ -462,8 +468,13 @@ def _call_alibaba_chat(
         while True:
             req = _make_alibaba_request(url, request_body, headers)
             try:
-                with urllib.request.urlopen(req, timeout=timeout) as resp:
-                    data = json.loads(resp.read() or b"{}")
+                with llm_http.urlopen(req, timeout=timeout) as resp:
+                    data, stream_ttft_ms = llm_stream.read_chat_completion_stream(
+                        resp,
+                        provider="Alibaba",
+                        idle_timeout_seconds=timeout,
+                        request_started_at=llm_start,
+                    )
                 break
             except HTTPError as exc:
                 detail = exc.read().decode("utf-8", errors="replace")
@@ -499,6 +510,8 @@ def _call_alibaba_chat(
     content, tool_calls, finish_reason, reasoning_content = _extract_alibaba_response(data)
     usage = data.get("usage") if isinstance(data.get("usage"), dict) else {}
     duration_ms = (time.monotonic() - llm_start) * 1000.0
+    # Real time-to-first-token when the body streamed; a JSON body has none.
+    effective_ttft_ms = stream_ttft_ms if stream_ttft_ms is not None else duration_ms
     if response_format is not None and not content.strip():
         error = (
             "Alibaba Chat API returned empty assistant content for "
@@ -509,7 +522,7 @@ def _call_alibaba_chat(
         _publish_llm_usage(
             model=model,
             usage=usage,
-            ttft_ms=duration_ms,
+            ttft_ms=effective_ttft_ms,
             duration_ms=duration_ms,
             success=False,
             error=error,
@@ -530,7 +543,7 @@ def _call_alibaba_chat(
                 output_tokens=output_tokens or None,
                 success=True,
                 has_tool_call=bool(tool_calls),
-                ttft_ms=duration_ms,
+                ttft_ms=effective_ttft_ms,
                 model_output=content or None,
             )
             record_tokens(type_="input", count=input_tokens, model=model)
@@ -541,7 +554,7 @@ def _call_alibaba_chat(
     _publish_llm_usage(
         model=model,
         usage=usage,
-        ttft_ms=duration_ms,
+        ttft_ms=effective_ttft_ms,
         duration_ms=duration_ms,
         success=True,
     )
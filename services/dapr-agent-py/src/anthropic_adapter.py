@@ -23,6 +23,7 @@ import os
 import re
 from typing import Any
 
+from src import llm_http
 from src.instruction_bundle import SYSTEM_PROMPT_DYNAMIC_BOUNDARY
 
 logger = logging.getLogger(__name__)
@@ -855,9 +856,17 @@ def _call_anthropic_sdk(
     # inside the activity body so Dapr's activity-level retry never has to
     # fire. See also the WorkflowRetryPolicy tuning in main.py that covers
     # the longer pod-death window.
+    # http_client: the process-wide per-origin pool (src/llm_http.py), so the
+    # keep-alive connections survive this call instead of being rebuilt (DNS +
+    # TCP + TLS) on every turn.
+    base_url = os.environ.get("ANTHROPIC_BASE_URL") or "https://api.anthropic.com"
+    client_kwargs: dict[str, Any] = {}
+    if llm_http.pool_enabled():
+        client_kwargs["http_client"] = llm_http.client_for(base_url)
     client = anthropic.Anthropic(
         api_key=api_key,
         max_retries=4,
+        **client_kwargs,
     )
     model = _get_anthropic_model(component)
     # cache_ttl '5m' (default) or '1h'. '1h' requires Anthropic's
@@ -1077,7 +1086,8 @@ def _call_anthropic_sdk(
 
     try:
         try:
-            response = _stream_final_message(client, **request_kwargs)
+            with llm_http.provider_slot(base_url):
+                response = _stream_final_message(client, **request_kwargs)
             content, tool_calls, thinking_blocks = _extract_response(response)
             _emit_thinking(thinking_blocks)
         except Exception as exc:
@@ -1143,7 +1153,8 @@ def _call_anthropic_sdk(
         )
         request_kwargs["max_tokens"] = ESCALATED_MAX_TOKENS
         try:
-            response = _stream_final_message(client, **request_kwargs)
+            with llm_http.provider_slot(base_url):
+                response = _stream_final_message(client, **request_kwargs)
             content, tool_calls, thinking_blocks = _extract_response(response)
             _emit_thinking(thinking_blocks)
         except Exception as exc:
@@ -1197,7 +1208,8 @@ def _call_anthropic_sdk(
         request_kwargs["max_tokens"] = max_tokens
 
         try:
-            response = _stream_final_message(client, **request_kwargs)
+            with llm_http.provider_slot(base_url):
+                response = _stream_final_message(client, **request_kwargs)
             content, tool_calls, thinking_blocks = _extract_response(response)
             _emit_thinking(thinking_blocks)
         except Exception as exc:
@@ -3,15 +3,24 @@
 The checkpoint metadata is intentionally small so Dapr workflow history only
 records commit references and changed-file summaries. Git stores the actual
 workspace state efficiently inside the sandbox repository.
+
+Checkpoints either run synchronously after each mutating tool
+(``capture_code_checkpoint``) or, with DAPR_AGENT_PY_CODE_CHECKPOINT_ASYNC,
+through a per-instance ``CheckpointLane``: each tool call snapshots its own
+workspace tree, and the lane turns a burst of snapshots into per-call commits
+in one exec and pushes them off the tool loop's critical path.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
 from textwrap import dedent
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, NamedTuple
 import urllib.parse
 import urllib.request
 
@@ -342,10 +351,11 @@ CHECKPOINT_SCRIPT = dedent(
 
     add_no_proxy_hosts()
 
-    def run(args, check=False, timeout=30):
+    def run(args, check=False, timeout=30, env=None):
         proc = subprocess.run(
             args,
             cwd=str(repo),
+            env=env,
             universal_newlines=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -367,10 +377,10 @@ CHECKPOINT_SCRIPT = dedent(
             )
         )
 
-    def run_git_with_lock_retry(args, check=False, timeout=30):
+    def run_git_with_lock_retry(args, check=False, timeout=30, env=None):
         proc = None
         for attempt in range(10):
-            proc = run(args, timeout=timeout)
+            proc = run(args, timeout=timeout, env=env)
             if proc.returncode == 0 or not git_lock_error(proc.stderr or proc.stdout):
                 break
             time.sleep(0.5 * (attempt + 1))
@@ -378,7 +388,18 @@ CHECKPOINT_SCRIPT = dedent(
             raise RuntimeError((proc.stderr or proc.stdout or f"{args[0]} failed").strip())
         return proc
 
-    def emit(extra):
+    # Coalesced batches (the background checkpoint lane) send "toolCalls",
+    # each carrying the tree snapshotted when that call finished; the
+    # synchronous per-tool path sends a single toolCallId/toolName.
+    TOOL_CALLS = payload.get("toolCalls") if isinstance(payload.get("toolCalls"), list) else None
+
+    def ref_name_for(tool_call):
+        if payload.get("executionId") and tool_call.get("toolCallId"):
+            return f"refs/workflow-builder/checkpoints/{payload['executionId']}/{tool_call['toolCallId']}"
+        return None
+
+    def checkpoint_record(tool_call, extra):
+        tool_call_id = tool_call.get("toolCallId")
         result = {
             "checkpointKind": "tool_mutation",
             "workflowExecutionId": payload.get("executionId"),
@@ -386,20 +407,30 @@ CHECKPOINT_SCRIPT = dedent(
             "workspaceRef": payload.get("workspaceRef") or None,
             "sandboxName": payload.get("sandboxName") or None,
             "repoPath": str(repo),
-            "toolCallId": payload.get("toolCallId") or None,
-            "sourceEventId": f"{payload.get('toolCallId')}:end" if payload.get("toolCallId") else None,
-            "toolName": payload.get("toolName") or "unknown",
+            "toolCallId": tool_call_id or None,
+            "sourceEventId": f"{tool_call_id}:end" if tool_call_id else None,
+            "toolName": tool_call.get("toolName") or "unknown",
             "metadata": {
                 "createdBy": "dapr-agent-py",
-                "gitRef": (
-                    f"refs/workflow-builder/checkpoints/{payload.get('executionId')}/{payload.get('toolCallId')}"
-                    if payload.get("executionId") and payload.get("toolCallId")
-                    else None
-                ),
+                "gitRef": ref_name_for(tool_call),
             },
         }
         result.update(extra)
-        print(json.dumps(result))
+        return result
+
+    def emit(extra, per_call=None):
+        per_call = per_call or {}
+        if TOOL_CALLS is None:
+            merged = dict(extra)
+            merged.update(per_call.get(payload.get("toolCallId")) or {})
+            print(json.dumps(checkpoint_record(payload, merged)))
+            return
+        records = []
+        for tool_call in TOOL_CALLS:
+            merged = dict(extra)
+            merged.update(per_call.get(tool_call.get("toolCallId")) or {})
+            records.append(checkpoint_record(tool_call, merged))
+        print(json.dumps({"checkpoints": records}))
 
     def basic_auth_header(username, token):
         import base64
@@ -493,7 +524,9 @@ CHECKPOINT_SCRIPT = dedent(
         if status not in {201, 409}:
             raise RuntimeError(f"Gitea repo create failed ({status}): {body[:300]}")
 
-    def push_checkpoint_ref(remote, remote_ref, after_sha):
+    def push_checkpoint_refs(remote, refspecs):
+        # refspecs: [(sha, ref)]; coalesced calls each have their own commit.
+        remote_ref = refspecs[0][1] if len(refspecs) == 1 else None
         if not remote.get("enabled"):
             return {
                 "remoteStatus": "skipped",
@@ -509,13 +542,14 @@ CHECKPOINT_SCRIPT = dedent(
             run(["git", "remote", "set-url", remote_name, remote["remoteUrl"]], check=True, timeout=10)
         else:
             run(["git", "remote", "add", remote_name, remote["remoteUrl"]], check=True, timeout=10)
+        # One push for every ref of a coalesced commit.
         push_args = [
             "git",
             "-c",
             f"http.extraHeader=Authorization: {basic_auth_header(remote['username'], remote['token'])}",
             "push",
             remote_name,
-            f"{after_sha}:{remote_ref}",
+            *[f"{sha}:{ref}" for sha, ref in refspecs],
         ]
         push = None
         for attempt in range(5):
@@ -533,6 +567,57 @@ CHECKPOINT_SCRIPT = dedent(
             "remotePushedAt": datetime.now(timezone.utc).isoformat(),
         }
 
+    def push_result(refspecs):
+        remote = payload.get("remote") or {}
+        try:
+            return push_checkpoint_refs(remote, refspecs)
+        except Exception as remote_exc:
+            return {
+                "remoteStatus": "error",
+                "remoteError": str(remote_exc)[:1000],
+                "remoteUrl": remote.get("remoteUrl") or None,
+                "remoteRef": refspecs[0][1] if len(refspecs) == 1 else None,
+                "remotePushedAt": None,
+            }
+
+    def changed_files(before_sha, after_sha):
+        files = []
+        name_status = run(["git", "diff", "--name-status", "--find-renames", before_sha, after_sha], timeout=30).stdout
+        numstat = run(["git", "diff", "--numstat", before_sha, after_sha], timeout=30).stdout
+        stats_by_path = {}
+        for line in numstat.splitlines():
+            parts = line.split("\t")
+            if len(parts) >= 3:
+                path = parts[-1]
+                additions = None if parts[0] == "-" else int(parts[0])
+                deletions = None if parts[1] == "-" else int(parts[1])
+                stats_by_path[path] = {
+                    "additions": additions,
+                    "deletions": deletions,
+                    "binary": parts[0] == "-" or parts[1] == "-",
+                }
+        for line in name_status.splitlines():
+            parts = line.split("\t")
+            if not parts:
+                continue
+            status_code = parts[0]
+            if status_code.startswith("R") and len(parts) >= 3:
+                previous_path = parts[1]
+                path = parts[2]
+            else:
+                previous_path = None
+                path = parts[-1] if len(parts) >= 2 else ""
+            if not path:
+                continue
+            item = {
+                "path": path,
+                "status": status_code,
+                "previousPath": previous_path,
+            }
+            item.update(stats_by_path.get(path, {}))
+            files.append(item)
+        return files
+
     try:
         run(["git", "--version"], check=True, timeout=10)
     except Exception as exc:
@@ -546,6 +631,15 @@ CHECKPOINT_SCRIPT = dedent(
         })
         raise SystemExit(0)
 
+    if isinstance(payload.get("pushRefs"), list):
+        # Push-only pass for commits the lane already created.
+        print(json.dumps(push_result([
+            (str(r.get("sha") or ""), str(r.get("ref") or ""))
+            for r in payload["pushRefs"]
+            if isinstance(r, dict)
+        ])))
+        raise SystemExit(0)
+
     try:
         inside = run(["git", "rev-parse", "--is-inside-work-tree"], timeout=10)
         if inside.returncode != 0 or inside.stdout.strip() != "true":
@@ -582,6 +676,21 @@ CHECKPOINT_SCRIPT = dedent(
 
         before = run(["git", "rev-parse", "HEAD"], check=True, timeout=10).stdout.strip()
 
+        if payload.get("snapshot"):
+            # Lane submit: record this tool call's exact workspace tree in a
+            # private index (the real index and HEAD stay untouched); the
+            # lane commits it later.
+            index_path = repo / ".git" / "wfb-checkpoint-index"
+            snapshot_env = dict(os.environ, GIT_INDEX_FILE=str(index_path))
+            if not index_path.exists():
+                run_git_with_lock_retry(["git", "read-tree", "HEAD"], check=True, timeout=60, env=snapshot_env)
+            run_git_with_lock_retry(["git", "add", "-A"], check=True, timeout=60, env=snapshot_env)
+            tree = run(["git", "write-tree"], check=True, timeout=60, env=snapshot_env).stdout.strip()
+            print(json.dumps({"tree": tree, "headSha": before}))
+            raise SystemExit(0)
+
+        tool_calls = TOOL_CALLS if TOOL_CALLS is not None else [payload]
+
         # Idempotency on activity retry: if the durable ref for this
         # (executionId, toolCallId) already exists locally, a prior attempt
         # of this same Dapr activity already committed. The tool's effect on
@@ -589,78 +698,23 @@ CHECKPOINT_SCRIPT = dedent(
         # `git status` would now report no_changes and we would lose the
         # original changedFiles list. Reconstruct the metadata from the
         # existing commit and skip straight to the (idempotent) push.
-        existing_ref_name = None
-        existing_after = None
-        if payload.get("executionId") and payload.get("toolCallId"):
-            existing_ref_name = f"refs/workflow-builder/checkpoints/{payload['executionId']}/{payload['toolCallId']}"
+        per_call = {}
+        for tool_call in tool_calls:
+            existing_ref_name = ref_name_for(tool_call)
+            if not existing_ref_name:
+                continue
             ref_check = run(["git", "rev-parse", "--verify", existing_ref_name], timeout=10)
-            if ref_check.returncode == 0 and ref_check.stdout.strip():
-                existing_after = ref_check.stdout.strip()
-
-        if existing_after:
+            existing_after = ref_check.stdout.strip() if ref_check.returncode == 0 else ""
+            if not existing_after:
+                continue
             parent = run(["git", "rev-parse", f"{existing_after}^"], timeout=10)
             before_existing = parent.stdout.strip() if parent.returncode == 0 else existing_after
-            files = []
-            name_status = run(["git", "diff", "--name-status", "--find-renames", before_existing, existing_after], timeout=30).stdout
-            numstat = run(["git", "diff", "--numstat", before_existing, existing_after], timeout=30).stdout
-            stats_by_path = {}
-            for line in numstat.splitlines():
-                parts = line.split("\t")
-                if len(parts) >= 3:
-                    path = parts[-1]
-                    additions = None if parts[0] == "-" else int(parts[0])
-                    deletions = None if parts[1] == "-" else int(parts[1])
-                    stats_by_path[path] = {
-                        "additions": additions,
-                        "deletions": deletions,
-                        "binary": parts[0] == "-" or parts[1] == "-",
-                    }
-            for line in name_status.splitlines():
-                parts = line.split("\t")
-                if not parts:
-                    continue
-                status_code = parts[0]
-                if status_code.startswith("R") and len(parts) >= 3:
-                    previous_path = parts[1]
-                    path = parts[2]
-                else:
-                    previous_path = None
-                    path = parts[-1] if len(parts) >= 2 else ""
-                if not path:
-                    continue
-                item = {
-                    "path": path,
-                    "status": status_code,
-                    "previousPath": previous_path,
-                }
-                item.update(stats_by_path.get(path, {}))
-                files.append(item)
-
-            remote_result = {
-                "remoteStatus": "skipped",
-                "remoteError": "remote ref unavailable",
-                "remoteUrl": None,
-                "remoteRef": existing_ref_name,
-                "remotePushedAt": None,
-            }
-            try:
-                remote_result = push_checkpoint_ref(payload.get("remote") or {}, existing_ref_name, existing_after)
-            except Exception as remote_exc:
-                remote = payload.get("remote") or {}
-                remote_result = {
-                    "remoteStatus": "error",
-                    "remoteError": str(remote_exc)[:1000],
-                    "remoteUrl": remote.get("remoteUrl") or None,
-                    "remoteRef": existing_ref_name,
-                    "remotePushedAt": None,
-                }
-
-            capped_files, total_files = cap_files(files)
-            emit({
+            capped_files, total_files = cap_files(changed_files(before_existing, existing_after))
+            per_call[tool_call.get("toolCallId")] = {
                 "status": "created",
                 "beforeSha": before_existing,
                 "afterSha": existing_after,
-                **remote_result,
+                **push_result([(existing_after, existing_ref_name)]),
                 "changedFiles": capped_files,
                 "fileCount": total_files,
                 "metadata": {
@@ -669,87 +723,123 @@ CHECKPOINT_SCRIPT = dedent(
                     "retried": True,
                     "truncated": total_files > CHANGED_FILES_CAP,
                 },
-            })
+            }
+        pending = [tc for tc in tool_calls if tc.get("toolCallId") not in per_call]
+        if not pending:
+            emit({}, per_call)
+            raise SystemExit(0)
+
+        no_changes = {
+            "status": "no_changes",
+            "beforeSha": before,
+            "afterSha": before,
+            "remoteUrl": None,
+            "remoteRef": None,
+            "remoteStatus": "skipped",
+            "remoteError": "no changes",
+            "remotePushedAt": None,
+            "changedFiles": [],
+            "fileCount": 0,
+        }
+        if TOOL_CALLS is not None:
+            # One commit per tool call, built from the tree snapshotted when
+            # that call finished, chained in submission order.
+            parent = before
+            refspecs = []
+            for tool_call in pending:
+                tool_call_id = str(tool_call.get("toolCallId") or "").strip()[:80]
+                tool_name = str(tool_call.get("toolName") or "tool").strip()[:80]
+                tree = str(tool_call.get("tree") or "")
+                if not tree:
+                    per_call[tool_call.get("toolCallId")] = {
+                        **no_changes,
+                        "status": "error",
+                        "error": "missing workspace snapshot",
+                        "beforeSha": None,
+                        "afterSha": None,
+                        "remoteStatus": "error",
+                        "remoteError": "missing workspace snapshot",
+                    }
+                    continue
+                parent_tree = run(["git", "rev-parse", f"{parent}^{{tree}}"], check=True, timeout=10).stdout.strip()
+                if tree == parent_tree:
+                    per_call[tool_call.get("toolCallId")] = {
+                        **no_changes,
+                        "beforeSha": parent,
+                        "afterSha": parent,
+                    }
+                    continue
+                commit_args = ["git", "commit-tree", tree, "-p", parent, "-m", f"checkpoint: {tool_name} {tool_call_id}".strip()]
+                if tool_call_id:
+                    commit_args.extend(["-m", f"Tool-Call-Id: {tool_call_id} ({tool_name})"])
+                commit = run(commit_args, check=True, timeout=30).stdout.strip()
+                ref_name = ref_name_for(tool_call)
+                if ref_name:
+                    run_git_with_lock_retry(["git", "update-ref", ref_name, commit], timeout=10)
+                    refspecs.append((commit, ref_name))
+                capped_files, total_files = cap_files(changed_files(parent, commit))
+                per_call[tool_call.get("toolCallId")] = {
+                    "status": "created",
+                    "beforeSha": parent,
+                    "afterSha": commit,
+                    "remoteUrl": None,
+                    "remoteRef": ref_name,
+                    "remoteStatus": "pending" if ref_name and payload.get("deferPush") else "skipped",
+                    "remoteError": None if ref_name else "remote ref unavailable",
+                    "remotePushedAt": None,
+                    "changedFiles": capped_files,
+                    "fileCount": total_files,
+                    "metadata": {
+                        "createdBy": "dapr-agent-py",
+                        "gitRef": ref_name,
+                        "truncated": total_files > CHANGED_FILES_CAP,
+                        "coalescedToolCallIds": [
+                            tc.get("toolCallId") for tc in pending if tc.get("toolCallId")
+                        ],
+                    },
+                }
+                parent = commit
+            if parent != before:
+                # Advance the branch (only if nobody moved it meanwhile) and
+                # reset the real index to it; the working tree is untouched.
+                moved = run_git_with_lock_retry(["git", "update-ref", "HEAD", parent, before], timeout=10)
+                if moved.returncode == 0:
+                    run_git_with_lock_retry(["git", "read-tree", parent], timeout=60)
+                try:
+                    run(["git", "gc", "--auto"], timeout=5)
+                except Exception:
+                    pass
+            if refspecs and not payload.get("deferPush"):
+                pushed = push_result(refspecs)
+                for tool_call in pending:
+                    record = per_call.get(tool_call.get("toolCallId")) or {}
+                    if record.get("status") == "created" and record.get("remoteRef"):
+                        record.update({**pushed, "remoteRef": record["remoteRef"]})
+            emit({}, per_call)
             raise SystemExit(0)
 
         status = run(["git", "status", "--porcelain=v1", "-z", "--untracked-files=all"], timeout=20)
         if not status.stdout:
-            emit({
-                "status": "no_changes",
-                "beforeSha": before,
-                "afterSha": before,
-                "remoteUrl": None,
-                "remoteRef": None,
-                "remoteStatus": "skipped",
-                "remoteError": "no changes",
-                "remotePushedAt": None,
-                "changedFiles": [],
-                "fileCount": 0,
-            })
+            emit(no_changes, per_call)
             raise SystemExit(0)
 
         run_git_with_lock_retry(["git", "add", "-A"], check=True, timeout=60)
         staged = run(["git", "diff", "--cached", "--quiet"], timeout=30)
         if staged.returncode == 0:
-            emit({
-                "status": "no_changes",
-                "beforeSha": before,
-                "afterSha": before,
-                "remoteUrl": None,
-                "remoteRef": None,
-                "remoteStatus": "skipped",
-                "remoteError": "no staged changes",
-                "remotePushedAt": None,
-                "changedFiles": [],
-                "fileCount": 0,
-            })
+            emit({**no_changes, "remoteError": "no staged changes"}, per_call)
             raise SystemExit(0)
 
         tool_name = str(payload.get("toolName") or "tool").strip()[:80]
         tool_call_id = str(payload.get("toolCallId") or "").strip()[:80]
-        message = f"checkpoint: {tool_name} {tool_call_id}".strip()
-        run_git_with_lock_retry(["git", "commit", "-m", message], check=True, timeout=60)
+        commit_args = ["git", "commit", "-m", f"checkpoint: {tool_name} {tool_call_id}".strip()]
+        if tool_call_id:
+            commit_args.extend(["-m", f"Tool-Call-Id: {tool_call_id} ({tool_name})"])
+        run_git_with_lock_retry(commit_args, check=True, timeout=60)
         after = run(["git", "rev-parse", "HEAD"], check=True, timeout=10).stdout.strip()
+        capped_files, total_files = cap_files(changed_files(before, after))
 
-        files = []
-        name_status = run(["git", "diff", "--name-status", "--find-renames", before, after], timeout=30).stdout
-        numstat = run(["git", "diff", "--numstat", before, after], timeout=30).stdout
-        stats_by_path = {}
-        for line in numstat.splitlines():
-            parts = line.split("\t")
-            if len(parts) >= 3:
-                path = parts[-1]
-                additions = None if parts[0] == "-" else int(parts[0])
-                deletions = None if parts[1] == "-" else int(parts[1])
-                stats_by_path[path] = {
-                    "additions": additions,
-                    "deletions": deletions,
-                    "binary": parts[0] == "-" or parts[1] == "-",
-                }
-        for line in name_status.splitlines():
-            parts = line.split("\t")
-            if not parts:
-                continue
-            status_code = parts[0]
-            if status_code.startswith("R") and len(parts) >= 3:
-                previous_path = parts[1]
-                path = parts[2]
-            else:
-                previous_path = None
-                path = parts[-1] if len(parts) >= 2 else ""
-            if not path:
-                continue
-            item = {
-                "path": path,
-                "status": status_code,
-                "previousPath": previous_path,
-            }
-            item.update(stats_by_path.get(path, {}))
-            files.append(item)
-
-        ref_name = None
-        if payload.get("executionId") and payload.get("toolCallId"):
-            ref_name = f"refs/workflow-builder/checkpoints/{payload['executionId']}/{payload['toolCallId']}"
+        ref_name = ref_name_for(payload)
+        if ref_name:
             run_git_with_lock_retry(["git", "update-ref", ref_name, after], timeout=10)
 
         try:
@@ -765,19 +855,8 @@ CHECKPOINT_SCRIPT = dedent(
             "remotePushedAt": None,
         }
         if ref_name:
-            try:
-                remote_result = push_checkpoint_ref(payload.get("remote") or {}, ref_name, after)
-            except Exception as remote_exc:
-                remote = payload.get("remote") or {}
-                remote_result = {
-                    "remoteStatus": "error",
-                    "remoteError": str(remote_exc)[:1000],
-                    "remoteUrl": remote.get("remoteUrl") or None,
-                    "remoteRef": ref_name,
-                    "remotePushedAt": None,
-                }
+            remote_result = push_result([(after, ref_name)])
 
-        capped_files, total_files = cap_files(files)
         emit({
             "status": "created",
             "beforeSha": before,
@@ -790,7 +869,7 @@ CHECKPOINT_SCRIPT = dedent(
                 "gitRef": ref_name,
                 "truncated": total_files > CHANGED_FILES_CAP,
             },
-        })
+        }, per_call)
     except Exception as exc:
         emit({
             "status": "error",
@@ -1055,3 +1134,374 @@ def restore_code_checkpoint(
         return {"ok": False, "error": f"invalid restore output: {exc}"}
     return parsed if isinstance(parsed, dict) else {"ok": False, "error": "restore output was not an object"}
 
+
+
+# ---------------------------------------------------------------------------
+# Coalesced background checkpoints
+# ---------------------------------------------------------------------------
+
+
+def async_checkpoints_enabled() -> bool:
+    """Route checkpoints through the per-instance background lane (default on)."""
+    return os.environ.get("DAPR_AGENT_PY_CODE_CHECKPOINT_ASYNC", "true").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+        "off",
+    }
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class _PendingCheckpoint(NamedTuple):
+    runtime: OpenShellRuntime
+    execution_id: str
+    workspace_ref: str | None
+    tool_call_id: str
+    tool_name: str
+    tree: str
+    on_result: Callable[[dict[str, Any]], None]
+
+
+def _run_script_json(runtime: OpenShellRuntime, payload: dict[str, Any], timeout: int) -> dict[str, Any]:
+    result = runtime.run_python(CHECKPOINT_SCRIPT, payload, timeout_seconds=timeout)
+    output = str(result.get("stdout") or result.get("output") or "").strip()
+    if not output:
+        raise RuntimeError(str(result.get("stderr") or "checkpoint produced no output")[:1000])
+    parsed = json.loads(output.splitlines()[-1])
+    if not isinstance(parsed, dict):
+        raise RuntimeError("checkpoint output was not an object")
+    return parsed
+
+
+def snapshot_workspace_tree(runtime: OpenShellRuntime, *, timeout: int = 120) -> str:
+    """Write the current workspace into a private index and return its tree
+    sha. HEAD, the real index and the working tree are left untouched."""
+    parsed = _run_script_json(
+        runtime,
+        {"repoPath": runtime.cwd or DEFAULT_CWD, "snapshot": True},
+        timeout,
+    )
+    tree = str(parsed.get("tree") or "").strip()
+    if not tree:
+        raise RuntimeError(str(parsed.get("error") or "snapshot returned no tree")[:1000])
+    return tree
+
+
+class CheckpointLane:
+    """Background checkpoint lane for one workflow instance.
+
+    Each mutating tool snapshots its workspace tree when it finishes (one
+    ``git add -A`` + ``git write-tree`` into a private index, see
+    ``snapshot_workspace_tree``) and ``submit``s it. The lane worker waits for
+    ``quiet_seconds`` without new submissions (or an explicit ``flush`` at a
+    turn boundary, or ``max_batch`` pending calls), then runs
+    CHECKPOINT_SCRIPT once for the whole burst: one commit per tool call,
+    chained from the snapshotted trees, plus one durable ref each. Restoring
+    to any call of a burst therefore restores exactly that call's state. The
+    push runs as a second exec. Each record is delivered through its
+    ``on_result`` callback once the push settles.
+
+    ``begin_mutation`` / ``end_mutation`` bracket a running mutating tool: the
+    lane never starts a commit while one is running, and a tool waits out an
+    in-flight commit before it starts.
+    """
+
+    def __init__(
+        self,
+        instance_id: str,
+        *,
+        quiet_seconds: float,
+        max_batch: int,
+        script_timeout: int = 120,
+    ) -> None:
+        self.instance_id = instance_id
+        self._quiet_seconds = quiet_seconds
+        self._max_batch = max(1, max_batch)
+        self._script_timeout = script_timeout
+        self._cond = threading.Condition()
+        self._pending: list[_PendingCheckpoint] = []
+        self._in_flight = 0
+        self._mutating = 0
+        self._committing = False
+        self._last_activity = 0.0
+        self._flush_requested = False
+        self._thread: threading.Thread | None = None
+        self.commits = 0
+        self.checkpoints = 0
+
+    def submit(self, item: _PendingCheckpoint) -> None:
+        with self._cond:
+            self._pending.append(item)
+            self._last_activity = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker,
+                    name=f"checkpoint-lane-{self.instance_id}",
+                    daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, *, wait: bool = False, timeout: float | None = None) -> bool:
+        """Commit pending checkpoints now. With ``wait``, block until every
+        submitted checkpoint (including an in-flight push) has completed;
+        returns False on timeout."""
+        with self._cond:
+            if self._pending:
+                self._flush_requested = True
+                self._cond.notify_all()
+            if not wait:
+                return True
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout=timeout
+            )
+
+    def begin_mutation(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._committing)
+            self._mutating += 1
+
+    def end_mutation(self) -> None:
+        with self._cond:
+            self._mutating = max(0, self._mutating - 1)
+            self._last_activity = time.monotonic()
+            self._cond.notify_all()
+
+    def idle(self) -> bool:
+        with self._cond:
+            return not self._pending and not self._in_flight and not self._mutating
+
+    def _next_batch(self) -> list[_PendingCheckpoint]:
+        with self._cond:
+            while self._pending:
+                if self._mutating:
+                    # A tool is still writing: its edits must not land in
+                    # (or race) this burst's commit.
+                    self._cond.wait()
+                    continue
+                if self._flush_requested or len(self._pending) >= self._max_batch:
+                    break
+                remaining = self._last_activity + self._quiet_seconds - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(timeout=remaining)
+            batch = self._pending[: self._max_batch]
+            del self._pending[: len(batch)]
+            self._flush_requested = bool(self._pending) and self._flush_requested
+            self._in_flight = len(batch)
+            self._committing = bool(batch)
+            if not batch:
+                self._thread = None
+                self._cond.notify_all()
+            return batch
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                records = self._checkpoint(batch)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("[checkpoint] lane %s batch failed: %s", self.instance_id, exc)
+                records = [self._fallback(item, str(exc)[:1000]) for item in batch]
+            finally:
+                self._commit_done()
+            for item, record in zip(batch, records):
+                try:
+                    item.on_result(record)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("[checkpoint] result callback failed: %s", exc)
+            with self._cond:
+                self._in_flight = 0
+                self.checkpoints += len(batch)
+                self._cond.notify_all()
+
+    def _commit_done(self) -> None:
+        with self._cond:
+            if self._committing:
+                self._committing = False
+                self._cond.notify_all()
+
+    def _fallback(self, item: _PendingCheckpoint, error: str) -> dict[str, Any]:
+        return _fallback_checkpoint(
+            runtime=item.runtime,
+            execution_id=item.execution_id,
+            instance_id=self.instance_id,
+            workspace_ref=item.workspace_ref,
+            tool_call_id=item.tool_call_id,
+            tool_name=item.tool_name,
+            status="error",
+            error=error,
+        )
+
+    def _checkpoint(self, batch: list[_PendingCheckpoint]) -> list[dict[str, Any]]:
+        # The latest submission carries the freshest runtime binding.
+        last = batch[-1]
+        runtime = last.runtime
+        remote = _checkpoint_remote_config()
+        payload = {
+            "executionId": last.execution_id,
+            "instanceId": self.instance_id,
+            "workspaceRef": last.workspace_ref or None,
+            "sandboxName": runtime.sandbox_name,
+            "repoPath": runtime.cwd or DEFAULT_CWD,
+            "toolCalls": [
+                {"toolCallId": item.tool_call_id, "toolName": item.tool_name, "tree": item.tree}
+                for item in batch
+            ],
+            "deferPush": True,
+            "remote": remote,
+        }
+        parsed = _run_script_json(runtime, payload, self._script_timeout)
+        self.commits += 1
+        self._commit_done()
+        records = parsed.get("checkpoints")
+        if not isinstance(records, list) or len(records) != len(batch):
+            raise RuntimeError("checkpoint batch output did not match the submitted tool calls")
+
+        to_push = [
+            r for r in records
+            if isinstance(r, dict) and r.get("remoteStatus") == "pending" and r.get("remoteRef")
+        ]
+        if to_push:
+            try:
+                pushed = _run_script_json(
+                    runtime,
+                    {
+                        "repoPath": payload["repoPath"],
+                        "pushRefs": [{"ref": r["remoteRef"], "sha": r.get("afterSha")} for r in to_push],
+                        "remote": remote,
+                    },
+                    self._script_timeout,
+                )
+            except Exception as exc:  # noqa: BLE001
+                pushed = {"remoteStatus": "error", "remoteError": str(exc)[:1000]}
+            for record in to_push:
+                record["remoteStatus"] = pushed.get("remoteStatus") or "error"
+                record["remoteError"] = pushed.get("remoteError")
+                record["remotePushedAt"] = pushed.get("remotePushedAt")
+                if pushed.get("remoteUrl"):
+                    record["remoteUrl"] = pushed["remoteUrl"]
+        return records
+
+
+class CheckpointLanes:
+    """Process-wide registry of ``CheckpointLane`` objects keyed by workflow
+    instance. Idle lanes are dropped when the registry grows past ``max_idle``."""
+
+    def __init__(
+        self,
+        *,
+        quiet_seconds: float | None = None,
+        max_batch: int | None = None,
+        max_idle: int = 256,
+    ) -> None:
+        self._quiet_seconds = (
+            _env_float("DAPR_AGENT_PY_CODE_CHECKPOINT_QUIET_MS", 750.0) / 1000.0
+            if quiet_seconds is None
+            else quiet_seconds
+        )
+        self._max_batch = (
+            int(_env_float("DAPR_AGENT_PY_CODE_CHECKPOINT_MAX_BATCH", 50))
+            if max_batch is None
+            else max_batch
+        )
+        self._max_idle = max_idle
+        self._lanes: dict[str, CheckpointLane] = {}
+        self._lock = threading.Lock()
+
+    def lane(self, instance_id: str) -> CheckpointLane:
+        with self._lock:
+            lane = self._lanes.get(instance_id)
+            if lane is None:
+                if len(self._lanes) >= self._max_idle:
+                    for key in [k for k, v in self._lanes.items() if v.idle()]:
+                        self._lanes.pop(key, None)
+                lane = CheckpointLane(
+                    instance_id,
+                    quiet_seconds=self._quiet_seconds,
+                    max_batch=self._max_batch,
+                )
+                self._lanes[instance_id] = lane
+            return lane
+
+    def submit(
+        self,
+        instance_id: str,
+        *,
+        runtime: OpenShellRuntime,
+        execution_id: str,
+        workspace_ref: str | None,
+        tool_call_id: str,
+        tool_name: str,
+        on_result: Callable[[dict[str, Any]], None],
+    ) -> None:
+        """Snapshot the workspace tree for this tool call (one exec, on the
+        caller's thread) and queue its commit on the instance's lane."""
+        try:
+            tree = snapshot_workspace_tree(runtime)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[checkpoint] snapshot failed after %s: %s", tool_name, exc)
+            on_result(
+                _fallback_checkpoint(
+                    runtime=runtime,
+                    execution_id=execution_id,
+                    instance_id=instance_id,
+                    workspace_ref=workspace_ref,
+                    tool_call_id=tool_call_id,
+                    tool_name=tool_name,
+                    status="error",
+                    error=f"snapshot failed: {exc}"[:1000],
+                )
+            )
+            return
+        self.lane(instance_id).submit(
+            _PendingCheckpoint(
+                runtime=runtime,
+                execution_id=execution_id,
+                workspace_ref=workspace_ref,
+                tool_call_id=tool_call_id,
+                tool_name=tool_name,
+                tree=tree,
+                on_result=on_result,
+            )
+        )
+
+    def begin_mutation(self, instance_id: str) -> None:
+        """Mark a mutating tool as running (waits out an in-flight commit)."""
+        self.lane(instance_id).begin_mutation()
+
+    def end_mutation(self, instance_id: str) -> None:
+        lane = self._existing(instance_id)
+        if lane is not None:
+            lane.end_mutation()
+
+    def _existing(self, instance_id: str) -> CheckpointLane | None:
+        with self._lock:
+            return self._lanes.get(instance_id)
+
+    def flush(self, instance_id: str, *, wait: bool = False, timeout: float | None = None) -> bool:
+        lane = self._existing(instance_id)
+        return True if lane is None else lane.flush(wait=wait, timeout=timeout)
+
+    def drain(self, timeout: float | None = 60.0) -> bool:
+        """Flush every lane and wait (used before restores and at shutdown)."""
+        with self._lock:
+            lanes = list(self._lanes.values())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ok = True
+        for lane in lanes:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ok = lane.flush(wait=True, timeout=remaining) and ok
+        return ok
+
+
+CHECKPOINT_LANES = CheckpointLanes()
+atexit.register(CHECKPOINT_LANES.drain, 30.0)
@@ -26,6 +26,7 @@ from datetime import datetime, timezone
 from typing import Any, Callable, Optional
 
 from .config import CompactionConfig
+from .ledger import ledger_enabled, ledger_for
 from .microcompact import microcompact_messages
 from .pairing import select_preserved_tail
 from .prompts import format_compact_summary, get_compact_prompt
@@ -374,12 +375,19 @@ def maybe_compact(
             reason="idempotent_replay",
         )
 
-    # 3. Count tokens
-    pre_count = count_tokens(
-        messages,
-        model=model,
-        anthropic_client=anthropic_client,
-    )
+    # 3. Count tokens (incrementally via the instance ledger when enabled)
+    if ledger_enabled():
+        pre_count = ledger_for(instance_id).count_tokens(
+            messages,
+            model=model,
+            anthropic_client=anthropic_client,
+        )
+    else:
+        pre_count = count_tokens(
+            messages,
+            model=model,
+            anthropic_client=anthropic_client,
+        )
 
     if not config.auto_compact_enabled:
         return CompactionResult(
@@ -0,0 +1,271 @@
+"""Per-instance token / byte ledger for compaction decisions.
+
+Every ``call_llm`` activity asks two questions about ``entry.messages`` before
+the provider call: "is the transcript over the auto-compact token threshold?"
+(``engine.maybe_compact``) and "is the serialized state over the byte budget?"
+(``state_budget.enforce_state_budget``). Answering them from scratch flattens
+every message through ``tokens._message_text`` and JSON-encodes the whole list
+each turn — megabytes of work on a 1M-context transcript, almost always to
+conclude "no".
+
+The ledger keeps, per workflow instance, one row per message:
+
+  - the message's heuristic character count and serialized byte size;
+  - a content digest (blake2b of the serialized message).
+
+``sync(messages)`` only measures messages it has not seen:
+
+  1. **identity hit** — the same message object, with the same ``content`` /
+     ``tool_calls`` objects, as last turn. dapr-agents keeps the entry in
+     memory between activities and message edits (state-budget offload,
+     compaction, microcompact) always install a new content object, so this
+     covers every unchanged message with no hashing;
+  2. **digest hit** — a fresh object with the same serialized form as a known
+     row (state reloaded from the store, tail re-emitted by compaction):
+     serialized once for the digest, but the text flattening is skipped;
+  3. **miss** — new or mutated message: measured and recorded.
+
+Totals are maintained alongside the rows, so ``token_count`` and
+``state_bytes`` are O(1) after a sync and match ``heuristic_token_count`` /
+``serialized_state_bytes`` exactly. An authoritative Anthropic
+``count_tokens`` result is cached against the ledger version, so it is only
+re-requested once the transcript has actually changed.
+
+Ledgers are in-memory only (nothing is written to state) and are rebuilt from
+``entry.messages`` after a pod restart, so replay semantics are unchanged.
+
+ENV:
+  DAPR_AGENT_PY_COMPACTION_LEDGER_ENABLED   (default true)
+  DAPR_AGENT_PY_COMPACTION_LEDGER_MAX_INSTANCES (default 256) — LRU bound
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any, Iterable
+
+from .state_budget import _to_jsonable
+from .tokens import _message_text, count_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_INSTANCES = 256
+
+
+def ledger_enabled() -> bool:
+    raw = os.environ.get("DAPR_AGENT_PY_COMPACTION_LEDGER_ENABLED")
+    if raw is None:
+        return True
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _max_instances() -> int:
+    raw = os.environ.get("DAPR_AGENT_PY_COMPACTION_LEDGER_MAX_INSTANCES")
+    if raw and raw.strip():
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    return DEFAULT_MAX_INSTANCES
+
+
+def _content_and_calls(message: Any) -> tuple[Any, Any]:
+    if isinstance(message, dict):
+        return message.get("content"), message.get("tool_calls")
+    return getattr(message, "content", None), getattr(message, "tool_calls", None)
+
+
+def _shape(value: Any) -> int:
+    # Lists can grow in place without changing identity.
+    return len(value) if type(value) is list else -1
+
+
+@dataclass(slots=True)
+class _Row:
+    message: Any  # strong ref: keeps id(message) from being recycled
+    content: Any
+    tool_calls: Any
+    content_shape: int
+    calls_shape: int
+    digest: str
+    chars: int
+    bytes: int
+
+
+def _serialize(message: Any) -> str:
+    try:
+        return json.dumps(_to_jsonable(message), default=str, separators=(",", ":"))
+    except Exception:  # noqa: BLE001
+        return str(message)
+
+
+class MessageLedger:
+    """Incremental token / byte totals for one instance's ``entry.messages``."""
+
+    def __init__(self) -> None:
+        self._rows: dict[int, _Row] = {}
+        self._by_digest: dict[str, tuple[int, int]] = {}
+        self._chars = 0
+        self._bytes = 0
+        self._count = 0
+        self._version = 0
+        self._authoritative: tuple[int, str, int] | None = None
+        # Cumulative re-measure counters (benchmarks / debugging).
+        self.measured = 0
+        self.digest_hits = 0
+
+    # -- totals ---------------------------------------------------------------
+
+    @property
+    def message_count(self) -> int:
+        return self._count
+
+    @property
+    def token_count(self) -> int:
+        """``heuristic_token_count`` of the last synced list."""
+        return self._chars // 4 + 8 * self._count
+
+    @property
+    def state_bytes(self) -> int:
+        """``serialized_state_bytes`` of the last synced list."""
+        return self._bytes + max(0, self._count - 1) + 2
+
+    @property
+    def version(self) -> int:
+        """Bumped whenever a sync observes any added, changed or removed message."""
+        return self._version
+
+    # -- sync -----------------------------------------------------------------
+
+    def _measure(self, message: Any) -> _Row:
+        blob = _serialize(message)
+        encoded = blob.encode("utf-8")
+        digest = blake2b(encoded, digest_size=16).hexdigest()
+        known = self._by_digest.get(digest)
+        if known is not None:
+            chars, size = known
+            self.digest_hits += 1
+        else:
+            chars, size = len(_message_text(message)), len(encoded)
+            self.measured += 1
+        content, tool_calls = _content_and_calls(message)
+        return _Row(
+            message=message,
+            content=content,
+            tool_calls=tool_calls,
+            content_shape=_shape(content),
+            calls_shape=_shape(tool_calls),
+            digest=digest,
+            chars=chars,
+            bytes=size,
+        )
+
+    def sync(self, messages: Iterable[Any]) -> "MessageLedger":
+        """Reconcile the ledger with ``messages``; only unseen ones are measured."""
+        previous = self._rows
+        rows: dict[int, _Row] = {}
+        chars = size = count = 0
+        changed = False
+        # Hot loop (runs over every message every turn): the identity check is
+        # inlined rather than going through _content_and_calls / _shape.
+        for message in messages:
+            key = id(message)
+            row = previous.get(key)
+            if row is not None and row.message is message:
+                if type(message) is dict:
+                    content = message.get("content")
+                    tool_calls = message.get("tool_calls")
+                else:
+                    content = getattr(message, "content", None)
+                    tool_calls = getattr(message, "tool_calls", None)
+                if not (
+                    content is row.content
+                    and tool_calls is row.tool_calls
+                    and (type(content) is not list or len(content) == row.content_shape)
+                    and (type(tool_calls) is not list or len(tool_calls) == row.calls_shape)
+                ):
+                    row = None
+            else:
+                row = None
+            if row is None:
+                row = self._measure(message)
+                self._by_digest[row.digest] = (row.chars, row.bytes)
+                changed = True
+            rows[key] = row
+            chars += row.chars
+            size += row.bytes
+            count += 1
+        if changed or count != self._count:
+            self._version += 1
+            if len(self._by_digest) > 2 * count + 64:
+                self._by_digest = {row.digest: (row.chars, row.bytes) for row in rows.values()}
+        self._rows = rows
+        self._chars, self._bytes, self._count = chars, size, count
+        return self
+
+    def count_tokens(
+        self,
+        messages: Iterable[Any],
+        *,
+        model: str | None = None,
+        anthropic_client: Any = None,
+    ) -> int:
+        """``tokens.count_tokens`` over ``messages``, served from the ledger.
+
+        The heuristic path is the synced total. The authoritative Anthropic
+        count is only requested when the transcript changed since the last
+        request for the same model.
+        """
+        messages_list = list(messages)
+        self.sync(messages_list)
+        if anthropic_client is None or not model or "claude" not in model:
+            return self.token_count
+        cached = self._authoritative
+        if cached is not None and cached[0] == self._version and cached[1] == model:
+            return cached[2]
+        result = count_tokens(messages_list, model=model, anthropic_client=anthropic_client)
+        self._authoritative = (self._version, model, result)
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Per-instance registry
+# ---------------------------------------------------------------------------
+
+
+_lock = threading.Lock()
+_ledgers: "OrderedDict[str, MessageLedger]" = OrderedDict()
+
+
+def ledger_for(instance_id: str) -> MessageLedger:
+    """The instance's ledger (created on first use; LRU-bounded)."""
+    key = str(instance_id or "")
+    with _lock:
+        ledger = _ledgers.get(key)
+        if ledger is None:
+            ledger = _ledgers[key] = MessageLedger()
+            limit = _max_instances()
+            while len(_ledgers) > limit:
+                _ledgers.popitem(last=False)
+        else:
+            _ledgers.move_to_end(key)
+        return ledger
+
+
+def clear_ledger(instance_id: str) -> bool:
+    """Drop an instance's ledger (terminal cleanup). Returns True if one existed."""
+    with _lock:
+        return _ledgers.pop(str(instance_id or ""), None) is not None
+
+
+__all__ = [
+    "MessageLedger",
+    "clear_ledger",
+    "ledger_enabled",
+    "ledger_for",
+]
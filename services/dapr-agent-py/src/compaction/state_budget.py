@@ -282,6 +282,7 @@ def enforce_state_budget(
     *,
     config: StateBudgetConfig | None = None,
     offload: OffloadSink | None = None,
+    ledger: Any = None,
 ) -> StateBudgetResult:
     """Pure byte-budget guard over ``entry.messages``.
 
@@ -289,9 +290,15 @@ def enforce_state_budget(
     serialized size is within budget the input is returned unchanged. When over
     budget, the oldest oversized bodies are offloaded (oldest-first, never
     touching the last ``preserve_last_n`` messages) until the document fits.
+
+    ``ledger`` (a ``compaction.ledger.MessageLedger``) supplies the size from
+    its incremental per-message totals instead of re-serializing the list.
     """
     cfg = config or resolve_state_budget_config()
-    pre = serialized_state_bytes(messages)
+    if ledger is not None:
+        pre = ledger.sync(messages).state_bytes
+    else:
+        pre = serialized_state_bytes(messages)
     if not cfg.enabled:
         return StateBudgetResult(
             over_budget=False,
@@ -315,15 +322,18 @@ def enforce_state_budget(
     n = len(out)
     reducible_upper = max(0, n - cfg.preserve_last_n)
     offloaded = 0
+    # Each shrink changes exactly one list element, so the document size moves
+    # by exactly the bytes reclaimed — no need to re-serialize per step.
+    post = pre
     for idx in range(reducible_upper):
-        if serialized_state_bytes(out) <= cfg.budget_bytes:
+        if post <= cfg.budget_bytes:
             break
         new_msg, reclaimed = _shrunk_message(out[idx], cfg, offload)
         if reclaimed > 0:
             out[idx] = new_msg
             offloaded += 1
+            post -= reclaimed
 
-    post = serialized_state_bytes(out)
     reason = "offloaded" if offloaded else "over_budget_no_reducible"
     return StateBudgetResult(
         over_budget=True,
@@ -384,11 +394,18 @@ def enforce_state_byte_budget(
     compaction uses. Always emits a ``state_size`` telemetry field so the cliff
     is observable even on the (common) under-budget path.
     """
+    from .ledger import ledger_enabled, ledger_for
+
     cfg = config or resolve_state_budget_config()
     entry = agent._infra.get_state(instance_id)
     messages = list(getattr(entry, "messages", []) or [])
 
-    result = enforce_state_budget(messages, config=cfg, offload=offload)
+    result = enforce_state_budget(
+        messages,
+        config=cfg,
+        offload=offload,
+        ledger=ledger_for(instance_id) if ledger_enabled() else None,
+    )
 
     try:
         (emit or _default_emit)(session_id, instance_id, result, cfg)
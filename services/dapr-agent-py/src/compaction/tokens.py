@@ -8,7 +8,9 @@ current LLM component is Anthropic (authoritative).
 Fallback: chars/4 heuristic matching `roughTokenCountEstimation`.
 
 No caching in state — token counts derive from `entry.messages`, so they
-are cheap to recompute and automatically replay-safe.
+are automatically replay-safe. The per-turn compaction check reads them
+through the in-memory per-instance ledger (`ledger.py`), which only
+re-measures new or changed messages.
 """
 from __future__ import annotations
 
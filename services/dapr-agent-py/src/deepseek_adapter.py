@@ -16,6 +16,7 @@ from typing import Any
 from urllib.error import HTTPError
 import urllib.request
 
+from src import llm_http, llm_stream
 from src.provider_conformance import (
     build_llm_chat_response,
     ensure_chat_completions_history,
@@ -284,7 +285,9 @@ def _make_deepseek_request(
         data=json.dumps(body).encode("utf-8"),
         headers={
             **auth_headers,
-            "Accept": "application/json",
+            "Accept": (
+                "text/event-stream" if body.get("stream") else "application/json"
+            ),
             "Content-Type": "application/json",
             "User-Agent": _user_agent(),
         },
@@ -507,8 +510,11 @@ def _call_deepseek_chat(
             else messages
         ),
         "max_tokens": output_cap,
-        "stream": False,
+        "stream": llm_stream.provider_streaming_enabled(),
     }
+    if request_body["stream"]:
+        # The final chunk then carries token usage (src/llm_stream.py).
+        request_body["stream_options"] = {"include_usage": True}
     if converted_tools:
         request_body["tools"] = converted_tools
         if tool_choice in (None, "", "auto"):
@@ -538,6 +544,7 @@ def _call_deepseek_chat(
         auth_mode,
     )
     data: dict[str, Any]
+    stream_ttft_ms: float | None = None
     rate_limit_retries = _rate_limit_max_retries()
     # Empty-content retry: DeepSeek's own JSON-mode docs say
     # "the API may occasionally return empty content" for `response_format:
@@ -571,8 +578,13 @@ def _call_deepseek_chat(
         while True:
             req = _make_deepseek_request(url, request_body, headers)
             try:
-                with urllib.request.urlopen(req, timeout=timeout) as resp:
-                    data = json.loads(resp.read() or b"{}")
+                with llm_http.urlopen(req, timeout=timeout) as resp:
+                    data, stream_ttft_ms = llm_stream.read_chat_completion_stream(
+                        resp,
+                        provider="DeepSeek",
+                        idle_timeout_seconds=timeout,
+                        request_started_at=llm_start,
+                    )
             except HTTPError as exc:
                 detail = exc.read().decode("utf-8", errors="replace")
                 if exc.code == 429 and rate_attempt < rate_limit_retries:
@@ -658,6 +670,8 @@ def _call_deepseek_chat(
 
     usage = data.get("usage") if isinstance(data.get("usage"), dict) else {}
     duration_ms = (time.monotonic() - llm_start) * 1000.0
+    # Real time-to-first-token when the body streamed; a JSON body has none.
+    effective_ttft_ms = stream_ttft_ms if stream_ttft_ms is not None else duration_ms
     if response_format is not None and not content.strip():
         # Exhausted retries — propagate.
         error = (
@@ -670,7 +684,7 @@ def _call_deepseek_chat(
         _publish_llm_usage(
             model=model,
             usage=usage,
-            ttft_ms=duration_ms,
+            ttft_ms=effective_ttft_ms,
             duration_ms=duration_ms,
             success=False,
             error=error,
@@ -693,7 +707,7 @@ def _call_deepseek_chat(
                 output_tokens=output_tokens or None,
                 success=True,
                 has_tool_call=bool(tool_calls),
-                ttft_ms=duration_ms,
+                ttft_ms=effective_ttft_ms,
                 model_output=content or None,
             )
             record_tokens(type_="input", count=input_tokens, model=model)
@@ -704,7 +718,7 @@ def _call_deepseek_chat(
     _publish_llm_usage(
         model=model,
         usage=usage,
-        ttft_ms=duration_ms,
+        ttft_ms=effective_ttft_ms,
         duration_ms=duration_ms,
         success=True,
     )
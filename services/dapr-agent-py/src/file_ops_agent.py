@@ -0,0 +1,295 @@
+"""Sandbox-side file-ops agent shared by the workspace runtimes.
+
+Self-contained (stdlib only): ``OpenShellRuntime`` ships this module's source
+into the sandbox, so it must not import anything from ``src``. The same ops
+serve three transports:
+
+* **persistent** — ``serve()`` runs as one long-lived ``python3`` process per
+  sandbox over an ``ExecSandboxInteractive`` stream, answering length-prefixed
+  JSON frames (``b"<len>\\n" + json``) until stdin closes. No per-call
+  interpreter spawn.
+* **one-shot** — ``run_once()`` answers one batch per ``python3`` exec (the
+  fallback when the client offers no interactive exec). The source is shipped
+  once and installed in the sandbox; later execs load that copy.
+* **in-process** — ``LocalWorkspaceRuntime`` calls ``handle`` directly.
+
+Every response dict mirrors the contract of the matching
+``OpenShellRuntime`` primitive (``stat_path``, ``read_file_lines``, ...), so
+callers cannot tell which transport served them.
+"""
+
+from __future__ import annotations
+
+import base64
+import collections
+import fnmatch
+import json
+import os
+import pathlib
+import re
+from typing import Any, BinaryIO, Callable
+
+PROTOCOL_VERSION = 1
+# Bytes sniffed for NUL when classifying a file as binary (git uses 8000).
+_BINARY_SNIFF_BYTES = 8192
+
+
+def _op_stat(req: dict[str, Any]) -> dict[str, Any]:
+    p = pathlib.Path(req["path"])
+    if not p.exists():
+        return {"ok": True, "exists": False, "path": str(p)}
+    st = p.stat()
+    return {
+        "ok": True,
+        "exists": True,
+        "path": str(p),
+        "is_file": p.is_file(),
+        "is_dir": p.is_dir(),
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+    }
+
+
+def _op_read_lines(req: dict[str, Any]) -> dict[str, Any]:
+    p = pathlib.Path(req["path"])
+    offset = int(req["offset"])
+    limit = int(req["limit"])
+    lines_out: list[str] = []
+    total_lines = 0
+    start_line = 0
+    end_line = 0
+    with p.open(encoding="utf-8", errors="replace") as handle:
+        for line_no, line_text in enumerate(handle, start=1):
+            total_lines = line_no
+            if line_no <= offset or len(lines_out) >= limit:
+                continue
+            if not lines_out:
+                start_line = line_no
+            end_line = line_no
+            lines_out.append(line_text.rstrip("\n").rstrip("\r"))
+    return {
+        "ok": True,
+        "lines": lines_out,
+        "total_lines": total_lines,
+        "start_line": start_line,
+        "end_line": end_line,
+    }
+
+
+def _op_read_window(req: dict[str, Any]) -> dict[str, Any]:
+    """Stat + binary sniff + line window in one pass (the Read/Edit hot path).
+
+    ``offset`` is 1-based; a negative offset reads the tail (``-100`` = the last
+    100 lines), capped at ``limit`` lines. ``content=True`` returns the whole
+    file as strict UTF-8 instead of a window. Files over ``guard_bytes`` are
+    counted but not windowed, and binary files are not scanned at all.
+    """
+    p = pathlib.Path(req["path"])
+    if not p.exists():
+        return {"ok": True, "exists": False, "path": str(p)}
+    st = p.stat()
+    out: dict[str, Any] = {
+        "ok": True,
+        "exists": True,
+        "path": str(p),
+        "is_file": p.is_file(),
+        "is_dir": p.is_dir(),
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+    }
+    if not out["is_file"]:
+        return out
+    with p.open("rb") as handle:
+        out["binary"] = b"\0" in handle.read(_BINARY_SNIFF_BYTES)
+    if req.get("content"):
+        text = p.read_text(encoding="utf-8")
+        out["content"] = text
+        out["total_lines"] = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+        return out
+    if out["binary"]:
+        return out
+    offset = int(req.get("offset") or 1)
+    limit = int(req["limit"])
+    guard = req.get("guard_bytes")
+    windowed = not (guard is not None and st.st_size > int(guard))
+    skip = max(0, offset - 1)
+    tail: collections.deque[tuple[int, str]] = collections.deque(
+        maxlen=-offset if offset < 0 else 0
+    )
+    window: list[tuple[int, str]] = []
+    total_lines = 0
+    with p.open(encoding="utf-8", errors="replace") as handle:
+        for line_no, line_text in enumerate(handle, start=1):
+            total_lines = line_no
+            if not windowed:
+                continue
+            if offset < 0:
+                tail.append((line_no, line_text))
+            elif line_no > skip and len(window) < limit:
+                window.append((line_no, line_text))
+    if offset < 0:
+        window = list(tail)[:limit]
+    out.update(
+        {
+            "lines": [text.rstrip("\n").rstrip("\r") for _, text in window],
+            "total_lines": total_lines,
+            "start_line": window[0][0] if window else 0,
+            "end_line": window[-1][0] if window else 0,
+            "windowed": windowed,
+        }
+    )
+    return out
+
+
+def _op_read_text(req: dict[str, Any]) -> dict[str, Any]:
+    return {"ok": True, "content": pathlib.Path(req["path"]).read_text(encoding="utf-8")}
+
+
+def _op_write_text(req: dict[str, Any]) -> dict[str, Any]:
+    p = pathlib.Path(req["path"])
+    existed = p.exists()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(req["content"], encoding="utf-8")
+    return {"ok": True, "existed": existed, "path": str(p)}
+
+
+def _op_read_bytes(req: dict[str, Any]) -> dict[str, Any]:
+    """Base64 of ``[offset, offset + length)``; ``size`` is the whole file."""
+    p = pathlib.Path(req["path"])
+    if not p.is_file():
+        return {"ok": False, "error": "not_a_file", "path": str(p)}
+    size = p.stat().st_size
+    max_bytes = int(req.get("max_bytes") or size)
+    if size > max_bytes:
+        return {"ok": False, "error": "too_large", "size": size, "max_bytes": max_bytes}
+    offset = int(req.get("offset") or 0)
+    length = req.get("length")
+    with p.open("rb") as handle:
+        handle.seek(offset)
+        data = handle.read() if length is None else handle.read(int(length))
+    return {
+        "ok": True,
+        "path": str(p),
+        "size": size,
+        "offset": offset,
+        "base64": base64.b64encode(data).decode("ascii"),
+    }
+
+
+def _op_glob(req: dict[str, Any]) -> dict[str, Any]:
+    search_path = pathlib.Path(req["search_dir"])
+    pattern = req["pattern"]
+    if not search_path.is_dir():
+        return {"ok": False, "error": "directory_not_found", "path": str(search_path)}
+    files = [p for p in search_path.glob(pattern) if p.is_file()]
+    files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    total = len(files)
+    files = files[: int(req["max_results"])]
+    return {
+        "ok": True,
+        "search_dir": str(search_path),
+        "pattern": pattern,
+        "matches": [str(p) for p in files],
+        "total": total,
+    }
+
+
+def _op_grep(req: dict[str, Any]) -> dict[str, Any]:
+    """Regex search over files under ``search_dir`` matching ``include``."""
+    search_path = pathlib.Path(req["search_dir"])
+    if not search_path.exists():
+        return {"ok": False, "error": "directory_not_found", "path": str(search_path)}
+    flags = re.IGNORECASE if req.get("ignore_case") else 0
+    regex = re.compile(req["pattern"], flags)
+    include = req.get("include") or "*"
+    max_results = int(req.get("max_results") or 100)
+    candidates = [search_path] if search_path.is_file() else sorted(search_path.rglob("*"))
+    matches: list[dict[str, Any]] = []
+    truncated = False
+    for path in candidates:
+        if not path.is_file() or not fnmatch.fnmatch(path.name, include):
+            continue
+        try:
+            with path.open(encoding="utf-8", errors="strict") as handle:
+                for line_no, line_text in enumerate(handle, start=1):
+                    if regex.search(line_text):
+                        if len(matches) >= max_results:
+                            truncated = True
+                            break
+                        matches.append(
+                            {"path": str(path), "line": line_no, "text": line_text.rstrip("\r\n")}
+                        )
+        except (UnicodeDecodeError, OSError):
+            continue  # binary / unreadable files are skipped, like rg
+        if truncated:
+            break
+    return {"ok": True, "matches": matches, "truncated": truncated}
+
+
+def _op_batch(req: dict[str, Any]) -> dict[str, Any]:
+    return {"ok": True, "results": [handle(item) for item in req.get("requests") or []]}
+
+
+OPS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "stat": _op_stat,
+    "read_lines": _op_read_lines,
+    "read_window": _op_read_window,
+    "read_text": _op_read_text,
+    "write_text": _op_write_text,
+    "read_bytes": _op_read_bytes,
+    "glob": _op_glob,
+    "grep": _op_grep,
+    "batch": _op_batch,
+}
+
+
+def handle(req: dict[str, Any]) -> dict[str, Any]:
+    """Dispatch one request; op failures come back as ``{"ok": False, "error"}``."""
+    op = OPS.get(str(req.get("op") or ""))
+    if op is None:
+        return {"ok": False, "error": f"unknown_op:{req.get('op')}"}
+    try:
+        return op(req)
+    except Exception as exc:  # noqa: BLE001 — surfaced to the caller verbatim
+        return {"ok": False, "error": str(exc)}
+
+
+# -- framing -----------------------------------------------------------------
+
+
+def write_frame(stream: BinaryIO, obj: dict[str, Any]) -> None:
+    body = json.dumps(obj).encode("utf-8")
+    stream.write(b"%d\n" % len(body))
+    stream.write(body)
+    stream.flush()
+
+
+def read_frame(stream: BinaryIO) -> dict[str, Any] | None:
+    header = stream.readline()
+    if not header:
+        return None
+    length = int(header.strip() or b"0")
+    body = b""
+    while len(body) < length:
+        chunk = stream.read(length - len(body))
+        if not chunk:
+            raise EOFError("file-ops frame truncated")
+        body += chunk
+    return json.loads(body)
+
+
+def serve(stdin: BinaryIO, stdout: BinaryIO) -> None:
+    """Answer frames until stdin closes. Responses echo the request ``id``."""
+    write_frame(stdout, {"ready": True, "protocol": PROTOCOL_VERSION, "pid": os.getpid()})
+    while True:
+        req = read_frame(stdin)
+        if req is None:
+            return
+        result = handle(req)
+        result["id"] = req.get("id")
+        write_frame(stdout, result)
+
+
+def run_once(raw: str) -> None:
+    """One-shot transport: answer one ``{"requests": [...]}`` batch on stdout."""
+    print(json.dumps(_op_batch(json.loads(raw))))
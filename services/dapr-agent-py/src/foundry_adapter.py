@@ -16,6 +16,7 @@ from typing import Any
 from urllib.error import HTTPError
 import urllib.request
 
+from src import llm_http, llm_stream
 from src.provider_conformance import (
     build_llm_chat_response,
     ensure_chat_completions_history,
@@ -255,7 +256,9 @@ def _make_foundry_request(
         data=json.dumps(body).encode("utf-8"),
         headers={
             **auth_headers,
-            "Accept": "application/json",
+            "Accept": (
+                "text/event-stream" if body.get("stream") else "application/json"
+            ),
             "Content-Type": "application/json",
         },
         method="POST",
@@ -369,8 +372,11 @@ def _call_foundry_chat(
         "model": model,
         "messages": messages,
         "max_tokens": output_cap,
-        "stream": False,
+        "stream": llm_stream.provider_streaming_enabled(),
     }
+    if request_body["stream"]:
+        # The final chunk then carries token usage (src/llm_stream.py).
+        request_body["stream_options"] = {"include_usage": True}
     if converted_tools:
         request_body["tools"] = converted_tools
         if tool_choice in (None, "", "auto"):
@@ -405,14 +411,20 @@ def _call_foundry_chat(
         auth_mode,
     )
     data: dict[str, Any]
+    stream_ttft_ms: float | None = None
     rate_limit_retries = _rate_limit_max_retries()
     attempt = 0
     try:
         while True:
             req = _make_foundry_request(url, request_body, headers)
             try:
-                with urllib.request.urlopen(req, timeout=timeout) as resp:
-                    data = json.loads(resp.read() or b"{}")
+                with llm_http.urlopen(req, timeout=timeout) as resp:
+                    data, stream_ttft_ms = llm_stream.read_chat_completion_stream(
+                        resp,
+                        provider="Azure AI Foundry",
+                        idle_timeout_seconds=timeout,
+                        request_started_at=llm_start,
+                    )
                 break
             except HTTPError as exc:
                 detail = exc.read().decode("utf-8", errors="replace")
@@ -448,6 +460,8 @@ def _call_foundry_chat(
     content, tool_calls, finish_reason, reasoning_content = _extract_foundry_response(data)
     usage = data.get("usage") if isinstance(data.get("usage"), dict) else {}
     duration_ms = (time.monotonic() - llm_start) * 1000.0
+    # Real time-to-first-token when the body streamed; a JSON body has none.
+    effective_ttft_ms = stream_ttft_ms if stream_ttft_ms is not None else duration_ms
     if response_format is not None and not content.strip():
         error = (
             "Azure AI Foundry Chat API returned empty assistant content for "
@@ -458,7 +472,7 @@ def _call_foundry_chat(
         _publish_llm_usage(
             model=model,
             usage=usage,
-            ttft_ms=duration_ms,
+            ttft_ms=effective_ttft_ms,
             duration_ms=duration_ms,
             success=False,
             error=error,
@@ -481,7 +495,7 @@ def _call_foundry_chat(
                 output_tokens=output_tokens or None,
                 success=True,
                 has_tool_call=bool(tool_calls),
-                ttft_ms=duration_ms,
+                ttft_ms=effective_ttft_ms,
                 model_output=content or None,
             )
             record_tokens(type_="input", count=input_tokens, model=model)
@@ -492,7 +506,7 @@ def _call_foundry_chat(
     _publish_llm_usage(
         model=model,
         usage=usage,
-        ttft_ms=duration_ms,
+        ttft_ms=effective_ttft_ms,
         duration_ms=duration_ms,
         success=True,
     )
@@ -38,6 +38,7 @@ from typing import Any
 from urllib.error import HTTPError
 import urllib.request
 
+from src import llm_http
 from src.provider_conformance import (
     build_llm_chat_response,
     parse_structured_response,
@@ -587,7 +588,7 @@ def _call_gateway_chat(
     while True:
         req = _gateway_request(url, body)
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
+            with llm_http.urlopen(req, timeout=timeout) as resp:
                 raw = resp.read() or b"{}"
                 data = json.loads(raw)
             break
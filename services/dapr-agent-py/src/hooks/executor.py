@@ -46,7 +46,11 @@ _EVENTS_WITH_IF_FILTER = {
 }
 
 
-def _if_filter_passes(event: str, if_rule: Optional[str], hook_input: dict[str, Any]) -> bool:
+def _if_filter_passes(
+    event: str,
+    if_rule: Optional[str | permission_rules.CompiledRule],
+    hook_input: dict[str, Any],
+) -> bool:
     if not if_rule:
         return True
     if event not in _EVENTS_WITH_IF_FILTER:
@@ -54,6 +58,8 @@ def _if_filter_passes(event: str, if_rule: Optional[str], hook_input: dict[str,
     tool_name = str(hook_input.get("tool_name") or "")
     tool_input = hook_input.get("tool_input") if isinstance(hook_input.get("tool_input"), dict) else {}
     try:
+        if isinstance(if_rule, permission_rules.CompiledRule):
+            return if_rule.matches(tool_name, tool_input)  # type: ignore[arg-type]
         return permission_rules.evaluate(if_rule, tool_name, tool_input)  # type: ignore[arg-type]
     except Exception as exc:
         logger.warning("[hooks] if-rule eval failed (%s): %s", if_rule, exc)
@@ -199,14 +205,17 @@ async def execute_hooks(
 ) -> AggregatedHookResult:
     event_value = event.value if isinstance(event, HookEvent) else event
 
+    # No hooks registered for this event: skip env checks and matching.
+    if not snapshot.has_hooks(event_value):
+        return AggregatedHookResult.empty(event_value)
     if not hooks_enabled() or not event_allowed(event_value):
         return AggregatedHookResult.empty(event_value)
 
     matches = snapshot.get_matching_hooks(event_value, match_query)
-    # `if`-field prefilter
+    # `if`-field prefilter (rules pre-compiled by the snapshot index)
     filtered = [
         m for m in matches
-        if _if_filter_passes(event_value, m.hook.if_, hook_input)
+        if _if_filter_passes(event_value, m.if_rule or m.hook.if_, hook_input)
     ]
     if not filtered:
         return AggregatedHookResult.empty(event_value)
@@ -12,9 +12,10 @@ Matching is permissive: missing fields => no match, never crash.
 from __future__ import annotations
 
 import fnmatch
+import functools
 import re
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
 
 _RULE_RE = re.compile(r"^\s*(?P<tool>[A-Za-z_][A-Za-z0-9_-]*)\s*(?:\((?P<arg>.*)\))?\s*$")
 _TOKEN_RE = re.compile(r"\s+(?:and|AND|&&)\s+|\s+(?:or|OR|\|\|)\s+")
@@ -70,10 +71,6 @@ def parse(rule: str) -> list[_Term]:
     return terms
 
 
-def _glob_match(pattern: str, value: str) -> bool:
-    return fnmatch.fnmatchcase(value, pattern)
-
-
 def _extract_arg_value(tool_name: str, tool_input: dict[str, Any]) -> str:
     """Pick the most-relevant scalar for matching against the `if` arg pattern.
 
@@ -89,22 +86,59 @@ def _extract_arg_value(tool_name: str, tool_input: dict[str, Any]) -> str:
     return ""
 
 
+@dataclass(frozen=True)
+class CompiledRule:
+    """An `if` rule parsed once, with arg globs translated to regexes.
+
+    `terms` holds (negate, tool, arg_regex) triples; arg_regex is None
+    for "any args".
+    """
+
+    source: str
+    terms: tuple[tuple[bool, str, Optional[re.Pattern[str]]], ...]
+
+    def matches(self, tool_name: str, tool_input: dict[str, Any]) -> bool:
+        if not self.terms:
+            return True
+        arg_value: Optional[str] = None
+        for negate, tool, arg_regex in self.terms:
+            hit = tool == tool_name
+            if hit and arg_regex is not None:
+                if arg_value is None:
+                    arg_value = _extract_arg_value(tool_name, tool_input)
+                hit = arg_regex.match(arg_value) is not None
+            if negate:
+                hit = not hit
+            if not hit:
+                return False
+        return True
+
+
+@functools.lru_cache(maxsize=512)
+def compile_rule(rule: str) -> CompiledRule:
+    """Parse + compile an `if` rule. Cached by rule text, so a rule shared
+    by many hooks or evaluated on every tool call is only parsed once."""
+    return CompiledRule(
+        source=rule,
+        terms=tuple(
+            (
+                term.negate,
+                term.tool,
+                None
+                if term.arg_pattern is None
+                else re.compile(fnmatch.translate(term.arg_pattern)),
+            )
+            for term in parse(rule)
+        ),
+    )
+
+
 def evaluate(rule: str, tool_name: str, tool_input: dict[str, Any]) -> bool:
     """Return True if the hook should run for (tool_name, tool_input).
 
     Empty/missing rule -> True (no filter). Unparseable rule -> True
     (defensive: don't silently skip the hook).
     """
-    terms = parse(rule)
-    if not terms:
+    if not rule:
         return True
-    arg_value = _extract_arg_value(tool_name, tool_input)
-    for term in terms:
-        hit = term.tool == tool_name
-        if hit and term.arg_pattern is not None:
-            hit = _glob_match(term.arg_pattern, arg_value)
-        if term.negate:
-            hit = not hit
-        if not hit:
-            return False
-    return True
+    return compile_rule(rule).matches(tool_name, tool_input)
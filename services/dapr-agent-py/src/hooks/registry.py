@@ -11,8 +11,9 @@ import copy
 import fnmatch
 import re
 from dataclasses import dataclass, field
-from typing import Any, Literal, Optional
+from typing import Any, Callable, Literal, Optional
 
+from . import permission_rules
 from .events import HookEvent
 from .schemas import HookCommand, HookMatcher, HooksSettings
 
@@ -37,6 +38,8 @@ class MatchingHook:
     """Result of resolving the registry against a single event + query."""
 
     registered: RegisteredHook
+    # Pre-compiled `if` rule from the snapshot index (None = no rule).
+    if_rule: Optional[permission_rules.CompiledRule] = None
 
     @property
     def hook(self) -> HookCommand:
@@ -70,6 +73,89 @@ def _matcher_matches(matcher: str, query: str) -> bool:
     return fnmatch.fnmatchcase(query, matcher)
 
 
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _compile_matcher(matcher: str) -> tuple[bool, frozenset[str], Optional[Callable[[str], bool]]]:
+    """Compile a matcher into (match_all, exact_names, pattern_predicate).
+
+    Same semantics as `_matcher_matches`, split so the common cases
+    (match-all, literal tool names, `Edit|Write` alternations) become
+    dictionary keys and only real globs/regexes need a per-query test.
+    """
+    if not matcher or matcher == "*":
+        return True, frozenset(), None
+    if len(matcher) >= 2 and matcher.startswith("/") and matcher.endswith("/"):
+        try:
+            search = re.compile(matcher[1:-1]).search
+        except re.error:
+            return False, frozenset(), None
+        return False, frozenset(), lambda query: search(query) is not None
+    alternatives = (
+        [alt.strip() for alt in matcher.split("|") if alt.strip()]
+        if "|" in matcher
+        else [matcher]
+    )
+    exact = frozenset(alt for alt in alternatives if not _GLOB_CHARS & set(alt))
+    globs = [alt for alt in alternatives if alt not in exact]
+    if not globs:
+        return False, exact, None
+    glob_re = re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in globs))
+    return False, exact, lambda query: glob_re.match(query) is not None
+
+
+_QUERY_CACHE_SIZE = 256
+
+
+class _EventIndex:
+    """Compiled hooks for one event.
+
+    Hooks keep their registration position so results come back in the
+    same order as a linear scan. Results are memoized per query; the
+    snapshot is immutable, so entries never go stale.
+    """
+
+    __slots__ = ("_always", "_exact", "_patterns", "_if_rules", "_memo")
+
+    def __init__(self, hooks: tuple[RegisteredHook, ...]) -> None:
+        always: list[int] = []
+        exact: dict[str, list[int]] = {}
+        patterns: list[tuple[int, Callable[[str], bool]]] = []
+        for position, registered in enumerate(hooks):
+            match_all, names, predicate = _compile_matcher(registered.matcher)
+            if match_all:
+                always.append(position)
+                continue
+            for name in names:
+                exact.setdefault(name, []).append(position)
+            if predicate is not None:
+                patterns.append((position, predicate))
+        self._always = tuple(always)
+        self._exact = {name: tuple(positions) for name, positions in exact.items()}
+        self._patterns = tuple(patterns)
+        self._if_rules = tuple(
+            permission_rules.compile_rule(r.hook.if_) if r.hook.if_ else None
+            for r in hooks
+        )
+        self._memo: dict[str, tuple[int, ...]] = {}
+
+    def positions(self, query: str) -> tuple[int, ...]:
+        cached = self._memo.get(query)
+        if cached is not None:
+            return cached
+        hits = set(self._always)
+        hits.update(self._exact.get(query, ()))
+        hits.update(pos for pos, predicate in self._patterns if predicate(query))
+        result = tuple(sorted(hits))
+        if len(self._memo) >= _QUERY_CACHE_SIZE:
+            self._memo.clear()
+        self._memo[query] = result
+        return result
+
+    def if_rule(self, position: int) -> Optional[permission_rules.CompiledRule]:
+        return self._if_rules[position]
+
+
 class HookRegistry:
     """Mutable registry. Call `.snapshot()` to get an immutable view."""
 
@@ -177,18 +263,38 @@ class HooksSnapshot:
     """Immutable, deep-copied view of the registry at a point in time."""
 
     by_event: dict[str, tuple[RegisteredHook, ...]] = field(default_factory=dict)
+    # Matchers and `if` rules compiled once per snapshot; see _EventIndex.
+    _index: dict[str, _EventIndex] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_index",
+            {event: _EventIndex(items) for event, items in self.by_event.items() if items},
+        )
 
     def get_matching_hooks(
         self,
         event: str | HookEvent,
         query: str = "",
     ) -> list[MatchingHook]:
+        if not self._index:
+            return []
+        key = event.value if isinstance(event, HookEvent) else event
+        index = self._index.get(key)
+        if index is None:
+            return []
+        hooks = self.by_event[key]
+        return [
+            MatchingHook(registered=hooks[pos], if_rule=index.if_rule(pos))
+            for pos in index.positions(query)
+        ]
+
+    def has_hooks(self, event: str | HookEvent) -> bool:
         key = event.value if isinstance(event, HookEvent) else event
-        out: list[MatchingHook] = []
-        for r in self.by_event.get(key, ()):
-            if _matcher_matches(r.matcher, query):
-                out.append(MatchingHook(registered=r))
-        return out
+        return key in self._index
 
     def overlay(self, per_run_settings: HooksSettings) -> "HooksSnapshot":
         """Return a new snapshot with per-run hooks appended (mirrors plugin
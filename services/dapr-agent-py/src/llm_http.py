@@ -0,0 +1,318 @@
+"""Process-wide pooled HTTP transport shared by every LLM provider adapter.
+
+Adapters used to call ``urllib.request.urlopen`` per request (and the
+Anthropic adapter built a fresh SDK client per call), so every LLM turn paid
+DNS + TCP + TLS again. This module keeps ONE ``httpx.Client`` per endpoint
+origin (``scheme://host:port``) for the life of the process:
+
+* keep-alive connections are reused across turns, sessions and adapters;
+* HTTP/2 is negotiated via ALPN when ``h2`` is installed and the provider
+  offers it (HTTP/1.1 otherwise — no per-provider configuration);
+* a per-origin semaphore bounds in-flight requests to one provider so a burst
+  of parallel sub-agents cannot open an unbounded number of connections;
+* each request reports whether it reused a connection and, if not, how long
+  the TCP + TLS handshake took (``telemetry.metrics.record_llm_http_request``).
+
+``urlopen`` is a drop-in for ``urllib.request.urlopen`` on a prepared
+``urllib.request.Request``: the response supports ``read`` / ``readline`` /
+``headers`` / ``status`` and ``with``, and HTTP error statuses raise
+``urllib.error.HTTPError``, so adapter retry / error handling is unchanged.
+Bodies are streamed (Kimi reads SSE line by line).
+
+ENV:
+  LLM_HTTP_POOL_ENABLED        (default true)  — false = plain urllib per call
+  LLM_HTTP2_ENABLED            (default true)  — offer h2 when available
+  LLM_HTTP_MAX_CONNECTIONS     (default 32)    — per origin
+  LLM_HTTP_MAX_KEEPALIVE       (default 16)    — idle connections per origin
+  LLM_HTTP_KEEPALIVE_SECONDS   (default 90)
+  LLM_HTTP_MAX_CONCURRENCY     (default 16)    — in-flight requests per origin
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import io
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Iterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+_slots: dict[str, threading.BoundedSemaphore] = {}
+_stats: dict[str, dict[str, float]] = {}
+
+
+def _as_bool(raw: str | None, default: bool) -> bool:
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() not in ("0", "false", "no", "off")
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, "") or default))
+    except ValueError:
+        return default
+
+
+def pool_enabled() -> bool:
+    return _as_bool(os.environ.get("LLM_HTTP_POOL_ENABLED"), True)
+
+
+def _http2_available() -> bool:
+    if not _as_bool(os.environ.get("LLM_HTTP2_ENABLED"), True):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def origin_of(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return f"{parts.scheme}://{parts.hostname}:{port}"
+
+
+def _new_client() -> httpx.Client:
+    return httpx.Client(
+        http2=_http2_available(),
+        limits=httpx.Limits(
+            max_connections=_int_env("LLM_HTTP_MAX_CONNECTIONS", 32),
+            max_keepalive_connections=_int_env("LLM_HTTP_MAX_KEEPALIVE", 16),
+            keepalive_expiry=float(_int_env("LLM_HTTP_KEEPALIVE_SECONDS", 90)),
+        ),
+        # Adapters own retries and per-call timeouts; redirects are not part
+        # of any provider API we call.
+        follow_redirects=False,
+        event_hooks={"request": [_attach_trace], "response": [_report_connection]},
+    )
+
+
+def client_for(url: str) -> httpx.Client:
+    """The shared client for ``url``'s origin (created on first use)."""
+    origin = origin_of(url)
+    with _lock:
+        client = _clients.get(origin)
+        if client is None:
+            client = _clients[origin] = _new_client()
+            _slots[origin] = threading.BoundedSemaphore(
+                _int_env("LLM_HTTP_MAX_CONCURRENCY", 16)
+            )
+        return client
+
+
+@contextlib.contextmanager
+def provider_slot(url: str) -> Iterator[None]:
+    """Hold one of the origin's bounded in-flight request slots."""
+    client_for(url)
+    slot = _slots[origin_of(url)]
+    slot.acquire()
+    try:
+        yield
+    finally:
+        slot.release()
+
+
+# -- connection metrics ------------------------------------------------------
+#
+# httpcore reports connection lifecycle through the per-request ``trace``
+# extension. A request that never emits ``connect_tcp`` rode an existing
+# pooled connection.
+
+
+def _attach_trace(request: httpx.Request) -> None:
+    marks: dict[str, float] = {}
+
+    def trace(event: str, info: dict[str, Any]) -> None:
+        if event in (
+            "connection.connect_tcp.started",
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            marks[event] = time.perf_counter()
+
+    request.extensions["trace"] = trace
+    request.extensions["llm_http_marks"] = marks
+
+
+def _report_connection(response: httpx.Response) -> None:
+    marks = response.request.extensions.get("llm_http_marks") or {}
+    started = marks.get("connection.connect_tcp.started")
+    reused = started is None
+    handshake_ms: float | None = None
+    if started is not None:
+        finished = marks.get("connection.start_tls.complete") or marks.get(
+            "connection.connect_tcp.complete"
+        )
+        if finished is not None:
+            handshake_ms = (finished - started) * 1000.0
+    origin = origin_of(str(response.request.url))
+    with _lock:
+        stats = _stats.setdefault(
+            origin, {"requests": 0, "reused": 0, "handshakes": 0, "handshake_ms": 0.0}
+        )
+        stats["requests"] += 1
+        if reused:
+            stats["reused"] += 1
+        elif handshake_ms is not None:
+            stats["handshakes"] += 1
+            stats["handshake_ms"] += handshake_ms
+    try:
+        from src.telemetry import record_llm_http_request
+
+        record_llm_http_request(
+            provider=response.request.url.host,
+            reused=reused,
+            http_version=response.http_version,
+            handshake_ms=handshake_ms,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("[llm-http] metrics record failed: %s", exc)
+
+
+def pool_stats() -> dict[str, dict[str, float]]:
+    """Per-origin request / reuse / handshake counters (process lifetime)."""
+    with _lock:
+        return {origin: dict(stats) for origin, stats in _stats.items()}
+
+
+# -- urllib-compatible facade ------------------------------------------------
+
+
+class PooledResponse:
+    """``http.client.HTTPResponse``-shaped view of a streamed httpx response."""
+
+    def __init__(self, response: httpx.Response, release: Any) -> None:
+        self._response = response
+        self._release = release
+        self._chunks = response.iter_bytes()
+        self._buffer = b""
+        self._eof = False
+        self.status = response.status_code
+        self.code = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.url = str(response.url)
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        try:
+            self._buffer += next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            return False
+        except httpx.TimeoutException as exc:
+            raise TimeoutError(str(exc) or "LLM provider read timed out") from exc
+        return True
+
+    def read(self, amt: int | None = None) -> bytes:
+        if amt is None:
+            while self._fill():
+                pass
+            data, self._buffer = self._buffer, b""
+            return data
+        while len(self._buffer) < amt and self._fill():
+            pass
+        data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def readline(self, limit: int = -1) -> bytes:
+        while b"\n" not in self._buffer and self._fill():
+            pass
+        end = self._buffer.find(b"\n") + 1 or len(self._buffer)
+        if limit >= 0:
+            end = min(end, limit)
+        line, self._buffer = self._buffer[:end], self._buffer[end:]
+        return line
+
+    def getcode(self) -> int:
+        return self.status
+
+    def close(self) -> None:
+        if self._release is None:
+            return
+        try:
+            self._response.close()
+        finally:
+            self._release()
+            self._release = None
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+def urlopen(
+    req: urllib.request.Request | str, timeout: float | None = None
+) -> PooledResponse | Any:
+    """``urllib.request.urlopen`` over the shared per-origin pool."""
+    if not pool_enabled():
+        return urllib.request.urlopen(req, timeout=timeout)
+    if isinstance(req, str):
+        req = urllib.request.Request(req)
+    url = req.full_url
+    client = client_for(url)
+    slot = _slots[origin_of(url)]
+    request = client.build_request(
+        req.get_method(),
+        url,
+        content=req.data,
+        headers=dict(req.header_items()),
+        timeout=httpx.Timeout(timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+    )
+    slot.acquire()
+    try:
+        response = client.send(request, stream=True)
+    except httpx.TimeoutException as exc:
+        slot.release()
+        raise TimeoutError(str(exc) or "LLM provider request timed out") from exc
+    except httpx.TransportError as exc:
+        slot.release()
+        raise urllib.error.URLError(exc) from exc
+    except BaseException:
+        slot.release()
+        raise
+    if response.status_code >= 400:
+        try:
+            body = response.read()
+        finally:
+            response.close()
+            slot.release()
+        raise urllib.error.HTTPError(
+            url,
+            response.status_code,
+            response.reason_phrase,
+            response.headers,  # type: ignore[arg-type] — .get() is all callers use
+            io.BytesIO(body),
+        )
+    return PooledResponse(response, slot.release)
+
+
+def close_all() -> None:
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _slots.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+atexit.register(close_all)
@@ -0,0 +1,567 @@
+"""Shared SSE streaming engine for OpenAI-shaped provider adapters.
+
+Generalized from the Kimi K3 streaming path. Adapters request
+``stream: true`` and hand the open response to one of two readers:
+
+* ``read_chat_completion_stream`` — Chat Completions chunks
+  (``choices[0].delta``), used by Kimi, Together, NVIDIA, DeepSeek, Alibaba.
+* ``read_responses_stream`` — OpenAI Responses API events
+  (``response.output_text.delta`` ... ``response.completed``).
+
+Both aggregate the stream back into the exact body the non-streaming API
+returns, so each adapter's ``_extract_*_response`` stays unchanged. They also
+report real time-to-first-token: the first reasoning, content or tool-call
+delta, not the end of the body. Partial output is published as coalesced
+``agent.*_delta`` session events through ``StreamDeltaEmitter``.
+
+Idle timeouts are per read: the timeout handed to ``urlopen`` bounds the
+silence between SSE bytes, not the life of the response, so long reasoning
+turns survive as long as the provider keeps sending data or keep-alive
+comments. A provider that ignores ``stream: true`` and answers with a JSON
+body is read as JSON (``sse=None`` sniffs the ``Content-Type``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import time
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def provider_streaming_enabled() -> bool:
+    """``DAPR_AGENT_PY_PROVIDER_STREAMING`` (default on) — request SSE bodies."""
+    return os.environ.get(
+        "DAPR_AGENT_PY_PROVIDER_STREAMING", "true"
+    ).strip().lower() in ("1", "true", "yes", "on")
+
+
+def stream_deltas_enabled(default: bool = True) -> bool:
+    raw = os.environ.get("DAPR_AGENT_PY_STREAM_DELTAS")
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _coalesce_ms() -> int:
+    return int(os.environ.get("DAPR_AGENT_PY_DELTA_COALESCE_MS", "80"))
+
+
+def _coalesce_bytes() -> int:
+    return int(os.environ.get("DAPR_AGENT_PY_DELTA_COALESCE_BYTES", "2048"))
+
+
+class StreamDeltaEmitter:
+    """Publish bounded, coalesced deltas without duplicating the terminal message.
+
+    Buffers per ``(event_type, content_block_index)`` and flushes on elapsed
+    time or buffered bytes, whichever fires first. Inert when disabled or when
+    no session is in scope.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool | None = None,
+        coalesce_ms: int | None = None,
+        coalesce_bytes: int | None = None,
+        label: str = "llm",
+    ) -> None:
+        self._label = label
+        self._coalesce_ms = _coalesce_ms() if coalesce_ms is None else coalesce_ms
+        self._coalesce_bytes = (
+            _coalesce_bytes() if coalesce_bytes is None else coalesce_bytes
+        )
+        self._session_id: str | None = None
+        self._instance_id: str | None = None
+        self._publish: Any = None
+        self._buffers: dict[tuple[str, int], dict[str, Any]] = {}
+        if not (stream_deltas_enabled() if enabled is None else enabled):
+            return
+        try:
+            from src.event_publisher import (
+                get_scoped_session,
+                publish_session_event,
+            )
+
+            self._session_id, self._instance_id = get_scoped_session()
+            if self._session_id:
+                self._publish = publish_session_event
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("[delta-emit] %s session lookup failed: %s", label, exc)
+
+    def append(
+        self,
+        event_type: str,
+        index: int,
+        text: str,
+        *,
+        tool_use_id: str | None = None,
+    ) -> None:
+        if self._publish is None or not text:
+            return
+        key = (event_type, index)
+        entry = self._buffers.setdefault(
+            key,
+            {
+                "buf": "",
+                "cumulative": 0,
+                "opened_at_ns": time.monotonic_ns(),
+                "tool_use_id": tool_use_id,
+            },
+        )
+        if tool_use_id:
+            entry["tool_use_id"] = tool_use_id
+        entry["buf"] += text
+        entry["cumulative"] += len(text)
+
+        buffered_bytes = len(entry["buf"].encode("utf-8", "ignore"))
+        age_ms = (time.monotonic_ns() - entry["opened_at_ns"]) / 1_000_000
+        if buffered_bytes >= self._coalesce_bytes or age_ms >= self._coalesce_ms:
+            self._flush(key)
+            entry["opened_at_ns"] = time.monotonic_ns()
+
+    def _flush(self, key: tuple[str, int]) -> None:
+        entry = self._buffers.get(key)
+        if self._publish is None or not entry or not entry.get("buf"):
+            return
+        event_type, index = key
+        payload: dict[str, Any] = {
+            "content_block_index": index,
+            "text": entry["buf"],
+            "cumulative_len": entry["cumulative"],
+        }
+        if entry.get("tool_use_id"):
+            payload["tool_use_id"] = entry["tool_use_id"]
+            payload["partial_json"] = entry["buf"]
+        try:
+            self._publish(
+                self._session_id,
+                event_type,
+                payload,
+                instance_id=self._instance_id,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("[delta-emit] %s publish failed: %s", self._label, exc)
+        entry["buf"] = ""
+
+    def flush_all(self) -> None:
+        for key in list(self._buffers):
+            self._flush(key)
+
+
+def is_event_stream(response: Any) -> bool:
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return False
+    try:
+        content_type = headers.get("Content-Type") or headers.get("content-type") or ""
+    except Exception:  # noqa: BLE001
+        return False
+    return "text/event-stream" in str(content_type).lower()
+
+
+def iter_sse_data(
+    response: Any,
+    *,
+    idle_timeout_seconds: float,
+    provider: str,
+    require_done: bool = True,
+) -> Iterator[str]:
+    """Yield SSE ``data:`` payload strings until ``[DONE]`` (or EOF).
+
+    With ``require_done`` a stream that ends without ``data: [DONE]`` is an
+    error (a truncated response must not look like a complete one).
+    """
+    data_lines: list[str] = []
+    while True:
+        try:
+            raw_line = response.readline()
+        except (TimeoutError, socket.timeout) as exc:
+            raise TimeoutError(
+                f"{provider} SSE stream was idle for "
+                f"{idle_timeout_seconds:g} seconds before completion."
+            ) from exc
+
+        if raw_line == b"" or raw_line == "":
+            if data_lines:
+                payload = "\n".join(data_lines)
+                if payload == "[DONE]":
+                    return
+                yield payload
+            if not require_done:
+                return
+            raise RuntimeError(
+                f"{provider} SSE stream ended before the required data: [DONE] event."
+            )
+
+        if isinstance(raw_line, bytes):
+            line = raw_line.decode("utf-8", errors="replace")
+        else:
+            line = str(raw_line)
+        line = line.rstrip("\r\n")
+
+        if not line:
+            if not data_lines:
+                continue
+            payload = "\n".join(data_lines)
+            data_lines = []
+            if payload == "[DONE]":
+                return
+            yield payload
+            continue
+
+        # SSE comments are valid keep-alives. Reading them resets the socket's
+        # per-operation idle timeout without producing a chunk.
+        if line.startswith(":"):
+            continue
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip(" "))
+        elif data_lines and not line.startswith(("event:", "id:", "retry:")):
+            # Kimi's no-SDK example treats a non-prefixed line as a
+            # continuation of the open data payload. Ignore other SSE fields.
+            data_lines.append(line)
+
+
+def _iter_json_chunks(
+    response: Any,
+    *,
+    idle_timeout_seconds: float,
+    provider: str,
+    require_done: bool,
+) -> Iterator[dict[str, Any]]:
+    for payload in iter_sse_data(
+        response,
+        idle_timeout_seconds=idle_timeout_seconds,
+        provider=provider,
+        require_done=require_done,
+    ):
+        try:
+            chunk = json.loads(payload)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(
+                f"{provider} SSE stream returned invalid JSON: {payload[:200]}"
+            ) from exc
+        if not isinstance(chunk, dict):
+            raise RuntimeError(f"{provider} SSE stream returned a non-object JSON chunk.")
+        yield chunk
+
+
+def _read_json_body(response: Any) -> dict[str, Any]:
+    return json.loads(response.read() or b"{}")
+
+
+def _delta_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "".join(
+            str(item.get("text", "")) if isinstance(item, dict) else str(item)
+            for item in value
+        )
+    return str(value)
+
+
+def _argument_text(arguments: Any) -> str:
+    return arguments if isinstance(arguments, str) else json.dumps(arguments, ensure_ascii=False)
+
+
+def merge_stream_tool_calls(
+    accumulated: dict[int, dict[str, Any]],
+    fragments: Any,
+) -> None:
+    """Fold streamed ``delta.tool_calls`` fragments into whole calls by index."""
+    if not isinstance(fragments, list):
+        return
+    for position, fragment in enumerate(fragments):
+        if not isinstance(fragment, dict):
+            continue
+        try:
+            index = int(fragment.get("index", position))
+        except (TypeError, ValueError):
+            index = position
+        if index < 0:
+            continue
+
+        call = accumulated.setdefault(
+            index,
+            {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""},
+            },
+        )
+        call_id = fragment.get("id")
+        if call_id:
+            call["id"] += str(call_id)
+        call_type = fragment.get("type")
+        if call_type:
+            call["type"] = str(call_type)
+
+        raw_function = fragment.get("function")
+        if not isinstance(raw_function, dict):
+            continue
+        function = call["function"]
+        name = raw_function.get("name")
+        if name:
+            function["name"] += str(name)
+        arguments = raw_function.get("arguments")
+        if arguments is not None:
+            function["arguments"] += _argument_text(arguments)
+
+
+def _ttft_ms(first_token_at: float | None, request_started_at: float) -> float | None:
+    if first_token_at is None:
+        return None
+    return (first_token_at - request_started_at) * 1000.0
+
+
+def read_chat_completion_stream(
+    response: Any,
+    *,
+    provider: str,
+    idle_timeout_seconds: float,
+    request_started_at: float,
+    emitter: StreamDeltaEmitter | None = None,
+    sse: bool | None = None,
+    require_done: bool = False,
+    normalize_tool_call: Callable[[Any], dict[str, Any] | None] | None = None,
+) -> tuple[dict[str, Any], float | None]:
+    """Aggregate a Chat Completions SSE response into a non-stream body.
+
+    Returns ``(data, ttft_ms)``; ``ttft_ms`` is None for a JSON body or a
+    stream that produced no token. With ``normalize_tool_call`` an
+    incomplete streamed call is an error instead of being passed through.
+    """
+    if sse is None:
+        sse = is_event_stream(response)
+    if not sse:
+        return _read_json_body(response), None
+
+    response_id: Any = None
+    response_model: Any = None
+    response_object: Any = "chat.completion"
+    response_created: Any = None
+    role = "assistant"
+    content_parts: list[str] = []
+    reasoning_parts: list[str] = []
+    streamed_tool_calls: dict[int, dict[str, Any]] = {}
+    finish_reason: str | None = None
+    usage: dict[str, Any] = {}
+    first_token_at: float | None = None
+    received_chunk = False
+    delta_emitter = emitter or StreamDeltaEmitter(label=provider)
+
+    for chunk in _iter_json_chunks(
+        response,
+        idle_timeout_seconds=idle_timeout_seconds,
+        provider=provider,
+        require_done=require_done,
+    ):
+        received_chunk = True
+
+        stream_error = chunk.get("error")
+        if stream_error:
+            if isinstance(stream_error, dict):
+                detail = stream_error.get("message") or json.dumps(stream_error)
+            else:
+                detail = str(stream_error)
+            raise RuntimeError(f"{provider} Chat API stream failed: {detail}")
+
+        response_id = chunk.get("id") or response_id
+        response_model = chunk.get("model") or response_model
+        response_object = chunk.get("object") or response_object
+        response_created = chunk.get("created") or response_created
+        top_level_usage = chunk.get("usage")
+        if isinstance(top_level_usage, dict):
+            usage = top_level_usage
+
+        choices = chunk.get("choices")
+        if not isinstance(choices, list):
+            continue
+        for choice in choices:
+            if not isinstance(choice, dict):
+                continue
+            try:
+                choice_index = int(choice.get("index", 0))
+            except (TypeError, ValueError):
+                choice_index = 0
+            if choice_index != 0:
+                continue
+
+            choice_usage = choice.get("usage")
+            if isinstance(choice_usage, dict):
+                usage = choice_usage
+            if choice.get("finish_reason") is not None:
+                finish_reason = str(choice["finish_reason"])
+
+            delta = choice.get("delta")
+            if not isinstance(delta, dict):
+                continue
+            if delta.get("role"):
+                role = str(delta["role"])
+
+            reasoning_delta = _delta_text(
+                delta.get("reasoning_content")
+                or delta.get("reasoning")
+                or delta.get("thinking")
+            )
+            content_delta = _delta_text(delta.get("content"))
+            tool_fragments = delta.get("tool_calls")
+            if reasoning_delta or content_delta or tool_fragments:
+                first_token_at = first_token_at or time.monotonic()
+            if reasoning_delta:
+                reasoning_parts.append(reasoning_delta)
+                delta_emitter.append("agent.thinking_delta", 0, reasoning_delta)
+            if content_delta:
+                content_parts.append(content_delta)
+                delta_emitter.append("agent.message_delta", 1, content_delta)
+            merge_stream_tool_calls(streamed_tool_calls, tool_fragments)
+            if isinstance(tool_fragments, list):
+                for position, fragment in enumerate(tool_fragments):
+                    if not isinstance(fragment, dict):
+                        continue
+                    try:
+                        tool_index = int(fragment.get("index", position))
+                    except (TypeError, ValueError):
+                        tool_index = position
+                    if tool_index < 0:
+                        continue
+                    raw_function = fragment.get("function")
+                    if not isinstance(raw_function, dict):
+                        continue
+                    raw_arguments = raw_function.get("arguments")
+                    if raw_arguments is None:
+                        continue
+                    accumulated_call = streamed_tool_calls.get(tool_index) or {}
+                    delta_emitter.append(
+                        "agent.tool_input_delta",
+                        tool_index + 2,
+                        _argument_text(raw_arguments),
+                        tool_use_id=str(accumulated_call.get("id") or "") or None,
+                    )
+
+    delta_emitter.flush_all()
+
+    if not received_chunk:
+        raise RuntimeError(f"{provider} SSE stream completed without a response chunk.")
+
+    tool_calls: list[dict[str, Any]] = []
+    for index in sorted(streamed_tool_calls):
+        call = streamed_tool_calls[index]
+        if normalize_tool_call is not None:
+            call = normalize_tool_call(call)
+            if call is None:
+                raise RuntimeError(
+                    f"{provider} SSE stream returned an incomplete tool call at index {index}."
+                )
+        tool_calls.append(call)
+
+    message: dict[str, Any] = {
+        "role": role,
+        "content": "".join(content_parts),
+    }
+    reasoning_content = "".join(reasoning_parts)
+    if reasoning_content:
+        message["reasoning_content"] = reasoning_content
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+
+    data: dict[str, Any] = {
+        "id": response_id,
+        "object": response_object,
+        "created": response_created,
+        "model": response_model,
+        "choices": [
+            {
+                "index": 0,
+                "message": message,
+                "finish_reason": finish_reason,
+            }
+        ],
+        "usage": usage,
+    }
+    return data, _ttft_ms(first_token_at, request_started_at)
+
+
+# Responses API event type → session delta event type.
+_RESPONSES_TEXT_EVENTS = {
+    "response.output_text.delta": "agent.message_delta",
+    "response.reasoning_summary_text.delta": "agent.thinking_delta",
+    "response.reasoning_text.delta": "agent.thinking_delta",
+}
+
+
+def read_responses_stream(
+    response: Any,
+    *,
+    provider: str,
+    idle_timeout_seconds: float,
+    request_started_at: float,
+    emitter: StreamDeltaEmitter | None = None,
+    sse: bool | None = None,
+) -> tuple[dict[str, Any], float | None]:
+    """Read an OpenAI Responses API stream; returns the ``response.completed``
+    body (identical to the non-streaming response) and the real TTFT."""
+    if sse is None:
+        sse = is_event_stream(response)
+    if not sse:
+        return _read_json_body(response), None
+
+    delta_emitter = emitter or StreamDeltaEmitter(label=provider)
+    first_token_at: float | None = None
+    completed: dict[str, Any] | None = None
+    call_ids: dict[int, str] = {}
+
+    for event in _iter_json_chunks(
+        response,
+        idle_timeout_seconds=idle_timeout_seconds,
+        provider=provider,
+        require_done=False,
+    ):
+        event_type = str(event.get("type") or "")
+        if event_type in _RESPONSES_TEXT_EVENTS or event_type == (
+            "response.function_call_arguments.delta"
+        ):
+            first_token_at = first_token_at or time.monotonic()
+        if event_type in _RESPONSES_TEXT_EVENTS:
+            delta_emitter.append(
+                _RESPONSES_TEXT_EVENTS[event_type],
+                0 if _RESPONSES_TEXT_EVENTS[event_type] == "agent.thinking_delta" else 1,
+                _delta_text(event.get("delta")),
+            )
+        elif event_type == "response.output_item.added":
+            item = event.get("item") or {}
+            if isinstance(item, dict) and item.get("type") == "function_call":
+                call_ids[int(event.get("output_index") or 0)] = str(
+                    item.get("call_id") or item.get("id") or ""
+                )
+        elif event_type == "response.function_call_arguments.delta":
+            output_index = int(event.get("output_index") or 0)
+            delta_emitter.append(
+                "agent.tool_input_delta",
+                output_index + 2,
+                _delta_text(event.get("delta")),
+                tool_use_id=call_ids.get(output_index) or None,
+            )
+        elif event_type in ("response.completed", "response.incomplete"):
+            body = event.get("response")
+            completed = body if isinstance(body, dict) else {}
+        elif event_type in ("response.failed", "error"):
+            body = event.get("response") if event_type == "response.failed" else event
+            error = (body or {}).get("error") if isinstance(body, dict) else None
+            detail = (
+                error.get("message") if isinstance(error, dict) else None
+            ) or json.dumps(error or body)
+            raise RuntimeError(f"{provider} stream failed: {detail}")
+
+    delta_emitter.flush_all()
+    if completed is None:
+        raise RuntimeError(f"{provider} stream ended before response.completed.")
+    return completed, _ttft_ms(first_token_at, request_started_at)
@@ -120,6 +120,8 @@ from src.openshell_runtime import (
     reset_runtime,
 )
 from src.code_checkpoint import (
+    CHECKPOINT_LANES,
+    async_checkpoints_enabled,
     capture_code_checkpoint,
     log_checkpoint_remote_status,
     restore_code_checkpoint,
@@ -151,6 +153,7 @@ from src.capability_compiler import (
     safe_skill_segment as _safe_skill_segment,
     skill_package_entries,
 )
+from src.skill_bundles import SkillPackage, materialize_skill_packages, skill_package
 from src.event_publisher import (
     drive_goal_stop_check,
     get_scoped_session,
@@ -158,7 +161,7 @@ from src.event_publisher import (
     scope_session,
     unscope_session,
 )
-from src.mcp_retry import connect_mcp_client_with_retries
+from src.mcp_session_pool import MCP_SESSION_POOL
 from src.session_host_monitor import (
     benchmark_activity_age_seconds,
     benchmark_activity_is_recent,
@@ -199,10 +202,11 @@ from src.structured_output import (
     evaluate_structured_output_call,
     structured_output_success_content,
 )
+from src.shell_read_only import bash_tool_call_read_only
 from src.tool_batching import (
     max_tool_concurrency,
     partition_tool_calls,
-    tool_name_concurrency_safe,
+    tool_call_concurrency_safe,
 )
 from src.runtime_config import (
     SESSION_RUNTIME_CONFIG_EVENT_TYPE,
@@ -1625,8 +1629,8 @@ def _install_runtime_skill_refs(runtime, instance_id: str, refs: list[dict[str,
 def _extract_skill_package_entries(item: dict[str, Any]) -> list[dict[str, str]]:
     # Skill caps + path sanitization moved to the shared capability compiler
     # (services/shared/capability_compiler/skills.py). Delegates byte-identical
-    # (str-only entries); the runtime.write_text loop + SkillDefinition coupling
-    # stay below in _materialize_instance_skill_packages.
+    # (str-only entries); sandbox delivery + SkillDefinition coupling stay
+    # below in _materialize_instance_skill_packages.
     return skill_package_entries(item)
 
 
@@ -1650,6 +1654,7 @@ def _materialize_instance_skill_packages(
     OpenShell workspace before the Skill tool advertises them.
     """
     updated: list[SkillDefinition] = []
+    packages: list[SkillPackage] = []
     safe_instance = _safe_skill_segment(instance_id or "instance")
     items_by_name = {
         str(item.get("name") or "").strip(): item
@@ -1663,23 +1668,7 @@ def _materialize_instance_skill_packages(
             updated.append(skill)
             continue
         package_dir = f"/sandbox/.workflow-builder/skills/{safe_instance}/{_safe_skill_segment(skill.name)}"
-        if write_files:
-            for entry in package_entries:
-                target_path = posixpath.join(package_dir, entry["path"])
-                result = runtime.write_text(target_path, entry["content"])
-                if not result.get("ok"):
-                    logger.warning(
-                        "[skills] Failed to materialize %s for skill %s: %s",
-                        entry["path"],
-                        skill.name,
-                        result.get("error") or result.get("output"),
-                    )
-            logger.info(
-                "[skills] Materialized %d package file(s) for skill %s at %s",
-                len(package_entries),
-                skill.name,
-                package_dir,
-            )
+        packages.append(skill_package(skill.name, package_dir, package_entries))
         updated.append(
             replace(
                 skill,
@@ -1687,6 +1676,19 @@ def _materialize_instance_skill_packages(
                 package_files=tuple(entry["path"] for entry in package_entries),
             )
         )
+    if write_files and packages:
+        # One exec for every package, each shipped as a content-addressed tar
+        # (see src/skill_bundles.py); unchanged bundles are not re-sent.
+        statuses = materialize_skill_packages(runtime, packages)
+        for package in packages:
+            logger.info(
+                "[skills] Materialized %d package file(s) for skill %s at %s (%s, digest %s)",
+                len(package.entries),
+                package.skill_name,
+                package.target_dir,
+                statuses.get(package.target_dir),
+                package.digest[:12],
+            )
     return updated
 
 
@@ -1707,7 +1709,9 @@ class OpenShellDurableAgent(DurableAgent):
         # Instances whose MCP configs were written to (or read from) the state
         # store — used to write the cross-replica hydration doc exactly once.
         self._mcp_configs_persisted: set[str] = set()
-        self._mcp_clients_by_instance: dict[str, MCPClient] = {}
+        # Pool keys (see src/mcp_session_pool.py) each instance holds a
+        # reference on; the connected clients themselves are shared pod-wide.
+        self._mcp_pool_keys_by_instance: dict[str, tuple[str, ...]] = {}
         self._mcp_config_hash_by_instance: dict[str, str] = {}
         self._mcp_tools_by_instance: dict[str, dict[str, Any]] = {}
         self._allowed_tools_by_instance: dict[str, set[str]] = {}
@@ -1979,9 +1983,10 @@ class OpenShellDurableAgent(DurableAgent):
                 tool_calls_by_id: dict[str, dict[str, Any]] = {}
 
                 # Partition the turn's tool calls into ordered runs. Consecutive
-                # concurrency-safe inline tools (Read/Grep/Glob/MCP-read) coalesce
-                # into ONE ctx.when_all batch (capped); everything else — Bash,
-                # Write/Edit, workflow/agent tools — stays strictly one-at-a-time.
+                # concurrency-safe inline tools (Read/Grep/Glob/MCP-read and
+                # provably read-only Bash) coalesce into ONE ctx.when_all batch
+                # (capped); everything else — other Bash, Write/Edit,
+                # workflow/agent tools — stays strictly one-at-a-time.
                 # Execution order follows the original sequence (only adjacent safe
                 # calls batch), so a write-then-read in one turn can't race. Opt-in
                 # via batch_safe_tools; default off preserves the legacy path.
@@ -1989,7 +1994,7 @@ class OpenShellDurableAgent(DurableAgent):
                     if not batch_safe_tools:
                         return False
                     _n = (_tc.get("function") or {}).get("name", "")
-                    if not tool_name_concurrency_safe(_n):
+                    if not tool_call_concurrency_safe(_tc):
                         return False
                     _to = self.tool_executor.get_tool(_n)
                     # Workflow/agent-call tools are sub-orchestrations → never batch.
@@ -2625,7 +2630,7 @@ class OpenShellDurableAgent(DurableAgent):
             get_skill_registry().set_instance_skills(skills)
 
     async def _close_mcp_client_async(self, instance_id: str) -> None:
-        client = self._mcp_clients_by_instance.pop(instance_id, None)
+        pool_keys = self._mcp_pool_keys_by_instance.pop(instance_id, None)
         self._mcp_config_hash_by_instance.pop(instance_id, None)
         self._mcp_tools_by_instance.pop(instance_id, None)
         self._mcp_tool_sources_by_instance.pop(instance_id, None)
@@ -2633,8 +2638,8 @@ class OpenShellDurableAgent(DurableAgent):
         self._mcp_configs_by_instance.pop(instance_id, None)
         self._mcp_configs_persisted.discard(instance_id)
         self._allowed_tools_by_instance.pop(instance_id, None)
-        if client is not None:
-            await client.close()
+        if pool_keys:
+            await MCP_SESSION_POOL.release(instance_id, pool_keys)
 
     def _close_mcp_client(self, instance_id: str) -> None:
         if not instance_id:
@@ -2731,25 +2736,27 @@ class OpenShellDurableAgent(DurableAgent):
             if not configs:
                 return
         config_hash = json.dumps(configs, sort_keys=True, default=str)
-        if self._mcp_config_hash_by_instance.get(instance_id) == config_hash:
+        held_keys = self._mcp_pool_keys_by_instance.get(instance_id)
+        if (
+            self._mcp_config_hash_by_instance.get(instance_id) == config_hash
+            and held_keys is not None
+            and MCP_SESSION_POOL.is_current(instance_id, held_keys)
+        ):
             return
 
-        existing = self._mcp_clients_by_instance.get(instance_id)
-        client = await connect_mcp_client_with_retries(
+        # Servers with an identical config (headers included, so tenants stay
+        # isolated) share one pooled connection and tool catalog pod-wide.
+        pooled = await MCP_SESSION_POOL.acquire_many(
+            instance_id,
             configs,
             client_factory=lambda: MCPClient(persistent_connections=False),
             logger=logger,
             context=f"instance {instance_id}",
         )
-        if existing is not None:
-            try:
-                await existing.close()
-            except Exception as exc:  # noqa: BLE001
-                logger.warning(
-                    "[mcp] Failed to close previous MCP client for %s: %s",
-                    instance_id,
-                    exc,
-                )
+        pool_keys = tuple(server.key for server in pooled.values())
+        stale_keys = set(held_keys or ()) - set(pool_keys)
+        if stale_keys:
+            await MCP_SESSION_POOL.release(instance_id, stale_keys)
         allowed_tools_by_server = (
             self._mcp_allowed_tools_by_instance.get(instance_id) or {}
         )
@@ -2775,7 +2782,7 @@ class OpenShellDurableAgent(DurableAgent):
                 if allowed_tools
                 else set()
             )
-            for tool in client.get_server_tools(server_name):
+            for tool in pooled[server_name].tools:
                 raw_tool_name = str(getattr(tool, "name", "") or "")
                 wrapped_prefix = f"{server_name}_"
                 if raw_tool_name.startswith(wrapped_prefix):
@@ -2804,8 +2811,9 @@ class OpenShellDurableAgent(DurableAgent):
                 tool_sources[norm_key] = {
                     "server": server_name,
                     "transport": transport,
+                    "poolKey": pooled[server_name].key,
                 }
-        self._mcp_clients_by_instance[instance_id] = client
+        self._mcp_pool_keys_by_instance[instance_id] = pool_keys
         self._mcp_config_hash_by_instance[instance_id] = config_hash
         self._mcp_tools_by_instance[instance_id] = tools
         self._mcp_tool_sources_by_instance[instance_id] = tool_sources
@@ -3038,6 +3046,10 @@ class OpenShellDurableAgent(DurableAgent):
 
     def call_llm(self, ctx, payload):
         """Publish llm_start/llm_complete streaming events with content."""
+        # Turn boundary: commit the previous turn's coalesced checkpoints
+        # while the model is thinking (non-blocking).
+        if async_checkpoints_enabled():
+            CHECKPOINT_LANES.flush(self._activity_instance_id(ctx, payload))
         # Re-apply Anthropic adapter on each call (survives durable workflow replay)
         try:
             from src.anthropic_adapter import patch_for_anthropic
@@ -3799,6 +3811,17 @@ class OpenShellDurableAgent(DurableAgent):
         except Exception as exc:  # noqa: BLE001
             logger.warning("[telemetry] tool span start failed: %s", exc)
 
+        # Hold the instance's checkpoint lane while this tool may be writing:
+        # no background commit starts until it has finished and snapshotted
+        # its own tree (and the tool waits out an in-flight commit).
+        _checkpoint_mutation = bool(
+            inst_id
+            and _code_checkpoint_enabled()
+            and async_checkpoints_enabled()
+            and should_checkpoint_tool(tool_name)
+        )
+        if _checkpoint_mutation:
+            CHECKPOINT_LANES.begin_mutation(inst_id)
         try:
           custom_hooks_enabled = self._custom_hooks_enabled_for_instance(inst_id, context)
           hook_snapshot = _current_hook_snapshot(self, inst_id)
@@ -4004,12 +4027,16 @@ class OpenShellDurableAgent(DurableAgent):
                     _normalize_tool_lookup_name(tool_name)
                 )
                 if mcp_tool is not None:
-                  async def _execute_mcp_tool():
-                      return await mcp_tool.arun(**tool_args)
-
                   mcp_source = (
                       self._mcp_tool_sources_by_instance.get(inst_id) or {}
                   ).get(_normalize_tool_lookup_name(tool_name), {})
+
+                  async def _execute_mcp_tool():
+                      async with MCP_SESSION_POOL.call_slot(
+                          mcp_source.get("poolKey"), inst_id
+                      ):
+                          return await mcp_tool.arun(**tool_args)
+
                   import time as _time_mcp
                   mcp_start = _time_mcp.monotonic()
                   try:
@@ -4041,6 +4068,7 @@ class OpenShellDurableAgent(DurableAgent):
                   except Exception as exc:
                       error = str(exc)
                       _exec_error = error
+                      MCP_SESSION_POOL.mark_unhealthy(mcp_source.get("poolKey"))
                       try:
                           publish_session_event(
                               sess_id,
@@ -4263,7 +4291,43 @@ class OpenShellDurableAgent(DurableAgent):
                           result = merged
                           output = visible_content[:500]
           checkpoint = None
-          if _code_checkpoint_enabled() and should_checkpoint_tool(tool_name):
+          # Read-only Bash (which may run inside a parallel batch) changes
+          # nothing, so it skips the checkpoint commit.
+          _wants_checkpoint = (
+              _code_checkpoint_enabled()
+              and should_checkpoint_tool(tool_name)
+              and not bash_tool_call_read_only(tool_name, tool_args)
+          )
+          if _wants_checkpoint and tool_call_id and async_checkpoints_enabled():
+              # Coalesced background lane: the checkpoint row arrives later as
+              # its own `code_checkpoint` event keyed by this tool call.
+              def _publish_checkpoint(
+                  record: dict[str, Any],
+                  _sess_id: Any = sess_id,
+                  _tool_name: str = tool_name,
+                  _tool_call_id: str = tool_call_id,
+              ) -> None:
+                  publish_session_event(
+                      _sess_id,
+                      "code_checkpoint",
+                      {"toolName": _tool_name, "codeCheckpoint": record},
+                      source_event_id=f"{_tool_call_id}:checkpoint",
+                      instance_id=inst_id,
+                  )
+
+              try:
+                  CHECKPOINT_LANES.submit(
+                      inst_id,
+                      runtime=get_runtime(),
+                      execution_id=exec_id,
+                      workspace_ref=self._workspace_ref_by_instance.get(inst_id),
+                      tool_call_id=tool_call_id,
+                      tool_name=tool_name,
+                      on_result=_publish_checkpoint,
+                  )
+              except Exception as exc:
+                  logger.warning("[checkpoint] failed to queue after %s: %s", tool_name, exc)
+          elif _wants_checkpoint:
               try:
                   with _start_checkpoint_span(tool_name, tool_call_id) as _span:
                       checkpoint = capture_code_checkpoint(
@@ -4335,6 +4399,8 @@ class OpenShellDurableAgent(DurableAgent):
                   logger.warning("[tool-idempotency] cache put failed: %s", exc)
           return result
         finally:
+            if _checkpoint_mutation:
+                CHECKPOINT_LANES.end_mutation(inst_id)
             try:
                 reset_runtime(runtime_token)
             except Exception as exc:  # noqa: BLE001
@@ -4409,6 +4475,9 @@ class OpenShellDurableAgent(DurableAgent):
         code_checkpoint_restore = _extract_code_checkpoint_restore(message, metadata)
 
         if code_checkpoint_restore and not ctx.is_replaying:
+            # Settle coalesced checkpoints first so no background commit
+            # races the hard reset.
+            CHECKPOINT_LANES.drain(timeout=120.0)
             restore_result = restore_code_checkpoint(runtime, code_checkpoint_restore)
             try:
                 _ctx_inst = getattr(ctx, "instance_id", None) or ""
@@ -5138,6 +5207,12 @@ class OpenShellDurableAgent(DurableAgent):
                     self._tool_result_cache.clear_instance(instance_id)
                 except Exception:
                     pass
+                try:
+                    from src.compaction.ledger import clear_ledger
+
+                    clear_ledger(instance_id)
+                except Exception:
+                    pass
 
         agent_workflow_result = None
         try:
@@ -0,0 +1,370 @@
+"""Process-wide pool of MCP server connections shared across agent instances.
+
+``_ensure_mcp_client_async`` used to build one ``MCPClient`` per instance, so
+every new session re-ran the MCP ``initialize`` handshake and ``tools/list``
+for servers dozens of concurrent sessions were already using with an identical
+config (typically the ``mcp-gateway``). The pool instead keeps:
+
+- one connected client + wrapped tool catalog per server, keyed by
+  :func:`server_pool_key` over the server name and its FULL config. Headers
+  are part of the key, so instances with different per-tenant auth headers
+  never share an entry (or the tools bound to it);
+- a reference count per entry (the set of holding instance ids). Unreferenced
+  entries stay warm for ``DAPR_AGENT_PY_MCP_POOL_IDLE_SECONDS`` before closing;
+- a TTL on the catalog (``DAPR_AGENT_PY_MCP_POOL_CATALOG_TTL_SECONDS``). The
+  refresh reconnects and re-lists tools, which doubles as the health check; a
+  failed refresh keeps serving the last good catalog and retries after
+  ``DAPR_AGENT_PY_MCP_POOL_RETRY_SECONDS``. ``mark_unhealthy`` forces the next
+  check early after a transport failure;
+- per-server call limits (``DAPR_AGENT_PY_MCP_POOL_MAX_CONCURRENT_CALLS``) and
+  a per-instance share of them
+  (``DAPR_AGENT_PY_MCP_POOL_MAX_CALLS_PER_INSTANCE``), so one busy session
+  cannot hold every slot on a shared server.
+
+Activities drive coroutines on different event loops and threads, so the pool
+only uses threading primitives; concurrent connects of the same key are
+single-flighted through a ``concurrent.futures.Future``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+from contextlib import asynccontextmanager
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from typing import Any, NamedTuple
+
+from src.mcp_retry import (
+    ClientFactory,
+    _close_client,
+    _nonnegative_float_env,
+    _positive_int_env,
+    connect_mcp_client_with_retries,
+)
+
+logger = logging.getLogger(__name__)
+
+Clock = Callable[[], float]
+
+
+def server_pool_key(server_name: str, server_cfg: Mapping[str, Any]) -> str:
+    """Pool key for one MCP server config (name, transport, url, headers...)."""
+    canonical = json.dumps(
+        {"server": server_name, "config": server_cfg}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PooledServer(NamedTuple):
+    """Snapshot of one pool entry handed to an instance."""
+
+    key: str
+    server_name: str
+    tools: list[Any]
+    generation: int
+
+
+class _Entry:
+    def __init__(self, key: str, server_name: str, config: dict[str, Any]) -> None:
+        self.key = key
+        self.server_name = server_name
+        self.config = config
+        self.client: Any = None
+        self.tools: list[Any] = []
+        self.generation = 0
+        self.checked_at = 0.0
+        self.next_check = 0.0
+        self.pending: concurrent.futures.Future | None = None
+        self.holders: dict[str, int] = {}
+        self.idle_since: float | None = None
+        self.in_flight = 0
+        self.in_flight_by_holder: dict[str, int] = {}
+
+
+class MCPSessionPool:
+    def __init__(
+        self,
+        *,
+        catalog_ttl_seconds: float | None = None,
+        retry_seconds: float | None = None,
+        idle_seconds: float | None = None,
+        max_concurrent_calls: int | None = None,
+        max_calls_per_instance: int | None = None,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self._catalog_ttl = (
+            catalog_ttl_seconds
+            if catalog_ttl_seconds is not None
+            else _nonnegative_float_env("DAPR_AGENT_PY_MCP_POOL_CATALOG_TTL_SECONDS", 300.0)
+        )
+        self._retry_seconds = (
+            retry_seconds
+            if retry_seconds is not None
+            else _nonnegative_float_env("DAPR_AGENT_PY_MCP_POOL_RETRY_SECONDS", 15.0)
+        )
+        self._idle_seconds = (
+            idle_seconds
+            if idle_seconds is not None
+            else _nonnegative_float_env("DAPR_AGENT_PY_MCP_POOL_IDLE_SECONDS", 300.0)
+        )
+        self._max_calls = max(
+            1,
+            max_concurrent_calls
+            if max_concurrent_calls is not None
+            else _positive_int_env("DAPR_AGENT_PY_MCP_POOL_MAX_CONCURRENT_CALLS", 16),
+        )
+        self._max_calls_per_holder = min(
+            self._max_calls,
+            max(
+                1,
+                max_calls_per_instance
+                if max_calls_per_instance is not None
+                else _positive_int_env("DAPR_AGENT_PY_MCP_POOL_MAX_CALLS_PER_INSTANCE", 4),
+            ),
+        )
+        self._clock = clock
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    # -- catalog -----------------------------------------------------------
+
+    def _due(self, entry: _Entry, now: float) -> bool:
+        return entry.client is None or now >= entry.next_check
+
+    async def _refresh(
+        self,
+        entry: _Entry,
+        *,
+        client_factory: ClientFactory,
+        log: logging.Logger,
+        context: str,
+    ) -> None:
+        initial = entry.client is None
+        configs = {entry.server_name: entry.config}
+        try:
+            # A health-check refresh must not stall the turn on cold-start
+            # retries; the last good catalog keeps serving meanwhile.
+            client = await connect_mcp_client_with_retries(
+                configs,
+                client_factory=client_factory,
+                logger=log,
+                context=context,
+                **({} if initial else {"max_attempts": 1, "retry_empty_tools": False}),
+            )
+            tools = list(client.get_server_tools(entry.server_name))
+            if not initial and not tools and entry.tools:
+                await _close_client(client, log)
+                raise RuntimeError("refresh returned 0 tool(s)")
+        except BaseException as exc:
+            with self._lock:
+                entry.next_check = self._clock() + self._retry_seconds
+            if initial or not isinstance(exc, Exception):
+                raise
+            log.warning(
+                "[mcp] Pool health check failed for server %s (%s); serving the "
+                "cached catalog and retrying in %.0fs",
+                entry.server_name,
+                exc,
+                self._retry_seconds,
+            )
+            return
+
+        with self._lock:
+            previous = entry.client
+            entry.client = client
+            entry.tools = tools
+            entry.generation += 1
+            entry.checked_at = self._clock()
+            entry.next_check = entry.checked_at + self._catalog_ttl
+        if previous is not None:
+            # Tools wrapped by the previous client keep working after close():
+            # ephemeral-mode clients retain the server config for per-call
+            # sessions, so instances still holding them are unaffected.
+            await _close_client(previous, log)
+
+    async def acquire(
+        self,
+        holder: str,
+        server_name: str,
+        server_cfg: Mapping[str, Any],
+        *,
+        client_factory: ClientFactory,
+        logger: logging.Logger | None = None,
+        context: str = "instance",
+    ) -> PooledServer:
+        """Reference the pooled entry for ``server_cfg`` on behalf of
+        ``holder``, connecting or refreshing it when its catalog is due."""
+        log = logger or logging.getLogger(__name__)
+        key = server_pool_key(server_name, server_cfg)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(key, server_name, dict(server_cfg))
+                self._entries[key] = entry
+            pending = entry.pending
+            leader = pending is None and self._due(entry, self._clock())
+            if leader:
+                pending = entry.pending = concurrent.futures.Future()
+
+        if leader:
+            try:
+                await self._refresh(
+                    entry, client_factory=client_factory, log=log, context=context
+                )
+            except BaseException as exc:
+                with self._lock:
+                    entry.pending = None
+                    if entry.client is None and not entry.holders:
+                        self._entries.pop(key, None)
+                pending.set_exception(exc)
+                raise
+            with self._lock:
+                entry.pending = None
+            pending.set_result(None)
+        elif pending is not None:
+            await asyncio.wrap_future(pending)
+
+        with self._lock:
+            if entry.client is None:
+                raise RuntimeError(f"MCP server {server_name} is not connected")
+            entry.holders[holder] = entry.generation
+            entry.idle_since = None
+            return PooledServer(key, server_name, list(entry.tools), entry.generation)
+
+    async def acquire_many(
+        self,
+        holder: str,
+        configs: Mapping[str, Mapping[str, Any]],
+        *,
+        client_factory: ClientFactory,
+        logger: logging.Logger | None = None,
+        context: str = "instance",
+    ) -> dict[str, PooledServer]:
+        """Acquire every server in ``configs`` concurrently. On failure the
+        entries newly referenced by this call are released and the first
+        error is raised."""
+        with self._lock:
+            already_held = {
+                key for key, entry in self._entries.items() if holder in entry.holders
+            }
+        names = list(configs)
+        results = await asyncio.gather(
+            *(
+                self.acquire(
+                    holder,
+                    name,
+                    configs.get(name) or {},
+                    client_factory=client_factory,
+                    logger=logger,
+                    context=f"{context} server {name}",
+                )
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await self.release(
+                holder,
+                [
+                    r.key
+                    for r in results
+                    if isinstance(r, PooledServer) and r.key not in already_held
+                ],
+            )
+            raise errors[0]
+        return dict(zip(names, results))
+
+    def is_current(self, holder: str, keys: Iterable[str]) -> bool:
+        """True when ``holder`` already has the latest catalog of every entry
+        and none of them is due for a health check."""
+        now = self._clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if (
+                    entry is None
+                    or entry.holders.get(holder) != entry.generation
+                    or self._due(entry, now)
+                ):
+                    return False
+        return True
+
+    def mark_unhealthy(self, key: str | None) -> None:
+        """Run the next health check (reconnect + ``tools/list``) for ``key``
+        on its next acquire instead of waiting for the catalog TTL."""
+        with self._lock:
+            entry = self._entries.get(key or "")
+            if entry is not None:
+                entry.next_check = min(entry.next_check, self._clock())
+
+    async def release(self, holder: str, keys: Iterable[str]) -> None:
+        """Drop ``holder``'s references; idle entries past their grace period
+        are closed."""
+        now = self._clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                entry.holders.pop(holder, None)
+                if not entry.holders and entry.idle_since is None:
+                    entry.idle_since = now
+            expired = [
+                entry
+                for entry in self._entries.values()
+                if not entry.holders
+                and entry.pending is None
+                and entry.idle_since is not None
+                and now - entry.idle_since >= self._idle_seconds
+            ]
+            for entry in expired:
+                self._entries.pop(entry.key, None)
+        for entry in expired:
+            if entry.client is not None:
+                await _close_client(entry.client, logger)
+
+    # -- calls -------------------------------------------------------------
+
+    def _try_take_slot(self, entry: _Entry, holder: str) -> bool:
+        with self._lock:
+            mine = entry.in_flight_by_holder.get(holder, 0)
+            if entry.in_flight >= self._max_calls or mine >= self._max_calls_per_holder:
+                return False
+            entry.in_flight += 1
+            entry.in_flight_by_holder[holder] = mine + 1
+            return True
+
+    def _give_slot(self, entry: _Entry, holder: str) -> None:
+        with self._lock:
+            entry.in_flight -= 1
+            mine = entry.in_flight_by_holder.get(holder, 1) - 1
+            if mine > 0:
+                entry.in_flight_by_holder[holder] = mine
+            else:
+                entry.in_flight_by_holder.pop(holder, None)
+
+    @asynccontextmanager
+    async def call_slot(self, key: str | None, holder: str) -> AsyncIterator[None]:
+        """Hold one of the server's call slots for the duration of a tool call."""
+        with self._lock:
+            entry = self._entries.get(key or "")
+        if entry is None:
+            yield
+            return
+        delay = 0.002
+        while not self._try_take_slot(entry, holder):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        try:
+            yield
+        finally:
+            self._give_slot(entry, holder)
+
+
+MCP_SESSION_POOL = MCPSessionPool()
@@ -14,6 +14,7 @@ from typing import Any
 from urllib.error import HTTPError
 import urllib.request
 
+from src import llm_http, llm_stream
 from src.provider_conformance import (
     build_llm_chat_response,
     ensure_chat_completions_history,
@@ -256,7 +257,9 @@ def _make_nvidia_request(
         data=json.dumps(body).encode("utf-8"),
         headers={
             **auth_headers,
-            "Accept": "application/json",
+            "Accept": (
+                "text/event-stream" if body.get("stream") else "application/json"
+            ),
             "Content-Type": "application/json",
         },
         method="POST",
@@ -351,8 +354,11 @@ def _call_nvidia_chat(
         "model": model,
         "messages": messages,
         "max_tokens": output_cap,
-        "stream": False,
+        "stream": llm_stream.provider_streaming_enabled(),
     }
+    if request_body["stream"]:
+        # The final chunk then carries token usage (src/llm_stream.py).
+        request_body["stream_options"] = {"include_usage": True}
     if converted_tools:
         request_body["tools"] = converted_tools
         if tool_choice in (None, "", "auto"):
@@ -392,8 +398,13 @@ def _call_nvidia_chat(
         auth_mode,
     )
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = json.loads(resp.read() or b"{}")
+        with llm_http.urlopen(req, timeout=timeout) as resp:
+            data, stream_ttft_ms = llm_stream.read_chat_completion_stream(
+                resp,
+                provider="NVIDIA",
+                idle_timeout_seconds=timeout,
+                request_started_at=llm_start,
+            )
     except HTTPError as exc:
         detail = exc.read().decode("utf-8", errors="replace")
         elapsed = (_time.monotonic() - llm_start) * 1000.0
@@ -421,6 +432,8 @@ def _call_nvidia_chat(
     content, tool_calls, finish_reason = _extract_nvidia_response(data)
     usage = data.get("usage") if isinstance(data.get("usage"), dict) else {}
     duration_ms = (_time.monotonic() - llm_start) * 1000.0
+    # Real time-to-first-token when the body streamed; a JSON body has none.
+    effective_ttft_ms = stream_ttft_ms if stream_ttft_ms is not None else duration_ms
     if llm_span is not None:
         try:
             from src.telemetry import end_llm_request_span, record_tokens
@@ -437,7 +450,7 @@ def _call_nvidia_chat(
                 output_tokens=output_tokens or None,
                 success=True,
                 has_tool_call=bool(tool_calls),
-                ttft_ms=duration_ms,
+                ttft_ms=effective_ttft_ms,
                 model_output=content or None,
             )
             record_tokens(type_="input", count=input_tokens, model=model)
@@ -448,7 +461,7 @@ def _call_nvidia_chat(
     _publish_llm_usage(
         model=model,
         usage=usage,
-        ttft_ms=duration_ms,
+        ttft_ms=effective_ttft_ms,
         duration_ms=duration_ms,
         success=True,
     )
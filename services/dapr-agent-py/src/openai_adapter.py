@@ -9,6 +9,7 @@ from typing import Any
 from urllib.error import HTTPError
 import urllib.request
 
+from src import llm_http, llm_stream
 from src.instruction_bundle import SYSTEM_PROMPT_DYNAMIC_BOUNDARY
 from src.provider_conformance import (
     build_llm_chat_response,
@@ -330,7 +331,9 @@ def _make_openai_request(
         data=json.dumps(body).encode(),
         headers={
             **auth_headers,
-            "Accept": "application/json",
+            "Accept": (
+                "text/event-stream" if body.get("stream") else "application/json"
+            ),
             "Content-Type": "application/json",
         },
         method="POST",
@@ -596,6 +599,10 @@ def _call_openai_responses(
 
     url = os.environ.get("OPENAI_RESPONSES_URL", "https://api.openai.com/v1/responses")
     timeout = int(os.environ.get("OPENAI_RESPONSES_TIMEOUT_SECONDS", "180"))
+    if llm_stream.provider_streaming_enabled():
+        # Stream so the UI sees deltas and ttft_ms is the real first token;
+        # response.completed carries the same body as the non-stream call.
+        request_body["stream"] = True
     req = _make_openai_request(url, request_body, request_headers)
     logger.info(
         "[openai-responses] Calling %s with %d messages, %d tools, auth=%s",
@@ -604,9 +611,15 @@ def _call_openai_responses(
         len(converted_tools or []),
         auth_mode,
     )
+    stream_ttft_ms: float | None = None
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            data = json.loads(resp.read() or b"{}")
+        with llm_http.urlopen(req, timeout=timeout) as resp:
+            data, stream_ttft_ms = llm_stream.read_responses_stream(
+                resp,
+                provider="OpenAI Responses",
+                idle_timeout_seconds=timeout,
+                request_started_at=llm_start,
+            )
     except HTTPError as exc:
         detail = exc.read().decode("utf-8", errors="replace")
         _publish_llm_usage(
@@ -665,7 +678,7 @@ def _call_openai_responses(
                 cache_read_tokens=cache_read or None,
                 success=True,
                 has_tool_call=bool(tool_calls),
-                ttft_ms=duration_ms,
+                ttft_ms=stream_ttft_ms if stream_ttft_ms is not None else duration_ms,
                 model_output=content or None,
             )
             record_tokens(type_="input", count=input_tokens, model=model)
@@ -677,7 +690,11 @@ def _call_openai_responses(
     _publish_llm_usage(
         model=model,
         usage=data.get("usage") or {},
-        ttft_ms=(_time.monotonic() - llm_start) * 1000.0,
+        ttft_ms=(
+            stream_ttft_ms
+            if stream_ttft_ms is not None
+            else (_time.monotonic() - llm_start) * 1000.0
+        ),
         duration_ms=(_time.monotonic() - llm_start) * 1000.0,
         success=True,
         prompt_cache_telemetry=prompt_cache_telemetry,
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import base64
+import collections
+import functools
+import hashlib
 import json
 import logging
 import os
 import posixpath
+import queue
 import shlex
 import contextvars
 import threading
-from textwrap import dedent
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterator
+
+from src import file_ops_agent
 
 if TYPE_CHECKING:
     from openshell import SandboxSession
@@ -19,10 +25,292 @@ SANDBOX_NAME_ENV = "OPENSHELL_SANDBOX_NAME"
 SANDBOX_CWD_ENV = "OPENSHELL_CWD"
 DEFAULT_CWD = "/sandbox"
 DEFAULT_TIMEOUT_SECONDS = 30 * 60
+FILE_OPS_AGENT_ENV = "DAPR_AGENT_PY_FILE_OPS_AGENT"
+FILE_OPS_TIMEOUT_SECONDS = 120
+# read_bytes_base64: files up to this size come back in the first response;
+# larger ones are pulled in raw byte ranges of _READ_BYTES_CHUNK.
+_READ_BYTES_FAST_THRESHOLD = 256 * 1024
+_READ_BYTES_CHUNK = 384 * 1024
+# Request keys that carry sandbox paths (resolved against the runtime cwd).
+_FILE_OP_PATH_KEYS = ("path", "search_dir")
+# Single-line bootstrap (OpenShell argv cannot carry newlines): read the agent
+# source as one length-prefixed block from stdin, then serve frames on the
+# rest of the same stream.
+_FILE_OPS_BOOTSTRAP = (
+    "import sys;_i=sys.stdin.buffer;_s=_i.read(int(_i.readline()));"
+    "_n={'__name__':'file_ops_agent'};"
+    "exec(compile(_s,'file_ops_agent.py','exec'),_n);"
+    "_n['serve'](_i,sys.stdout.buffer)"
+)
+# One-shot execs reuse a copy of the agent installed in the sandbox by the
+# first one instead of re-sending its source every call. A missing copy (new
+# sandbox, /tmp wiped) exits with _FILE_OPS_AGENT_MISSING and is re-shipped.
+_FILE_OPS_AGENT_DIR = "/tmp"
+_FILE_OPS_AGENT_MISSING = 75
+# ExecSandboxInteractive stdin messages are capped well below gRPC's 4 MiB
+# default message size.
+_EXEC_STDIN_CHUNK = 1024 * 1024
+# Sandboxes whose file-ops agent state is kept (least recently used evicted).
+_FILE_OPS_AGENTS_MAX = 64
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _file_ops_agent_source() -> str:
+    with open(file_ops_agent.__file__, encoding="utf-8") as handle:
+        return handle.read()
+
+
+def _file_ops_agent_path() -> str:
+    digest = hashlib.sha256(_file_ops_agent_source().encode("utf-8")).hexdigest()[:16]
+    return posixpath.join(_FILE_OPS_AGENT_DIR, f"dapr-agent-py-file-ops-{digest}.py")
+
+
+def _openshell_pb2() -> Any:
+    from openshell._proto import openshell_pb2
+
+    return openshell_pb2
+
+
+def _file_ops_agent_enabled() -> bool:
+    return os.environ.get(FILE_OPS_AGENT_ENV, "true").strip().lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
+
+
+class _FileOpsStream:
+    """Client end of the persistent sandbox file-ops agent.
+
+    Wraps a duplex exec handle (``stdin`` writable / ``stdout`` readable,
+    binary) running ``_FILE_OPS_BOOTSTRAP``; one request frame in, one
+    response frame out. Callers serialize access (see ``_FileOpsAgentSlot``).
+    Every exchange is bounded by ``FILE_OPS_TIMEOUT_SECONDS``, like a one-shot
+    exec; on expiry the handle is closed and ``TimeoutError`` raised.
+    """
+
+    def __init__(self, handle: Any) -> None:
+        self._handle = handle
+        self._seq = 0
+        source = _file_ops_agent_source().encode("utf-8")
+
+        def start() -> dict[str, Any] | None:
+            handle.stdin.write(b"%d\n" % len(source))
+            handle.stdin.write(source)
+            handle.stdin.flush()
+            return file_ops_agent.read_frame(handle.stdout)
+
+        ready = self._exchange(start)
+        if not ready or not ready.get("ready"):
+            raise RuntimeError(f"file-ops agent failed to start: {ready!r}")
+
+    def _exchange(self, fn: Any) -> Any:
+        # The exec stream has no per-read deadline; a timer closing the handle
+        # unblocks a reader stuck on a hung agent.
+        expired = threading.Event()
+
+        def expire() -> None:
+            expired.set()
+            self.close()
+
+        timer = threading.Timer(FILE_OPS_TIMEOUT_SECONDS, expire)
+        timer.daemon = True
+        timer.start()
+        timeout = f"file-ops agent did not answer within {FILE_OPS_TIMEOUT_SECONDS}s"
+        try:
+            result = fn()
+        except Exception as exc:
+            if expired.is_set():
+                raise TimeoutError(timeout) from exc
+            raise
+        finally:
+            timer.cancel()
+        if expired.is_set():
+            raise TimeoutError(timeout)
+        return result
+
+    def request(self, req: dict[str, Any]) -> dict[str, Any]:
+        self._seq += 1
+
+        def send() -> dict[str, Any] | None:
+            file_ops_agent.write_frame(self._handle.stdin, {**req, "id": self._seq})
+            return file_ops_agent.read_frame(self._handle.stdout)
+
+        resp = self._exchange(send)
+        if resp is None or resp.get("id") != self._seq:
+            raise RuntimeError(f"file-ops agent protocol error: {resp!r}")
+        resp.pop("id", None)
+        return resp
+
+    def close(self) -> None:
+        try:
+            self._handle.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+class _InteractiveStdin:
+    """Buffers writes; ``flush`` sends them as ExecSandboxInput stdin messages."""
+
+    def __init__(self, send: Any) -> None:
+        self._send = send
+        self._buf = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buf += data
+        return len(data)
+
+    def flush(self) -> None:
+        data, self._buf = bytes(self._buf), bytearray()
+        for start in range(0, len(data), _EXEC_STDIN_CHUNK):
+            self._send(data[start : start + _EXEC_STDIN_CHUNK])
+
+
+class _InteractiveStdout:
+    """Byte reader over the stdout events of an ExecSandboxInteractive call.
+
+    stderr events are logged; the exit event (or the end of the call) is EOF.
+    gRPC errors propagate to the reader.
+    """
+
+    def __init__(self, events: Iterator[Any]) -> None:
+        self._events = events
+        self._buf = bytearray()
+        self._eof = False
+        self.exit_code: int | None = None
+
+    def _fill(self) -> bool:
+        while not self._eof:
+            event = next(self._events, None)
+            if event is None:
+                self._eof = True
+                break
+            kind = event.WhichOneof("payload")
+            if kind == "stdout" and event.stdout.data:
+                self._buf += event.stdout.data
+                return True
+            if kind == "stderr":
+                logger.debug(
+                    "[file-ops] agent stderr: %s",
+                    bytes(event.stderr.data).decode("utf-8", "replace").rstrip(),
+                )
+            elif kind == "exit":
+                self.exit_code = int(event.exit.exit_code)
+                self._eof = True
+        return False
+
+    def _take(self, size: int) -> bytes:
+        out = bytes(self._buf[:size])
+        del self._buf[:size]
+        return out
+
+    def readline(self) -> bytes:
+        while b"\n" not in self._buf and self._fill():
+            pass
+        end = self._buf.find(b"\n")
+        return self._take(len(self._buf) if end < 0 else end + 1)
+
+    def read(self, size: int) -> bytes:
+        if not self._buf:
+            self._fill()
+        return self._take(size)
+
+
+class _InteractiveExec:
+    """Duplex exec handle over OpenShell's ``ExecSandboxInteractive`` rpc.
+
+    The openshell SDK only wraps the unary ``ExecSandbox`` call, so this
+    drives the bidirectional stub directly: the first request is the
+    ``start`` message, every ``stdin.flush()`` sends one (or more) ``stdin``
+    messages, and ``close()`` ends the request stream and cancels the call.
+    """
+
+    def __init__(
+        self,
+        stub: Any,
+        pb2: Any,
+        sandbox_id: str,
+        argv: list[str],
+        *,
+        timeout_seconds: int,
+    ) -> None:
+        self._pb2 = pb2
+        self._inputs: queue.Queue[Any] = queue.Queue()
+        self._inputs.put(
+            pb2.ExecSandboxInput(
+                start=pb2.ExecSandboxRequest(
+                    sandbox_id=sandbox_id,
+                    command=list(argv),
+                    timeout_seconds=timeout_seconds,
+                )
+            )
+        )
+        self._call = stub.ExecSandboxInteractive(
+            self._requests(), timeout=timeout_seconds + 10
+        )
+        self.stdin = _InteractiveStdin(self._send_stdin)
+        self.stdout = _InteractiveStdout(iter(self._call))
+
+    def _requests(self) -> Iterator[Any]:
+        while (item := self._inputs.get()) is not None:
+            yield item
+
+    def _send_stdin(self, data: bytes) -> None:
+        self._inputs.put(self._pb2.ExecSandboxInput(stdin=data))
+
+    def close(self) -> None:
+        self._inputs.put(None)
+        cancel = getattr(self._call, "cancel", None)
+        if callable(cancel):
+            cancel()
+
+
+class _FileOpsAgentSlot:
+    """File-ops agent state for one sandbox, shared by every runtime bound to
+    it: the persistent stream, the lock serializing its frames, and whether
+    the one-shot agent copy is installed."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.stream: _FileOpsStream | None = None
+        self.unavailable = False
+        self.installed = False
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = None
+        self.unavailable = False
+        self.installed = False
+
+
+_file_ops_agents: collections.OrderedDict[str, _FileOpsAgentSlot] = collections.OrderedDict()
+_file_ops_agents_lock = threading.Lock()
+
+
+def _file_ops_agent_slot(sandbox_name: str) -> _FileOpsAgentSlot:
+    with _file_ops_agents_lock:
+        slot = _file_ops_agents.get(sandbox_name)
+        if slot is None:
+            slot = _file_ops_agents[sandbox_name] = _FileOpsAgentSlot()
+        _file_ops_agents.move_to_end(sandbox_name)
+        evicted = []
+        while len(_file_ops_agents) > _FILE_OPS_AGENTS_MAX:
+            evicted.append(_file_ops_agents.popitem(last=False)[1])
+    for old in evicted:
+        # An evicted slot still in use keeps its stream until that caller's
+        # next failure; only idle ones are closed here.
+        if old.lock.acquire(blocking=False):
+            try:
+                old.close()
+            finally:
+                old.lock.release()
+    return slot
+
+
 def _sandbox_bash_prelude() -> str:
     return (
         'if [ -d /sandbox/.venv/bin ]; then\n'
@@ -200,309 +488,248 @@ class OpenShellRuntime:
             timeout_seconds=timeout_seconds,
         )
 
+    # -- file ops ----------------------------------------------------------
+    #
+    # Every file primitive is a request to the file-ops agent
+    # (src/file_ops_agent.py). Over ExecSandboxInteractive the agent is ONE
+    # long-lived process per sandbox answering framed requests for every
+    # runtime bound to it; without one each batch costs a single python3 exec
+    # (never one per primitive).
+
+    def file_ops(self, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Run file-op requests in order in one round-trip; one result each."""
+        resolved = [self._resolve_file_op(req) for req in requests]
+        if not resolved:
+            return []
+        self._ensure_session()
+        slot = _file_ops_agent_slot(self._sandbox_name or "")
+        if _file_ops_agent_enabled():
+            results = self._file_ops_via_stream(slot, resolved)
+            if results is not None:
+                return results
+        return self._file_ops_one_shot(slot, resolved)
+
+    def file_op(self, op: str, **args: Any) -> dict[str, Any]:
+        return self.file_ops([{"op": op, **args}])[0]
+
+    def _resolve_file_op(self, req: dict[str, Any]) -> dict[str, Any]:
+        out = dict(req)
+        for key in _FILE_OP_PATH_KEYS:
+            if isinstance(out.get(key), str):
+                out[key] = self.resolve_path(out[key])
+        if out.get("op") == "batch":
+            out["requests"] = [self._resolve_file_op(r) for r in out.get("requests") or []]
+        return out
+
+    def _open_file_ops_stream(self) -> Any | None:
+        """Duplex exec handle running the agent bootstrap, or None when the
+        OpenShell client cannot provide one (one-shot fallback)."""
+        session = self._ensure_session()
+        # SandboxSession has no public handle on the gRPC stub; reuse the
+        # client's channel rather than opening a second mTLS connection.
+        stub = getattr(getattr(session, "_client", None), "_stub", None)
+        if stub is None or not hasattr(stub, "ExecSandboxInteractive"):
+            return None
+        try:
+            pb2 = _openshell_pb2()
+        except ImportError:
+            return None
+        return _InteractiveExec(
+            stub,
+            pb2,
+            session.id,
+            ["python3", "-u", "-c", _FILE_OPS_BOOTSTRAP],
+            timeout_seconds=DEFAULT_TIMEOUT_SECONDS,
+        )
+
+    def _file_ops_via_stream(
+        self, slot: _FileOpsAgentSlot, requests: list[dict[str, Any]]
+    ) -> list[dict[str, Any]] | None:
+        if slot.unavailable:
+            return None
+        with slot.lock:
+            opening = slot.stream is None
+            try:
+                if opening:
+                    handle = self._open_file_ops_stream()
+                    if handle is None:
+                        slot.unavailable = True
+                        return None
+                    slot.stream = _FileOpsStream(handle)
+                if len(requests) == 1:
+                    return [slot.stream.request(requests[0])]
+                resp = slot.stream.request({"op": "batch", "requests": requests})
+                return list(resp.get("results") or [])
+            except Exception as exc:  # noqa: BLE001 — stream is an optimization
+                logger.warning("[file-ops] agent stream failed, using one-shot: %s", exc)
+                # A stream that never came up is not re-bootstrapped on every
+                # call (a sandbox switch retries); an established one that
+                # dropped or timed out (deadline, agent exit, hung request) is
+                # torn down and reopened next time.
+                slot.unavailable = slot.stream is None
+                if slot.stream is not None:
+                    slot.stream.close()
+                slot.stream = None
+                return None
+
+    def _close_file_ops_stream(self) -> None:
+        slot = _file_ops_agent_slot(self._sandbox_name or "")
+        with slot.lock:
+            slot.close()
+
+    def _file_ops_one_shot(
+        self, slot: _FileOpsAgentSlot, requests: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        payload_json = json.dumps({"requests": requests})
+        path = _file_ops_agent_path()
+        if slot.installed:
+            script = (
+                "import sys\n"
+                f"try:\n    _src = open({path!r}, encoding='utf-8').read()\n"
+                f"except OSError:\n    sys.exit({_FILE_OPS_AGENT_MISSING})\n"
+                "exec(compile(_src, 'file_ops_agent.py', 'exec'))\n"
+                f"run_once({payload_json!r})\n"
+            )
+        else:
+            # Ships the source once and installs it (atomically) for the
+            # next calls; "installed" reports whether the copy landed.
+            script = (
+                "import os as _os\n"
+                f"_src = {_file_ops_agent_source()!r}\n"
+                "exec(compile(_src, 'file_ops_agent.py', 'exec'))\n"
+                f"_tmp = {path!r} + '.%d' % _os.getpid()\n"
+                "try:\n"
+                "    with open(_tmp, 'w', encoding='utf-8') as _f:\n"
+                "        _f.write(_src)\n"
+                f"    _os.replace(_tmp, {path!r})\n"
+                "    _installed = True\n"
+                "except OSError:\n"
+                "    _installed = False\n"
+                f"print(json.dumps({{**_op_batch(json.loads({payload_json!r})), "
+                "'installed': _installed}))\n"
+            )
+        raw = self._exec(
+            ["python3"],
+            stdin=script.encode("utf-8"),
+            timeout_seconds=FILE_OPS_TIMEOUT_SECONDS,
+        )
+        if slot.installed and raw.get("exit_code") == _FILE_OPS_AGENT_MISSING:
+            slot.installed = False
+            return self._file_ops_one_shot(slot, requests)
+        if not raw["ok"]:
+            return [raw for _ in requests]
+        try:
+            body = json.loads(raw["stdout"])
+            results = body["results"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            invalid = {
+                "ok": False,
+                "error": "invalid_json",
+                "stdout": raw["stdout"],
+                "stderr": raw["stderr"],
+            }
+            return [invalid for _ in requests]
+        if body.get("installed"):
+            slot.installed = True
+        return results
+
     def stat_path(self, path: str) -> dict[str, Any]:
-        script = dedent(
-            """
-            import json, pathlib, sys
-            payload = json.loads(sys.stdin.read())
-            p = pathlib.Path(payload["path"])
-            if not p.exists():
-                print(json.dumps({"ok": True, "exists": False, "path": str(p)}))
-                raise SystemExit(0)
-            st = p.stat()
-            print(json.dumps({
-                "ok": True,
-                "exists": True,
-                "path": str(p),
-                "is_file": p.is_file(),
-                "is_dir": p.is_dir(),
-                "size": st.st_size,
-                "mtime": st.st_mtime,
-            }))
-            """
-        ).strip()
-        return self._json_result(script, {"path": path})
+        return self.file_op("stat", path=path)
 
     def read_file_lines(self, path: str, offset: int, limit: int) -> dict[str, Any]:
-        script = dedent(
-            """
-            import json, pathlib, sys
-            payload = json.loads(sys.stdin.read())
-            p = pathlib.Path(payload["path"])
-            offset = int(payload["offset"])
-            limit = int(payload["limit"])
-            lines_out = []
-            total_lines = 0
-            start_line = 0
-            end_line = 0
-            try:
-                with p.open(encoding="utf-8", errors="replace") as handle:
-                    for line_no, line_text in enumerate(handle, start=1):
-                        total_lines = line_no
-                        if line_no <= offset:
-                            continue
-                        if len(lines_out) >= limit:
-                            continue
-                        if not lines_out:
-                            start_line = line_no
-                        end_line = line_no
-                        lines_out.append(line_text.rstrip("\\n").rstrip("\\r"))
-            except Exception as exc:
-                print(json.dumps({"ok": False, "error": str(exc)}))
-                raise SystemExit(0)
-            print(json.dumps({
-                "ok": True,
-                "lines": lines_out,
-                "total_lines": total_lines,
-                "start_line": start_line,
-                "end_line": end_line,
-            }))
-            """
-        ).strip()
-        return self._json_result(script, {"path": path, "offset": offset, "limit": limit})
+        return self.file_op("read_lines", path=path, offset=offset, limit=limit)
+
+    def read_window(
+        self,
+        path: str,
+        offset: int = 1,
+        limit: int = 1000,
+        *,
+        content: bool = False,
+        guard_bytes: int | None = None,
+    ) -> dict[str, Any]:
+        """Stat, binary sniff, total line count and a line window in ONE op.
+
+        ``offset`` is 1-based (negative = tail). With ``content=True`` the
+        whole file comes back as ``content`` instead of ``lines`` (edit tools).
+        See ``file_ops_agent._op_read_window`` for the full contract.
+        """
+        return self.file_op(
+            "read_window",
+            path=path,
+            offset=offset,
+            limit=limit,
+            content=content,
+            guard_bytes=guard_bytes,
+        )
 
     def read_text(self, path: str) -> dict[str, Any]:
-        script = dedent(
-            """
-            import json, pathlib, sys
-            payload = json.loads(sys.stdin.read())
-            p = pathlib.Path(payload["path"])
-            try:
-                print(json.dumps({"ok": True, "content": p.read_text(encoding="utf-8")}))
-            except Exception as exc:
-                print(json.dumps({"ok": False, "error": str(exc)}))
-            """
-        ).strip()
-        return self._json_result(script, {"path": path})
+        return self.file_op("read_text", path=path)
 
     def write_text(self, path: str, content: str) -> dict[str, Any]:
-        script = dedent(
-            """
-            import json, pathlib, sys
-            payload = json.loads(sys.stdin.read())
-            p = pathlib.Path(payload["path"])
-            try:
-                existed = p.exists()
-                p.parent.mkdir(parents=True, exist_ok=True)
-                p.write_text(payload["content"], encoding="utf-8")
-                print(json.dumps({"ok": True, "existed": existed, "path": str(p)}))
-            except Exception as exc:
-                print(json.dumps({"ok": False, "error": str(exc)}))
-            """
-        ).strip()
-        return self._json_result(script, {"path": path, "content": content})
+        return self.file_op("write_text", path=path, content=content)
 
     def read_bytes_base64(
         self, path: str, max_bytes: int = 100 * 1024 * 1024
     ) -> dict[str, Any]:
         """Read any file in the sandbox and return base64-encoded contents.
-        Handles arbitrarily-large files up to ``max_bytes`` via chunked
-        reads — writes base64 to a sandbox-side temp file, then pulls it
-        back in 512 KB stdout chunks so we don't hit OpenShell's practical
-        throughput cap on a single exec call.
-
-        For small files (<256 KB raw, ~350 KB base64) the fast path returns
-        in one shot. Larger files switch to the chunked path; callers don't
-        need to know which mode fired.
-        """
-        # Fast path: single-shot read for small files
-        fast = self._read_bytes_single_shot(path, max_bytes, fast_threshold=256 * 1024)
-        if fast.get("ok") or fast.get("error") != "use_chunked":
-            return fast
-        # Chunked path: stage base64 to /tmp/<ref>, pull in 512 KB stdout chunks
-        return self._read_bytes_chunked(path, max_bytes)
-
-    def _read_bytes_single_shot(
-        self, path: str, max_bytes: int, fast_threshold: int
-    ) -> dict[str, Any]:
-        script = dedent(
-            """
-            import base64, json, pathlib, sys
-            payload = json.loads(sys.stdin.read())
-            p = pathlib.Path(payload["path"])
-            max_bytes = int(payload["max_bytes"])
-            fast_threshold = int(payload["fast_threshold"])
-            try:
-                if not p.is_file():
-                    print(json.dumps({"ok": False, "error": "not_a_file", "path": str(p)}))
-                    raise SystemExit(0)
-                size = p.stat().st_size
-                if size > max_bytes:
-                    print(json.dumps({
-                        "ok": False,
-                        "error": "too_large",
-                        "size": size,
-                        "max_bytes": max_bytes,
-                    }))
-                    raise SystemExit(0)
-                if size > fast_threshold:
-                    # Let the caller switch to chunked mode.
-                    print(json.dumps({
-                        "ok": False,
-                        "error": "use_chunked",
-                        "size": size,
-                    }))
-                    raise SystemExit(0)
-                with p.open("rb") as handle:
-                    data = handle.read()
-                print(json.dumps({
-                    "ok": True,
-                    "path": str(p),
-                    "size": size,
-                    "base64": base64.b64encode(data).decode("ascii"),
-                }))
-            except SystemExit:
-                raise
-            except Exception as exc:
-                print(json.dumps({"ok": False, "error": str(exc)}))
-            """
-        ).strip()
-        return self._json_result(
-            script,
-            {"path": path, "max_bytes": max_bytes, "fast_threshold": fast_threshold},
-        )
 
-    def _read_bytes_chunked(
-        self, path: str, max_bytes: int
-    ) -> dict[str, Any]:
-        """Stage base64(bytes) to a sandbox temp file, then pull fixed-size
-        stdout chunks back. Chunk size matches a safe stdout payload window.
-        Total time is O(size / chunk_size) round-trips — small for files
-        under a few MB, acceptable for artifacts up to 100 MB.
+        Files up to 256 KB come back in the first response; larger files (up
+        to ``max_bytes``) are pulled in raw byte ranges, one agent request per
+        range, so no single response hits OpenShell's practical throughput
+        cap. Callers don't need to know which mode fired.
         """
-        import uuid
-
-        chunk_size = 512 * 1024  # base64 chars per chunk; ~384 KB raw
-        staging_ref = f"/tmp/wb-upload-{uuid.uuid4().hex}.b64"
-        stage_script = dedent(
-            """
-            import base64, json, pathlib, sys
-            payload = json.loads(sys.stdin.read())
-            src = pathlib.Path(payload["src"])
-            dst = pathlib.Path(payload["dst"])
-            max_bytes = int(payload["max_bytes"])
-            try:
-                if not src.is_file():
-                    print(json.dumps({"ok": False, "error": "not_a_file"}))
-                    raise SystemExit(0)
-                size = src.stat().st_size
-                if size > max_bytes:
-                    print(json.dumps({
-                        "ok": False,
-                        "error": "too_large",
-                        "size": size,
-                        "max_bytes": max_bytes,
-                    }))
-                    raise SystemExit(0)
-                with src.open("rb") as handle:
-                    encoded = base64.b64encode(handle.read())
-                dst.write_bytes(encoded)
-                print(json.dumps({
-                    "ok": True,
-                    "size": size,
-                    "b64_size": len(encoded),
-                    "staging_ref": str(dst),
-                }))
-            except SystemExit:
-                raise
-            except Exception as exc:
-                print(json.dumps({"ok": False, "error": str(exc)}))
-            """
-        ).strip()
-        stage = self._json_result(
-            stage_script,
-            {"src": path, "dst": staging_ref, "max_bytes": max_bytes},
+        first = self.file_op(
+            "read_bytes", path=path, max_bytes=max_bytes, length=_READ_BYTES_FAST_THRESHOLD
         )
-        if not stage.get("ok"):
-            return stage
-
-        b64_size = int(stage["b64_size"])
-        chunks: list[str] = []
-        offset = 0
-        while offset < b64_size:
-            chunk_end = min(offset + chunk_size, b64_size)
-            read_script = dedent(
-                """
-                import json, pathlib, sys
-                payload = json.loads(sys.stdin.read())
-                p = pathlib.Path(payload["path"])
-                start = int(payload["start"])
-                end = int(payload["end"])
-                with p.open("rb") as handle:
-                    handle.seek(start)
-                    data = handle.read(end - start)
-                print(json.dumps({"ok": True, "chunk": data.decode("ascii")}))
-                """
-            ).strip()
-            chunk_res = self._json_result(
-                read_script,
-                {"path": staging_ref, "start": offset, "end": chunk_end},
+        if not first.get("ok"):
+            return first
+        size = int(first["size"])
+        data = base64.b64decode(first["base64"])
+        while len(data) < size:
+            chunk = self.file_op(
+                "read_bytes",
+                path=path,
+                max_bytes=max_bytes,
+                offset=len(data),
+                length=_READ_BYTES_CHUNK,
             )
-            if not chunk_res.get("ok"):
-                # Clean up the staging file before returning the error.
-                self._exec(
-                    ["rm", "-f", staging_ref],
-                    timeout_seconds=10,
-                )
-                return chunk_res
-            chunks.append(chunk_res["chunk"])
-            offset = chunk_end
-
-        # Remove staging file; fire-and-forget, chunks are already in memory.
-        self._exec(["rm", "-f", staging_ref], timeout_seconds=10)
-
+            if not chunk.get("ok"):
+                return chunk
+            piece = base64.b64decode(chunk["base64"])
+            if not piece:
+                break  # file shrank underneath us; return what exists
+            data += piece
         return {
             "ok": True,
-            "path": path,
-            "size": int(stage["size"]),
-            "base64": "".join(chunks),
+            "path": first["path"],
+            "size": size,
+            "base64": base64.b64encode(data).decode("ascii"),
         }
 
     def glob_files(self, pattern: str, search_dir: str, max_results: int) -> dict[str, Any]:
-        script = dedent(
-            """
-            import json, pathlib, sys
-            payload = json.loads(sys.stdin.read())
-            search_path = pathlib.Path(payload["search_dir"])
-            pattern = payload["pattern"]
-            if not search_path.is_dir():
-                print(json.dumps({"ok": False, "error": "directory_not_found", "path": str(search_path)}))
-                raise SystemExit(0)
-            try:
-                files = [p for p in search_path.glob(pattern) if p.is_file()]
-                files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-                total = len(files)
-                files = files[: int(payload["max_results"])]
-                print(json.dumps({
-                    "ok": True,
-                    "search_dir": str(search_path),
-                    "pattern": pattern,
-                    "matches": [str(p) for p in files],
-                    "total": total,
-                }))
-            except Exception as exc:
-                print(json.dumps({"ok": False, "error": str(exc)}))
-            """
-        ).strip()
-        return self._json_result(
-            script,
-            {"pattern": pattern, "search_dir": search_dir, "max_results": max_results},
+        return self.file_op(
+            "glob", pattern=pattern, search_dir=search_dir, max_results=max_results
         )
 
-    def _json_result(self, script: str, payload: dict[str, Any]) -> dict[str, Any]:
-        raw = self.run_python(script, payload)
-        if not raw["ok"]:
-            return raw
-        try:
-            parsed = json.loads(raw["stdout"])
-        except json.JSONDecodeError:
-            return {
-                "ok": False,
-                "error": "invalid_json",
-                "stdout": raw["stdout"],
-                "stderr": raw["stderr"],
-            }
-        return parsed
+    def grep_files(
+        self,
+        pattern: str,
+        search_dir: str,
+        *,
+        include: str | None = None,
+        max_results: int = 100,
+        ignore_case: bool = False,
+    ) -> dict[str, Any]:
+        """Python-regex search (no ripgrep dependency) via the file-ops agent."""
+        return self.file_op(
+            "grep",
+            pattern=pattern,
+            search_dir=search_dir,
+            include=include,
+            max_results=max_results,
+            ignore_case=ignore_case,
+        )
 
 
 WORKSPACE_MODE_ENV = "DAPR_AGENT_PY_WORKSPACE_MODE"
@@ -522,10 +749,10 @@ class LocalWorkspaceRuntime(OpenShellRuntime):
 
     Used when ``DAPR_AGENT_PY_WORKSPACE_MODE=local`` (the JuiceFS-backed
     ``dapr-agent-py-juicefs`` runtime). Only ``_exec`` / ``_ensure_session`` /
-    ``sandbox_name`` differ — every higher-level method (``stat_path``,
-    ``read_file_lines``, ``read_text``, ``write_text``, ``read_bytes_base64``,
-    ``glob_files``) inherits unchanged because it is implemented as a python
-    script run through ``run_python`` → ``_exec``, which now runs locally.
+    ``sandbox_name`` / ``file_ops`` differ — every higher-level file method
+    (``stat_path``, ``read_file_lines``, ``read_text``, ``write_text``,
+    ``read_bytes_base64``, ``glob_files``, ``grep_files``) inherits unchanged
+    because it is a file-ops agent request, which here is served in-process.
     """
 
     def __init__(self) -> None:
@@ -545,6 +772,11 @@ class LocalWorkspaceRuntime(OpenShellRuntime):
         # No remote session in local mode.
         return None
 
+    def file_ops(self, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # Same op interface as the sandbox agent, served in-process: the
+        # workspace is mounted in this pod, so no interpreter spawn at all.
+        return [file_ops_agent.handle(self._resolve_file_op(req)) for req in requests]
+
     def set_cwd(self, cwd: str | None) -> None:  # type: ignore[override]
         # The platform stamps ``/sandbox`` as the fallback cwd on every turn
         # message (agent config, child dispatch, bind_runtime). In local mode
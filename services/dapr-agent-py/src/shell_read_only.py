@@ -0,0 +1,343 @@
+"""Conservative read-only classifier for Bash tool commands.
+
+``tool_batching`` only fans out tool calls that cannot observe each other's
+side effects. Bash used to be excluded wholesale, which serialized common
+exploration turns (``git status``, ``ls``, ``cat package.json``, ``rg foo``).
+This module proves a command read-only or gives up:
+
+- the command is tokenized with POSIX quoting rules, keeping track of which
+  tokens are unquoted operators; anything it cannot tokenize (unbalanced
+  quotes, trailing backslash) is NOT read-only;
+- command substitution, process substitution, subshells/groups, background
+  jobs, here-docs, variable assignments, newlines, ANSI-C / locale quoting
+  (``$'…'``, ``$"…"``) and unquoted ``#`` (comments) are rejected outright —
+  the tokenizer does not model them, so it could misplace an operator;
+- pipelines and ``&&`` / ``||`` / ``;`` lists are allowed when every simple
+  command in them is read-only;
+- output redirection is only allowed to ``/dev/null`` or another fd;
+- every command name must be on an allowlist, and commands with write modes
+  (``sort -o``, ``find -delete``, ``sed -i``, ``git branch -D`` …) have their
+  arguments checked.
+
+False negatives only cost parallelism; false positives could race a write,
+so anything unrecognised is classified as mutating. Dependency-free and pure,
+like ``tool_batching``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable
+
+_LIST_OPERATORS = frozenset({"|", "||", "&&", ";"})
+_OUTPUT_REDIRECTS = frozenset({">", ">>", "&>", ">&", "&>>"})
+_INPUT_REDIRECT = "<"
+_OPERATOR_CHARS = frozenset("();<>|&")
+_SAFE_REDIRECT_TARGET = "/dev/null"
+_FORBIDDEN_SNIPPETS = ("`", "$(", "<(", ">(", "\n", "\r", "<<", "$'", '$"')
+
+# Commands that never write files or spawn other commands, whatever their
+# arguments (or whose write modes are checked in _ARGUMENT_CHECKS below).
+_READ_ONLY_COMMANDS = frozenset(
+    {
+        "[", "arch", "basename", "cat", "cd", "cksum", "cmp", "column", "comm",
+        "cut", "date", "df", "diff", "dirname", "du", "echo", "egrep", "env",
+        "expand", "false", "fgrep", "file", "find", "fold", "free", "git",
+        "grep", "head", "hexdump", "hostname", "id", "jq", "join", "locale",
+        "ls", "md5sum", "nl", "nproc", "od", "paste", "printenv", "printf",
+        "ps", "pwd", "readlink", "realpath", "rev", "rg", "sed", "seq",
+        "sha1sum", "sha256sum", "sha512sum", "sort", "stat", "strings", "tac",
+        "tail", "test", "tr", "tree", "true", "type", "uname", "uniq",
+        "uptime", "wc", "which", "whoami",
+    }
+)
+
+# Toolchains whose only allowed invocation is a bare version probe.
+_VERSION_PROBE_COMMANDS = frozenset(
+    {
+        "bun", "cargo", "deno", "go", "java", "node", "npm", "pip", "pip3",
+        "pnpm", "python", "python3", "ruby", "rustc", "tsc", "uv", "yarn",
+    }
+)
+
+_GIT_READ_ONLY_SUBCOMMANDS = frozenset(
+    {
+        "blame", "cat-file", "count-objects", "describe", "diff", "grep", "log",
+        "ls-files", "ls-remote", "ls-tree", "merge-base", "name-rev",
+        "rev-list", "rev-parse", "shortlog", "show", "show-ref", "status",
+        "whatchanged", "for-each-ref",
+    }
+)
+_GIT_LIST_ONLY_FLAGS = {
+    "branch": frozenset(
+        {"-a", "-r", "-v", "-vv", "--all", "--remotes", "--list", "--show-current",
+         "--verbose", "--no-color", "--color"}
+    ),
+    "tag": frozenset({"-l", "--list", "-n"}),
+    "remote": frozenset({"-v", "--verbose"}),
+    "stash": frozenset({"list"}),
+    "worktree": frozenset({"list", "--porcelain"}),
+    "config": frozenset({"--get", "--get-all", "--list", "-l", "--global", "--local",
+                         "--show-origin"}),
+}
+_GIT_BLOCKED_LONG_OPTIONS = ("--output", "--ext-diff", "--open-files-in-pager")
+_SED_PRINT_SCRIPT = re.compile(r"^\s*(?:(?:\d+|\$)(?:\s*,\s*(?:\d+|\$))?\s*p\s*;?\s*)+$")
+
+
+def _flag_in(args: list[str], *flags: str) -> bool:
+    """True when any arg is one of ``flags`` (``--long=value`` included), a
+    GNU-style abbreviation of a long flag (``--outp`` for ``--output``), or a
+    short-option cluster containing a single-letter flag (``-rf`` ∋ ``-f``)."""
+    for arg in args:
+        if arg == "--":
+            return False
+        name = arg.split("=", 1)[0]
+        for flag in flags:
+            if arg == flag or (flag.startswith("--") and arg.startswith(flag + "=")):
+                return True
+            if flag.startswith("--") and len(name) > 2 and flag.startswith(name):
+                return True
+            if (
+                len(flag) == 2
+                and not arg.startswith("--")
+                and arg.startswith("-")
+                and flag[1] in arg[1:]
+            ):
+                return True
+    return False
+
+
+def _positionals(args: list[str]) -> list[str]:
+    return [a for a in args if not a.startswith("-") or a == "-"]
+
+
+def _options(args: list[str]) -> list[str]:
+    """Arguments before a ``--`` separator that look like options."""
+    end = args.index("--") if "--" in args else len(args)
+    return [a for a in args[:end] if a.startswith("-") and a != "-"]
+
+
+def _git_blocked_option(opt: str) -> bool:
+    """``--output`` writes a file; ``--ext-diff`` and ``grep -O`` /
+    ``--open-files-in-pager`` run programs. git accepts any unique prefix of a
+    long option (``--open``, ``--ext-d``) and attached short values (``-Ocmd``,
+    ``-nO``), so both forms are matched."""
+    if opt.startswith("--"):
+        name = opt.split("=", 1)[0]
+        return any(
+            name.startswith(blocked) or (len(name) > 2 and blocked.startswith(name))
+            for blocked in _GIT_BLOCKED_LONG_OPTIONS
+        )
+    return "O" in opt[1:]
+
+
+def _git_read_only(args: list[str]) -> bool:
+    rest = list(args)
+    # Global options before the subcommand; `-c` can inject aliases/pagers.
+    while rest and rest[0].startswith("-"):
+        opt = rest.pop(0)
+        if opt in ("--no-pager", "--no-optional-locks", "-P"):
+            continue
+        if opt == "-C" and rest:
+            rest.pop(0)
+            continue
+        return False
+    if not rest:
+        return False
+    subcommand, sub_args = rest[0], rest[1:]
+    if any(_git_blocked_option(a) for a in _options(sub_args)):
+        return False
+    if subcommand in _GIT_READ_ONLY_SUBCOMMANDS:
+        return True
+    allowed = _GIT_LIST_ONLY_FLAGS.get(subcommand)
+    if allowed is None:
+        return False
+    if subcommand == "config":
+        # Read forms only: an explicit --get/--list, then at most a key.
+        return bool(sub_args) and sub_args[0] in allowed and all(
+            a in allowed or not a.startswith("-") for a in sub_args
+        ) and len(_positionals(sub_args)) <= 1
+    if subcommand in ("stash", "worktree"):
+        return bool(sub_args) and sub_args[0] == "list" and all(a in allowed for a in sub_args)
+    return all(a in allowed for a in sub_args)
+
+
+def _sed_read_only(args: list[str]) -> bool:
+    scripts: list[str] = []
+    expect_script = False
+    for arg in args:
+        if expect_script:
+            scripts.append(arg)
+            expect_script = False
+        elif arg in ("-n", "-E", "-r", "--quiet", "--silent"):
+            continue
+        elif arg == "-e":
+            expect_script = True
+        elif arg.startswith("-"):
+            return False  # -i / --in-place / -f script files / unknown
+        elif not scripts:
+            scripts.append(arg)
+    return bool(scripts) and not expect_script and all(
+        _SED_PRINT_SCRIPT.match(s) for s in scripts
+    )
+
+
+def _find_read_only(args: list[str]) -> bool:
+    return not any(
+        a in ("-delete", "-exec", "-execdir", "-ok", "-okdir", "-fprint",
+              "-fprint0", "-fprintf", "-fls")
+        for a in args
+    )
+
+
+_ARGUMENT_CHECKS: dict[str, Callable[[list[str]], bool]] = {
+    "date": lambda a: not _flag_in(a, "-s", "--set")
+    and all(p.startswith("+") for p in _positionals(a)),
+    "env": lambda a: not a,  # `env CMD` runs CMD
+    "file": lambda a: not _flag_in(a, "-C", "--compile"),
+    "find": _find_read_only,
+    "git": _git_read_only,
+    "hostname": lambda a: all(p.startswith("-") for p in a)
+    and not _flag_in(a, "-F", "--file"),
+    "rg": lambda a: not _flag_in(a, "--pre"),
+    "sed": _sed_read_only,
+    "sort": lambda a: not _flag_in(a, "-o", "--output", "--compress-program"),
+    "tree": lambda a: not _flag_in(a, "-o", "--output"),
+    "uniq": lambda a: len(_positionals(a)) <= 1,  # `uniq IN OUT` writes OUT
+}
+
+
+def _tokenize(command: str) -> list[tuple[str, bool]] | None:
+    """Split into ``(text, is_operator)`` tokens. Quoted operator characters
+    stay part of their word, so ``grep '|' x`` is one command, not a pipe."""
+    tokens: list[tuple[str, bool]] = []
+    word: list[str] = []
+    in_word = False
+    i, n = 0, len(command)
+
+    def flush() -> None:
+        nonlocal in_word
+        if in_word:
+            tokens.append(("".join(word), False))
+            word.clear()
+            in_word = False
+
+    while i < n:
+        c = command[i]
+        if c in " \t":
+            flush()
+            i += 1
+        elif c in _OPERATOR_CHARS:
+            flush()
+            j = i
+            while j < n and command[j] in _OPERATOR_CHARS:
+                j += 1
+            tokens.append((command[i:j], True))
+            i = j
+        elif c == "'":
+            end = command.find("'", i + 1)
+            if end < 0:
+                return None
+            word.append(command[i + 1 : end])
+            in_word = True
+            i = end + 1
+        elif c == '"':
+            j = i + 1
+            while j < n and command[j] != '"':
+                if command[j] == "\\" and j + 1 < n and command[j + 1] in '$`"\\':
+                    j += 1
+                word.append(command[j])
+                j += 1
+            if j >= n:
+                return None
+            in_word = True
+            i = j + 1
+        elif c == "#":
+            return None  # a comment would hide the rest of the line from bash
+        elif c == "\\":
+            if i + 1 >= n:
+                return None
+            word.append(command[i + 1])
+            in_word = True
+            i += 2
+        else:
+            word.append(c)
+            in_word = True
+            i += 1
+    flush()
+    return tokens
+
+
+def _simple_command_read_only(words: list[str]) -> bool:
+    if not words:
+        return False
+    name, args = words[0], words[1:]
+    if "=" in name or "/" in name:
+        return False  # assignment prefix or an explicit script/binary path
+    if name in _VERSION_PROBE_COMMANDS:
+        return args in (["--version"], ["-V"], ["version"])
+    if name not in _READ_ONLY_COMMANDS:
+        return False
+    check = _ARGUMENT_CHECKS.get(name)
+    return check is None or check(args)
+
+
+def is_read_only_command(command: str) -> bool:
+    """Return True only when ``command`` provably has no side effects beyond
+    its own output (no file writes, no mutating binaries, no subshells)."""
+    if not command or not command.strip():
+        return False
+    if any(snippet in command for snippet in _FORBIDDEN_SNIPPETS):
+        return False
+    tokens = _tokenize(command)
+    if not tokens:
+        return False
+
+    # An fd prefix such as the `2` in `2>/dev/null` stays in the argument
+    # list; that only ever makes the argument checks stricter.
+    words: list[str] = []
+    i = 0
+    while i < len(tokens):
+        token, is_operator = tokens[i]
+        if not is_operator:
+            words.append(token)
+        elif token in _LIST_OPERATORS:
+            if not _simple_command_read_only(words):
+                return False
+            words = []
+        elif token in _OUTPUT_REDIRECTS or token == _INPUT_REDIRECT:
+            if i + 1 >= len(tokens) or tokens[i + 1][1]:
+                return False
+            target = tokens[i + 1][0]
+            if token != _INPUT_REDIRECT and not (
+                target == _SAFE_REDIRECT_TARGET
+                or (token == ">&" and (target.isdigit() or target == "-"))
+            ):
+                return False
+            i += 1
+        else:
+            return False  # subshell, background job, or unknown operator
+        i += 1
+    return _simple_command_read_only(words)
+
+
+_BASH_TOOL_NAMES = frozenset({"bash", "bash_run"})
+
+
+def bash_tool_call_read_only(tool_name: str, arguments: Any) -> bool:
+    """True for a Bash tool call whose ``command`` argument is read-only.
+
+    ``arguments`` is the raw tool-call payload (JSON string or dict).
+    """
+    if (tool_name or "").strip().lower() not in _BASH_TOOL_NAMES:
+        return False
+    if isinstance(arguments, str):
+        try:
+            arguments = json.loads(arguments) if arguments else {}
+        except json.JSONDecodeError:
+            return False
+    if not isinstance(arguments, dict):
+        return False
+    command = arguments.get("command")
+    return isinstance(command, str) and is_read_only_command(command)
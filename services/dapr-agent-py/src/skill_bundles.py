@@ -0,0 +1,255 @@
+"""Content-addressed skill package delivery into the OpenShell sandbox.
+
+Skill packages (SKILL.md plus references/scripts) arrive through agentConfig
+and used to be written with one ``runtime.write_text`` round-trip per file, for
+every new instance, even when the bundle was byte-identical to one the sandbox
+already had. Instead:
+
+- each package is keyed by :func:`capability_compiler.skill_package_digest`
+  over its compiled entries and packed ONCE per pod into a deterministic
+  tar.gz (``PACKED_SKILL_BUNDLES``, an LRU keyed by that digest);
+- the sandbox keeps a content-addressed store
+  (``/sandbox/.workflow-builder/skill-store/<digest>/``); a package is unpacked
+  there at most once and each instance's package dir is a local copy of it;
+- every package for a session goes through ONE ``run_python`` exec
+  (``SKILL_STORE_SCRIPT``). Tars are only attached for digests this pod has
+  not seen in that sandbox; if the store was lost anyway, the missing ones are
+  re-sent in a second exec.
+
+Packages that still fail fall back to the per-file ``write_text`` path.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections import OrderedDict
+import io
+import json
+import logging
+import os
+import posixpath
+import tarfile
+import threading
+from textwrap import dedent
+from typing import Any, NamedTuple
+
+from src.capability_compiler import skill_package_digest
+
+logger = logging.getLogger(__name__)
+
+SKILL_STORE_ROOT = "/sandbox/.workflow-builder/skill-store"
+_BUNDLE_CACHE_SIZE = int(os.environ.get("DAPR_AGENT_PY_SKILL_BUNDLE_CACHE_SIZE", "256"))
+# Keep each exec's stdin payload well under OpenShell's practical limits.
+_EXEC_MAX_TAR_BYTES = int(os.environ.get("DAPR_AGENT_PY_SKILL_BUNDLE_EXEC_MAX_BYTES", str(4 * 1024 * 1024)))
+_SCRIPT_TIMEOUT_SECONDS = 120
+
+SKILL_STORE_SCRIPT = dedent(
+    r"""
+    import base64, io, json, os, shutil, sys, tarfile
+
+    payload = json.loads(sys.stdin.read() or "{}")
+    store = payload["storeRoot"]
+    results = {}
+
+    def unpack(tar_b64, dest):
+        with tarfile.open(fileobj=io.BytesIO(base64.b64decode(tar_b64)), mode="r:gz") as tar:
+            for member in tar.getmembers():
+                name = os.path.normpath(member.name)
+                if not member.isfile() or os.path.isabs(name) or name.split(os.sep)[0] == "..":
+                    raise ValueError("unsafe bundle member: " + member.name)
+                target = os.path.join(dest, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with tar.extractfile(member) as src, open(target, "wb") as out:
+                    shutil.copyfileobj(src, out)
+
+    for pkg in payload.get("packages") or []:
+        digest, target = pkg["digest"], pkg["dir"]
+        source = os.path.join(store, digest)
+        complete = os.path.join(source, ".complete")
+        try:
+            if not os.path.isfile(complete):
+                if not pkg.get("tar"):
+                    results[target] = "missing"
+                    continue
+                staging = "%s.tmp-%d" % (source, os.getpid())
+                shutil.rmtree(staging, ignore_errors=True)
+                unpack(pkg["tar"], staging)
+                with open(os.path.join(staging, ".complete"), "w") as fh:
+                    fh.write(digest)
+                shutil.rmtree(source, ignore_errors=True)
+                os.makedirs(store, exist_ok=True)
+                os.rename(staging, source)
+            shutil.rmtree(target, ignore_errors=True)
+            shutil.copytree(source, target, ignore=shutil.ignore_patterns(".complete"))
+            results[target] = "ok"
+        except Exception as exc:
+            results[target] = "error: %s" % exc
+
+    print(json.dumps({"results": results}))
+    """
+).strip()
+
+
+class SkillPackage(NamedTuple):
+    """One compiled skill package bound for ``target_dir`` in the sandbox."""
+
+    skill_name: str
+    target_dir: str
+    entries: list[dict[str, str]]
+    digest: str
+
+
+def skill_package(skill_name: str, target_dir: str, entries: list[dict[str, str]]) -> SkillPackage:
+    return SkillPackage(skill_name, target_dir, entries, skill_package_digest(entries))
+
+
+def pack_skill_package(entries: list[dict[str, str]]) -> bytes:
+    """Deterministic tar.gz of the package entries (sorted, zeroed metadata)."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", format=tarfile.PAX_FORMAT) as tar:
+        for entry in sorted(entries, key=lambda e: e["path"]):
+            data = entry["content"].encode("utf-8")
+            info = tarfile.TarInfo(entry["path"])
+            info.size = len(data)
+            info.mode = 0o644
+            info.mtime = 0
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class SkillBundleCache:
+    """Pod-local LRU of packed bundles keyed by package digest, plus a record
+    of which digests each sandbox is known to hold."""
+
+    def __init__(self, max_entries: int = _BUNDLE_CACHE_SIZE) -> None:
+        self._max_entries = max(1, max_entries)
+        self._bundles: OrderedDict[str, str] = OrderedDict()
+        self._in_sandbox: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.packs = 0
+
+    def bundle_b64(self, package: SkillPackage) -> str:
+        with self._lock:
+            cached = self._bundles.get(package.digest)
+            if cached is not None:
+                self._bundles.move_to_end(package.digest)
+                return cached
+        packed = base64.b64encode(pack_skill_package(package.entries)).decode("ascii")
+        with self._lock:
+            self.packs += 1
+            self._bundles[package.digest] = packed
+            while len(self._bundles) > self._max_entries:
+                self._bundles.popitem(last=False)
+        return packed
+
+    def known_in_sandbox(self, sandbox: str, digest: str) -> bool:
+        with self._lock:
+            return (sandbox, digest) in self._in_sandbox
+
+    def mark_in_sandbox(self, sandbox: str, digest: str) -> None:
+        with self._lock:
+            self._in_sandbox[(sandbox, digest)] = None
+            self._in_sandbox.move_to_end((sandbox, digest))
+            while len(self._in_sandbox) > self._max_entries * 4:
+                self._in_sandbox.popitem(last=False)
+
+    def forget_sandbox(self, sandbox: str, digest: str) -> None:
+        with self._lock:
+            self._in_sandbox.pop((sandbox, digest), None)
+
+
+PACKED_SKILL_BUNDLES = SkillBundleCache()
+
+
+def _run_store_script(runtime: Any, packages: list[dict[str, Any]]) -> dict[str, str]:
+    result = runtime.run_python(
+        SKILL_STORE_SCRIPT,
+        {"storeRoot": SKILL_STORE_ROOT, "packages": packages},
+        timeout_seconds=_SCRIPT_TIMEOUT_SECONDS,
+    )
+    output = str(result.get("stdout") or "").strip()
+    if not output:
+        raise RuntimeError(str(result.get("output") or result.get("stderr") or "no output")[:500])
+    parsed = json.loads(output.splitlines()[-1])
+    return {str(k): str(v) for k, v in (parsed.get("results") or {}).items()}
+
+
+def _exec_batches(items: list[tuple[SkillPackage, str | None]]) -> list[list[tuple[SkillPackage, str | None]]]:
+    batches: list[list[tuple[SkillPackage, str | None]]] = [[]]
+    size = 0
+    for package, tar_b64 in items:
+        weight = len(tar_b64 or "")
+        if batches[-1] and size + weight > _EXEC_MAX_TAR_BYTES:
+            batches.append([])
+            size = 0
+        batches[-1].append((package, tar_b64))
+        size += weight
+    return batches
+
+
+def _ship(runtime: Any, items: list[tuple[SkillPackage, str | None]]) -> dict[str, str]:
+    statuses: dict[str, str] = {}
+    for batch in _exec_batches(items):
+        payload = [
+            {"digest": package.digest, "dir": package.target_dir, **({"tar": tar_b64} if tar_b64 else {})}
+            for package, tar_b64 in batch
+        ]
+        try:
+            statuses.update(_run_store_script(runtime, payload))
+        except Exception as exc:  # noqa: BLE001
+            for package, _ in batch:
+                statuses[package.target_dir] = f"error: {exc}"
+    return statuses
+
+
+def write_skill_package_files(runtime: Any, package: SkillPackage) -> list[str]:
+    """Per-file delivery (one ``write_text`` each); returns the error messages."""
+    errors: list[str] = []
+    for entry in package.entries:
+        result = runtime.write_text(posixpath.join(package.target_dir, entry["path"]), entry["content"])
+        if not result.get("ok"):
+            errors.append(f"{entry['path']}: {result.get('error') or result.get('output')}")
+    return errors
+
+
+def materialize_skill_packages(runtime: Any, packages: list[SkillPackage]) -> dict[str, str]:
+    """Materialize every package into its ``target_dir``; returns a status per
+    target dir (``"ok"``, ``"fallback"`` or ``"error: ..."``)."""
+    if not packages:
+        return {}
+    sandbox = str(getattr(runtime, "sandbox_name", "") or "")
+    cache = PACKED_SKILL_BUNDLES
+    first = [
+        (package, None if cache.known_in_sandbox(sandbox, package.digest) else cache.bundle_b64(package))
+        for package in packages
+    ]
+    statuses = _ship(runtime, first)
+    missing = [p for p in packages if statuses.get(p.target_dir) == "missing"]
+    if missing:
+        # The sandbox lost its store (recreated under the same name).
+        for package in missing:
+            cache.forget_sandbox(sandbox, package.digest)
+        statuses.update(_ship(runtime, [(p, cache.bundle_b64(p)) for p in missing]))
+
+    for package in packages:
+        status = statuses.get(package.target_dir)
+        if status == "ok":
+            cache.mark_in_sandbox(sandbox, package.digest)
+            continue
+        logger.warning(
+            "[skills] Bundle delivery failed for skill %s (%s); writing files individually",
+            package.skill_name,
+            status or "no result",
+        )
+        errors = write_skill_package_files(runtime, package)
+        if errors:
+            logger.warning(
+                "[skills] Failed to materialize %d file(s) for skill %s: %s",
+                len(errors),
+                package.skill_name,
+                "; ".join(errors)[:1000],
+            )
+            statuses[package.target_dir] = f"error: {errors[0]}"
+        else:
+            statuses[package.target_dir] = "fallback"
+    return statuses
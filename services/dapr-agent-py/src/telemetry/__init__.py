@@ -22,6 +22,7 @@ from .metrics import (
     record_code_edit_decision,
     record_cost,
     record_lines_of_code,
+    record_llm_http_request,
     record_session_start,
     record_tokens,
 )
@@ -78,6 +79,7 @@ __all__ = [
     "record_cost",
     "record_code_edit_decision",
     "record_lines_of_code",
+    "record_llm_http_request",
     "record_active_time",
     # events
     "log_otel_event",
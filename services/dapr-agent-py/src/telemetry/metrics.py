@@ -17,6 +17,7 @@ from .providers import get_meter
 logger = logging.getLogger(__name__)
 
 _counters: dict[str, Any] = {}
+_histograms: dict[str, Any] = {}
 
 
 def _get_counter(name: str, description: str, unit: str = ""):
@@ -30,22 +31,47 @@ def _get_counter(name: str, description: str, unit: str = ""):
     return counter
 
 
-def _add(name: str, value: float, attributes: dict[str, Any] | None = None) -> None:
-    counter = _counters.get(name)
-    if counter is None:
-        return
+def _get_histogram(name: str, description: str, unit: str = ""):
+    if name in _histograms:
+        return _histograms[name]
+    meter = get_meter()
+    if meter is None:
+        return None
+    histogram = meter.create_histogram(name=name, description=description, unit=unit)
+    _histograms[name] = histogram
+    return histogram
+
+
+def _merged_attributes(attributes: dict[str, Any] | None) -> dict[str, Any]:
     merged = dict(get_telemetry_attributes())
     if attributes:
         for k, v in attributes.items():
             if v is None:
                 continue
             merged[k] = v
+    return merged
+
+
+def _add(name: str, value: float, attributes: dict[str, Any] | None = None) -> None:
+    counter = _counters.get(name)
+    if counter is None:
+        return
     try:
-        counter.add(value, merged)
+        counter.add(value, _merged_attributes(attributes))
     except Exception as exc:  # noqa: BLE001
         logger.warning("counter %s add failed: %s", name, exc)
 
 
+def _record(name: str, value: float, attributes: dict[str, Any] | None = None) -> None:
+    histogram = _histograms.get(name)
+    if histogram is None:
+        return
+    try:
+        histogram.record(value, _merged_attributes(attributes))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("histogram %s record failed: %s", name, exc)
+
+
 def init_metrics() -> None:
     """Materialize counters. Called after `init_telemetry()`."""
     _get_counter(
@@ -75,6 +101,17 @@ def init_metrics() -> None:
         "Total active time",
         unit="s",
     )
+    # Pooled LLM provider transport (src/llm_http.py). Reuse rate =
+    # requests{reused=true} / requests.
+    _get_counter(
+        "dapr_agent_py.llm_http.requests",
+        "LLM provider HTTP requests (provider, reused=true|false, http_version)",
+    )
+    _get_histogram(
+        "dapr_agent_py.llm_http.handshake.duration",
+        "TCP+TLS handshake time of new LLM provider connections",
+        unit="ms",
+    )
 
 
 def record_session_start() -> None:
@@ -132,6 +169,23 @@ def record_active_time(seconds: float) -> None:
     _add("claude_code.active_time.total", seconds)
 
 
+def record_llm_http_request(
+    *,
+    provider: str,
+    reused: bool,
+    http_version: str = "",
+    handshake_ms: float | None = None,
+) -> None:
+    attributes = {"provider": provider, "http_version": http_version or None}
+    _add(
+        "dapr_agent_py.llm_http.requests",
+        1,
+        {**attributes, "reused": "true" if reused else "false"},
+    )
+    if handshake_ms is not None:
+        _record("dapr_agent_py.llm_http.handshake.duration", handshake_ms, attributes)
+
+
 class ActiveTimeTimer:
     """Context manager that records the elapsed wall time to active_time.total."""
 
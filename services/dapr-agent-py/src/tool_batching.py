@@ -8,9 +8,9 @@ unsafe tool alone (serial), caps fan-out (default 10), and re-orders results to
 the original call order.
 
 We port that model: read-only tools batch via the Dapr workflow ``ctx.when_all``
-fan-out; everything else stays on the strict one-at-a-time path. Bash is treated
-UNSAFE here (we do not parse the command) — the dominant win is parallel file
-reads, which is most of what makes a multi-read turn slow.
+fan-out; everything else stays on the strict one-at-a-time path. Bash joins a
+batch only when ``shell_read_only`` proves its command read-only (``git status``,
+``ls``, ``rg foo`` …); any other Bash call stays serial.
 
 This module is intentionally dependency-free (no dapr/grpc imports) so the
 partition logic is unit-testable in isolation and replay-deterministic.
@@ -21,6 +21,8 @@ from __future__ import annotations
 import os
 from typing import Any, Callable
 
+from src.shell_read_only import bash_tool_call_read_only
+
 _CONCURRENCY_SAFE_TOOL_NAMES = frozenset(
     {
         "read",
@@ -74,6 +76,15 @@ def tool_name_concurrency_safe(name: str) -> bool:
     return any(leaf.startswith(p) for p in _CONCURRENCY_SAFE_MCP_PREFIXES)
 
 
+def tool_call_concurrency_safe(tool_call: dict[str, Any]) -> bool:
+    """Per-call classification: tool name, plus the command for Bash calls."""
+    fn = tool_call.get("function") or {}
+    name = fn.get("name", "")
+    if bash_tool_call_read_only(name, fn.get("arguments")):
+        return True
+    return tool_name_concurrency_safe(name)
+
+
 def partition_tool_calls(
     tool_calls: list[dict[str, Any]],
     *,
@@ -56,14 +56,15 @@ def file_edit(
     if old_string == new_string:
         return "Error: old_string and new_string are identical -- no changes to make."
 
+    # One runtime op returns stat + full content (no separate stat round-trip).
     try:
-        stat = runtime.stat_path(resolved)
+        read_result = runtime.read_window(resolved, content=True)
     except Exception as exc:
-        return f"Error reading file stats: {exc}"
-    if not stat.get("ok"):
-        return f"Error reading file stats: {stat.get('error') or stat}"
+        return f"Error reading file: {exc}"
+    if not read_result.get("ok"):
+        return f"Error reading file: {read_result.get('error') or read_result}"
 
-    if not stat.get("exists"):
+    if not read_result.get("exists"):
         if old_string == "":
             # Creating a new file with new_string as content
             try:
@@ -75,15 +76,9 @@ def file_edit(
             return f"Created new file {resolved}"
         return f"Error: File not found: {resolved}"
 
-    if stat.get("is_dir"):
+    if read_result.get("is_dir"):
         return f"Error: '{resolved}' is a directory, not a file."
 
-    try:
-        read_result = runtime.read_text(resolved)
-    except Exception as exc:
-        return f"Error reading file: {exc}"
-    if not read_result.get("ok"):
-        return f"Error reading file: {read_result.get('error') or read_result}"
     content = str(read_result.get("content") or "")
 
     if old_string == "":
@@ -52,89 +52,67 @@ def file_read(path: str, line_offset: int = 1, n_lines: int = _MAX_LINES) -> str
     if is_blocked_path(resolved):
         return f"Error: Access to '{resolved}' is blocked (device/pseudo-file)."
 
+    if n_lines < 1:
+        return "Error: n_lines must be >= 1."
+
+    # One runtime op: stat + binary sniff + total line count + the requested
+    # window (tail reads included). The size guard below refuses an
+    # unwindowed top-of-file read of a huge file; paged reads (a line_offset
+    # window or a smaller n_lines) are fine, so only those skip the guard.
+    guarded = line_offset == 1 and n_lines >= _MAX_LINES
     try:
-        stat = runtime.stat_path(resolved)
+        result = runtime.read_window(
+            resolved,
+            line_offset,
+            n_lines,
+            guard_bytes=_MAX_FILE_SIZE if guarded else None,
+        )
     except Exception as exc:
-        return f"Error reading file stats: {exc}"
+        return f"Error reading file: {exc}"
 
-    if not stat.get("ok"):
-        return f"Error reading file stats: {stat.get('error') or stat}"
+    if not result.get("ok"):
+        return f"Error reading file: {result.get('error') or result}"
 
-    if not stat.get("exists"):
+    if not result.get("exists"):
         return f"Error: File not found: {resolved}"
 
-    if stat.get("is_dir"):
+    if result.get("is_dir"):
         return (
             f"Error: '{resolved}' is a directory, not a file. Use Bash with 'ls' "
             f"to list a known directory, or Glob to find files by name pattern."
         )
 
-    if is_binary_file(resolved):
+    if is_binary_file(resolved) or result.get("binary"):
         return f"Error: '{resolved}' appears to be a binary file and cannot be displayed as text."
 
-    if n_lines < 1:
-        return "Error: n_lines must be >= 1."
-
-    # Size guard: refuse an unwindowed top-of-file read of a huge file; paged
-    # reads (a line_offset window or a smaller n_lines) are fine.
-    size = int(stat.get("size") or 0)
-
-    if size > _MAX_FILE_SIZE and line_offset == 1 and n_lines >= _MAX_LINES:
-        total_lines = _count_lines(resolved)
+    total_lines = int(result.get("total_lines") or 0)
+    if result.get("windowed") is False:
+        size = int(result.get("size") or 0)
         return (
             f"Error: File '{resolved}' is {size:,} bytes ({total_lines} lines). "
             f"Use line_offset and n_lines to read specific portions "
             f"(e.g., line_offset=1, n_lines=100 for the first 100 lines)."
         )
 
-    # kimi-code semantics: line_offset is 1-based; negative reads the tail.
-    # The runtime backend takes a 0-based skip count.
-    if line_offset < 0:
-        total = _count_lines(resolved)
-        skip = max(0, total + line_offset)
-    else:
-        skip = max(0, line_offset - 1)
-
-    # Read with offset/limit
-    try:
-        result = runtime.read_file_lines(resolved, skip, n_lines)
-        if not result.get("ok"):
-            return f"Error reading file: {result.get('error') or result}"
-
-        raw_lines = list(result.get("lines") or [])
-        total_lines = int(result.get("total_lines") or 0)
-        start_line = int(result.get("start_line") or 0)
-        end_line = int(result.get("end_line") or 0)
-        lines_out = [
-            f"{line_no:>6}\t{line_text}"
-            for line_no, line_text in enumerate(raw_lines, start=start_line)
-        ]
-
-        if not lines_out:
-            if total_lines == 0:
-                return f"File '{resolved}' is empty."
-            return (
-                f"No lines in range: line_offset={line_offset} is beyond the file's "
-                f"{total_lines} lines."
-            )
-
-        content = "\n".join(lines_out)
-        meta = f"(Read {len(lines_out)} lines, lines {start_line}-{end_line} of {total_lines} total)"
-        return f"{content}\n{meta}"
-
-    except Exception as exc:
-        return f"Error reading file: {exc}"
-
+    raw_lines = list(result.get("lines") or [])
+    start_line = int(result.get("start_line") or 0)
+    end_line = int(result.get("end_line") or 0)
+    lines_out = [
+        f"{line_no:>6}\t{line_text}"
+        for line_no, line_text in enumerate(raw_lines, start=start_line)
+    ]
+
+    if not lines_out:
+        if total_lines == 0:
+            return f"File '{resolved}' is empty."
+        return (
+            f"No lines in range: line_offset={line_offset} is beyond the file's "
+            f"{total_lines} lines."
+        )
 
-def _count_lines(path: str) -> int:
-    """Fast line count without loading entire file into memory."""
-    try:
-        result = get_runtime().read_file_lines(path, 0, 0)
-    except Exception:
-        return 0
-    if not result.get("ok"):
-        return 0
-    return int(result.get("total_lines") or 0)
+    content = "\n".join(lines_out)
+    meta = f"(Read {len(lines_out)} lines, lines {start_line}-{end_line} of {total_lines} total)"
+    return f"{content}\n{meta}"
 
 
 file_read.__doc__ = get_read_tool_description()
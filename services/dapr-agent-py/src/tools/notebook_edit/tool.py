@@ -23,10 +23,11 @@ def notebook_edit(
     if not resolved.endswith(".ipynb"):
         return f"Error: '{resolved}' is not a Jupyter notebook (.ipynb) file."
 
-    stat = runtime.stat_path(resolved)
-    if not stat.get("ok"):
-        return f"Error reading notebook: {stat.get('error') or stat}"
-    if not stat.get("exists"):
+    # One runtime op returns stat + full content (no separate stat round-trip).
+    read_result = runtime.read_window(resolved, content=True)
+    if not read_result.get("ok"):
+        return f"Error reading notebook: {read_result.get('error') or read_result}"
+    if not read_result.get("exists"):
         return f"Error: Notebook not found: {resolved}"
 
     if edit_mode not in ("replace", "insert", "delete"):
@@ -36,11 +37,7 @@ def notebook_edit(
         return f"Error: cell_type must be 'code' or 'markdown', got '{cell_type}'."
 
     try:
-        read_result = runtime.read_text(resolved)
-        if not read_result.get("ok"):
-            return f"Error reading notebook: {read_result.get('error') or read_result}"
-        raw = str(read_result.get("content") or "")
-        notebook = json.loads(raw)
+        notebook = json.loads(str(read_result.get("content") or ""))
     except json.JSONDecodeError as exc:
         return f"Error reading notebook: {exc}"
 
@@ -35,6 +35,7 @@ _POST_TIMEOUT_SECONDS = int(os.environ.get("DAPR_WORKSPACE_DIFF_POST_TIMEOUT_SEC
 _MAX_PATCH_BYTES = int(os.environ.get("DAPR_WORKSPACE_DIFF_MAX_BYTES", str(8 * 1024 * 1024)))
 
 _EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+_NULL_BLOB = "0" * 40
 _OUT_FILE = "/tmp/wfb-run-diff.patch"
 
 # Base64 the noise list so it can be embedded in the bash command string WITHOUT
@@ -51,19 +52,22 @@ _NOISE_EXCLUDE = "node_modules/\n.git/\n.wfb-diff-git/\n.venv/\n__pycache__/\ndi
 _NOISE_B64 = base64.b64encode(_NOISE_EXCLUDE.encode("utf-8")).decode("ascii")
 
 # Dual capture (kept in sync with cli-agent-py/src/workspace_diff_sync.py): the
-# combined patch is written to $OUTF (NOT stdout — OpenShell truncates large
-# stdout); only WFB_BASE/WFB_BYTES are printed for the caller to parse.
+# combined patch is appended to $OUTF byte-for-byte (NOT stdout — OpenShell
+# truncates large stdout, and `$(...)` would eat the blank line that ends a
+# binary patch); only WFB_BASE/WFB_FULL/WFB_BYTES are printed for the caller to parse.
+# Unlike the CLI (one capture per pod), the OpenShell sandbox outlives many
+# sessions, so the temp index is replaced by a persistent baseline index.
 _CAPTURE_SCRIPT = r"""
 set -e
 git config --global --add safe.directory '*' 2>/dev/null || true
 [ -d "$REPO" ] || { echo "__WFB_NO_REPO__"; exit 0; }
 EMPTY="4b825dc642cb6eb9a060e54bf8d69288fbee4904"
-T=/tmp/wfb-diff-index
-OUT=""
-# Noise/seed paths removed from the index AFTER `git add -A` — environment-
-# independent (does NOT rely on info/exclude being honored, which it is NOT in the
-# OpenShell sandbox's git). Covers dependency/vcs dirs + the openshell seed home
-# dotfiles (dapr's cwd is the seeded /sandbox HOME) + our own snapshot git dir.
+FULL=0
+: > "$OUTF"
+# Noise/seed paths kept out of the index — environment-independent (does NOT
+# rely on info/exclude being honored, which it is NOT in the OpenShell sandbox's
+# git). Covers dependency/vcs dirs + the openshell seed home dotfiles (dapr's cwd
+# is the seeded /sandbox HOME) + our own snapshot git dir.
 NOISE_PATHS=".wfb-diff-git node_modules .venv __pycache__ dist build .cache .next vendor .pytest_cache .accesslog .config .stats .trash .bashrc .profile .bash_history .bash_logout .gitconfig .claude.json .claude .codex .agents .workspace-initialized .ssh .npm .local .cargo .rustup"
 NESTED=$(find "$REPO" -mindepth 2 -maxdepth 3 -name .git 2>/dev/null | sed 's:/[.]git$::' | grep -v '/[.]wfb-' || true)
 # Nested-repo paths RELATIVE to $REPO — excluded from the root scratch tree so a
@@ -79,44 +83,61 @@ for N in $NESTED; do NESTED_REL="$NESTED_REL ${N#$REPO/}"; done
 ROOT_IS_CLONE=0
 if [ -e "$REPO/.git" ] && git -C "$REPO" rev-parse -q --verify origin/HEAD >/dev/null 2>&1; then ROOT_IS_CLONE=1; fi
 
+# Baseline file index: every capture git dir keeps a persistent `wfb-index`
+# (path -> blob, mtime, size) next to `wfb-index.base`, the baseline tree it
+# describes. While the two agree, `git add -A` re-hashes only files whose stat
+# changed, so only changed paths are diffed. A lost or stale index is a full
+# resync (rebuilt from the working tree) and reported as WFB_FULL=1.
+wfb_index() {
+  T="$1/wfb-index"
+  if [ ! -f "$T" ] || [ "$(cat "$T.base" 2>/dev/null)" != "$2" ]; then
+    rm -f "$T" "$T.base"
+    FULL=1
+  fi
+}
+
 # --- ROOT scratch tree (workspace shape: root is NOT a real clone) ---
 if [ "$ROOT_IS_CLONE" = "0" ]; then
   GD="$REPO/.wfb-diff-git"
   [ -d "$GD" ] || GIT_DIR="$GD" GIT_WORK_TREE="$REPO" git init -q >/dev/null 2>&1 || true
   GIT_DIR="$GD" git config user.email wfb@local >/dev/null 2>&1 || true
   GIT_DIR="$GD" git config user.name wfb >/dev/null 2>&1 || true
-  rm -f "$T"
   PREV=$(GIT_DIR="$GD" git rev-parse -q --verify refs/wfb/baseline 2>/dev/null || echo "$EMPTY")
-  GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git add -A --ignore-errors 2>/dev/null || true
+  wfb_index "$GD" "$PREV"
+  # Exclude pathspecs keep noise from ever being hashed; the `git rm --cached`
+  # after it stays as a safety net.
+  EXCL=""
+  for X in $NOISE_PATHS .git $NESTED_REL; do EXCL="$EXCL :(exclude)$X"; done
+  GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git add -A --ignore-errors -- . $EXCL 2>/dev/null || true
   GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git rm -r --cached --quiet --ignore-unmatch $NOISE_PATHS .git $NESTED_REL >/dev/null 2>&1 || true
-  P=$(GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git diff --cached --find-renames --stat --patch --binary "$PREV" -- 2>/dev/null || true)
+  GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git diff --cached --find-renames --full-index --patch --binary "$PREV" -- >> "$OUTF" 2>/dev/null || true
   NEW=$(GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git write-tree 2>/dev/null || true)
-  [ -n "$NEW" ] && GIT_DIR="$GD" git update-ref refs/wfb/baseline "$NEW" 2>/dev/null || true
-  OUT="$OUT$P"
+  [ -n "$NEW" ] && GIT_DIR="$GD" git update-ref refs/wfb/baseline "$NEW" 2>/dev/null && printf '%s' "$NEW" > "$T.base" || true
 fi
 
 # --- Each git repo: the root clone (only if a REAL clone) + every nested repo ---
 REPOS=""
 [ "$ROOT_IS_CLONE" = "1" ] && REPOS="$REPO"
 REPOS="$REPOS $NESTED"
+EXCL=""
+for X in $NOISE_PATHS; do EXCL="$EXCL :(exclude)$X"; done
 for R in $REPOS; do
   [ -d "$R" ] || continue
   REL=""
   [ "$R" != "$REPO" ] && REL="${R#$REPO/}/"
   cd "$R"
-  rm -f "$T"
   PREV=$(git rev-parse -q --verify refs/wfb/baseline 2>/dev/null || git rev-parse -q --verify origin/HEAD^{tree} 2>/dev/null || echo "$EMPTY")
-  GIT_INDEX_FILE="$T" git add -A --ignore-errors 2>/dev/null || true
+  wfb_index "$(git rev-parse --absolute-git-dir)" "$PREV"
+  GIT_INDEX_FILE="$T" git add -A --ignore-errors -- . $EXCL 2>/dev/null || true
   GIT_INDEX_FILE="$T" git rm -r --cached --quiet --ignore-unmatch $NOISE_PATHS >/dev/null 2>&1 || true
-  P=$(GIT_INDEX_FILE="$T" git diff --cached --find-renames --stat --patch --binary --src-prefix="a/$REL" --dst-prefix="b/$REL" "$PREV" -- 2>/dev/null || true)
+  GIT_INDEX_FILE="$T" git diff --cached --find-renames --full-index --patch --binary --src-prefix="a/$REL" --dst-prefix="b/$REL" "$PREV" -- >> "$OUTF" 2>/dev/null || true
   NEW=$(GIT_INDEX_FILE="$T" git write-tree 2>/dev/null || true)
-  [ -n "$NEW" ] && git update-ref refs/wfb/baseline "$NEW" 2>/dev/null || true
+  [ -n "$NEW" ] && git update-ref refs/wfb/baseline "$NEW" 2>/dev/null && printf '%s' "$NEW" > "$T.base" || true
   cd "$REPO"
-  OUT="$OUT$P"
 done
 
-printf '%s' "$OUT" > "$OUTF"
 echo "WFB_BASE=per-node"
+echo "WFB_FULL=$FULL"
 echo "WFB_BYTES=$(wc -c < "$OUTF" 2>/dev/null || echo 0)"
 """
 
@@ -127,6 +148,8 @@ echo "WFB_BYTES=$(wc -c < "$OUTF" 2>/dev/null || echo 0)"
 # .codex/, .gitconfig, …) that live in dapr's cwd (/sandbox is the seeded home dir,
 # unlike the CLI's clean /sandbox/work). Only sets a baseline that doesn't already
 # exist, so a workflow retry (agent already wrote files) never baselines them out.
+# The index it builds is kept as the baseline index, so the first capture only
+# re-hashes what the agent touched.
 _PRIME_SCRIPT = r"""
 set -e
 git config --global --add safe.directory '*' 2>/dev/null || true
@@ -137,7 +160,6 @@ NESTED_REL=""
 for N in $NESTED; do NESTED_REL="$NESTED_REL ${N#$REPO/}"; done
 ROOT_IS_CLONE=0
 if [ -e "$REPO/.git" ] && git -C "$REPO" rev-parse -q --verify origin/HEAD >/dev/null 2>&1; then ROOT_IS_CLONE=1; fi
-T=/tmp/wfb-prime-index
 PRIMED=0
 
 if [ "$ROOT_IS_CLONE" = "0" ]; then
@@ -146,26 +168,32 @@ if [ "$ROOT_IS_CLONE" = "0" ]; then
     [ -d "$GD" ] || GIT_DIR="$GD" GIT_WORK_TREE="$REPO" git init -q >/dev/null 2>&1 || true
     GIT_DIR="$GD" git config user.email wfb@local >/dev/null 2>&1 || true
     GIT_DIR="$GD" git config user.name wfb >/dev/null 2>&1 || true
-    rm -f "$T"
-    GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git add -A --ignore-errors 2>/dev/null || true
+    T="$GD/wfb-index"
+    rm -f "$T" "$T.base"
+    EXCL=""
+    for X in $NOISE_PATHS .git $NESTED_REL; do EXCL="$EXCL :(exclude)$X"; done
+    GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git add -A --ignore-errors -- . $EXCL 2>/dev/null || true
     GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git rm -r --cached --quiet --ignore-unmatch $NOISE_PATHS .git $NESTED_REL >/dev/null 2>&1 || true
     NEW=$(GIT_DIR="$GD" GIT_WORK_TREE="$REPO" GIT_INDEX_FILE="$T" git write-tree 2>/dev/null || true)
-    [ -n "$NEW" ] && GIT_DIR="$GD" git update-ref refs/wfb/baseline "$NEW" 2>/dev/null && PRIMED=$((PRIMED+1)) || true
+    [ -n "$NEW" ] && GIT_DIR="$GD" git update-ref refs/wfb/baseline "$NEW" 2>/dev/null && printf '%s' "$NEW" > "$T.base" && PRIMED=$((PRIMED+1)) || true
   fi
 fi
 
 REPOS=""
 [ "$ROOT_IS_CLONE" = "1" ] && REPOS="$REPO"
 REPOS="$REPOS $NESTED"
+EXCL=""
+for X in $NOISE_PATHS; do EXCL="$EXCL :(exclude)$X"; done
 for R in $REPOS; do
   [ -d "$R" ] || continue
   cd "$R"
   if ! git rev-parse -q --verify refs/wfb/baseline >/dev/null 2>&1; then
-    rm -f "$T"
-    GIT_INDEX_FILE="$T" git add -A --ignore-errors 2>/dev/null || true
+    T="$(git rev-parse --absolute-git-dir)/wfb-index"
+    rm -f "$T" "$T.base"
+    GIT_INDEX_FILE="$T" git add -A --ignore-errors -- . $EXCL 2>/dev/null || true
     GIT_INDEX_FILE="$T" git rm -r --cached --quiet --ignore-unmatch $NOISE_PATHS >/dev/null 2>&1 || true
     NEW=$(GIT_INDEX_FILE="$T" git write-tree 2>/dev/null || true)
-    [ -n "$NEW" ] && git update-ref refs/wfb/baseline "$NEW" 2>/dev/null && PRIMED=$((PRIMED+1)) || true
+    [ -n "$NEW" ] && git update-ref refs/wfb/baseline "$NEW" 2>/dev/null && printf '%s' "$NEW" > "$T.base" && PRIMED=$((PRIMED+1)) || true
   fi
   cd "$REPO"
 done
@@ -190,6 +218,65 @@ def _clean(value: Any) -> str | None:
     return value.strip() if isinstance(value, str) and value.strip() else None
 
 
+def _diff_path(raw: str) -> str | None:
+    """Path from a ``---``/``+++``/header token, minus its ``a/``/``b/`` prefix."""
+    raw = raw.rstrip("\n")
+    if raw.startswith('"') and raw.endswith('"'):
+        raw = raw[1:-1].encode("latin-1", "backslashreplace").decode("unicode_escape")
+        raw = raw.encode("latin-1", "replace").decode("utf-8", "replace")
+    if raw == "/dev/null":
+        return None
+    return raw[2:] if raw[:2] in ("a/", "b/") else raw
+
+
+def _file_deltas(patch: str) -> list[dict[str, Any]]:
+    """Split a ``git diff --full-index`` patch into one delta per file, keyed by
+    the pre/post blob hashes of its ``index <old>..<new>`` line."""
+    deltas: list[dict[str, Any]] = []
+    blocks = ("\n" + patch).split("\ndiff --git ")[1:]
+    for i, block in enumerate(blocks):
+        # The split eats the newline that ended every block but the last.
+        text = "diff --git " + block + ("\n" if i < len(blocks) - 1 else "")
+        header, _, body = text.partition("\n")
+        delta: dict[str, Any] = {
+            "path": None,
+            "oldPath": None,
+            "status": "modified",
+            "oldBlob": None,
+            "newBlob": None,
+            "patch": text,
+        }
+        old_path = new_path = None
+        for line in body.splitlines():
+            if line.startswith(("@@", "GIT binary patch", "Binary files ")):
+                break
+            if line.startswith("index "):
+                old_blob, _, new_blob = line.split()[1].partition("..")
+                delta["oldBlob"] = None if old_blob == _NULL_BLOB else old_blob
+                delta["newBlob"] = None if new_blob == _NULL_BLOB else new_blob
+            elif line.startswith("new file mode"):
+                delta["status"] = "added"
+            elif line.startswith("deleted file mode"):
+                delta["status"] = "deleted"
+            elif line.startswith("rename from "):
+                delta["status"] = "renamed"
+                old_path = line[len("rename from "):]
+            elif line.startswith("rename to "):
+                new_path = line[len("rename to "):]
+            elif line.startswith("--- ") and old_path is None:
+                old_path = _diff_path(line[4:])
+            elif line.startswith("+++ ") and new_path is None:
+                new_path = _diff_path(line[4:])
+        if new_path is None and old_path is None:
+            # Binary / mode-only entries carry no ---/+++ lines; same path both sides.
+            old_path = new_path = _diff_path(header[len("diff --git "):].split(" b/", 1)[-1])
+        delta["path"] = new_path or old_path
+        if delta["status"] == "renamed":
+            delta["oldPath"] = old_path
+        deltas.append(delta)
+    return deltas
+
+
 def _post_run_diff(execution_id: str, payload: dict[str, Any]) -> tuple[bool, str]:
     body = json.dumps(payload).encode("utf-8")
     req = urllib.request.Request(
@@ -239,16 +326,19 @@ def sync_workspace_diff_openshell(
         return {"ok": True, "skipped": "no_workspace"}
     base = "per-node"
     nbytes = 0
+    full = False
     for line in out.splitlines():
         if line.startswith("WFB_BASE="):
             base = line[len("WFB_BASE="):].strip() or "per-node"
+        elif line.startswith("WFB_FULL="):
+            full = line[len("WFB_FULL="):].strip() == "1"
         elif line.startswith("WFB_BYTES="):
             try:
                 nbytes = int(line[len("WFB_BYTES="):].strip() or "0")
             except ValueError:
                 nbytes = 0
     if nbytes <= 0:
-        return {"ok": True, "empty": True, "base": base}
+        return {"ok": True, "empty": True, "base": base, "full": full}
 
     # Pull the patch back via the chunked base64 reader (large-payload safe).
     try:
@@ -264,21 +354,25 @@ def sync_workspace_diff_openshell(
     except Exception as exc:  # noqa: BLE001
         return {"ok": True, "skipped": f"decode_failed: {exc}"}
     if not patch.strip():
-        return {"ok": True, "empty": True, "base": base}
+        return {"ok": True, "empty": True, "base": base, "full": full}
     if len(patch.encode("utf-8")) > _MAX_PATCH_BYTES:
         patch = patch.encode("utf-8")[:_MAX_PATCH_BYTES].decode("utf-8", errors="ignore")
 
+    # Per-file deltas keyed by blob hash; the BFF reassembles the patch. `full`
+    # tells it this capture rebuilt a lost baseline index.
+    files = _file_deltas(patch)
     ok, detail = _post_run_diff(
         execution_id,
         {
-            "patch": patch,
+            "files": files,
+            "full": full,
             "baseRef": "per-node" if base == "per-node" else base[:12],
             "headRef": "working",
             "nodeId": node_id,
             "title": "Workspace changes",
         },
     )
-    return {"ok": True, "posted": ok, "detail": detail, "base": base}
+    return {"ok": True, "posted": ok, "detail": detail, "base": base, "full": full, "files": len(files)}
 
 
 # --- Source bundle (durable, applyable version of the produced code) -----------
@@ -0,0 +1,161 @@
+"""Incremental token/byte ledger: exactness, invalidation, and the 10k benchmark."""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+from src.compaction.ledger import MessageLedger, clear_ledger, ledger_for
+from src.compaction.state_budget import (
+    GRPC_HARD_CEILING_BYTES,
+    StateBudgetConfig,
+    enforce_state_budget,
+    serialized_state_bytes,
+)
+from src.compaction.tokens import heuristic_token_count
+
+
+def _transcript(n: int) -> list[dict]:
+    messages: list[dict] = []
+    for i in range(n):
+        if i % 3 == 0:
+            messages.append({"role": "user", "content": f"question {i} " + "q" * 400})
+        elif i % 3 == 1:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": f"answer {i} " + "a" * 600}],
+                    "tool_calls": [
+                        {"id": f"c{i}", "function": {"name": "Read", "arguments": '{"path": "x.py"}'}}
+                    ],
+                }
+            )
+        else:
+            messages.append({"role": "tool", "tool_call_id": f"c{i - 1}", "content": "r" * 1200})
+    return messages
+
+
+def test_totals_match_full_recount():
+    messages = _transcript(30) + [SimpleNamespace(role="user", content="pydantic-ish", tool_calls=None)]
+
+    ledger = MessageLedger().sync(messages)
+
+    assert ledger.token_count == heuristic_token_count(messages)
+    assert ledger.state_bytes == serialized_state_bytes(messages)
+    assert MessageLedger().sync([]).state_bytes == serialized_state_bytes([])
+
+
+def test_only_new_and_mutated_messages_are_measured():
+    messages = _transcript(12)
+    ledger = MessageLedger().sync(messages)
+    assert ledger.measured == 12
+    version = ledger.version
+
+    ledger.sync(messages)
+    assert ledger.measured == 12 and ledger.version == version
+
+    messages.append({"role": "user", "content": "next turn"})
+    messages[3]["content"] = "edited in place"
+    messages[1]["content"].append({"type": "text", "text": "grown"})
+    ledger.sync(messages)
+
+    assert ledger.measured == 15
+    assert ledger.version == version + 1
+    assert ledger.token_count == heuristic_token_count(messages)
+    assert ledger.state_bytes == serialized_state_bytes(messages)
+
+    del messages[:6]
+    ledger.sync(messages)
+    assert ledger.measured == 15
+    assert ledger.state_bytes == serialized_state_bytes(messages)
+
+
+def test_reloaded_copies_hit_the_digest_index():
+    messages = _transcript(9)
+    ledger = MessageLedger().sync(messages)
+
+    reloaded = [dict(m) for m in messages]  # state store round-trip
+    ledger.sync(reloaded)
+
+    assert ledger.measured == 9
+    assert ledger.digest_hits == 9
+    assert ledger.token_count == heuristic_token_count(reloaded)
+
+
+def test_authoritative_count_is_requested_once_per_transcript_version():
+    calls: list[int] = []
+
+    class _Messages:
+        def count_tokens(self, *, model, messages):
+            calls.append(len(messages))
+            return SimpleNamespace(input_tokens=4242)
+
+    client = SimpleNamespace(messages=_Messages())
+    messages = _transcript(6)
+    ledger = MessageLedger()
+
+    first = ledger.count_tokens(messages, model="claude-opus-4-7", anthropic_client=client)
+    second = ledger.count_tokens(messages, model="claude-opus-4-7", anthropic_client=client)
+    messages.append({"role": "user", "content": "more"})
+    third = ledger.count_tokens(messages, model="claude-opus-4-7", anthropic_client=client)
+
+    assert (first, second, third) == (4242, 4242, 4242)
+    assert len(calls) == 2
+
+
+def test_state_budget_with_ledger_matches_full_serialization():
+    messages = [{"role": "assistant", "content": "y" * 8000} for _ in range(6)]
+    cfg = StateBudgetConfig(
+        enabled=True,
+        budget_bytes=20_000,
+        hard_ceiling_bytes=GRPC_HARD_CEILING_BYTES,
+        preserve_last_n=2,
+        min_offload_bytes=512,
+        head_preview_chars=64,
+    )
+
+    plain = enforce_state_budget(messages, config=cfg)
+    ledgered = enforce_state_budget(messages, config=cfg, ledger=MessageLedger())
+
+    assert ledgered.to_dict() == plain.to_dict()
+    assert ledgered.post_bytes == serialized_state_bytes(ledgered.messages)
+    assert ledgered.post_bytes <= cfg.budget_bytes
+
+
+def test_registry_is_per_instance():
+    first = ledger_for("ledger-test-a")
+    assert ledger_for("ledger-test-a") is first
+    assert ledger_for("ledger-test-b") is not first
+    assert clear_ledger("ledger-test-a") is True
+    assert ledger_for("ledger-test-a") is not first
+    clear_ledger("ledger-test-a")
+    clear_ledger("ledger-test-b")
+
+
+def test_benchmark_10k_message_transcript():
+    """Benchmark: per-turn compaction sizing on a 10k-message transcript.
+
+    Before: heuristic_token_count + serialized_state_bytes over the whole list
+    every turn. After: ledger sync with one new message per turn.
+    """
+    messages = _transcript(10_000)
+    turns = 5
+
+    started = time.perf_counter()
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"full turn {i}"})
+        full = (heuristic_token_count(messages), serialized_state_bytes(messages))
+    before = (time.perf_counter() - started) / turns
+
+    ledger = MessageLedger().sync(messages)  # first turn of the instance
+    started = time.perf_counter()
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"ledger turn {i}"})
+        ledger.sync(messages)
+        incremental = (ledger.token_count, ledger.state_bytes)
+    after = (time.perf_counter() - started) / turns
+    print(f"\n10k-message turn sizing: full {before * 1e3:.1f} ms, ledger {after * 1e3:.1f} ms")
+
+    assert incremental == (heuristic_token_count(messages), serialized_state_bytes(messages))
+    assert full[0] < incremental[0]
+    assert ledger.measured == 10_000 + 2 * turns
+    assert after < before
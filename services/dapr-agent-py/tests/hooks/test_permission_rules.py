@@ -1,7 +1,7 @@
 """Tests for the if-field permission-rule parser."""
 from __future__ import annotations
 
-from src.hooks.permission_rules import evaluate, parse
+from src.hooks.permission_rules import compile_rule, evaluate, parse
 
 
 class TestParse:
@@ -57,3 +57,11 @@ class TestEvaluate:
     def test_unparseable_rule_defaults_to_pass(self):
         # Defensive: don't silently skip hooks on malformed rules.
         assert evaluate("!!!", "Bash", {"command": "ls"}) is True
+
+    def test_compiled_rule_is_cached_and_agrees_with_evaluate(self):
+        rule = "Bash(git *) and !Bash(git push*)"
+        assert compile_rule(rule) is compile_rule(rule)
+        for command in ("git status", "git push origin", "ls"):
+            assert compile_rule(rule).matches("Bash", {"command": command}) == evaluate(
+                rule, "Bash", {"command": command}
+            )
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from src.hooks.events import HookEvent
-from src.hooks.registry import HookRegistry, HooksSnapshot
+from src.hooks.registry import HookRegistry, HooksSnapshot, _matcher_matches
 from src.hooks.schemas import HooksSettings
 
 
@@ -61,6 +61,52 @@ class TestMatcher:
         assert len(snap.get_matching_hooks(HookEvent.PreToolUse, "Bash")) == 0
 
 
+class TestCompiledIndex:
+    MATCHERS = [
+        "", "*", "Bash", "Read*", "Edit|Write|MultiEdit", "mcp__*|Bash",
+        "/^(Bash|Read)$/", "/[/", "Note?ook*", "| Edit |",
+    ]
+    QUERIES = ["Bash", "Read", "ReadDir", "Edit", "MultiEdit", "mcp__gh__pr", "NotebookEdit", ""]
+
+    def test_index_agrees_with_linear_matcher_and_keeps_order(self):
+        reg = HookRegistry()
+        for i, matcher in enumerate(self.MATCHERS):
+            reg.register_from_settings(_settings("PreToolUse", matcher, f"h{i}"), source="user")
+        snap = reg.snapshot()
+        for query in self.QUERIES:
+            expected = [
+                f"h{i}" for i, m in enumerate(self.MATCHERS) if _matcher_matches(m, query)
+            ]
+            got = [m.hook.command for m in snap.get_matching_hooks(HookEvent.PreToolUse, query)]
+            assert got == expected, query
+            # Memoized second lookup returns the same result.
+            again = [m.hook.command for m in snap.get_matching_hooks(HookEvent.PreToolUse, query)]
+            assert again == expected
+
+    def test_if_rules_are_compiled_into_the_index(self):
+        snap = HooksSnapshot().overlay(
+            HooksSettings.from_raw(
+                {
+                    "PreToolUse": [
+                        {
+                            "matcher": "Bash",
+                            "hooks": [{"type": "command", "command": "x", "if": "Bash(git *)"}],
+                        }
+                    ]
+                }
+            )
+        )
+        (match,) = snap.get_matching_hooks(HookEvent.PreToolUse, "Bash")
+        assert match.if_rule is not None
+        assert match.if_rule.matches("Bash", {"command": "git status"})
+        assert not match.if_rule.matches("Bash", {"command": "ls"})
+
+    def test_empty_snapshot_has_no_hooks(self):
+        snap = HookRegistry().snapshot()
+        assert not snap.has_hooks(HookEvent.PreToolUse)
+        assert snap.get_matching_hooks(HookEvent.PreToolUse, "Bash") == []
+
+
 class TestSnapshotOverlay:
     def test_snapshot_immutable_to_later_registry_changes(self):
         reg = HookRegistry()
@@ -62,7 +62,7 @@ def test_alibaba_chat_uses_singapore_openai_compatible_endpoint(monkeypatch) ->
             "usage": {"prompt_tokens": 3, "completion_tokens": 2},
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_alibaba_chat(
         "llm-alibaba-qwen3-coder-plus",
@@ -77,7 +77,8 @@ def test_alibaba_chat_uses_singapore_openai_compatible_endpoint(monkeypatch) ->
     assert bodies[0]["model"] == "qwen3-coder-plus"
     assert bodies[0]["messages"] == [{"role": "user", "content": "hello"}]
     assert bodies[0]["max_tokens"] == 8192
-    assert bodies[0]["stream"] is False
+    assert bodies[0]["stream"] is True
+    assert bodies[0]["stream_options"] == {"include_usage": True}
     assert result["content"] == "ok"
     assert result["metadata"]["provider"] == "alibaba-chat"
 
@@ -98,7 +99,7 @@ def test_alibaba_chat_accepts_dashscope_fallback_key(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_alibaba_chat(
         "llm-alibaba-qwen3-coder-plus",
@@ -125,7 +126,7 @@ def test_alibaba_chat_converts_tools_and_tool_choice(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_alibaba_chat(
         "llm-alibaba-qwen3-coder-plus",
@@ -169,7 +170,7 @@ def test_alibaba_structured_output_prompts_for_json_without_response_format_by_d
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_alibaba_chat(
         "llm-alibaba-qwen3-coder-plus",
@@ -208,7 +209,7 @@ def test_alibaba_structured_output_can_enable_response_format(monkeypatch) -> No
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_alibaba_chat(
         "llm-alibaba-qwen3-coder-plus",
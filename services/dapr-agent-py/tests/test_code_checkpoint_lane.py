@@ -0,0 +1,276 @@
+"""Coalesced background checkpoint lane (CheckpointLane / CheckpointLanes)."""
+from __future__ import annotations
+
+import json
+import subprocess
+import threading
+import time
+
+import pytest
+
+from src import code_checkpoint
+from src.code_checkpoint import CheckpointLanes, capture_code_checkpoint
+
+
+@pytest.fixture(autouse=True)
+def _remote_disabled(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_CHECKPOINT_GIT_REMOTE_ENABLED", "false")
+
+
+class _ScriptedRuntime:
+    """Answers CHECKPOINT_SCRIPT payloads without a sandbox; each commit exec
+    costs ``latency`` seconds (a git add/commit/push round-trip) and each
+    tree snapshot ``snapshot_latency``."""
+
+    sandbox_name = "sandbox-1"
+    cwd = "/sandbox"
+
+    def __init__(self, latency: float = 0.0, snapshot_latency: float = 0.0) -> None:
+        self.latency = latency
+        self.snapshot_latency = snapshot_latency
+        self.payloads: list[dict] = []
+        self.snapshots = 0
+        self.committing = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def run_python(self, script, payload, timeout_seconds=None):
+        if payload.get("snapshot"):
+            self.snapshots += 1
+            time.sleep(self.snapshot_latency)
+            return {"stdout": json.dumps({"tree": f"tree{self.snapshots}"})}
+        self.payloads.append(payload)
+        self.committing.set()
+        self.release.wait(5)
+        time.sleep(self.latency)
+        calls = payload.get("toolCalls") or [payload]
+        records = [
+            {
+                "toolCallId": call.get("toolCallId"),
+                "toolName": call.get("toolName"),
+                "status": "created",
+                "afterSha": f"sha{len(self.payloads)}",
+                "remoteStatus": "skipped",
+            }
+            for call in calls
+        ]
+        out = {"checkpoints": records} if "toolCalls" in payload else records[0]
+        return {"stdout": json.dumps(out)}
+
+
+def _submit(lanes, runtime, tool_call_id, results):
+    lanes.submit(
+        "inst-1",
+        runtime=runtime,
+        execution_id="exec-1",
+        workspace_ref=None,
+        tool_call_id=tool_call_id,
+        tool_name="Edit",
+        on_result=results.append,
+    )
+
+
+def test_burst_coalesces_into_one_commit_with_per_tool_records():
+    runtime = _ScriptedRuntime()
+    lanes = CheckpointLanes(quiet_seconds=0.2, max_batch=50)
+    results: list[dict] = []
+    for i in range(15):
+        _submit(lanes, runtime, f"call-{i}", results)
+
+    assert lanes.flush("inst-1", wait=True, timeout=5)
+
+    assert len(runtime.payloads) == 1
+    assert [c["toolCallId"] for c in runtime.payloads[0]["toolCalls"]] == [
+        f"call-{i}" for i in range(15)
+    ]
+    assert runtime.payloads[0]["deferPush"] is True
+    assert [c["tree"] for c in runtime.payloads[0]["toolCalls"]] == [
+        f"tree{i + 1}" for i in range(15)
+    ]
+    assert sorted(r["toolCallId"] for r in results) == sorted(f"call-{i}" for i in range(15))
+    assert {r["afterSha"] for r in results} == {"sha1"}
+
+
+def test_max_batch_caps_a_commit():
+    runtime = _ScriptedRuntime()
+    lanes = CheckpointLanes(quiet_seconds=10.0, max_batch=4)
+    results: list[dict] = []
+    for i in range(8):
+        _submit(lanes, runtime, f"call-{i}", results)
+
+    assert lanes.flush("inst-1", wait=True, timeout=5)
+    assert [len(p["toolCalls"]) for p in runtime.payloads] == [4, 4]
+    assert len(results) == 8
+
+
+def test_next_mutation_waits_out_an_in_flight_commit():
+    runtime = _ScriptedRuntime()
+    runtime.release.clear()
+    lanes = CheckpointLanes(quiet_seconds=0.0, max_batch=50)
+    _submit(lanes, runtime, "call-0", [])
+    assert runtime.committing.wait(2)
+
+    waited = threading.Event()
+
+    def mutate():
+        lanes.begin_mutation("inst-1")
+        waited.set()
+        lanes.end_mutation("inst-1")
+
+    threading.Thread(target=mutate, daemon=True).start()
+    assert not waited.wait(0.1)
+    runtime.release.set()
+    assert waited.wait(2)
+    assert lanes.flush("inst-1", wait=True, timeout=5)
+
+
+def test_lane_does_not_commit_while_a_mutating_tool_is_running():
+    runtime = _ScriptedRuntime()
+    lanes = CheckpointLanes(quiet_seconds=0.02, max_batch=50)
+    results: list[dict] = []
+    _submit(lanes, runtime, "call-0", results)
+    lanes.begin_mutation("inst-1")
+    time.sleep(0.15)  # well past the quiet window
+    assert runtime.payloads == []
+    _submit(lanes, runtime, "call-1", results)
+    lanes.end_mutation("inst-1")
+
+    assert lanes.flush("inst-1", wait=True, timeout=5)
+    assert [c["toolCallId"] for c in runtime.payloads[0]["toolCalls"]] == ["call-0", "call-1"]
+
+
+def test_twenty_edit_turn_tool_loop_latency():
+    """Benchmark: tool-loop time for a 20-edit turn where each checkpoint
+    exec costs 25ms, synchronous per-tool vs. the coalesced lane (which still
+    pays a 5ms tree snapshot per tool call)."""
+    edits = 20
+    runtime = _ScriptedRuntime(latency=0.025, snapshot_latency=0.005)
+
+    started = time.perf_counter()
+    for i in range(edits):
+        capture_code_checkpoint(
+            runtime,
+            execution_id="exec-1",
+            instance_id="inst-1",
+            workspace_ref=None,
+            tool_call_id=f"sync-{i}",
+            tool_name="Edit",
+        )
+    sync_loop = time.perf_counter() - started
+    sync_execs = len(runtime.payloads)
+
+    runtime.payloads.clear()
+    lanes = CheckpointLanes(quiet_seconds=0.05, max_batch=50)
+    results: list[dict] = []
+    started = time.perf_counter()
+    for i in range(edits):
+        lanes.begin_mutation("inst-1")
+        _submit(lanes, runtime, f"async-{i}", results)
+        lanes.end_mutation("inst-1")
+    async_loop = time.perf_counter() - started
+    assert lanes.flush("inst-1", wait=True, timeout=5)
+
+    print(
+        f"\n20-edit turn: sync loop={sync_loop * 1000:.0f}ms ({sync_execs} execs) "
+        f"async loop={async_loop * 1000:.1f}ms ({runtime.snapshots} snapshots, "
+        f"{len(runtime.payloads)} commit exec)"
+    )
+    assert sync_execs == edits
+    assert len(runtime.payloads) == 1
+    assert len(results) == edits
+    assert async_loop < sync_loop / 2
+
+
+class _LocalRuntime:
+    """Runs the checkpoint script with the host python, like OpenShell does."""
+
+    sandbox_name = "local"
+
+    def __init__(self, cwd: str) -> None:
+        self.cwd = cwd
+
+    def run_python(self, script, payload, timeout_seconds=None):
+        full = (
+            f"import sys as _sys; _sys.stdin = __import__('io').StringIO({json.dumps(payload)!r})\n"
+            + script
+        )
+        proc = subprocess.run(
+            ["python3"], input=full, capture_output=True, text=True, timeout=timeout_seconds
+        )
+        return {"stdout": proc.stdout, "stderr": proc.stderr}
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_coalesced_burst_keeps_one_exact_commit_per_tool_call(tmp_path):
+    runtime = _LocalRuntime(str(tmp_path))
+    lanes = CheckpointLanes(quiet_seconds=10.0, max_batch=50)
+    results: list[dict] = []
+    for i in range(3):
+        (tmp_path / f"f{i}.txt").write_text(str(i))
+        _submit(lanes, runtime, f"call-{i}", results)
+
+    assert lanes.flush("inst-1", wait=True, timeout=30)
+
+    by_call = {r["toolCallId"]: r for r in results}
+    assert set(by_call) == {"call-0", "call-1", "call-2"}
+    assert by_call["call-2"]["afterSha"] == _git(tmp_path, "rev-parse", "HEAD")
+    for i in range(3):
+        call_id = f"call-{i}"
+        record = by_call[call_id]
+        ref = f"refs/workflow-builder/checkpoints/exec-1/{call_id}"
+        assert record["status"] == "created"
+        assert record["remoteRef"] == ref
+        assert record["remoteStatus"] == "skipped"
+        assert record["sourceEventId"] == f"{call_id}:end"
+        assert _git(tmp_path, "rev-parse", ref) == record["afterSha"]
+        # Restoring call k yields exactly the workspace after call k.
+        assert _git(tmp_path, "ls-tree", "--name-only", ref).split() == [
+            f"f{j}.txt" for j in range(i + 1)
+        ]
+        assert [f["path"] for f in record["changedFiles"]] == [f"f{i}.txt"]
+        assert f"Tool-Call-Id: {call_id} (Edit)" in _git(tmp_path, "log", "-1", "--format=%B", ref)
+    assert by_call["call-1"]["beforeSha"] == by_call["call-0"]["afterSha"]
+    assert _git(tmp_path, "status", "--porcelain") == ""
+
+    # A retried tool call reuses its existing ref instead of committing again.
+    retry: list[dict] = []
+    _submit(lanes, runtime, "call-1", retry)
+    assert lanes.flush("inst-1", wait=True, timeout=30)
+    assert retry[0]["afterSha"] == by_call["call-1"]["afterSha"]
+    assert retry[0]["metadata"]["retried"] is True
+
+
+def test_tool_still_writing_when_the_quiet_window_expires(tmp_path):
+    runtime = _LocalRuntime(str(tmp_path))
+    lanes = CheckpointLanes(quiet_seconds=0.05, max_batch=50)
+    results: list[dict] = []
+
+    lanes.begin_mutation("inst-1")
+    (tmp_path / "a.txt").write_text("a")
+    _submit(lanes, runtime, "call-0", results)
+    lanes.end_mutation("inst-1")
+
+    # A long Bash starts, writes half its edits, and outlives the window.
+    lanes.begin_mutation("inst-1")
+    (tmp_path / "b1.txt").write_text("half")
+    time.sleep(0.3)
+    assert results == []
+    (tmp_path / "b2.txt").write_text("other half")
+    _submit(lanes, runtime, "call-1", results)
+    lanes.end_mutation("inst-1")
+
+    assert lanes.flush("inst-1", wait=True, timeout=30)
+    by_call = {r["toolCallId"]: r for r in results}
+    ref = "refs/workflow-builder/checkpoints/exec-1/{}"
+    assert _git(tmp_path, "ls-tree", "--name-only", ref.format("call-0")).split() == ["a.txt"]
+    assert sorted(f["path"] for f in by_call["call-1"]["changedFiles"]) == ["b1.txt", "b2.txt"]
+
+
+def test_async_checkpoints_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("DAPR_AGENT_PY_CODE_CHECKPOINT_ASYNC", "false")
+    assert code_checkpoint.async_checkpoints_enabled() is False
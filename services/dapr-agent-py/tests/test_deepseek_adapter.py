@@ -66,7 +66,7 @@ def test_deepseek_chat_uses_openai_compatible_endpoint_key_and_thinking(monkeypa
             "usage": {"prompt_tokens": 3, "completion_tokens": 2},
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_deepseek_chat(
         "llm-deepseek-v4-pro",
@@ -81,7 +81,8 @@ def test_deepseek_chat_uses_openai_compatible_endpoint_key_and_thinking(monkeypa
     assert bodies[0]["messages"] == [{"role": "user", "content": "hello"}]
     assert bodies[0]["thinking"] == {"type": "enabled"}
     assert bodies[0]["reasoning_effort"] == "max"
-    assert bodies[0]["stream"] is False
+    assert bodies[0]["stream"] is True
+    assert bodies[0]["stream_options"] == {"include_usage": True}
     assert result["content"] == "ok"
     assert result["metadata"]["provider"] == "deepseek-chat"
 
@@ -101,7 +102,7 @@ def test_deepseek_chat_selects_flash_model(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_deepseek_chat(
         "llm-deepseek-v4-flash",
@@ -127,7 +128,7 @@ def test_deepseek_chat_accepts_dict_tool_choice(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_deepseek_chat(
         "llm-deepseek-v4-pro",
@@ -163,7 +164,7 @@ def test_deepseek_chat_accepts_none_tool_choice(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_deepseek_chat(
         "llm-deepseek-v4-pro",
@@ -209,7 +210,7 @@ def test_deepseek_structured_output_uses_json_object_and_disables_thinking(
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_deepseek_chat(
         "llm-deepseek-v4-pro",
@@ -257,7 +258,7 @@ def test_deepseek_chat_retries_429_with_retry_after_ms(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_deepseek_chat(
         "llm-deepseek-v4-pro",
@@ -297,7 +298,7 @@ def test_deepseek_chat_retries_429_with_fallback_backoff(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_deepseek_chat(
         "llm-deepseek-v4-pro",
@@ -383,7 +384,7 @@ def test_deepseek_reasoning_effort_override_wins_over_env(monkeypatch) -> None:
             "usage": {"prompt_tokens": 3, "completion_tokens": 2},
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_deepseek_chat(
         "llm-deepseek-v4-pro",
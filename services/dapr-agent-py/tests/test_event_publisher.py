@@ -1,5 +1,7 @@
 from pathlib import Path
+import json
 import sys
+import threading
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
@@ -23,13 +25,17 @@ def _enable_incremental_tier():
         event_publisher.set_incremental_tier_enabled(prev)
 
 
-class _ImmediateThread:
-    def __init__(self, target, args=(), daemon=None):
-        self.target = target
-        self.args = args
-
-    def start(self):
-        self.target(*self.args)
+def _capture_ingest(monkeypatch) -> list:
+    """Record delivered (session_id, envelope) pairs; read after a flush."""
+    captured: list = []
+    monkeypatch.setattr(
+        event_publisher,
+        "_post_ingest_batch",
+        lambda session_id, envelopes: captured.extend(
+            (session_id, envelope) for envelope in envelopes
+        ),
+    )
+    return captured
 
 
 def test_tool_call_end_with_json_error_output_is_failed_result():
@@ -82,13 +88,7 @@ def test_runtime_config_payload_is_not_wrapped_or_audit_stamped():
 def test_publish_session_event_preserves_explicit_trace_context(monkeypatch):
     from src import event_publisher
 
-    captured = []
-    monkeypatch.setattr(event_publisher.threading, "Thread", _ImmediateThread)
-    monkeypatch.setattr(
-        event_publisher,
-        "_post_ingest",
-        lambda session_id, envelope: captured.append((session_id, envelope)),
-    )
+    captured = _capture_ingest(monkeypatch)
 
     publish_data = {
         "traceId": "explicit-trace",
@@ -100,6 +100,7 @@ def test_publish_session_event_preserves_explicit_trace_context(monkeypatch):
         publish_data,
         source_event_id="source-1",
     )
+    assert event_publisher.flush_session_events("session-1")
 
     assert captured[0][0] == "session-1"
     assert captured[0][1]["data"]["traceId"] == "explicit-trace"
@@ -110,13 +111,7 @@ def test_publish_session_event_stamps_missing_trace_context(monkeypatch):
     from src import event_publisher
     from src.telemetry import session_tracing
 
-    captured = []
-    monkeypatch.setattr(event_publisher.threading, "Thread", _ImmediateThread)
-    monkeypatch.setattr(
-        event_publisher,
-        "_post_ingest",
-        lambda session_id, envelope: captured.append((session_id, envelope)),
-    )
+    captured = _capture_ingest(monkeypatch)
     monkeypatch.setattr(
         session_tracing,
         "get_current_trace_context",
@@ -129,6 +124,7 @@ def test_publish_session_event_stamps_missing_trace_context(monkeypatch):
         {},
         source_event_id="source-2",
     )
+    assert event_publisher.flush_session_events("session-1")
 
     assert captured[0][1]["data"]["traceId"] == "ambient-trace"
     assert captured[0][1]["data"]["spanId"] == "ambient-span"
@@ -137,13 +133,7 @@ def test_publish_session_event_stamps_missing_trace_context(monkeypatch):
 def test_publish_session_event_stamps_context_usage_fields(monkeypatch):
     from src import event_publisher
 
-    captured = []
-    monkeypatch.setattr(event_publisher.threading, "Thread", _ImmediateThread)
-    monkeypatch.setattr(
-        event_publisher,
-        "_post_ingest",
-        lambda session_id, envelope: captured.append((session_id, envelope)),
-    )
+    captured = _capture_ingest(monkeypatch)
 
     event_publisher.publish_session_event(
         "session-1",
@@ -156,6 +146,7 @@ def test_publish_session_event_stamps_context_usage_fields(monkeypatch):
         },
         source_event_id="source-context",
     )
+    assert event_publisher.flush_session_events("session-1")
 
     data = captured[0][1]["data"]
     assert data["context_window_size"] == 200_000
@@ -175,13 +166,7 @@ def test_incremental_tier_off_skips_enrichment(monkeypatch):
     src.telemetry.session_tracing on runtimes that don't ship them."""
     event_publisher.set_incremental_tier_enabled(False)
 
-    captured = []
-    monkeypatch.setattr(event_publisher.threading, "Thread", _ImmediateThread)
-    monkeypatch.setattr(
-        event_publisher,
-        "_post_ingest",
-        lambda session_id, envelope: captured.append((session_id, envelope)),
-    )
+    captured = _capture_ingest(monkeypatch)
     from src.telemetry import session_tracing
 
     monkeypatch.setattr(
@@ -196,6 +181,7 @@ def test_incremental_tier_off_skips_enrichment(monkeypatch):
         {"model": "claude-sonnet-4-6", "input_tokens": 80_000},
         source_event_id="source-off",
     )
+    assert event_publisher.flush_session_events("session-1")
 
     # Base envelope is still produced + posted...
     data = captured[0][1]["data"]
@@ -204,3 +190,178 @@ def test_incremental_tier_off_skips_enrichment(monkeypatch):
     # ...but no enrichment fields were stamped (gate OFF).
     assert "context_window_size" not in data
     assert "traceId" not in data
+
+
+# ---------------------------------------------------------------------------
+# Batched ingest pipeline
+# ---------------------------------------------------------------------------
+
+
+def _fresh_pipeline(monkeypatch, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, str(value))
+    pipeline = event_publisher._IngestPipeline()
+    monkeypatch.setattr(event_publisher, "_ingest_pipeline", pipeline)
+    return pipeline
+
+
+def test_pipeline_batches_per_session_in_order(monkeypatch):
+    _fresh_pipeline(monkeypatch, SESSION_EVENTS_BATCH_MAX=50)
+    batches: list = []
+    gate = threading.Event()
+
+    def _post(session_id, envelopes):
+        gate.wait(5)
+        batches.append((session_id, [e["sourceEventId"] for e in envelopes]))
+
+    monkeypatch.setattr(event_publisher, "_post_ingest_batch", _post)
+    for i in range(60):
+        event_publisher.publish_session_event(
+            f"s{i % 2}", "agent.message_delta", {"i": i}, source_event_id=f"{i % 2}:{i}"
+        )
+    gate.set()
+    assert event_publisher.flush_session_events()
+
+    for session in ("s0", "s1"):
+        sent = [sid for s, ids in batches if s == session for sid in ids]
+        assert sent == [f"{session[1]}:{i}" for i in range(60) if f"s{i % 2}" == session]
+    assert len(batches) < 10
+
+
+def test_pipeline_retries_with_backoff_then_delivers(monkeypatch):
+    _fresh_pipeline(monkeypatch, SESSION_EVENTS_MAX_ATTEMPTS=3)
+    monkeypatch.setattr(event_publisher.time, "sleep", lambda _s: None)
+    calls: list = []
+
+    def _post(session_id, envelopes):
+        calls.append(len(envelopes))
+        if len(calls) < 3:
+            raise event_publisher._IngestHTTPError(503, "busy")
+
+    monkeypatch.setattr(event_publisher, "_post_ingest_batch", _post)
+    event_publisher.publish_session_event("s", "agent.message", {}, blocking=True)
+
+    assert calls == [1, 1, 1]
+
+
+def test_pipeline_does_not_retry_client_errors(monkeypatch):
+    _fresh_pipeline(monkeypatch)
+    calls: list = []
+
+    def _post(session_id, envelopes):
+        calls.append(len(envelopes))
+        raise event_publisher._IngestHTTPError(401, "Unauthorized")
+
+    monkeypatch.setattr(event_publisher, "_post_ingest_batch", _post)
+    event_publisher.publish_session_event("s", "agent.message", {}, blocking=True)
+
+    assert calls == [1]
+
+
+def test_pipeline_overflow_policies(monkeypatch):
+    gate = threading.Event()
+    sent: list = []
+
+    def _post(session_id, envelopes):
+        gate.wait(5)
+        sent.extend(e["sourceEventId"] for e in envelopes)
+
+    monkeypatch.setattr(event_publisher, "_post_ingest_batch", _post)
+    for policy, expected in (("drop_newest", ["a", "b"]), ("drop_oldest", ["a", "c"])):
+        gate.clear()
+        sent.clear()
+        pipeline = _fresh_pipeline(
+            monkeypatch,
+            SESSION_EVENTS_QUEUE_MAX=1,
+            SESSION_EVENTS_OVERFLOW_POLICY=policy,
+            SESSION_EVENTS_LINGER_MS=0,
+        )
+        pipeline.submit("s", {"sourceEventId": "a"})
+        # Wait until the worker holds "a" in flight so the queue is empty.
+        assert pipeline._cond.acquire(timeout=5)
+        try:
+            pipeline._cond.wait_for(lambda: pipeline._size == 0, timeout=5)
+        finally:
+            pipeline._cond.release()
+        pipeline.submit("s", {"sourceEventId": "b"})
+        pipeline.submit("s", {"sourceEventId": "c"})
+        gate.set()
+        assert pipeline.flush()
+        assert sent == expected
+        assert pipeline.dropped == 1
+
+
+def test_ingest_throughput_against_stub_bff(monkeypatch):
+    """Benchmark: 2000 streamed events over 4 sessions against a local stub BFF.
+
+    The old publisher opened one thread + one TCP connection + one POST per
+    event; the pipeline must deliver everything in per-session order over a
+    single keep-alive connection in a handful of batched calls.
+    """
+    import http.server
+    import time
+
+    received: dict[str, list] = {}
+    peers: set = set()
+    requests_seen = []
+
+    class _Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):  # noqa: N802
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            session_id = self.path.split("/")[4]
+            events = body["events"] if "events" in body else [body]
+            received.setdefault(session_id, []).extend(e["data"]["i"] for e in events)
+            peers.add(self.client_address)
+            requests_seen.append(len(events))
+            payload = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _fresh_pipeline(monkeypatch)
+        monkeypatch.setattr(
+            event_publisher, "_WORKFLOW_BUILDER_URL", f"http://127.0.0.1:{server.server_port}"
+        )
+        monkeypatch.setattr(event_publisher, "_INTERNAL_API_TOKEN", "token")
+        monkeypatch.setattr(event_publisher, "_ingest_connection", event_publisher._IngestConnection())
+
+        sessions, per_session = 4, 500
+        started = time.perf_counter()
+
+        def _produce(session_id):
+            for i in range(per_session):
+                event_publisher.publish_session_event(session_id, "agent.message_delta", {"i": i})
+
+        producers = [
+            threading.Thread(target=_produce, args=(f"bench-{n}",)) for n in range(sessions)
+        ]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        assert event_publisher.flush_session_events(timeout=30)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    total = sessions * per_session
+    assert {k: v for k, v in received.items()} == {
+        f"bench-{n}": list(range(per_session)) for n in range(sessions)
+    }
+    assert len(peers) == 1
+    assert len(requests_seen) <= total // 10
+    print(
+        f"\n[session-ingest bench] {total} events, {len(requests_seen)} POSTs, "
+        f"{len(peers)} connection(s), {total / elapsed:,.0f} events/s"
+    )
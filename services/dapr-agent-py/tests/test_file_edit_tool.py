@@ -57,15 +57,11 @@ class FakeRuntime:
             return path
         return f"/sandbox/{path}"
 
-    def stat_path(self, path: str) -> dict:
-        return {
-            "ok": True,
-            "exists": path in self.files,
-            "is_dir": False,
-        }
-
-    def read_text(self, path: str) -> dict:
-        return {"ok": True, "content": self.files[path]}
+    def read_window(self, path: str, *, content: bool = False) -> dict:
+        assert content
+        if path not in self.files:
+            return {"ok": True, "exists": False}
+        return {"ok": True, "exists": True, "is_dir": False, "content": self.files[path]}
 
     def write_text(self, path: str, content: str) -> dict:
         self.files[path] = content
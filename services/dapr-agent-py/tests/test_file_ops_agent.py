@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import base64
+import io
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+from typing import Any
+
+import pytest
+
+
+root = os.path.join(os.path.dirname(__file__), "..")
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+from src import file_ops_agent, openshell_runtime  # noqa: E402
+from src.openshell_runtime import (  # noqa: E402
+    _FILE_OPS_BOOTSTRAP,
+    LocalWorkspaceRuntime,
+    OpenShellRuntime,
+)
+
+
+def _frames(*reqs: dict[str, Any]) -> io.BytesIO:
+    buf = io.BytesIO()
+    for req in reqs:
+        file_ops_agent.write_frame(buf, req)
+    buf.seek(0)
+    return buf
+
+
+def _read_all(buf: io.BytesIO) -> list[dict[str, Any]]:
+    buf.seek(0)
+    out = []
+    while (frame := file_ops_agent.read_frame(buf)) is not None:
+        out.append(frame)
+    return out
+
+
+def test_serve_answers_frames_in_order_with_ids(tmp_path) -> None:
+    target = tmp_path / "a.txt"
+    target.write_text("one\ntwo\nthree\n")
+    stdout = io.BytesIO()
+
+    file_ops_agent.serve(
+        _frames(
+            {"id": 1, "op": "stat", "path": str(target)},
+            {
+                "id": 2,
+                "op": "batch",
+                "requests": [
+                    {"op": "read_lines", "path": str(target), "offset": 1, "limit": 1},
+                    {"op": "nope"},
+                ],
+            },
+        ),
+        stdout,
+    )
+
+    ready, stat, batch = _read_all(stdout)
+    assert ready["ready"] is True and ready["protocol"] == file_ops_agent.PROTOCOL_VERSION
+    assert stat["id"] == 1 and stat["is_file"] is True and stat["size"] == 14
+    assert batch["id"] == 2
+    assert batch["results"][0]["lines"] == ["two"]
+    assert batch["results"][0]["total_lines"] == 3
+    assert batch["results"][1] == {"ok": False, "error": "unknown_op:nope"}
+
+
+def test_grep_skips_binary_and_truncates(tmp_path) -> None:
+    (tmp_path / "a.py").write_text("Alpha\nbeta\nALPHA again\n")
+    (tmp_path / "b.txt").write_text("alpha\n")
+    (tmp_path / "blob.py").write_bytes(b"\xff\xfealpha")
+
+    result = file_ops_agent.handle(
+        {
+            "op": "grep",
+            "pattern": "alpha",
+            "search_dir": str(tmp_path),
+            "include": "*.py",
+            "ignore_case": True,
+            "max_results": 1,
+        }
+    )
+
+    assert result["ok"] is True
+    assert result["matches"] == [{"path": str(tmp_path / "a.py"), "line": 1, "text": "Alpha"}]
+    assert result["truncated"] is True
+
+
+_SANDBOX_IDS = itertools.count(1)
+
+
+@pytest.fixture(autouse=True)
+def _agent_dir(tmp_path, monkeypatch):
+    # The one-shot transport installs the agent next to the "sandbox" /tmp.
+    install_dir = tmp_path / "agent-install"
+    install_dir.mkdir()
+    monkeypatch.setattr(openshell_runtime, "_FILE_OPS_AGENT_DIR", str(install_dir))
+    return install_dir
+
+
+@pytest.fixture
+def pb2(monkeypatch):
+    module = pytest.importorskip("openshell_proto_0_0_45.openshell_pb2")
+    monkeypatch.setattr(openshell_runtime, "_openshell_pb2", lambda: module)
+    return module
+
+
+class _SubprocessRuntime(OpenShellRuntime):
+    """OpenShellRuntime whose exec is a local python3 — the one-shot path."""
+
+    def __init__(self, sandbox_name: str | None = None) -> None:
+        super().__init__()
+        self.set_sandbox_name(sandbox_name or f"sb-{next(_SANDBOX_IDS)}")
+        self.spawns = 0
+        self.stdin_sizes: list[int] = []
+
+    def _ensure_session(self):  # type: ignore[override]
+        return object()  # no gRPC stub → one-shot fallback
+
+    def _exec(self, argv, *, stdin=None, timeout_seconds=None):  # type: ignore[override]
+        self.spawns += 1
+        self.stdin_sizes.append(len(stdin or b""))
+        proc = subprocess.run(
+            [sys.executable if argv[0] == "python3" else argv[0], *argv[1:]],
+            input=stdin,
+            capture_output=True,
+            timeout=timeout_seconds,
+        )
+        return {
+            "ok": proc.returncode == 0,
+            "exit_code": proc.returncode,
+            "stdout": proc.stdout.decode(),
+            "stderr": proc.stderr.decode(),
+        }
+
+
+class _FakeInteractiveCall:
+    """ExecSandboxInteractive call backed by a local python3 process: stdin
+    messages are piped in, stdout comes back as events, then the exit event."""
+
+    def __init__(self, pb2, requests, command: list[str]) -> None:
+        self._pb2 = pb2
+        self._proc = subprocess.Popen(
+            [sys.executable, *command[1:]],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        threading.Thread(target=self._feed, args=(requests,), daemon=True).start()
+
+    def _feed(self, requests) -> None:
+        try:
+            for message in requests:
+                if message.WhichOneof("payload") == "stdin":
+                    self._proc.stdin.write(message.stdin)
+                    self._proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            pass
+        finally:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def __iter__(self):
+        while chunk := os.read(self._proc.stdout.fileno(), 65536):
+            yield self._pb2.ExecSandboxEvent(stdout=self._pb2.ExecSandboxStdout(data=chunk))
+        yield self._pb2.ExecSandboxEvent(
+            exit=self._pb2.ExecSandboxExit(exit_code=self._proc.wait(timeout=10))
+        )
+
+    def cancel(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait(timeout=10)
+
+
+class _FakeStub:
+    def __init__(self, pb2) -> None:
+        self._pb2 = pb2
+        self.starts: list[Any] = []
+        self.calls: list[_FakeInteractiveCall] = []
+        self.command_override: list[str] | None = None
+
+    def ExecSandboxInteractive(self, request_iterator, timeout=None):
+        first = next(request_iterator)
+        assert first.WhichOneof("payload") == "start"  # must lead the stream
+        self.starts.append(first.start)
+        command = self.command_override or list(first.start.command)
+        call = _FakeInteractiveCall(self._pb2, request_iterator, command)
+        self.calls.append(call)
+        return call
+
+
+class _FakeSession:
+    def __init__(self, stub: _FakeStub, sandbox_id: str) -> None:
+        self._client = types.SimpleNamespace(_stub=stub)
+        self.id = sandbox_id
+
+
+class _StreamRuntime(_SubprocessRuntime):
+    def __init__(self, stub: _FakeStub, sandbox_name: str | None = None) -> None:
+        super().__init__(sandbox_name)
+        self.session = _FakeSession(stub, f"id-{self.configured_sandbox_name}")
+
+    def _ensure_session(self):  # type: ignore[override]
+        return self.session
+
+
+def test_one_shot_fallback_batches_into_one_spawn(tmp_path) -> None:
+    rt = _SubprocessRuntime()
+    rt.set_cwd(str(tmp_path))
+    (tmp_path / "x.txt").write_text("hello\n")
+
+    results = rt.file_ops(
+        [
+            {"op": "stat", "path": "x.txt"},
+            {"op": "read_text", "path": "x.txt"},
+            {"op": "write_text", "path": "sub/y.txt", "content": "y"},
+        ]
+    )
+
+    assert rt.spawns == 1
+    assert results[0]["path"] == str(tmp_path / "x.txt")
+    assert results[1]["content"] == "hello\n"
+    assert (tmp_path / "sub" / "y.txt").read_text() == "y"
+
+
+def test_one_shot_ships_the_agent_source_once_per_sandbox(tmp_path, _agent_dir) -> None:
+    rt = _SubprocessRuntime()
+    rt.set_cwd(str(tmp_path))
+    (tmp_path / "x.txt").write_text("hello\n")
+    source_size = len(openshell_runtime._file_ops_agent_source())
+
+    assert rt.read_text("x.txt")["content"] == "hello\n"
+    assert rt.stat_path("x.txt")["size"] == 6
+    # Another runtime bound to the same sandbox reuses the installed copy.
+    assert _SubprocessRuntime(rt.configured_sandbox_name).read_text(
+        str(tmp_path / "x.txt")
+    )["ok"]
+    assert rt.stdin_sizes[0] > source_size and rt.stdin_sizes[1] < 1024
+
+    # The copy vanished (sandbox recreated): re-shipped transparently.
+    for installed in _agent_dir.iterdir():
+        installed.unlink()
+    assert rt.read_text("x.txt")["content"] == "hello\n"
+    assert rt.spawns == 4 and rt.stdin_sizes[-1] > source_size
+
+
+def test_stream_agent_serves_many_primitives_from_one_process(tmp_path, pb2) -> None:
+    stub = _FakeStub(pb2)
+    rt = _StreamRuntime(stub)
+    rt.set_cwd(str(tmp_path))
+    payload = os.urandom(700 * 1024)  # spans the fast window + two raw ranges
+    (tmp_path / "blob.bin").write_bytes(payload)
+    try:
+        for i in range(20):
+            assert rt.write_text(f"f{i}.txt", str(i))["ok"] is True
+        assert rt.stat_path("f3.txt")["size"] == 1
+        assert rt.glob_files("*.txt", str(tmp_path), 100)["total"] == 20
+        assert rt.grep_files("^7$", str(tmp_path))["matches"][0]["path"].endswith("f7.txt")
+        assert rt.write_text("big.txt", "x" * (3 * 1024 * 1024))["ok"] is True
+        got = rt.read_bytes_base64("blob.bin")
+    finally:
+        rt._close_file_ops_stream()
+
+    assert base64.b64decode(got["base64"]) == payload and got["size"] == len(payload)
+    assert len(stub.starts) == 1 and rt.spawns == 0
+    start = stub.starts[0]
+    assert start.sandbox_id == rt.session.id
+    assert "\n" not in " ".join(start.command)  # OpenShell argv restriction
+
+
+def test_stream_is_shared_per_sandbox_and_locked_per_sandbox(tmp_path, pb2) -> None:
+    stub = _FakeStub(pb2)
+    first = _StreamRuntime(stub)
+    second = _StreamRuntime(stub, first.configured_sandbox_name)
+    other = _StreamRuntime(stub)
+    (tmp_path / "a.txt").write_text("a")
+    try:
+        assert first.read_text(str(tmp_path / "a.txt"))["content"] == "a"
+        assert second.read_text(str(tmp_path / "a.txt"))["content"] == "a"
+        assert len(stub.starts) == 1
+
+        # A file op holding sandbox A's agent does not stall sandbox B.
+        busy = openshell_runtime._file_ops_agent_slot(first.configured_sandbox_name)
+        with busy.lock:
+            done = threading.Event()
+            worker = threading.Thread(
+                target=lambda: (other.read_text(str(tmp_path / "a.txt")), done.set())
+            )
+            worker.start()
+            assert done.wait(10)
+        assert len(stub.starts) == 2
+    finally:
+        first._close_file_ops_stream()
+        other._close_file_ops_stream()
+
+
+def test_broken_stream_falls_back_to_one_shot(tmp_path, pb2) -> None:
+    stub = _FakeStub(pb2)
+    stub.command_override = ["python3", "-c", "import sys; sys.exit(3)"]
+    rt = _StreamRuntime(stub)
+    rt.set_cwd(str(tmp_path))
+    (tmp_path / "a.txt").write_text("a")
+
+    assert rt.read_text("a.txt")["content"] == "a"
+    assert rt.read_text("a.txt")["content"] == "a"
+    # A stream that never came up is not re-bootstrapped on every call.
+    assert len(stub.starts) == 1 and rt.spawns == 2
+
+
+def test_dropped_stream_is_reopened(tmp_path, pb2) -> None:
+    stub = _FakeStub(pb2)
+    rt = _StreamRuntime(stub)
+    rt.set_cwd(str(tmp_path))
+    (tmp_path / "a.txt").write_text("a")
+    try:
+        assert rt.read_text("a.txt")["content"] == "a"
+        stub.calls[0].cancel()  # deadline / agent exit mid-session
+        assert rt.read_text("a.txt")["content"] == "a"
+        assert rt.read_text("a.txt")["content"] == "a"
+    finally:
+        rt._close_file_ops_stream()
+
+    assert len(stub.starts) == 2 and rt.spawns == 1
+
+
+def test_hung_stream_request_times_out_to_one_shot(tmp_path, monkeypatch, pb2) -> None:
+    monkeypatch.setattr(openshell_runtime, "FILE_OPS_TIMEOUT_SECONDS", 1)
+    stub = _FakeStub(pb2)
+    # Completes the handshake, then never answers a request.
+    stub.command_override = [
+        "python3",
+        "-c",
+        "import sys,time;_i=sys.stdin.buffer;_i.read(int(_i.readline()));"
+        "sys.stdout.buffer.write(b'15\\n{\"ready\": true}');sys.stdout.buffer.flush();"
+        "time.sleep(60)",
+    ]
+    rt = _StreamRuntime(stub)
+    rt.set_cwd(str(tmp_path))
+    (tmp_path / "a.txt").write_text("a")
+
+    started = time.monotonic()
+    assert rt.read_text("a.txt")["content"] == "a"
+
+    assert time.monotonic() - started < 10
+    assert rt.spawns == 1
+    assert stub.calls[0]._proc.poll() is not None  # torn down
+    slot = openshell_runtime._file_ops_agent_slot(rt.configured_sandbox_name)
+    assert slot.stream is None and not slot.unavailable
+
+
+def test_no_interactive_exec_uses_one_shot(tmp_path) -> None:
+    rt = _SubprocessRuntime()
+    rt.set_cwd(str(tmp_path))
+
+    assert rt.stat_path("missing")["exists"] is False
+    assert rt.stat_path("missing")["exists"] is False
+    assert rt.spawns == 2
+
+
+def test_agent_kill_switch_uses_one_shot(tmp_path, monkeypatch, pb2) -> None:
+    monkeypatch.setenv("DAPR_AGENT_PY_FILE_OPS_AGENT", "false")
+    stub = _FakeStub(pb2)
+    rt = _StreamRuntime(stub)
+    rt.set_cwd(str(tmp_path))
+
+    assert rt.stat_path("missing")["exists"] is False
+    assert stub.starts == [] and rt.spawns == 1
+
+
+def test_local_runtime_serves_ops_in_process(tmp_path, monkeypatch) -> None:
+    rt = LocalWorkspaceRuntime()
+    rt.set_cwd(str(tmp_path))
+
+    def _no_spawn(*_a, **_k):
+        raise AssertionError("local file ops must not spawn")
+
+    monkeypatch.setattr(rt, "_exec", _no_spawn)
+    assert rt.write_text("n.txt", "x")["ok"] is True
+    assert rt.file_op("read_bytes", path="n.txt")["base64"] == base64.b64encode(b"x").decode()
+
+
+def test_bootstrap_is_a_single_line() -> None:
+    assert "\n" not in _FILE_OPS_BOOTSTRAP
+
+
+def test_read_window_tail_guard_binary_and_content(tmp_path) -> None:
+    text = tmp_path / "t.txt"
+    text.write_text("".join(f"line {i}\n" for i in range(1, 11)))
+    blob = tmp_path / "b.dat"
+    blob.write_bytes(b"abc\0def")
+    req = {"op": "read_window", "path": str(text), "limit": 3}
+
+    tail = file_ops_agent.handle({**req, "offset": -4})
+    head = file_ops_agent.handle({**req, "offset": 9})
+    guarded = file_ops_agent.handle({**req, "offset": 1, "guard_bytes": 10})
+    whole = file_ops_agent.handle({"op": "read_window", "path": str(text), "content": True})
+    binary = file_ops_agent.handle({**req, "path": str(blob)})
+
+    assert tail["lines"] == ["line 7", "line 8", "line 9"]
+    assert (tail["start_line"], tail["end_line"], tail["total_lines"]) == (7, 9, 10)
+    assert head["lines"] == ["line 9", "line 10"] and head["binary"] is False
+    assert guarded["windowed"] is False and guarded["lines"] == []
+    assert guarded["total_lines"] == 10
+    assert whole["content"] == text.read_text() and whole["total_lines"] == 10
+    assert binary["binary"] is True and "lines" not in binary
+
+
+def test_read_window_benchmark_50k_lines(tmp_path) -> None:
+    """Benchmark: Read latency on a 50k-line file, legacy sequence vs one op.
+
+    The legacy tail read was stat → line-count pass → window pass (three
+    sandbox round-trips, two full scans); read_window is one round-trip and
+    one scan. Measured over the one-shot transport so each round-trip pays
+    the interpreter spawn it would cost against a real sandbox.
+    """
+    big = tmp_path / "big.py"
+    big.write_text("".join(f"value_{i} = {i}  # padding padding\n" for i in range(50_000)))
+    rt = _SubprocessRuntime()
+    rt.set_cwd(str(tmp_path))
+
+    def legacy() -> list[str]:
+        rt.stat_path("big.py")
+        total = rt.read_file_lines("big.py", 0, 0)["total_lines"]
+        return rt.read_file_lines("big.py", total - 100, 100)["lines"]
+
+    def compound() -> list[str]:
+        return rt.read_window("big.py", -100, 100)["lines"]
+
+    def best_of(fn, runs: int = 3) -> tuple[float, int, list[str]]:
+        timings = []
+        for _ in range(runs):
+            spawns = rt.spawns
+            started = time.perf_counter()
+            lines = fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings), rt.spawns - spawns, lines
+
+    before, before_trips, before_lines = best_of(legacy)
+    after, after_trips, after_lines = best_of(compound)
+    print(f"\nRead tail of 50k lines: legacy {before * 1e3:.1f} ms, read_window {after * 1e3:.1f} ms")
+
+    assert after_lines == before_lines and after_lines[-1].startswith("value_49999")
+    assert (before_trips, after_trips) == (3, 1)
+    assert after < before
@@ -49,48 +49,46 @@ def _load_tool(monkeypatch):
 
 
 class FakeRuntime:
-    """Mirror of the sandbox backend's read_file_lines contract: `offset` is a
-    0-based skip count, `limit` caps returned lines, totals always count the
-    whole file."""
+    """Mirror of the sandbox backend's read_window contract: `offset` is
+    1-based (negative reads the tail), `limit` caps returned lines, totals
+    always count the whole file, and files over `guard_bytes` are not windowed.
+    """
 
     def __init__(self, files: dict[str, str], dirs: set[str] | None = None) -> None:
         self.files = files
         self.dirs = dirs or set()
+        self.calls = 0
 
     def resolve_path(self, path: str) -> str:
         if path.startswith("/"):
             return path
         return f"/sandbox/{path}"
 
-    def stat_path(self, path: str) -> dict:
+    def read_window(self, path: str, offset: int, limit: int, *, guard_bytes=None) -> dict:
+        self.calls += 1
+        exists = path in self.files or path in self.dirs
+        if not exists or path in self.dirs:
+            return {"ok": True, "exists": exists, "is_dir": path in self.dirs}
+        text = self.files[path]
+        numbered = list(enumerate(text.splitlines(), start=1))
+        windowed = guard_bytes is None or len(text) <= guard_bytes
+        if not windowed:
+            window = []
+        elif offset < 0:
+            window = numbered[offset:][:limit]
+        else:
+            window = numbered[max(0, offset - 1) :][:limit]
         return {
             "ok": True,
-            "exists": path in self.files or path in self.dirs,
-            "is_dir": path in self.dirs,
-            "size": len(self.files.get(path, "")),
-        }
-
-    def read_file_lines(self, path: str, offset: int, limit: int) -> dict:
-        lines_out: list[str] = []
-        total = 0
-        start_line = 0
-        end_line = 0
-        for line_no, line_text in enumerate(self.files[path].splitlines(), start=1):
-            total = line_no
-            if line_no <= offset:
-                continue
-            if len(lines_out) >= limit:
-                continue
-            if not lines_out:
-                start_line = line_no
-            end_line = line_no
-            lines_out.append(line_text)
-        return {
-            "ok": True,
-            "lines": lines_out,
-            "total_lines": total,
-            "start_line": start_line,
-            "end_line": end_line,
+            "exists": True,
+            "is_dir": False,
+            "binary": "\0" in text,
+            "size": len(text),
+            "lines": [line for _, line in window],
+            "total_lines": len(numbered),
+            "start_line": window[0][0] if window else 0,
+            "end_line": window[-1][0] if window else 0,
+            "windowed": windowed,
         }
 
 
@@ -222,3 +220,32 @@ def test_read_description_uses_registered_tool_names(monkeypatch):
     for internal_name in ("bash_run", "glob_search", "grep_search", "file_read"):
         assert internal_name not in doc
     assert "Bash" in doc and "Glob" in doc and "Grep" in doc
+
+
+def test_read_is_one_runtime_round_trip_even_for_tail_reads(monkeypatch):
+    tool = _load_tool(monkeypatch)
+    runtime = FakeRuntime({"/sandbox/f.txt": FIVE_LINES})
+    _patch_runtime(monkeypatch, tool, runtime)
+
+    tool.file_read(path="f.txt", line_offset=-2)
+
+    assert runtime.calls == 1
+
+
+def test_read_refuses_unwindowed_huge_file_with_line_count(monkeypatch):
+    tool = _load_tool(monkeypatch)
+    big = "x" * 99 + "\n"
+    _patch_runtime(monkeypatch, tool, FakeRuntime({"/sandbox/big.txt": big * 3000}))
+
+    refused = tool.file_read(path="big.txt")
+    paged = tool.file_read(path="big.txt", line_offset=2999)
+
+    assert "(3000 lines)" in refused and "Use line_offset" in refused
+    assert paged.endswith("(Read 2 lines, lines 2999-3000 of 3000 total)")
+
+
+def test_read_rejects_content_sniffed_binary(monkeypatch):
+    tool = _load_tool(monkeypatch)
+    _patch_runtime(monkeypatch, tool, FakeRuntime({"/sandbox/blob.dat": "a\0b"}))
+
+    assert "appears to be a binary file" in tool.file_read(path="blob.dat")
@@ -65,7 +65,7 @@ def test_foundry_chat_uses_openai_v1_endpoint_and_key(monkeypatch) -> None:
             "usage": {"prompt_tokens": 3, "completion_tokens": 2},
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_foundry_chat(
         "llm-foundry-deepseek-v4-flash",
@@ -77,7 +77,8 @@ def test_foundry_chat_uses_openai_v1_endpoint_and_key(monkeypatch) -> None:
     assert headers[0]["Authorization"] == "Bearer foundry-test"
     assert bodies[0]["model"] == "DeepSeek-V4-Flash"
     assert bodies[0]["messages"] == [{"role": "user", "content": "hello"}]
-    assert bodies[0]["stream"] is False
+    assert bodies[0]["stream"] is True
+    assert bodies[0]["stream_options"] == {"include_usage": True}
     assert result["content"] == "ok"
     assert result["metadata"]["provider"] == "azure-ai-foundry-chat"
 
@@ -104,7 +105,7 @@ def test_foundry_chat_sends_strict_response_format(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_foundry_chat(
         "llm-foundry-deepseek-v4-flash",
@@ -147,7 +148,7 @@ def test_foundry_chat_retries_429_with_retry_after(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_foundry_chat(
         "llm-foundry-deepseek-v4-flash",
@@ -212,7 +213,7 @@ def test_foundry_structured_call_rejects_empty_content(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     try:
         adapter._call_foundry_chat(
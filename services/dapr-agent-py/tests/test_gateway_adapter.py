@@ -90,7 +90,7 @@ def test_kimi_k3_gateway_uses_max_reasoning_and_completion_defaults(monkeypatch)
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_gateway_chat(
         "llm-kimi-k3",
@@ -121,7 +121,7 @@ def test_kimi_k3_gateway_forwards_supported_per_agent_reasoning_effort(monkeypat
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     for effort in ("low", "high"):
         adapter._call_gateway_chat(
@@ -175,7 +175,7 @@ def test_kimi_k3_gateway_replays_reasoning_with_tool_history(monkeypatch) -> Non
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
     result = adapter._call_gateway_chat(
         "llm-kimi-k3",
         "kimi-k3",
@@ -218,7 +218,7 @@ def test_kimi_k3_gateway_uses_strict_pydantic_json_schema(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
     adapter._call_gateway_chat(
         "llm-kimi-k3",
         "kimi-k3",
@@ -252,7 +252,7 @@ def test_kimi_k3_gateway_uses_raw_native_json_schema(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
     adapter._call_gateway_chat(
         "llm-kimi-k3",
         "kimi-k3",
@@ -302,7 +302,7 @@ def test_kimi_k3_gateway_structured_output_tool_mode_composes_tools(
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
     result = adapter._call_gateway_chat(
         "llm-kimi-k3",
         "kimi-k3",
@@ -409,7 +409,7 @@ def test_glm_52_gateway_disables_thinking_for_tool_calls(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_gateway_chat(
         "llm-glm-5.2",
@@ -464,7 +464,7 @@ def test_gateway_chat_retries_transient_503_with_backoff(monkeypatch) -> None:
             "usage": {"prompt_tokens": 3, "completion_tokens": 2},
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_gateway_chat(
         "llm-deepseek-v4-pro",
@@ -506,7 +506,7 @@ def test_gateway_chat_uses_retry_after_for_transient_503(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_gateway_chat(
         "llm-deepseek-v4-pro",
@@ -539,7 +539,7 @@ def test_gateway_chat_raises_after_transient_retry_budget(monkeypatch) -> None:
             BytesIO(b'{"detail":"Service is too busy"}'),
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     try:
         adapter._call_gateway_chat(
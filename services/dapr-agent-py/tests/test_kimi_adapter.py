@@ -164,7 +164,7 @@ def test_kimi_k3_chat_uses_openai_compatible_endpoint_and_max_reasoning(
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -301,7 +301,7 @@ def test_kimi_sse_accumulates_reasoning_content_and_content(monkeypatch) -> None
         *_sse_event("[DONE]"),
     ]
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
@@ -410,7 +410,7 @@ def test_kimi_sse_publishes_coalesced_nonterminal_deltas(monkeypatch) -> None:
         *_sse_event("[DONE]"),
     ]
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
@@ -542,7 +542,7 @@ def test_kimi_sse_accumulates_indexed_tool_call_fragments(monkeypatch) -> None:
         *_sse_event("[DONE]"),
     ]
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
@@ -599,7 +599,7 @@ def test_kimi_sse_requires_done_even_after_finish_reason(monkeypatch) -> None:
         }
     )
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
@@ -624,7 +624,7 @@ def test_kimi_sse_preserves_multiline_data_continuations(monkeypatch) -> None:
         *_sse_event("[DONE]"),
     ]
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
@@ -653,7 +653,7 @@ def test_kimi_sse_surfaces_provider_error_event(monkeypatch) -> None:
         *_sse_event("[DONE]"),
     ]
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
@@ -677,7 +677,7 @@ def test_kimi_sse_uses_per_read_idle_timeout(monkeypatch) -> None:
         observed_timeouts.append(timeout)
         return _RawSseResponse([b": keep-alive\n", b"\n", TimeoutError()])
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     with pytest.raises(
         TimeoutError,
@@ -879,7 +879,7 @@ def test_kimi_chat_http_body_keeps_vision_content_as_an_array(monkeypatch) -> No
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
     messages = adapter._normalize_messages_for_kimi(
         None,
         [
@@ -927,7 +927,7 @@ def test_kimi_chat_accepts_dict_tool_choice(monkeypatch) -> None:
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -970,7 +970,7 @@ def test_kimi_chat_accepts_none_tool_choice(monkeypatch) -> None:
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1022,7 +1022,7 @@ def test_kimi_structured_output_uses_strict_json_schema_and_max_reasoning(
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1069,7 +1069,7 @@ def test_kimi_dynamic_script_schema_uses_native_strict_json_schema(monkeypatch)
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1126,7 +1126,7 @@ def test_kimi_structured_output_tool_composes_with_normal_tools(monkeypatch) ->
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1268,7 +1268,7 @@ def test_kimi_non_object_schema_does_not_enter_tool_mode(monkeypatch) -> None:
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1346,7 +1346,7 @@ def test_kimi_structured_tool_preserves_screenshot_pixels(monkeypatch) -> None:
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1412,7 +1412,7 @@ def test_kimi_chat_retries_429_with_retry_after_ms(monkeypatch) -> None:
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1456,7 +1456,7 @@ def test_kimi_chat_retries_429_with_fallback_backoff(monkeypatch) -> None:
             }
         )
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -1695,7 +1695,7 @@ def test_kimi_sse_captures_usage_only_trailing_chunk(monkeypatch) -> None:
         b"\n",
     ]
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
@@ -1755,7 +1755,7 @@ def test_kimi_span_records_cache_read_tokens(monkeypatch) -> None:
         b"\n",
     ]
     monkeypatch.setattr(
-        adapter.urllib.request,
+        adapter.llm_http,
         "urlopen",
         lambda req, timeout: _RawSseResponse(lines),
     )
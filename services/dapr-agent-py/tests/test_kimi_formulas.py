@@ -730,6 +730,7 @@ def test_call_kimi_chat_includes_formula_tools(monkeypatch) -> None:
         raise URLError(f"unexpected url {url}")
 
     monkeypatch.setattr(formulas.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_kimi_chat(
         "llm-kimi-k3",
@@ -765,6 +766,7 @@ def test_call_kimi_chat_survives_formula_fetch_failure(monkeypatch, caplog) -> N
         raise URLError("formula API unreachable")
 
     monkeypatch.setattr(formulas.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     with caplog.at_level("WARNING"):
         result = adapter._call_kimi_chat(
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+
+
+root = os.path.join(os.path.dirname(__file__), "..")
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+from src import llm_http  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *_args) -> None:
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1  # type: ignore[attr-defined]
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/busy":
+            payload = b'{"detail":"busy"}'
+            self.send_response(429)
+            self.send_header("Retry-After", "2")
+        elif self.path == "/sse":
+            payload = b"data: one\n\ndata: two\n\ndata: [DONE]\n\n"
+            self.send_response(200)
+        else:
+            payload = json.dumps({"echo": json.loads(body or b"{}")}).encode()
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.connections = 0  # type: ignore[attr-defined]
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield srv, f"http://127.0.0.1:{srv.server_address[1]}"
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        llm_http.close_all()
+
+
+def _post(url: str, body: dict | None = None) -> urllib.request.Request:
+    return urllib.request.Request(
+        url,
+        data=json.dumps(body or {}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+
+
+def test_turns_reuse_one_pooled_connection(server) -> None:
+    srv, base = server
+
+    for i in range(5):
+        with llm_http.urlopen(_post(f"{base}/chat", {"turn": i}), timeout=5) as resp:
+            assert resp.status == 200
+            assert json.loads(resp.read()) == {"echo": {"turn": i}}
+
+    stats = llm_http.pool_stats()[llm_http.origin_of(base)]
+    assert srv.connections == 1
+    assert (stats["requests"], stats["reused"], stats["handshakes"]) == (5, 4, 1)
+
+
+def test_error_status_raises_urllib_http_error(server) -> None:
+    _, base = server
+
+    with pytest.raises(HTTPError) as info:
+        llm_http.urlopen(_post(f"{base}/busy"), timeout=5)
+
+    assert info.value.code == 429
+    assert info.value.headers.get("Retry-After") == "2"
+    assert info.value.read() == b'{"detail":"busy"}'
+
+
+def test_streamed_body_reads_line_by_line(server) -> None:
+    _, base = server
+
+    with llm_http.urlopen(_post(f"{base}/sse"), timeout=5) as resp:
+        lines = [resp.readline() for _ in range(6)]
+        assert resp.readline() == b""
+
+    assert lines[0] == b"data: one\n" and lines[4] == b"data: [DONE]\n"
+
+
+def test_concurrency_is_bounded_per_origin(server, monkeypatch) -> None:
+    _, base = server
+    monkeypatch.setenv("LLM_HTTP_MAX_CONCURRENCY", "1")
+    llm_http.close_all()
+
+    first = llm_http.urlopen(_post(f"{base}/chat"), timeout=5)
+    done = threading.Event()
+
+    def second() -> None:
+        with llm_http.urlopen(_post(f"{base}/chat"), timeout=5) as resp:
+            resp.read()
+        done.set()
+
+    worker = threading.Thread(target=second, daemon=True)
+    worker.start()
+    assert not done.wait(0.3)  # waits for the held slot
+    first.close()
+    assert done.wait(5)
+
+
+def test_kill_switch_falls_back_to_plain_urllib(server, monkeypatch) -> None:
+    _, base = server
+    monkeypatch.setenv("LLM_HTTP_POOL_ENABLED", "false")
+
+    with llm_http.urlopen(_post(f"{base}/chat", {"a": 1}), timeout=5) as resp:
+        assert json.loads(resp.read()) == {"echo": {"a": 1}}
+    assert llm_http.origin_of(base) not in llm_http.pool_stats()
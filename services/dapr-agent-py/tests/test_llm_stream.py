@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+root = os.path.join(os.path.dirname(__file__), "..")
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+llm_stream = importlib.import_module("src.llm_stream")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def monotonic_ns(self) -> int:
+        return int(self.now * 1e9)
+
+
+class _SseResponse:
+    """Line-at-a-time SSE body; a float entry advances the clock by that many seconds."""
+
+    headers = {"Content-Type": "text/event-stream; charset=utf-8"}
+
+    def __init__(self, lines: list[bytes | float | Exception], clock: _Clock | None = None):
+        self._lines = list(lines)
+        self._clock = clock
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def readline(self) -> bytes:
+        while self._lines:
+            item = self._lines.pop(0)
+            if isinstance(item, float):
+                if self._clock is not None:
+                    self._clock.now += item
+                continue
+            if isinstance(item, Exception):
+                raise item
+            return item
+        return b""
+
+
+def _event(payload: dict | str) -> list[bytes]:
+    data = payload if isinstance(payload, str) else json.dumps(payload)
+    return [f"data: {data}\n".encode(), b"\n"]
+
+
+def _chunk(delta: dict, finish_reason: str | None = None) -> list[bytes]:
+    return _event(
+        {
+            "id": "chatcmpl-1",
+            "model": "m",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(llm_stream, "time", fake)
+    return fake
+
+
+def _quiet() -> llm_stream.StreamDeltaEmitter:
+    return llm_stream.StreamDeltaEmitter(enabled=False)
+
+
+def test_chat_stream_aggregates_body_and_measures_first_token(clock) -> None:
+    lines = [
+        b": keep-alive\n",
+        2.0,  # provider thinks before the first token
+        *_chunk({"role": "assistant", "reasoning_content": "Plan."}),
+        3.0,  # the rest of the completion
+        *_chunk({"content": "Hi "}),
+        *_chunk({"tool_calls": [{"index": 0, "id": "call_", "function": {"name": "Re"}}]}),
+        *_chunk({"tool_calls": [{"index": 0, "id": "1", "function": {"name": "ad", "arguments": '{"p'}}]}),
+        *_chunk({"content": "there", "tool_calls": [{"index": 0, "function": {"arguments": '":1}'}}]}, "tool_calls"),
+        *_event({"id": "chatcmpl-1", "choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 7}}),
+        *_event("[DONE]"),
+    ]
+    started = clock.now
+
+    data, ttft_ms = llm_stream.read_chat_completion_stream(
+        _SseResponse(lines, clock),
+        provider="Test",
+        idle_timeout_seconds=30,
+        request_started_at=started,
+        emitter=_quiet(),
+    )
+
+    assert ttft_ms == pytest.approx(2000.0)
+    message = data["choices"][0]["message"]
+    assert message["content"] == "Hi there"
+    assert message["reasoning_content"] == "Plan."
+    assert message["tool_calls"] == [
+        {"id": "call_1", "type": "function", "function": {"name": "Read", "arguments": '{"p":1}'}}
+    ]
+    assert data["choices"][0]["finish_reason"] == "tool_calls"
+    assert data["usage"] == {"prompt_tokens": 5, "completion_tokens": 7}
+
+
+def test_json_body_is_read_when_provider_ignores_stream() -> None:
+    class _Json:
+        headers = {"Content-Type": "application/json"}
+
+        def read(self) -> bytes:
+            return b'{"choices": [{"message": {"content": "ok"}}]}'
+
+    data, ttft_ms = llm_stream.read_chat_completion_stream(
+        _Json(), provider="Test", idle_timeout_seconds=30, request_started_at=0.0
+    )
+
+    assert data["choices"][0]["message"]["content"] == "ok"
+    assert ttft_ms is None
+
+
+def test_idle_stream_raises_descriptive_timeout() -> None:
+    lines = [*_chunk({"content": "partial"}), TimeoutError("timed out")]
+
+    with pytest.raises(TimeoutError, match="Test SSE stream was idle for 45 seconds"):
+        llm_stream.read_chat_completion_stream(
+            _SseResponse(lines),
+            provider="Test",
+            idle_timeout_seconds=45,
+            request_started_at=0.0,
+            emitter=_quiet(),
+        )
+
+
+def test_required_done_rejects_truncated_stream() -> None:
+    with pytest.raises(RuntimeError, match="ended before the required data: \\[DONE\\]"):
+        llm_stream.read_chat_completion_stream(
+            _SseResponse(_chunk({"content": "cut"})),
+            provider="Test",
+            idle_timeout_seconds=30,
+            request_started_at=0.0,
+            emitter=_quiet(),
+            require_done=True,
+        )
+
+
+def test_deltas_are_coalesced_into_session_events(monkeypatch) -> None:
+    published: list[tuple[str, dict]] = []
+    publisher = importlib.import_module("src.event_publisher")
+    monkeypatch.setattr(publisher, "get_scoped_session", lambda: ("s-1", "i-1"))
+    monkeypatch.setattr(
+        publisher,
+        "publish_session_event",
+        lambda session_id, event_type, data, instance_id=None: published.append(
+            (event_type, data)
+        ),
+    )
+    emitter = llm_stream.StreamDeltaEmitter(
+        enabled=True, coalesce_ms=60_000, coalesce_bytes=1_000_000
+    )
+    lines = [*_chunk({"content": "a"}), *_chunk({"content": "b"}), *_chunk({"content": "c"})]
+
+    llm_stream.read_chat_completion_stream(
+        _SseResponse(lines),
+        provider="Test",
+        idle_timeout_seconds=30,
+        request_started_at=0.0,
+        emitter=emitter,
+    )
+
+    assert published == [
+        ("agent.message_delta", {"content_block_index": 1, "text": "abc", "cumulative_len": 3})
+    ]
+
+
+def test_responses_stream_returns_completed_body_with_real_ttft(clock) -> None:
+    completed = {
+        "id": "resp_1",
+        "status": "completed",
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": "Hello"}]}],
+        "usage": {"input_tokens": 3, "output_tokens": 1},
+    }
+    lines = [
+        *_event({"type": "response.created", "response": {"id": "resp_1"}}),
+        1.5,
+        *_event({"type": "response.output_text.delta", "output_index": 0, "delta": "Hel"}),
+        4.0,
+        *_event({"type": "response.output_text.delta", "output_index": 0, "delta": "lo"}),
+        *_event({"type": "response.completed", "response": completed}),
+    ]
+    started = clock.now
+
+    data, ttft_ms = llm_stream.read_responses_stream(
+        _SseResponse(lines, clock),
+        provider="OpenAI Responses",
+        idle_timeout_seconds=30,
+        request_started_at=started,
+        emitter=_quiet(),
+    )
+
+    assert data == completed
+    assert ttft_ms == pytest.approx(1500.0)
+
+
+def test_responses_stream_failure_raises() -> None:
+    lines = _event({"type": "response.failed", "response": {"error": {"message": "overloaded"}}})
+
+    with pytest.raises(RuntimeError, match="OpenAI Responses stream failed: overloaded"):
+        llm_stream.read_responses_stream(
+            _SseResponse(lines),
+            provider="OpenAI Responses",
+            idle_timeout_seconds=30,
+            request_started_at=0.0,
+            emitter=_quiet(),
+        )
+
+
+def test_together_adapter_streams_and_reports_true_ttft(monkeypatch, clock) -> None:
+    adapter = importlib.import_module("src.together_adapter")
+    monkeypatch.setenv("TOGETHER_API_KEY", "together-test")
+    monkeypatch.setattr(adapter.time, "monotonic", clock.monotonic)
+    usage_events: list[dict] = []
+    monkeypatch.setattr(adapter, "_publish_llm_usage", lambda **kw: usage_events.append(kw))
+    bodies: list[dict] = []
+    accepts: list[str] = []
+
+    def urlopen(req, timeout):
+        bodies.append(json.loads(req.data))
+        accepts.append(req.headers["Accept"])
+        return _SseResponse(
+            [
+                0.8,
+                *_chunk({"content": "streamed"}),
+                2.2,
+                *_chunk({}, "stop"),
+                *_event({"choices": [], "usage": {"prompt_tokens": 2, "completion_tokens": 1}}),
+                *_event("[DONE]"),
+            ],
+            clock,
+        )
+
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
+
+    result = adapter._call_together_chat("llm-together", [{"role": "user", "content": "hi"}])
+
+    assert result["content"] == "streamed"
+    assert bodies[0]["stream"] is True
+    assert accepts == ["text/event-stream"]
+    assert usage_events[-1]["ttft_ms"] == pytest.approx(800.0)
+    assert usage_events[-1]["duration_ms"] == pytest.approx(3000.0)
@@ -0,0 +1,279 @@
+"""Process-wide MCP session pool (src/mcp_session_pool.py)."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.mcp_session_pool import MCPSessionPool, server_pool_key
+
+
+GATEWAY = {"transport": "streamable_http", "url": "http://mcp-gateway/mcp"}
+
+
+class _Tool:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class _FakeServer:
+    """Counts MCP handshakes; each connect costs ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.0, tools: tuple[str, ...] = ("search", "fetch")) -> None:
+        self.latency = latency
+        self.tools = tools
+        self.connects = 0
+        self.fail = False
+        self.clients: list[_FakeClient] = []
+        self._lock = threading.Lock()
+
+    def factory(self):
+        client = _FakeClient(self)
+        self.clients.append(client)
+        return client
+
+
+class _FakeClient:
+    def __init__(self, server: _FakeServer) -> None:
+        self.server = server
+        self.configs: dict = {}
+        self.closed = False
+
+    async def connect_from_config(self, configs):
+        await asyncio.sleep(self.server.latency)
+        with self.server._lock:
+            self.server.connects += 1
+        if self.server.fail:
+            raise RuntimeError("gateway unavailable")
+        self.configs = configs
+
+    def get_server_tools(self, server_name):
+        if server_name not in self.configs:
+            return []
+        return [_Tool(f"{server_name}_{name}") for name in self.server.tools]
+
+    def get_all_tools(self):
+        return [tool for name in self.configs for tool in self.get_server_tools(name)]
+
+    async def close(self):
+        self.closed = True
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pool(**kwargs) -> MCPSessionPool:
+    kwargs.setdefault("catalog_ttl_seconds", 300.0)
+    kwargs.setdefault("retry_seconds", 15.0)
+    kwargs.setdefault("idle_seconds", 60.0)
+    return MCPSessionPool(**kwargs)
+
+
+def _acquire(pool, server, holder, cfg=GATEWAY, name="gateway"):
+    return pool.acquire(holder, name, cfg, client_factory=server.factory)
+
+
+def test_identical_configs_share_one_handshake_across_loops():
+    pool = _pool()
+    server = _FakeServer(latency=0.05)
+
+    async def burst(prefix):
+        return await asyncio.gather(*(_acquire(pool, server, f"{prefix}-{i}") for i in range(10)))
+
+    results: list = []
+    threads = [
+        threading.Thread(target=lambda p=p: results.extend(asyncio.run(burst(p))))
+        for p in ("a", "b")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert server.connects == 1
+    assert len({r.key for r in results}) == 1
+    assert all(r.tools[0] is results[0].tools[0] for r in results)
+    assert [t.name for t in results[0].tools] == ["gateway_search", "gateway_fetch"]
+
+
+def test_auth_headers_isolate_tenants():
+    pool = _pool()
+    server = _FakeServer()
+    tenant_a = {**GATEWAY, "headers": {"Authorization": "Bearer a"}}
+    tenant_b = {**GATEWAY, "headers": {"Authorization": "Bearer b"}}
+
+    async def run():
+        return (
+            await _acquire(pool, server, "inst-a", tenant_a),
+            await _acquire(pool, server, "inst-b", tenant_b),
+            await _acquire(pool, server, "inst-a2", dict(reversed(list(tenant_a.items())))),
+        )
+
+    a, b, a2 = asyncio.run(run())
+
+    assert server.connects == 2
+    assert a.key != b.key and a.key == a2.key
+    assert a.tools[0] is not b.tools[0]
+    assert server_pool_key("gateway", tenant_a) != server_pool_key("other", tenant_a)
+
+
+def test_catalog_ttl_refresh_and_failed_health_check_keeps_cached_tools():
+    clock = _Clock()
+    pool = _pool(clock=clock)
+    server = _FakeServer()
+
+    async def run():
+        first = await _acquire(pool, server, "inst-1")
+        assert pool.is_current("inst-1", [first.key])
+
+        clock.now += 301
+        assert not pool.is_current("inst-1", [first.key])
+        server.fail = True
+        stale = await _acquire(pool, server, "inst-1")
+        assert stale.generation == first.generation and stale.tools == first.tools
+        # Retry is deferred, not attempted on every turn.
+        await _acquire(pool, server, "inst-1")
+        assert server.connects == 2
+
+        clock.now += 16
+        server.fail = False
+        server.tools = ("search", "fetch", "browse")
+        fresh = await _acquire(pool, server, "inst-1")
+        assert fresh.generation == first.generation + 1
+        assert len(fresh.tools) == 3 and pool.is_current("inst-1", [fresh.key])
+        assert server.clients[0].closed
+
+        pool.mark_unhealthy(fresh.key)
+        assert not pool.is_current("inst-1", [fresh.key])
+
+    asyncio.run(run())
+
+
+def test_failed_first_connect_raises_and_is_retried_next_time(monkeypatch):
+    monkeypatch.setenv("DAPR_AGENT_PY_MCP_CONNECT_ATTEMPTS", "1")
+    pool = _pool()
+    server = _FakeServer()
+    server.fail = True
+
+    async def run():
+        with pytest.raises(RuntimeError, match="gateway unavailable"):
+            await pool.acquire_many(
+                "inst-1",
+                {"gateway": GATEWAY, "other": {"url": "http://other/mcp"}},
+                client_factory=server.factory,
+            )
+        server.fail = False
+        return await pool.acquire_many(
+            "inst-1", {"gateway": GATEWAY}, client_factory=server.factory
+        )
+
+    pooled = asyncio.run(run())
+
+    assert list(pooled) == ["gateway"] and pooled["gateway"].tools
+
+
+def test_unreferenced_entries_close_after_the_idle_grace():
+    clock = _Clock()
+    pool = _pool(clock=clock)
+    server = _FakeServer()
+
+    async def run():
+        first = await _acquire(pool, server, "inst-1")
+        await pool.release("inst-1", [first.key])
+        # A new session inside the grace period reuses the warm entry.
+        again = await _acquire(pool, server, "inst-2")
+        assert server.connects == 1
+        await pool.release("inst-2", [again.key])
+        clock.now += 61
+        await pool.release("inst-3", [])
+        assert server.clients[0].closed
+        await _acquire(pool, server, "inst-4")
+        assert server.connects == 2
+
+    asyncio.run(run())
+
+
+def test_busy_instance_cannot_take_every_call_slot():
+    pool = _pool(max_concurrent_calls=4, max_calls_per_instance=2)
+    server = _FakeServer()
+    active: dict[str, int] = {"busy": 0, "quiet": 0}
+    peak: dict[str, int] = {"busy": 0, "total": 0}
+
+    async def call(holder, key):
+        async with pool.call_slot(key, holder):
+            active[holder] += 1
+            peak["busy"] = max(peak["busy"], active["busy"])
+            peak["total"] = max(peak["total"], sum(active.values()))
+            await asyncio.sleep(0.02)
+            active[holder] -= 1
+
+    async def run():
+        key = (await _acquire(pool, server, "busy")).key
+        await _acquire(pool, server, "quiet")
+        busy = [asyncio.create_task(call("busy", key)) for _ in range(10)]
+        await asyncio.sleep(0.005)
+        started = time.perf_counter()
+        await call("quiet", key)
+        quiet_latency = time.perf_counter() - started
+        await asyncio.gather(*busy)
+        return quiet_latency
+
+    quiet_latency = asyncio.run(run())
+
+    assert peak["busy"] == 2 and peak["total"] <= 4
+    assert quiet_latency < 0.06
+
+
+def test_thirty_session_start_handshakes():
+    """Benchmark: 30 concurrent sessions on the same gateway config with a
+    40ms initialize + tools/list. One client per instance vs. the pool."""
+    sessions = 30
+    server = _FakeServer(latency=0.04)
+
+    async def per_instance():
+        clients = [server.factory() for _ in range(sessions)]
+        await asyncio.gather(*(c.connect_from_config({"gateway": GATEWAY}) for c in clients))
+
+    started = time.perf_counter()
+    asyncio.run(per_instance())
+    unpooled = time.perf_counter() - started
+    unpooled_connects = server.connects
+
+    server.connects = 0
+    pool = _pool()
+
+    async def pooled():
+        await asyncio.gather(
+            *(
+                pool.acquire_many(f"inst-{i}", {"gateway": GATEWAY}, client_factory=server.factory)
+                for i in range(sessions)
+            )
+        )
+        # A second wave of sessions while the catalog is fresh.
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                pool.acquire_many(f"next-{i}", {"gateway": GATEWAY}, client_factory=server.factory)
+                for i in range(sessions)
+            )
+        )
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    warm = asyncio.run(pooled())
+    cold = time.perf_counter() - started - warm
+
+    print(
+        f"\n30-session start: per-instance={unpooled * 1000:.0f}ms ({unpooled_connects} handshakes) "
+        f"pooled cold={cold * 1000:.0f}ms warm wave={warm * 1000:.1f}ms ({server.connects} handshake)"
+    )
+    assert unpooled_connects == sessions
+    assert server.connects == 1
+    assert warm < server.latency
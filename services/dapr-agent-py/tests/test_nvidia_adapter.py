@@ -58,7 +58,7 @@ def test_nvidia_chat_uses_openai_compatible_endpoint_and_key(monkeypatch) -> Non
             "usage": {"prompt_tokens": 3, "completion_tokens": 2},
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_nvidia_chat(
         "llm-nvidia-llama31-8b",
@@ -69,7 +69,8 @@ def test_nvidia_chat_uses_openai_compatible_endpoint_and_key(monkeypatch) -> Non
     assert auth_headers == ["Bearer nv-test"]
     assert bodies[0]["model"] == "meta/llama-3.1-8b-instruct"
     assert bodies[0]["messages"] == [{"role": "user", "content": "hello"}]
-    assert bodies[0]["stream"] is False
+    assert bodies[0]["stream"] is True
+    assert bodies[0]["stream_options"] == {"include_usage": True}
     assert result["content"] == "ok"
     assert result["metadata"]["provider"] == "nvidia-chat"
 
@@ -96,7 +97,7 @@ def test_nvidia_chat_sends_strict_response_format(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_nvidia_chat(
         "llm-nvidia-llama31-8b",
@@ -67,7 +67,7 @@ def test_openai_responses_uses_api_key(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_openai_responses(
         "llm-openai-gpt5",
@@ -120,7 +120,7 @@ def test_response_format_schema_is_sent_as_strict_json_schema(monkeypatch) -> No
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_openai_responses(
         "llm-openai-gpt5",
@@ -158,7 +158,7 @@ def test_native_json_schema_sent_as_strict_and_returns_text(monkeypatch) -> None
             "output": [{"type": "message", "content": [{"type": "output_text", "text": '{"real": true}'}]}],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     raw_schema = {
         "type": "object",
@@ -207,7 +207,7 @@ def test_pydantic_response_format_wins_over_native_schema(monkeypatch) -> None:
             "output": [{"type": "message", "content": [{"type": "output_text", "text": "{}"}]}],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_openai_responses(
         "llm-openai-gpt5",
@@ -544,7 +544,7 @@ def test_call_openai_responses_stamps_cache_key_on_request_body(monkeypatch) ->
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_openai_responses(
         "llm-openai-gpt5",
@@ -577,7 +577,7 @@ def test_call_openai_responses_omits_cache_key_when_not_provided(monkeypatch) ->
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_openai_responses(
         "llm-openai-gpt5",
@@ -616,7 +616,7 @@ def test_call_openai_responses_disables_parallel_tool_calls_by_default(monkeypat
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_openai_responses(
         "llm-openai-gpt5",
@@ -650,7 +650,7 @@ def test_call_openai_responses_allows_parallel_tool_calls_by_env_opt_in(monkeypa
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     adapter._call_openai_responses(
         "llm-openai-gpt5",
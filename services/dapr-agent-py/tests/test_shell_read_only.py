@@ -0,0 +1,221 @@
+"""Read-only Bash classifier: corpus of real agent commands + batching benchmark."""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.shell_read_only import bash_tool_call_read_only, is_read_only_command
+from src.tool_batching import partition_tool_calls, tool_call_concurrency_safe
+
+# Commands taken from agent transcripts (exploration turns) — all read-only.
+READ_ONLY_CORPUS = [
+    "git status",
+    "git status --short",
+    "git --no-pager log --oneline -20",
+    "git -C /workspace/app diff --stat HEAD~1",
+    "git diff -- src/main.py",
+    "git show HEAD:package.json",
+    "git branch --show-current",
+    "git branch -a",
+    "git rev-parse --abbrev-ref HEAD",
+    "git ls-files | wc -l",
+    "git config --get remote.origin.url",
+    "git stash list",
+    "ls",
+    "ls -la",
+    "ls -la src/ && ls tests/",
+    "cat package.json",
+    "cat README.md | head -50",
+    "head -n 40 src/app.py",
+    "tail -100 logs/server.log",
+    "rg foo",
+    "rg -n 'def main' --type py",
+    "rg -l \"TODO|FIXME\" src",
+    "grep -rn 'import React' src/ | head -20",
+    "grep -c '|' data.csv",
+    "find . -name '*.py' -not -path './node_modules/*' | head -50",
+    "find src -type f | wc -l",
+    "wc -l src/*.py",
+    "pwd",
+    "pwd && ls",
+    "tree -L 2 -I node_modules",
+    "sed -n '1,80p' src/main.py",
+    "sed -n 120,200p app.py",
+    "jq '.scripts' package.json",
+    "cat pyproject.toml 2>/dev/null || cat setup.py",
+    "ls node_modules 2>&1 | head",
+    "du -sh .",
+    "df -h",
+    "stat src/main.py",
+    "file dist/app.js",
+    "diff -u a.txt b.txt",
+    "sort names.txt | uniq -c | sort -rn | head",
+    "echo $HOME",
+    "echo \"done; rm -rf /\"",
+    "which python3",
+    "python3 --version",
+    "node --version",
+    "uname -a",
+    "cd frontend && cat package.json",
+    "test -f .env && echo yes || echo no",
+    "date +%Y-%m-%d",
+    "od -c image.png | head",
+    "cut -d, -f1 < data.csv",
+]
+
+# Commands that write, spawn arbitrary programs, or cannot be proven safe.
+MUTATING_CORPUS = [
+    "npm install",
+    "pip install -r requirements.txt",
+    "python3 script.py",
+    "node build.js",
+    "rm -rf dist",
+    "mkdir -p out",
+    "touch a.txt",
+    "mv a b",
+    "cp a b",
+    "git add -A",
+    "git commit -m 'x'",
+    "git checkout main",
+    "git stash",
+    "git branch -D feature",
+    "git branch new-feature",
+    "git tag v1.0",
+    "git config user.name bob",
+    "git -c core.pager=evil log",
+    "git diff --output=patch.diff",
+    "git grep -O foo",
+    "git grep -Otouch\\ /tmp/x hi",
+    "git grep --open='touch /tmp/x' hi",
+    "git grep --open-files=vim hi",
+    "git grep -nOvim hi",
+    "git diff --ext-d",
+    "git log -p --ext",
+    "git diff --out=patch.diff",
+    "echo hi > out.txt",
+    "echo hi >> out.txt",
+    "cat a > b",
+    "ls &> listing.txt",
+    "ls > /dev/null; rm x",
+    "cat package.json | tee copy.json",
+    "sed -i 's/a/b/' file",
+    "sed 's/a/b/w out' file",
+    "sed -n 1p -i file",
+    "sort -o sorted.txt names.txt",
+    "sort -uo sorted.txt names.txt",
+    "find . -name '*.pyc' -delete",
+    "find . -exec rm {} \\;",
+    "uniq in.txt out.txt",
+    "tree -o tree.txt",
+    "rg --pre ./decode foo",
+    "date -s '2020-01-01'",
+    "hostname evil",
+    "env FOO=1 python3 x.py",
+    "FOO=bar ls",
+    "echo $(rm -rf /)",
+    "echo `whoami`",
+    "cat <(ls)",
+    "(cd x && ls)",
+    "{ ls; }",
+    "ls &",
+    "sleep 1 & ls",
+    "cat << EOF",
+    "ls\nrm -rf x",
+    "./scripts/check.sh",
+    "/bin/ls",
+    "awk '{print > \"out\"}' f",
+    "xargs rm < files.txt",
+    "sudo ls",
+    "curl -o x https://example.com",
+    "sort x '|' cat -o y",
+    "echo $'\\'' > /tmp/pwn2 #'",
+    "echo $\"x\" > /tmp/out",
+    "ls #' > /tmp/pwn",
+    "cat f # comment",
+    "sort --outp=/tmp/x f",
+    "sort --o /tmp/x f",
+    "sort --compress-prog=touch f",
+    "date --se='2020-01-01'",
+    "hostname --file=/tmp/name",
+    "hostname -F /tmp/name",
+    "file --compi magic",
+    "tree --output tree.txt",
+    "echo 'unterminated",
+    "ls \\",
+    "",
+    "   ",
+]
+
+
+@pytest.mark.parametrize("command", READ_ONLY_CORPUS)
+def test_read_only_corpus(command):
+    assert is_read_only_command(command), command
+
+
+@pytest.mark.parametrize("command", MUTATING_CORPUS)
+def test_mutating_corpus(command):
+    assert not is_read_only_command(command), command
+
+
+def test_bash_tool_call_parses_arguments():
+    assert bash_tool_call_read_only("Bash", json.dumps({"command": "git status"}))
+    assert bash_tool_call_read_only("bash_run", {"command": "ls -la"})
+    assert not bash_tool_call_read_only("Bash", json.dumps({"command": "make"}))
+    assert not bash_tool_call_read_only("Bash", "{not json")
+    assert not bash_tool_call_read_only("Read", {"command": "ls"})
+
+
+def _bash(command):
+    return {
+        "id": f"id-{command}",
+        "function": {"name": "Bash", "arguments": json.dumps({"command": command})},
+    }
+
+
+def test_read_only_bash_joins_the_parallel_batch():
+    calls = [_bash("git status"), _bash("ls"), _bash("cat package.json"), _bash("rg foo")]
+    calls.insert(2, {"id": "r", "function": {"name": "Read", "arguments": "{}"}})
+    calls.append(_bash("npm test"))
+    calls.append(_bash("git diff"))
+
+    parts = partition_tool_calls(
+        calls, is_batchable=tool_call_concurrency_safe, max_concurrency=6
+    )
+
+    assert [(p["parallel"], [i for i, _ in p["items"]]) for p in parts] == [
+        (True, [0, 1, 2, 3, 4]),
+        (False, [5]),
+        (False, [6]),
+    ]
+
+
+def test_multi_bash_turn_wall_clock():
+    """Benchmark: a four-command exploration turn, each command paying a
+    sandbox exec round-trip, run serially vs. partitioned + fanned out."""
+    round_trip = 0.05
+    turn = [_bash("git status"), _bash("ls"), _bash("cat package.json"), _bash("rg foo")]
+
+    def execute(_call):
+        time.sleep(round_trip)
+
+    started = time.perf_counter()
+    for call in turn:
+        execute(call)
+    serial = time.perf_counter() - started
+
+    parts = partition_tool_calls(
+        turn, is_batchable=tool_call_concurrency_safe, max_concurrency=6
+    )
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        for part in parts:
+            list(pool.map(execute, [call for _, call in part["items"]]))
+    batched = time.perf_counter() - started
+
+    print(f"\nmulti-Bash turn: serial={serial:.3f}s batched={batched:.3f}s")
+    assert len(parts) == 1
+    assert batched < serial / 2
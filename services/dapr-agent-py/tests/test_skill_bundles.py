@@ -0,0 +1,185 @@
+"""Content-addressed skill package delivery (src/skill_bundles.py)."""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src import skill_bundles
+from src.skill_bundles import (
+    SkillBundleCache,
+    materialize_skill_packages,
+    pack_skill_package,
+    skill_package,
+    write_skill_package_files,
+)
+
+
+class _SandboxRuntime:
+    """Maps the sandbox's ``/sandbox`` onto a temp dir; every exec or file op
+    pays ``round_trip`` seconds like an OpenShell RPC."""
+
+    sandbox_name = "sandbox-1"
+
+    def __init__(self, root, round_trip: float = 0.0) -> None:
+        self.root = str(root)
+        self.round_trip = round_trip
+        self.payloads: list[dict] = []
+        self.writes = 0
+        self.fail_exec = False
+
+    def _local(self, path: str) -> str:
+        return self.root + path[len("/sandbox"):] if path.startswith("/sandbox") else path
+
+    def run_python(self, script, payload, timeout_seconds=None):
+        time.sleep(self.round_trip)
+        self.payloads.append(payload)
+        if self.fail_exec:
+            raise RuntimeError("exec unavailable")
+        local = {
+            "storeRoot": self._local(payload["storeRoot"]),
+            "packages": [{**p, "dir": self._local(p["dir"])} for p in payload["packages"]],
+        }
+        proc = subprocess.run(
+            [sys.executable, "-c", script],
+            input=json.dumps(local),
+            capture_output=True,
+            text=True,
+            timeout=timeout_seconds,
+        )
+        parsed = json.loads(proc.stdout)
+        parsed["results"] = {
+            "/sandbox" + k[len(self.root):]: v for k, v in parsed["results"].items()
+        }
+        return {"ok": proc.returncode == 0, "stdout": json.dumps(parsed), "stderr": proc.stderr}
+
+    def write_text(self, path, content):
+        time.sleep(self.round_trip)
+        self.writes += 1
+        local = self._local(path)
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        with open(local, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        return {"ok": True}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    cache = SkillBundleCache(max_entries=64)
+    monkeypatch.setattr(skill_bundles, "PACKED_SKILL_BUNDLES", cache)
+    return cache
+
+
+def _packages(instance: str, skills: int = 3, files: int = 4):
+    packages = []
+    for s in range(skills):
+        entries = [{"path": "SKILL.md", "content": f"# skill {s}\n"}] + [
+            {"path": f"references/doc{f}.md", "content": f"skill {s} doc {f}\n" * 40}
+            for f in range(files - 1)
+        ]
+        packages.append(
+            skill_package(
+                f"skill-{s}", f"/sandbox/.workflow-builder/skills/{instance}/skill-{s}", entries
+            )
+        )
+    return packages
+
+
+def _assert_on_disk(runtime, packages):
+    for package in packages:
+        for entry in package.entries:
+            with open(runtime._local(f"{package.target_dir}/{entry['path']}"), encoding="utf-8") as fh:
+                assert fh.read() == entry["content"]
+
+
+def test_pack_is_deterministic():
+    entries = _packages("i")[0].entries
+    assert pack_skill_package(entries) == pack_skill_package(list(reversed(entries)))
+
+
+def test_first_session_ships_every_package_in_one_exec(tmp_path, _fresh_cache):
+    runtime = _SandboxRuntime(tmp_path)
+    packages = _packages("inst-1")
+
+    statuses = materialize_skill_packages(runtime, packages)
+
+    assert set(statuses.values()) == {"ok"}
+    assert len(runtime.payloads) == 1 and runtime.writes == 0
+    assert all("tar" in p for p in runtime.payloads[0]["packages"])
+    _assert_on_disk(runtime, packages)
+    for package in packages:
+        assert (tmp_path / ".workflow-builder" / "skill-store" / package.digest / ".complete").exists()
+
+
+def test_identical_bundle_for_a_new_instance_is_not_resent(tmp_path, _fresh_cache):
+    runtime = _SandboxRuntime(tmp_path)
+    materialize_skill_packages(runtime, _packages("inst-1"))
+    packs = _fresh_cache.packs
+
+    second = _packages("inst-2")
+    statuses = materialize_skill_packages(runtime, second)
+
+    assert set(statuses.values()) == {"ok"}
+    assert len(runtime.payloads) == 2
+    assert not any("tar" in p for p in runtime.payloads[1]["packages"])
+    assert _fresh_cache.packs == packs
+    _assert_on_disk(runtime, second)
+
+
+def test_lost_store_is_refilled_in_a_second_exec(tmp_path):
+    runtime = _SandboxRuntime(tmp_path)
+    materialize_skill_packages(runtime, _packages("inst-1"))
+    shutil.rmtree(tmp_path / ".workflow-builder" / "skill-store")
+
+    statuses = materialize_skill_packages(runtime, _packages("inst-2"))
+
+    assert set(statuses.values()) == {"ok"}
+    assert [bool(p["packages"][0].get("tar")) for p in runtime.payloads[1:]] == [False, True]
+    _assert_on_disk(runtime, _packages("inst-2"))
+
+
+def test_exec_failure_falls_back_to_per_file_writes(tmp_path):
+    runtime = _SandboxRuntime(tmp_path)
+    runtime.fail_exec = True
+    packages = _packages("inst-1", skills=2, files=3)
+
+    statuses = materialize_skill_packages(runtime, packages)
+
+    assert set(statuses.values()) == {"fallback"}
+    assert runtime.writes == 6
+    _assert_on_disk(runtime, packages)
+
+
+def test_session_start_ten_skills_by_thirty_files(tmp_path):
+    """Benchmark: materialize 10 skills x 30 files at session start with a 2ms
+    sandbox round-trip. Per-file write_text vs. one bundle exec (cold pod and
+    sandbox), vs. a second instance whose bundles the sandbox already holds."""
+    runtime = _SandboxRuntime(tmp_path, round_trip=0.002)
+
+    started = time.perf_counter()
+    for package in _packages("per-file", skills=10, files=30):
+        assert write_skill_package_files(runtime, package) == []
+    per_file = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cold = materialize_skill_packages(runtime, _packages("cold", skills=10, files=30))
+    bundled_cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    warm = materialize_skill_packages(runtime, _packages("warm", skills=10, files=30))
+    bundled_warm = time.perf_counter() - started
+
+    print(
+        f"\n10x30 skill session start: per-file={per_file:.3f}s ({runtime.writes} writes) "
+        f"bundle cold={bundled_cold:.3f}s warm={bundled_warm:.3f}s ({len(runtime.payloads)} execs)"
+    )
+    assert set(cold.values()) == set(warm.values()) == {"ok"}
+    assert runtime.writes == 300 and len(runtime.payloads) == 2
+    _assert_on_disk(runtime, _packages("warm", skills=10, files=30))
+    assert bundled_cold < per_file / 2
+    assert bundled_warm < per_file / 2
@@ -63,7 +63,7 @@ def test_together_chat_uses_openai_compatible_endpoint_and_key(monkeypatch) -> N
             "usage": {"prompt_tokens": 3, "completion_tokens": 2},
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_together_chat(
         "llm-together-glm-51",
@@ -75,7 +75,8 @@ def test_together_chat_uses_openai_compatible_endpoint_and_key(monkeypatch) -> N
     assert user_agents == ["workflow-builder-dapr-agent-py/1.0"]
     assert bodies[0]["model"] == "zai-org/GLM-5.1"
     assert bodies[0]["messages"] == [{"role": "user", "content": "hello"}]
-    assert bodies[0]["stream"] is False
+    assert bodies[0]["stream"] is True
+    assert bodies[0]["stream_options"] == {"include_usage": True}
     assert result["content"] == "ok"
     assert result["metadata"]["provider"] == "together-chat"
 
@@ -102,7 +103,7 @@ def test_together_chat_sends_strict_response_format(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_together_chat(
         "llm-together-glm-51",
@@ -147,7 +148,7 @@ def test_together_chat_retries_429_with_retry_after(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_together_chat(
         "llm-together-glm-51",
@@ -187,7 +188,7 @@ def test_together_chat_retries_429_with_fallback_backoff(monkeypatch) -> None:
             }],
         })
 
-    monkeypatch.setattr(adapter.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(adapter.llm_http, "urlopen", urlopen)
 
     result = adapter._call_together_chat(
         "llm-together-glm-51",
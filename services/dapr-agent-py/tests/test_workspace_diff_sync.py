@@ -0,0 +1,179 @@
+"""Incremental workspace diff capture: baseline index + per-file deltas."""
+from __future__ import annotations
+
+import base64
+import os
+import statistics
+import subprocess
+import time
+
+import pytest
+
+from src import workspace_diff_sync as wds
+
+
+class _LocalRuntime:
+    """Runs the capture scripts with the host bash, like OpenShell's execute."""
+
+    def __init__(self, cwd, home) -> None:
+        self.cwd = str(cwd)
+        self._env = {**os.environ, "HOME": str(home)}
+
+    def execute(self, command, timeout_seconds=None):
+        proc = subprocess.run(
+            ["bash", "-c", command],
+            cwd=self.cwd,
+            env=self._env,
+            capture_output=True,
+            text=True,
+            timeout=timeout_seconds,
+        )
+        return {"stdout": proc.stdout, "stderr": proc.stderr}
+
+    def read_bytes_base64(self, path, max_bytes=None):
+        with open(path, "rb") as fh:
+            return {"ok": True, "base64": base64.b64encode(fh.read()).decode("ascii")}
+
+
+@pytest.fixture
+def posted(monkeypatch):
+    payloads: list[dict] = []
+    monkeypatch.setattr(wds, "_INTERNAL_API_TOKEN", "token")
+    monkeypatch.setattr(
+        wds, "_post_run_diff", lambda _execution_id, payload: (payloads.append(payload), (True, "ok"))[1]
+    )
+    return payloads
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "ws"
+    (root / "src").mkdir(parents=True)
+    (root / "node_modules" / "pkg").mkdir(parents=True)
+    for i in range(4):
+        (root / "src" / f"f{i}.txt").write_text(f"line {i}\n")
+    (root / "node_modules" / "pkg" / "index.js").write_text("dep\n")
+    home = tmp_path / "home"
+    home.mkdir()
+    return root, _LocalRuntime(root, home)
+
+
+def _sync(runtime):
+    return wds.sync_workspace_diff_openshell(runtime, execution_id="exec-1", node_id="agent")
+
+
+def _blob(path):
+    return subprocess.run(
+        ["git", "hash-object", str(path)], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_capture_posts_per_file_deltas_keyed_by_blob(workspace, posted):
+    root, runtime = workspace
+    before = _blob(root / "src" / "f0.txt")
+    assert wds.prime_workspace_baseline_openshell(runtime)["out"].endswith("WFB_PRIMED=1")
+
+    (root / "src" / "f0.txt").write_text("line 0\nmore\n")
+    (root / "src" / "f1.txt").unlink()
+    (root / "src" / "f2.txt").rename(root / "src" / "g2.txt")
+    (root / "src" / "new.bin").write_bytes(bytes(range(256)))
+    (root / "node_modules" / "pkg" / "index.js").write_text("changed\n")
+
+    result = _sync(runtime)
+
+    assert result["posted"] is True and result["full"] is False
+    payload = posted[-1]
+    assert "patch" not in payload and payload["full"] is False
+    by_path = {f["path"]: f for f in payload["files"]}
+    assert set(by_path) == {"src/f0.txt", "src/f1.txt", "src/g2.txt", "src/new.bin"}
+    assert by_path["src/f0.txt"]["status"] == "modified"
+    assert by_path["src/f0.txt"]["oldBlob"] == before
+    assert by_path["src/f0.txt"]["newBlob"] == _blob(root / "src" / "f0.txt")
+    assert by_path["src/f1.txt"]["status"] == "deleted"
+    assert by_path["src/f1.txt"]["newBlob"] is None
+    assert by_path["src/g2.txt"]["status"] == "renamed"
+    assert by_path["src/g2.txt"]["oldPath"] == "src/f2.txt"
+    assert by_path["src/new.bin"]["status"] == "added"
+    assert by_path["src/new.bin"]["newBlob"] == _blob(root / "src" / "new.bin")
+    # Binary patches keep their terminating blank line through the split.
+    assert by_path["src/new.bin"]["patch"].endswith("\n\n")
+    with open(wds._OUT_FILE, encoding="utf-8") as fh:
+        assert "".join(f["patch"] for f in payload["files"]) == fh.read()
+
+    # Nothing changed since the last sync: no post at all.
+    assert _sync(runtime)["empty"] is True
+    assert len(posted) == 1
+
+
+def test_lost_index_triggers_a_full_resync(workspace, posted):
+    root, runtime = workspace
+    wds.prime_workspace_baseline_openshell(runtime)
+    (root / ".wfb-diff-git" / "wfb-index").unlink()
+    (root / "src" / "f3.txt").write_text("edited\n")
+
+    result = _sync(runtime)
+
+    assert result["full"] is True
+    assert [f["path"] for f in posted[-1]["files"]] == ["src/f3.txt"]
+    (root / "src" / "f3.txt").write_text("edited again\n")
+    assert _sync(runtime)["full"] is False
+
+
+def test_nested_repo_deltas_carry_the_subdir_prefix(workspace, posted):
+    root, runtime = workspace
+    repo = root / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    (repo / "app.py").write_text("print(1)\n")
+    wds.prime_workspace_baseline_openshell(runtime)
+
+    (repo / "app.py").write_text("print(2)\n")
+    _sync(runtime)
+
+    assert [f["path"] for f in posted[-1]["files"]] == ["repo/app.py"]
+    assert (repo / ".git" / "wfb-index").exists()
+
+
+def test_file_deltas_handles_mode_only_entries():
+    patch = (
+        "diff --git a/run.sh b/run.sh\n"
+        "old mode 100644\n"
+        "new mode 100755\n"
+    )
+
+    [delta] = wds._file_deltas(patch)
+
+    assert delta["path"] == "run.sh"
+    assert delta["oldBlob"] is None and delta["newBlob"] is None
+    assert delta["patch"] == patch
+
+
+def test_large_tree_sync_wall_clock(tmp_path, posted):
+    """Benchmark: one-file change in a ~2000-file tree, full resync (index
+    lost) vs. incremental capture from the baseline index."""
+    root = tmp_path / "big"
+    for d in range(20):
+        (root / f"pkg{d}").mkdir(parents=True)
+        for i in range(100):
+            (root / f"pkg{d}" / f"m{i}.py").write_text(f"x = {i}\n" * 1500)
+    home = tmp_path / "home"
+    home.mkdir()
+    runtime = _LocalRuntime(root, home)
+    wds.prime_workspace_baseline_openshell(runtime)
+
+    timings: dict[str, list[float]] = {"full": [], "incremental": []}
+    for round_ in range(3):
+        for mode in ("full", "incremental"):
+            if mode == "full":
+                (root / ".wfb-diff-git" / "wfb-index").unlink()
+            with open(root / "pkg3" / "m7.py", "a") as fh:
+                fh.write(f"y = {round_}\n")
+            started = time.perf_counter()
+            result = _sync(runtime)
+            timings[mode].append(time.perf_counter() - started)
+            assert result["full"] is (mode == "full")
+            assert [f["path"] for f in posted[-1]["files"]] == ["pkg3/m7.py"]
+
+    full, incremental = (statistics.median(timings[m]) for m in ("full", "incremental"))
+    print(f"\nworkspace diff sync: full={full:.3f}s incremental={incremental:.3f}s")
+    assert incremental < full
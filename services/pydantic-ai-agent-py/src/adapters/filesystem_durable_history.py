@@ -1,4 +1,31 @@
-"""Content-addressed durable transcript storage on the agent workspace PVC."""
+"""Content-addressed durable transcript storage on the agent workspace PVC.
+
+Transcripts are append-mostly: each model turn saves the previous history plus
+one or two new messages. Storing a full manifest per save (and re-verifying
+every message on every load) made a long session quadratic in hashing and PVC
+I/O, so manifests form a chain:
+
+* a **root** manifest (schema v1) lists every message ref;
+* a **chained** manifest (schema v2) names its ``parentRef`` plus only the
+  ``appendedRefs``, with a ``depth`` bounded by ``_MAX_CHAIN_DEPTH`` (the next
+  save after the bound writes a fresh root).
+
+Both carry the sha256 and byte size of the full canonical transcript. The
+digest is rolled forward from the parent's hash state, so a save only encodes
+and hashes the appended messages, and a load that walks a chain checks every
+ancestor's digest on the way.
+
+The adapter keeps an in-process LRU of verified message payloads and
+transcripts, keyed by digest and pinned to the object file's
+``(inode, size, mtime)``. Every load still reads and hashes the requested
+manifest; a transcript verified earlier in this process is then served from
+memory once its manifest and message files still match their stamps, so a
+load or save costs O(new messages) in hashing and reads. Any object that is
+not cached (another pod, a restart, an evicted or changed file) is re-read and
+verified exactly as before, so tampering is rejected on every load and a
+returned transcript always matches its reference. Callers receive freshly
+decoded message objects.
+"""
 
 from __future__ import annotations
 
@@ -7,7 +34,11 @@ import json
 import math
 import os
 import re
+import stat
 import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -24,8 +55,35 @@ _DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
 _HISTORY_REF_PATTERN = re.compile(r"^history\+sha256://([0-9a-f]{64})$")
 _MESSAGE_REF_PATTERN = re.compile(r"^message\+sha256://([0-9a-f]{64})$")
 _HISTORY_SCHEMA = "workflow-builder.pydantic-ai.durable-history/v1"
+_CHAINED_HISTORY_SCHEMA = "workflow-builder.pydantic-ai.durable-history/v2"
 _MESSAGE_SCHEMA = "workflow-builder.pydantic-ai.durable-message/v1"
 
+_ROOT_MANIFEST_KEYS = {
+    "messageRefs",
+    "schema",
+    "transcriptSha256",
+    "transcriptSizeBytes",
+}
+_CHAINED_MANIFEST_KEYS = {
+    "appendedRefs",
+    "depth",
+    "parentRef",
+    "schema",
+    "transcriptSha256",
+    "transcriptSizeBytes",
+}
+# Longest parent chain a cold load walks before reaching a root manifest.
+_MAX_CHAIN_DEPTH = 64
+_VERIFIED_TRANSCRIPT_LIMIT = 64
+_VERIFIED_MESSAGE_BYTES_LIMIT = 256 * 1024 * 1024
+
+# Canonical message envelopes are ``{"message":<message>,"schema":"..."}``
+# (sorted keys), so the message's own canonical bytes are a fixed slice.
+_ENVELOPE_PREFIX = b'{"message":'
+_ENVELOPE_SUFFIX = b',"schema":' + json.dumps(_MESSAGE_SCHEMA).encode("utf-8") + b"}"
+
+_Stamp = tuple[int, int, int]
+
 
 def _sha256(payload: bytes) -> str:
     return hashlib.sha256(payload).hexdigest()
@@ -59,26 +117,88 @@ def _validate_json_value(value: Any, *, location: str = "$") -> None:
     )
 
 
+_CANONICAL_ENCODER = json.JSONEncoder(
+    allow_nan=False,
+    ensure_ascii=False,
+    separators=(",", ":"),
+    sort_keys=True,
+)
+
+
+def _encode_json(value: Any) -> bytes:
+    try:
+        return _CANONICAL_ENCODER.encode(value).encode("utf-8")
+    except (RecursionError, TypeError, UnicodeEncodeError, ValueError) as exc:
+        raise DurableHistorySerializationError(
+            "value cannot be encoded as canonical JSON"
+        ) from exc
+
+
 def _canonical_json(value: Any) -> bytes:
     try:
         _validate_json_value(value)
-        return json.dumps(
-            value,
-            allow_nan=False,
-            ensure_ascii=False,
-            separators=(",", ":"),
-            sort_keys=True,
-        ).encode("utf-8")
-    except DurableHistorySerializationError:
-        raise
-    except (RecursionError, TypeError, UnicodeEncodeError, ValueError) as exc:
+    except RecursionError as exc:
         raise DurableHistorySerializationError(
             "value cannot be encoded as canonical JSON"
         ) from exc
+    return _encode_json(value)
+
+
+def _file_stamp(path: Path) -> _Stamp | None:
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISREG(info.st_mode):
+        return None
+    return (info.st_ino, info.st_size, info.st_mtime_ns)
+
+
+@dataclass(frozen=True, slots=True)
+class _VerifiedMessage:
+    digest: str
+    canonical: bytes
+    stamp: _Stamp
+
+
+@dataclass(frozen=True, slots=True)
+class _VerifiedTranscript:
+    digest: str
+    messages: tuple[_VerifiedMessage, ...]
+    # sha256 over ``[`` + the comma-joined messages, not yet closed.
+    hasher: Any
+    size_bytes: int
+    depth: int
+    # The manifest file as it was when this transcript was verified.
+    stamp: _Stamp
+
+    def transcript_bytes(self) -> bytes:
+        return b"[" + b",".join(item.canonical for item in self.messages) + b"]"
+
+
+def _close_digest(hasher: Any) -> str:
+    closed = hasher.copy()
+    closed.update(b"]")
+    return closed.hexdigest()
+
+
+def _extend(
+    hasher: Any, size_bytes: int, count: int, canonicals: list[bytes]
+) -> tuple[Any, int]:
+    """Roll ``(hasher, size)`` of a ``count``-message transcript forward."""
+    hasher = hasher.copy()
+    for canonical in canonicals:
+        if count:
+            hasher.update(b",")
+            size_bytes += 1
+        hasher.update(canonical)
+        size_bytes += len(canonical)
+        count += 1
+    return hasher, size_bytes
 
 
 class FilesystemDurableHistoryAdapter:
-    """Store immutable message blobs and ordered transcript manifests."""
+    """Store immutable message blobs and chained transcript manifests."""
 
     def __init__(self, workspace_root: str | Path, *, max_bytes: int) -> None:
         if (
@@ -104,6 +224,13 @@ class FilesystemDurableHistoryAdapter:
         self._manifests.mkdir(mode=0o700, exist_ok=True)
         self._max_bytes = max_bytes
 
+        self._lock = threading.Lock()
+        self._verified_messages: OrderedDict[str, _VerifiedMessage] = OrderedDict()
+        self._verified_message_bytes = 0
+        self._verified_transcripts: OrderedDict[str, _VerifiedTranscript] = (
+            OrderedDict()
+        )
+
     @staticmethod
     def _reference(scheme: str, digest: str) -> str:
         return f"{scheme}://{digest}"
@@ -200,31 +327,86 @@ class FilesystemDurableHistoryAdapter:
                 max_bytes=self._max_bytes,
             )
 
-    def _encode_message(self, message: dict[str, Any]) -> tuple[bytes, str]:
-        if not isinstance(message, dict):
-            raise DurableHistorySerializationError(
-                "durable transcript messages must be JSON objects"
-            )
-        self._check_budget(len(_canonical_json([message])))
-        envelope = {
-            "message": message,
-            "schema": _MESSAGE_SCHEMA,
-        }
-        payload = _canonical_json(envelope)
-        return payload, _sha256(payload)
-
-    def save_message(self, message: dict[str, Any]) -> str:
-        payload, digest = self._encode_message(message)
-        self._atomic_write(self._messages / f"{digest}.json", payload)
-        return self._reference(_MESSAGE_SCHEME, digest)
-
-    def load_message(self, reference: str) -> dict[str, Any]:
-        digest = self._parse_reference(reference, history=False)
-        payload = self._read_verified(
-            self._messages / f"{digest}.json",
-            digest,
-            kind="message",
+    # -- verified-object cache ---------------------------------------------
+
+    def _message_path(self, digest: str) -> Path:
+        return self._messages / f"{digest}.json"
+
+    def _manifest_path(self, digest: str) -> Path:
+        return self._manifests / f"{digest}.json"
+
+    def _remember_message(self, record: _VerifiedMessage) -> None:
+        with self._lock:
+            previous = self._verified_messages.pop(record.digest, None)
+            if previous is not None:
+                self._verified_message_bytes -= len(previous.canonical)
+            self._verified_messages[record.digest] = record
+            self._verified_message_bytes += len(record.canonical)
+            while (
+                self._verified_message_bytes > _VERIFIED_MESSAGE_BYTES_LIMIT
+                and len(self._verified_messages) > 1
+            ):
+                _, evicted = self._verified_messages.popitem(last=False)
+                self._verified_message_bytes -= len(evicted.canonical)
+
+    def _known_message(self, digest: str) -> _VerifiedMessage | None:
+        with self._lock:
+            record = self._verified_messages.get(digest)
+            if record is not None:
+                self._verified_messages.move_to_end(digest)
+        if record is None or _file_stamp(self._message_path(digest)) != record.stamp:
+            return None
+        return record
+
+    def _remember_transcript(self, record: _VerifiedTranscript) -> None:
+        with self._lock:
+            self._verified_transcripts.pop(record.digest, None)
+            self._verified_transcripts[record.digest] = record
+            while len(self._verified_transcripts) > _VERIFIED_TRANSCRIPT_LIMIT:
+                self._verified_transcripts.popitem(last=False)
+
+    def _cached_transcript(self, digest: str) -> _VerifiedTranscript | None:
+        with self._lock:
+            record = self._verified_transcripts.get(digest)
+            if record is not None:
+                self._verified_transcripts.move_to_end(digest)
+            return record
+
+    def _transcript_intact(
+        self, record: _VerifiedTranscript, stamp: _Stamp | None = None
+    ) -> bool:
+        """The manifest and every message file are unchanged since the
+        transcript was verified (one ``lstat`` each, no reads)."""
+        if stamp is None:
+            stamp = _file_stamp(self._manifest_path(record.digest))
+        return stamp == record.stamp and all(
+            _file_stamp(self._message_path(item.digest)) == item.stamp
+            for item in record.messages
         )
+
+    # -- messages ------------------------------------------------------------
+
+    def _store_message(self, canonical: bytes) -> _VerifiedMessage:
+        """Write one validated message's envelope unless it is already verified."""
+        self._check_budget(len(canonical) + 2)
+        payload = _ENVELOPE_PREFIX + canonical + _ENVELOPE_SUFFIX
+        digest = _sha256(payload)
+        known = self._known_message(digest)
+        if known is not None:
+            return known
+        path = self._message_path(digest)
+        self._atomic_write(path, payload)
+        record = _VerifiedMessage(digest, canonical, _file_stamp(path) or (0, 0, 0))
+        self._remember_message(record)
+        return record
+
+    def _verified_message(self, digest: str) -> _VerifiedMessage:
+        known = self._known_message(digest)
+        if known is not None:
+            return known
+        path = self._message_path(digest)
+        stamp = _file_stamp(path)
+        payload = self._read_verified(path, digest, kind="message")
         envelope = self._decode_canonical_object(payload, kind="message")
         if (
             set(envelope) != {"message", "schema"}
@@ -233,18 +415,52 @@ class FilesystemDurableHistoryAdapter:
             raise DurableHistoryIntegrityError(
                 "durable message object has an unsupported schema"
             )
-        message = envelope.get("message")
-        if not isinstance(message, dict):
+        if not isinstance(envelope.get("message"), dict):
             raise DurableHistoryIntegrityError(
                 "durable message object is missing its message"
             )
-        try:
-            self._check_budget(len(_canonical_json([message])))
-        except DurableHistorySerializationError as exc:
-            raise DurableHistoryIntegrityError(
-                "durable message object contains unsupported JSON"
-            ) from exc
-        return message
+        # The envelope is canonical, so its message bytes are canonical too.
+        canonical = payload[len(_ENVELOPE_PREFIX) : -len(_ENVELOPE_SUFFIX)]
+        self._check_budget(len(canonical) + 2)
+        record = _VerifiedMessage(digest, canonical, stamp or (0, 0, 0))
+        if stamp is not None:
+            self._remember_message(record)
+        return record
+
+    def save_message(self, message: dict[str, Any]) -> str:
+        if not isinstance(message, dict):
+            raise DurableHistorySerializationError(
+                "durable transcript messages must be JSON objects"
+            )
+        record = self._store_message(_canonical_json(message))
+        return self._reference(_MESSAGE_SCHEME, record.digest)
+
+    def load_message(self, reference: str) -> dict[str, Any]:
+        digest = self._parse_reference(reference, history=False)
+        return json.loads(self._verified_message(digest).canonical)
+
+    # -- transcripts ---------------------------------------------------------
+
+    def _longest_cached_prefix(
+        self, encoded: list[bytes]
+    ) -> _VerifiedTranscript | None:
+        with self._lock:
+            candidates = list(reversed(self._verified_transcripts.values()))
+        best: _VerifiedTranscript | None = None
+        for candidate in candidates:
+            count = len(candidate.messages)
+            if count > len(encoded) or (best is not None and count <= len(best.messages)):
+                continue
+            if count and candidate.messages[-1].canonical != encoded[count - 1]:
+                continue
+            if all(
+                item.canonical == encoded[index]
+                for index, item in enumerate(candidate.messages)
+            ) and self._transcript_intact(candidate):
+                best = candidate
+                if count == len(encoded):
+                    break
+        return best
 
     def save(self, messages: list[dict[str, Any]]) -> str:
         if not isinstance(messages, list):
@@ -256,79 +472,201 @@ class FilesystemDurableHistoryAdapter:
                 "durable transcript messages must be JSON objects"
             )
 
-        transcript_payload = _canonical_json(messages)
-        self._check_budget(len(transcript_payload))
-
-        encoded_messages = [self._encode_message(message) for message in messages]
-        message_refs: list[str] = []
-        for payload, digest in encoded_messages:
-            self._atomic_write(self._messages / f"{digest}.json", payload)
-            message_refs.append(self._reference(_MESSAGE_SCHEME, digest))
-
-        manifest = {
-            "messageRefs": message_refs,
-            "schema": _HISTORY_SCHEMA,
-            "transcriptSha256": _sha256(transcript_payload),
-            "transcriptSizeBytes": len(transcript_payload),
-        }
+        encoded = [_encode_json(message) for message in messages]
+        parent = self._longest_cached_prefix(encoded)
+        reused = len(parent.messages) if parent is not None else 0
+        # A reused prefix is byte-identical to messages that were validated
+        # when first stored; only the appended ones need the full check.
+        for message in messages[reused:]:
+            _canonical_json(message)
+        transcript_size = 2 + sum(len(item) for item in encoded) + max(
+            0, len(encoded) - 1
+        )
+        self._check_budget(transcript_size)
+
+        if parent is not None and reused == len(encoded):
+            return self._reference(_HISTORY_SCHEME, parent.digest)
+
+        appended = [self._store_message(item) for item in encoded[reused:]]
+        if parent is not None and parent.depth < _MAX_CHAIN_DEPTH:
+            hasher, size_bytes = _extend(
+                parent.hasher, parent.size_bytes - 1, reused, encoded[reused:]
+            )
+            prefix = parent.messages
+            depth = parent.depth + 1
+            manifest: dict[str, Any] = {
+                "appendedRefs": [
+                    self._reference(_MESSAGE_SCHEME, item.digest) for item in appended
+                ],
+                "depth": depth,
+                "parentRef": self._reference(_HISTORY_SCHEME, parent.digest),
+                "schema": _CHAINED_HISTORY_SCHEMA,
+            }
+        else:
+            if parent is not None:
+                appended = [*parent.messages, *appended]
+            hasher, size_bytes = _extend(hashlib.sha256(b"["), 1, 0, encoded)
+            prefix = ()
+            depth = 0
+            manifest = {
+                "messageRefs": [
+                    self._reference(_MESSAGE_SCHEME, item.digest) for item in appended
+                ],
+                "schema": _HISTORY_SCHEMA,
+            }
+        size_bytes += 1  # closing bracket
+        manifest["transcriptSha256"] = _close_digest(hasher)
+        manifest["transcriptSizeBytes"] = size_bytes
+
         manifest_payload = _canonical_json(manifest)
         manifest_digest = _sha256(manifest_payload)
-        self._atomic_write(
-            self._manifests / f"{manifest_digest}.json",
-            manifest_payload,
-        )
+        manifest_path = self._manifest_path(manifest_digest)
+        self._atomic_write(manifest_path, manifest_payload)
+        stamp = _file_stamp(manifest_path)
+        if stamp is not None:
+            self._remember_transcript(
+                _VerifiedTranscript(
+                    digest=manifest_digest,
+                    messages=(*prefix, *appended),
+                    hasher=hasher,
+                    size_bytes=size_bytes,
+                    depth=depth,
+                    stamp=stamp,
+                )
+            )
         return self._reference(_HISTORY_SCHEME, manifest_digest)
 
-    def load(self, reference: str) -> list[dict[str, Any]]:
-        digest = self._parse_reference(reference, history=True)
-        payload = self._read_verified(
-            self._manifests / f"{digest}.json",
-            digest,
-            kind="history manifest",
-        )
+    def _decode_manifest(self, payload: bytes) -> dict[str, Any]:
         manifest = self._decode_canonical_object(payload, kind="history manifest")
-        if (
-            set(manifest)
-            != {
-                "messageRefs",
-                "schema",
-                "transcriptSha256",
-                "transcriptSizeBytes",
-            }
-            or manifest.get("schema") != _HISTORY_SCHEMA
-        ):
+        schema = manifest.get("schema")
+        expected_keys = (
+            _ROOT_MANIFEST_KEYS
+            if schema == _HISTORY_SCHEMA
+            else _CHAINED_MANIFEST_KEYS
+            if schema == _CHAINED_HISTORY_SCHEMA
+            else None
+        )
+        if expected_keys is None or set(manifest) != expected_keys:
             raise DurableHistoryIntegrityError(
                 "durable history manifest has an unsupported schema"
             )
 
-        message_refs = manifest.get("messageRefs")
+        refs = manifest.get(
+            "messageRefs" if schema == _HISTORY_SCHEMA else "appendedRefs"
+        )
         expected_digest = manifest.get("transcriptSha256")
         expected_size = manifest.get("transcriptSizeBytes")
+        depth = manifest.get("depth", 0)
         if (
-            not isinstance(message_refs, list)
-            or any(not isinstance(item, str) for item in message_refs)
+            not isinstance(refs, list)
+            or any(not isinstance(item, str) for item in refs)
             or not isinstance(expected_digest, str)
             or _DIGEST_PATTERN.fullmatch(expected_digest) is None
             or isinstance(expected_size, bool)
             or not isinstance(expected_size, int)
             or expected_size < 0
+            or isinstance(depth, bool)
+            or not isinstance(depth, int)
+            or (schema == _CHAINED_HISTORY_SCHEMA and not 1 <= depth <= _MAX_CHAIN_DEPTH)
+            or (
+                schema == _CHAINED_HISTORY_SCHEMA
+                and not isinstance(manifest.get("parentRef"), str)
+            )
         ):
             raise DurableHistoryIntegrityError(
                 "durable history manifest contains invalid metadata"
             )
         self._check_budget(expected_size)
-
-        messages = [self.load_message(item) for item in message_refs]
-        transcript_payload = _canonical_json(messages)
-        actual_size = len(transcript_payload)
-        self._check_budget(actual_size)
-        if actual_size != expected_size:
+        return manifest
+
+    def _verify_transcript(
+        self,
+        *,
+        digest: str,
+        manifest: dict[str, Any],
+        stamp: _Stamp | None,
+        parent: _VerifiedTranscript | None,
+    ) -> _VerifiedTranscript:
+        if manifest["schema"] == _HISTORY_SCHEMA:
+            refs = manifest["messageRefs"]
+            prefix: tuple[_VerifiedMessage, ...] = ()
+            hasher, size_bytes = hashlib.sha256(b"["), 1
+        else:
+            assert parent is not None
+            if manifest["depth"] != parent.depth + 1:
+                raise DurableHistoryIntegrityError(
+                    "durable history manifest contains invalid metadata"
+                )
+            refs = manifest["appendedRefs"]
+            prefix = parent.messages
+            hasher, size_bytes = parent.hasher, parent.size_bytes - 1
+        appended = [
+            self._verified_message(self._parse_reference(item, history=False))
+            for item in refs
+        ]
+        hasher, size_bytes = _extend(
+            hasher, size_bytes, len(prefix), [item.canonical for item in appended]
+        )
+        size_bytes += 1
+        self._check_budget(size_bytes)
+        if size_bytes != manifest["transcriptSizeBytes"]:
             raise DurableHistoryIntegrityError(
                 "durable transcript size does not match its manifest"
             )
-        actual_digest = _sha256(transcript_payload)
-        if actual_digest != expected_digest:
+        if _close_digest(hasher) != manifest["transcriptSha256"]:
             raise DurableHistoryIntegrityError(
                 "durable transcript sha256 does not match its manifest"
             )
-        return messages
+        record = _VerifiedTranscript(
+            digest=digest,
+            messages=(*prefix, *appended),
+            hasher=hasher,
+            size_bytes=size_bytes,
+            depth=manifest.get("depth", 0),
+            stamp=stamp or (0, 0, 0),
+        )
+        if stamp is not None:
+            self._remember_transcript(record)
+        return record
+
+    def load(self, reference: str) -> list[dict[str, Any]]:
+        digest = self._parse_reference(reference, history=True)
+        path = self._manifest_path(digest)
+        stamp = _file_stamp(path)
+        payload = self._read_verified(path, digest, kind="history manifest")
+        cached = self._cached_transcript(digest)
+        if (
+            cached is not None
+            and stamp is not None
+            and self._transcript_intact(cached, stamp)
+        ):
+            return json.loads(cached.transcript_bytes())
+
+        # Walk parents until a root manifest or an intact cached ancestor.
+        pending: list[tuple[str, dict[str, Any], _Stamp | None]] = []
+        base: _VerifiedTranscript | None = None
+        while True:
+            manifest = self._decode_manifest(payload)
+            pending.append((digest, manifest, stamp))
+            if manifest["schema"] == _HISTORY_SCHEMA:
+                break
+            if len(pending) > _MAX_CHAIN_DEPTH:
+                raise DurableHistoryIntegrityError(
+                    "durable history manifest contains invalid metadata"
+                )
+            digest = self._parse_reference(manifest["parentRef"], history=True)
+            cached = self._cached_transcript(digest)
+            if cached is not None and self._transcript_intact(cached):
+                base = cached
+                break
+            path = self._manifest_path(digest)
+            stamp = _file_stamp(path)
+            payload = self._read_verified(path, digest, kind="history manifest")
+
+        record = base
+        for digest, manifest, stamp in reversed(pending):
+            record = self._verify_transcript(
+                digest=digest, manifest=manifest, stamp=stamp, parent=record
+            )
+        assert record is not None
+        return json.loads(record.transcript_bytes())
@@ -130,6 +130,9 @@ def test_load_detects_manifest_and_message_tampering(tmp_path, target):
 
     with pytest.raises(DurableHistoryIntegrityError, match="sha256 mismatch"):
         adapter.load(history_ref)
+    # A fresh adapter is another pod or a restart: nothing is cached.
+    with pytest.raises(DurableHistoryIntegrityError, match="sha256 mismatch"):
+        _adapter(tmp_path).load(history_ref)
 
 
 def test_missing_content_addressed_object_is_terminal_integrity_error(tmp_path):
@@ -242,3 +245,125 @@ def test_assistant_thinking_and_raw_tool_json_round_trip_unchanged(tmp_path):
 def test_save_rejects_values_that_cannot_round_trip_as_json(tmp_path, messages):
     with pytest.raises(DurableHistorySerializationError):
         _adapter(tmp_path).save(messages)
+
+
+def _manifest(tmp_path, reference: str) -> dict:
+    return json.loads(
+        (
+            tmp_path
+            / ".pydantic-ai"
+            / "durable-history"
+            / "manifests"
+            / f"{_digest(reference)}.json"
+        ).read_bytes()
+    )
+
+
+def _turn(index: int) -> list[dict]:
+    return [
+        {"kind": "response", "parts": [{"content": f"answer {index}", "part_kind": "text"}]},
+        {"kind": "request", "parts": [{"content": f"prompt {index}", "part_kind": "user-prompt"}]},
+    ]
+
+
+def test_appended_save_writes_chained_manifest_with_rolling_digest(tmp_path):
+    adapter = _adapter(tmp_path)
+    base = _turn(0)
+    base_ref = adapter.save(base)
+    extended = [*base, *_turn(1)]
+
+    extended_ref = adapter.save(extended)
+
+    manifest = _manifest(tmp_path, extended_ref)
+    assert manifest["schema"].endswith("/v2")
+    assert manifest["parentRef"] == base_ref
+    assert len(manifest["appendedRefs"]) == 2
+    assert manifest["transcriptSha256"] == hashlib.sha256(_canonical(extended)).hexdigest()
+    assert manifest["transcriptSizeBytes"] == len(_canonical(extended))
+    # A cold process walks the chain and verifies every ancestor.
+    assert _adapter(tmp_path).load(extended_ref) == extended
+    assert _adapter(tmp_path).load(base_ref) == base
+
+
+def test_rewritten_prefix_and_depth_bound_start_a_new_root(monkeypatch, tmp_path):
+    import src.adapters.filesystem_durable_history as module
+
+    monkeypatch.setattr(module, "_MAX_CHAIN_DEPTH", 2)
+    adapter = _adapter(tmp_path)
+    history = _turn(0)
+    refs = [adapter.save(history)]
+    for index in range(1, 4):
+        history = [*history, *_turn(index)]
+        refs.append(adapter.save(history))
+    compacted = [{"kind": "request", "parts": [{"content": "summary"}]}, *history[-2:]]
+    refs.append(adapter.save(compacted))
+
+    schemas = [_manifest(tmp_path, ref)["schema"][-2:] for ref in refs]
+    assert schemas == ["v1", "v2", "v2", "v1", "v1"]
+    assert _adapter(tmp_path).load(refs[3]) == history
+    assert _adapter(tmp_path).load(refs[4]) == compacted
+
+
+def test_cold_chain_load_detects_tampered_ancestor_message(tmp_path):
+    adapter = _adapter(tmp_path)
+    base_ref = adapter.save(_turn(0))
+    extended_ref = adapter.save([*_turn(0), *_turn(1)])
+    # Verify the chain cold once, then tamper with a root message.
+    assert _adapter(tmp_path).load(extended_ref) == [*_turn(0), *_turn(1)]
+    ancestor_message = _manifest(tmp_path, base_ref)["messageRefs"][0]
+    message_path = (
+        tmp_path
+        / ".pydantic-ai"
+        / "durable-history"
+        / "messages"
+        / f"{_digest(ancestor_message)}.json"
+    )
+    message_path.write_bytes(message_path.read_bytes() + b" ")
+
+    with pytest.raises(DurableHistoryIntegrityError, match="sha256 mismatch"):
+        _adapter(tmp_path).load(extended_ref)
+    # The writer's cached chain is not served over the tampered blob either,
+    # nor reused as the prefix of the next save.
+    with pytest.raises(DurableHistoryIntegrityError, match="sha256 mismatch"):
+        adapter.load(extended_ref)
+    next_ref = adapter.save([*_turn(0), *_turn(1), *_turn(2)])
+    assert _manifest(tmp_path, next_ref)["schema"][-2:] == "v1"
+
+
+def test_loaded_messages_are_independent_copies(tmp_path):
+    adapter = _adapter(tmp_path)
+    reference = adapter.save(_turn(0))
+
+    first = adapter.load(reference)
+    first[0]["parts"].clear()
+
+    assert adapter.load(reference) == _turn(0)
+
+
+def test_long_session_save_and_load_touch_only_new_messages(monkeypatch, tmp_path):
+    """Benchmark: a 500-turn session; per-turn save + load I/O stays O(new)."""
+    import time
+
+    adapter = _adapter(tmp_path)
+    history: list[dict] = []
+    reference = ""
+    reads: list[str] = []
+    real_read_bytes = Path.read_bytes
+
+    def counting_read_bytes(path: Path) -> bytes:
+        reads.append(path.parent.name)
+        return real_read_bytes(path)
+
+    monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+    started = time.perf_counter()
+    for index in range(500):
+        reads.clear()
+        history = [*history, *_turn(index)]
+        reference = adapter.save(history)
+        assert adapter.load(reference) == history
+    elapsed = time.perf_counter() - started
+    print(f"\n500-turn save+load: {elapsed * 1e3:.0f} ms total")
+
+    # Last turn: no message blob was read back; only the manifest was hashed.
+    assert reads == ["manifests"]
+    assert _adapter(tmp_path).load(reference) == history
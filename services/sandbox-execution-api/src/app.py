@@ -22,6 +22,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from src.content_tracing import set_current_span_io
+from src.k8s_informer import Informer, InformerRegistry
 from src.preview_runner_identity import (
     RUNNER_GENERATION_ANNOTATION,
     PreviewRunnerIdentityAdapter,
@@ -142,6 +143,7 @@ _init_otel()
 
 @asynccontextmanager
 async def _lifespan(_app: "FastAPI"):
+    _k8s_informers.enable()
     # Compatibility tombstone: profiled preview pools are retired and the size
     # helper is hard-disabled, so this cannot start a reconcile thread.
     try:
@@ -165,6 +167,7 @@ async def _lifespan(_app: "FastAPI"):
     except Exception as exc:  # pragma: no cover - never block startup on recovery
         logger.warning("dev-preview-activation: startup recovery failed: %s", exc)
     yield
+    _k8s_informers.shutdown()
 
 
 app = FastAPI(title="sandbox-execution-api", lifespan=_lifespan)
@@ -952,6 +955,86 @@ def _load_k8s_rbac_client():
     return client.RbacAuthorizationV1Api(_k8s_shared_api_client())
 
 
+def _selector_kwargs(label_selector: str | None) -> dict[str, str]:
+    return {"label_selector": label_selector} if label_selector else {}
+
+
+def _pods_informer(namespace: str | None, label_selector: str | None) -> Informer:
+    _batch, core = _load_k8s_clients()
+    if namespace:
+        return Informer(
+            f"pods/{namespace}",
+            core.list_namespaced_pod,
+            namespace=namespace,
+            **_selector_kwargs(label_selector),
+        )
+    return Informer(
+        "pods", core.list_pod_for_all_namespaces, **_selector_kwargs(label_selector)
+    )
+
+
+def _jobs_informer(namespace: str | None, label_selector: str | None) -> Informer:
+    batch, _core = _load_k8s_clients()
+    return Informer(
+        f"jobs/{namespace}",
+        batch.list_namespaced_job,
+        namespace=namespace,
+        **_selector_kwargs(label_selector),
+    )
+
+
+def _namespaces_informer(_namespace: str | None, label_selector: str | None) -> Informer:
+    _batch, core = _load_k8s_clients()
+    return Informer("namespaces", core.list_namespace, **_selector_kwargs(label_selector))
+
+
+def _leases_informer(namespace: str | None, label_selector: str | None) -> Informer:
+    return Informer(
+        f"leases/{namespace}",
+        _load_k8s_coordination_client().list_namespaced_lease,
+        namespace=namespace,
+        **_selector_kwargs(label_selector),
+    )
+
+
+def _sandboxes_informer(namespace: str | None, label_selector: str | None) -> Informer:
+    return Informer(
+        f"sandboxes/{namespace}",
+        _load_k8s_custom_objects_client().list_namespaced_custom_object,
+        group="agents.x-k8s.io",
+        version="v1alpha1",
+        namespace=namespace,
+        plural="sandboxes",
+        **_selector_kwargs(label_selector),
+    )
+
+
+# List+watch caches for readiness waits, the preview list and sweeps (see
+# src/k8s_informer.py). Started lazily per scope once the lifespan enables them;
+# every read site falls back to the direct API call when `_k8s_informer` is None.
+_k8s_informers = InformerRegistry(
+    {
+        "pods": _pods_informer,
+        "jobs": _jobs_informer,
+        "namespaces": _namespaces_informer,
+        "leases": _leases_informer,
+        "sandboxes": _sandboxes_informer,
+    }
+)
+
+
+def _k8s_informer(
+    kind: str,
+    namespace: str | None = None,
+    label_selector: str | None = None,
+    *,
+    sync_timeout: float | None = None,
+) -> Informer | None:
+    return _k8s_informers.get(
+        kind, namespace, label_selector, sync_timeout=sync_timeout
+    )
+
+
 # Stashes a Deployment's replica count before preview-native adopt scales it to 0,
 # so teardown can restore it (survives an SEA restart — state lives on the object).
 DEV_PREVIEW_ORIGINAL_REPLICAS_ANNOTATION = "wfb-dev-preview/original-replicas"
@@ -1894,10 +1977,19 @@ def _adopt_cleanup_stale_leases(
     blocked_releases: set[str],
     now: datetime | None = None,
 ) -> list[str]:
+    # The sweep only nominates candidates: each release rechecks claims under the
+    # transition lock and deletes with a resourceVersion precondition, so a
+    # watch-cached list is safe here.
+    selector = f"app={DEV_PREVIEW_ADOPTION_LEASE_LABEL}"
     try:
-        leases = coordination.list_namespaced_lease(
-            namespace=namespace,
-            label_selector=f"app={DEV_PREVIEW_ADOPTION_LEASE_LABEL}",
+        lease_cache = _k8s_informer("leases", namespace, selector, sync_timeout=0)
+        leases = (
+            lease_cache.list()
+            if lease_cache is not None
+            else coordination.list_namespaced_lease(
+                namespace=namespace,
+                label_selector=selector,
+            )
         )
     except Exception as exc:
         logger.warning("adopt: stale Lease sweep skipped (list failed): %s", exc)
@@ -4442,6 +4534,10 @@ def _wait_for_agent_host_ready(
     deadline = time.monotonic() + wait_seconds
     last_phase = "pending"
     last_failure: str | None = None
+    # Watch-driven when the pod informer for the namespace is synced: each tick
+    # reads the cache and blocks until a pod event (or the 1s probe cadence).
+    informer = _k8s_informer("pods", namespace, "app=agent-workflow-host")
+    seen = informer.version if informer is not None else 0
     while time.monotonic() < deadline:
         if failure_probe is not None:
             host_failure = failure_probe()
@@ -4450,10 +4546,13 @@ def _wait_for_agent_host_ready(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                     detail=f"agent workflow host {agent_app_id} failed before readiness: {host_failure}",
                 )
-        pods = core.list_namespaced_pod(
-            namespace=namespace,
-            label_selector=selector,
-        ).items
+        if informer is not None:
+            pods = informer.list(label_selector=selector).items
+        else:
+            pods = core.list_namespaced_pod(
+                namespace=namespace,
+                label_selector=selector,
+            ).items
         for pod in pods:
             failure = _pod_failure_reason(pod)
             if failure:
@@ -4481,7 +4580,12 @@ def _wait_for_agent_host_ready(
             phase = getattr(getattr(pod, "status", None), "phase", None)
             if phase:
                 last_phase = phase
-        time.sleep(1)
+        if informer is not None:
+            seen = informer.wait_for_change(
+                seen, min(1.0, max(0.0, deadline - time.monotonic()))
+            )
+        else:
+            time.sleep(1)
     logger.info(
         "agent workflow host %s was not ready after %ss; last phase %s; last failure %s",
         agent_app_id,
@@ -5612,11 +5716,26 @@ def _wait_for_dev_preview_ready(
         f"dev-preview-service={_dev_preview_service_label(service)}"
     )
 
+    informer = (
+        _k8s_informer(
+            "pods",
+            namespace,
+            f"{DEV_PREVIEW_MANAGED_LABEL}={DEV_PREVIEW_MANAGED_VALUE}",
+        )
+        if wait_seconds > 0
+        else None
+    )
+
+    def _list_pods() -> list[Any]:
+        if informer is not None:
+            return informer.list(label_selector=selector).items
+        return core.list_namespaced_pod(
+            namespace=namespace, label_selector=selector
+        ).items
+
     def _pod_ip() -> str | None:
         try:
-            pods = core.list_namespaced_pod(
-                namespace=namespace, label_selector=selector
-            ).items
+            pods = _list_pods()
         except Exception:
             return None
         for pod in pods:
@@ -5629,6 +5748,7 @@ def _wait_for_dev_preview_ready(
         return "queued", _pod_ip()
     deadline = time.monotonic() + wait_seconds
     last_failure: str | None = None
+    seen = informer.version if informer is not None else 0
     while time.monotonic() < deadline:
         if failure_probe is not None:
             failed = failure_probe()
@@ -5637,9 +5757,7 @@ def _wait_for_dev_preview_ready(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                     detail=f"dev-preview {execution_id} failed before readiness: {failed}",
                 )
-        pods = core.list_namespaced_pod(
-            namespace=namespace, label_selector=selector
-        ).items
+        pods = _list_pods()
         for pod in pods:
             failure = _pod_failure_reason(pod)
             if failure:
@@ -5652,7 +5770,12 @@ def _wait_for_dev_preview_ready(
                 continue
             if _pod_is_ready(pod):
                 return "ready", getattr(getattr(pod, "status", None), "pod_ip", None)
-        time.sleep(1)
+        if informer is not None:
+            seen = informer.wait_for_change(
+                seen, min(1.0, max(0.0, deadline - time.monotonic()))
+            )
+        else:
+            time.sleep(1)
     if last_failure:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -12406,8 +12529,26 @@ def _preview_reconciliation_marker_matches(
     )
 
 
+_VCLUSTER_PREVIEW_NAMESPACE_SELECTOR = "app=vcluster-preview"
+
+
+class _CachedNotFound(Exception):
+    """A synced informer has no such object: the cached equivalent of a 404."""
+
+    status = 404
+
+_VCLUSTER_PREVIEW_BFF_POD_SELECTOR = (
+    "app=workflow-builder,vcluster.loft.sh/namespace=workflow-builder"
+)
+
+
 def _vcluster_preview_phase(
-    batch, core, name: str, request_timeout: float | None = None
+    batch,
+    core,
+    name: str,
+    request_timeout: float | None = None,
+    *,
+    cached: bool = False,
 ) -> tuple[str, int, int, int]:
     """Phase keyed on the DURABLE vcluster (its host namespace), so a ready preview
     survives the provisioning Job's TTL GC. Readiness is the ACTUAL stack: a synced
@@ -12416,15 +12557,33 @@ def _vcluster_preview_phase(
 
     `request_timeout` (seconds) bounds each K8s call so one slow/hung preview can't
     stall the caller (the list endpoint probes previews concurrently and treats a
-    timed-out probe as not-ready rather than sinking the whole list)."""
+    timed-out probe as not-ready rather than sinking the whole list).
+
+    `cached=True` (the list endpoint) answers each of the three reads from the
+    job / preview-namespace / BFF-pod informers when they are synced; the
+    provisioning and status paths keep reading the API."""
     namespace = _vcluster_preview_control_namespace()
     job_name = _vcluster_preview_job_name(name, "up")
     active = succeeded = failed = 0
     job_found = False
-    try:
-        job = batch.read_namespaced_job_status(
-            name=job_name, namespace=namespace, _request_timeout=request_timeout
+    job_cache = namespace_cache = pod_cache = None
+    if cached:
+        job_cache = _k8s_informer("jobs", namespace, sync_timeout=0)
+        namespace_cache = _k8s_informer(
+            "namespaces", None, _VCLUSTER_PREVIEW_NAMESPACE_SELECTOR, sync_timeout=0
+        )
+        pod_cache = _k8s_informer(
+            "pods", None, _VCLUSTER_PREVIEW_BFF_POD_SELECTOR, sync_timeout=0
         )
+    try:
+        if job_cache is not None:
+            job = job_cache.get(job_name, namespace)
+            if job is None:
+                raise _CachedNotFound()
+        else:
+            job = batch.read_namespaced_job_status(
+                name=job_name, namespace=namespace, _request_timeout=request_timeout
+            )
         job_found = True
         st = job.status
         active = int(getattr(st, "active", 0) or 0)
@@ -12445,7 +12604,13 @@ def _vcluster_preview_phase(
     reconciliation_succeeded = False
     bff_ready = False
     try:
-        preview_namespace = core.read_namespace(
+        # A namespace missing from the labelled cache may simply be unlabelled:
+        # only a hit is trusted, a miss still reads the API.
+        preview_namespace = (
+            namespace_cache.get(f"vcluster-{name}")
+            if namespace_cache is not None
+            else None
+        ) or core.read_namespace(
             name=f"vcluster-{name}", _request_timeout=request_timeout
         )
         ns_exists = True
@@ -12458,14 +12623,14 @@ def _vcluster_preview_phase(
             raise
     if ns_exists:
         try:
-            pods = core.list_namespaced_pod(
-                namespace=f"vcluster-{name}",
-                label_selector=(
-                    "app=workflow-builder,"
-                    "vcluster.loft.sh/namespace=workflow-builder"
-                ),
-                _request_timeout=request_timeout,
-            )
+            if pod_cache is not None:
+                pods = pod_cache.list(namespace=f"vcluster-{name}")
+            else:
+                pods = core.list_namespaced_pod(
+                    namespace=f"vcluster-{name}",
+                    label_selector=_VCLUSTER_PREVIEW_BFF_POD_SELECTOR,
+                    _request_timeout=request_timeout,
+                )
             for p in pods.items:
                 labels = (
                     getattr(p.metadata, "labels", None) or {}
@@ -15069,8 +15234,16 @@ def _compute_vcluster_previews(*, include_pool: bool = False) -> dict[str, Any]:
 
     batch, core = _load_k8s_clients()
     # Durable: enumerate the preview VCLUSTER NAMESPACES (labeled by the runner),
-    # not the TTL-GC'd provisioning Jobs.
-    nss = core.list_namespace(label_selector="app=vcluster-preview")
+    # not the TTL-GC'd provisioning Jobs. Served from the namespace informer once
+    # it has synced; the first list after startup reads the API.
+    namespace_cache = _k8s_informer(
+        "namespaces", None, _VCLUSTER_PREVIEW_NAMESPACE_SELECTOR, sync_timeout=0
+    )
+    nss = (
+        namespace_cache.list()
+        if namespace_cache is not None
+        else core.list_namespace(label_selector=_VCLUSTER_PREVIEW_NAMESPACE_SELECTOR)
+    )
     # A claimed pool member is shown under the user's ALIAS but PROBED under its real member id
     # (its ns is vcluster-<real>); a baking/free/recycling member is a pool slot, hidden from
     # the user list but counted for capacity. A4: `awake` counts only HOT members — a slept
@@ -15119,6 +15292,7 @@ def _compute_vcluster_previews(*, include_pool: bool = False) -> dict[str, Any]:
                 core,
                 member.real_name,
                 request_timeout=_VCLUSTER_PREVIEW_PROBE_TIMEOUT,
+                cached=True,
             )
             return member, display_name, host, pool_state, phase
         except Exception as exc:
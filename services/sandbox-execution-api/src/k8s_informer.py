@@ -0,0 +1,415 @@
+"""List+watch caches for the Kubernetes reads the execution API repeats.
+
+Readiness waits and the vcluster preview list used to hit the API server on
+every tick: ``list_namespaced_pod`` once a second per waiting request, one
+namespace list plus a job read, namespace read and pod list per preview on
+every list refresh.  An ``Informer`` lists a resource once, then follows a
+watch from that resourceVersion and keeps an in-memory store with a
+label index.  Waiters block on the informer's change counter instead of
+sleeping, so a pod turning Ready wakes them immediately.
+
+The cache is eventually consistent.  It is only used for reads that the
+API answered with a fresh list before and that tolerate a watch delay:
+readiness polling, listing and sweeps.  Lease acquisition and anything
+that writes with a resourceVersion precondition keep reading the API.
+
+Cached objects are shared between callers and must not be mutated.
+
+ENV:
+  SANDBOX_K8S_INFORMERS              (default true)
+  SANDBOX_K8S_INFORMERS_MAX          (default 64 concurrently watched scopes)
+  SANDBOX_K8S_INFORMER_SYNC_SECONDS  (default 5, wait for the initial list)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_WATCH_TIMEOUT_SECONDS = 300
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+def informers_enabled() -> bool:
+    raw = os.environ.get("SANDBOX_K8S_INFORMERS", "true")
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def _field(value: Any, attr: str, key: str | None = None) -> Any:
+    """Read a field from a kubernetes model or from a custom-object dict."""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return value.get(key or attr)
+    return getattr(value, attr, None)
+
+
+def object_key(obj: Any) -> tuple[str, str]:
+    metadata = _field(obj, "metadata")
+    return (
+        str(_field(metadata, "namespace") or ""),
+        str(_field(metadata, "name") or ""),
+    )
+
+
+def object_labels(obj: Any) -> dict[str, str]:
+    return dict(_field(_field(obj, "metadata"), "labels") or {})
+
+
+def _resource_version(listing: Any) -> str | None:
+    return _field(_field(listing, "metadata"), "resource_version", "resourceVersion")
+
+
+def parse_label_selector(selector: str | None) -> list[tuple[str, str, str | None]]:
+    """``a=b,c!=d,e,!f`` -> ``[(op, key, value)]`` with op in ``= != exists !exists``.
+
+    Set-based selectors (``in``/``notin``) are not used by this service and
+    raise ``ValueError`` so a new caller cannot silently get a wrong answer.
+    """
+    terms: list[tuple[str, str, str | None]] = []
+    for raw in (selector or "").split(","):
+        term = raw.strip()
+        if not term:
+            continue
+        if " in " in term or " notin " in term or "(" in term:
+            raise ValueError(f"unsupported label selector term: {term!r}")
+        if "!=" in term:
+            key, value = term.split("!=", 1)
+            terms.append(("!=", key.strip(), value.strip()))
+        elif "==" in term:
+            key, value = term.split("==", 1)
+            terms.append(("=", key.strip(), value.strip()))
+        elif "=" in term:
+            key, value = term.split("=", 1)
+            terms.append(("=", key.strip(), value.strip()))
+        elif term.startswith("!"):
+            terms.append(("!exists", term[1:].strip(), None))
+        else:
+            terms.append(("exists", term, None))
+    return terms
+
+
+def _matches(labels: dict[str, str], terms: Iterable[tuple[str, str, str | None]]) -> bool:
+    for op, key, value in terms:
+        if op == "=" and labels.get(key) != value:
+            return False
+        if op == "!=" and labels.get(key) == value:
+            return False
+        if op == "exists" and key not in labels:
+            return False
+        if op == "!exists" and key in labels:
+            return False
+    return True
+
+
+class Listing(dict):
+    """A cached list result shaped like both API responses.
+
+    Core/batch callers read ``.items``; custom-object callers read
+    ``["items"]`` / ``.get("items")``.
+    """
+
+    def __init__(self, items: list[Any]) -> None:
+        super().__init__(items=items)
+
+    @property
+    def items(self) -> list[Any]:  # type: ignore[override]
+        return self["items"]
+
+
+class Informer:
+    """One list+watch loop over a (resource, namespace, server-side selector) scope.
+
+    ``list_fn`` is the kubernetes client list method (``list_namespaced_pod``,
+    ``list_namespace``, ``list_namespaced_custom_object``...) and ``list_kwargs``
+    the arguments that pin its scope.  ``watch_factory`` returns an object with
+    kubernetes' ``Watch`` interface (``stream(fn, **kwargs)`` and ``stop()``).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        list_fn: Callable[..., Any],
+        *,
+        watch_factory: Callable[[], Any] | None = None,
+        **list_kwargs: Any,
+    ) -> None:
+        self.name = name
+        self._list_fn = list_fn
+        self._list_kwargs = list_kwargs
+        self._watch_factory = watch_factory
+        self._store: dict[tuple[str, str], Any] = {}
+        self._label_index: dict[tuple[str, str], set[tuple[str, str]]] = {}
+        self._changed = threading.Condition()
+        self._version = 0
+        self._resource_version: str | None = None
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._watch: Any = None
+        self._thread: threading.Thread | None = None
+        self.relists = 0
+        self.events = 0
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def start(self) -> "Informer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"informer-{self.name}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        watch = self._watch
+        if watch is not None:
+            try:
+                watch.stop()
+            except Exception:
+                pass
+        with self._changed:
+            self._changed.notify_all()
+
+    @property
+    def synced(self) -> bool:
+        return self._synced.is_set() and not self._stop.is_set()
+
+    def wait_synced(self, timeout: float) -> bool:
+        return self._synced.wait(timeout) and not self._stop.is_set()
+
+    def _default_watch(self) -> Any:
+        from kubernetes import watch
+
+        return watch.Watch()
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+                self._follow()
+                backoff = 0.5
+            except Exception as exc:
+                if getattr(exc, "status", None) == 410:
+                    logger.info("informer %s: watch expired, relisting", self.name)
+                    self._resource_version = None
+                    continue
+                logger.warning("informer %s: watch failed: %s", self.name, exc)
+                self._resource_version = None
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, _MAX_BACKOFF_SECONDS)
+
+    def _relist(self) -> None:
+        listing = self._list_fn(**self._list_kwargs)
+        items = _field(listing, "items") or []
+        with self._changed:
+            self._store = {}
+            self._label_index = {}
+            for obj in items:
+                self._put(obj)
+            self._resource_version = _resource_version(listing)
+            self._bump()
+        self.relists += 1
+        self._synced.set()
+
+    def _follow(self) -> None:
+        factory = self._watch_factory or self._default_watch
+        self._watch = factory()
+        try:
+            for event in self._watch.stream(
+                self._list_fn,
+                resource_version=self._resource_version,
+                timeout_seconds=_WATCH_TIMEOUT_SECONDS,
+                allow_watch_bookmarks=True,
+                **self._list_kwargs,
+            ):
+                if self._stop.is_set():
+                    return
+                self._apply(event)
+                if self._resource_version is None:
+                    return  # 410 in-band: relist
+        finally:
+            self._watch = None
+
+    def _apply(self, event: dict[str, Any]) -> None:
+        kind = event.get("type")
+        obj = event.get("object")
+        if kind == "ERROR":
+            code = _field(obj, "code")
+            if code == 410:
+                self._resource_version = None
+                return
+            raise RuntimeError(f"watch error: {obj!r}")
+        rv = _resource_version(obj)
+        if kind == "BOOKMARK":
+            if rv:
+                self._resource_version = rv
+            return
+        with self._changed:
+            if kind == "DELETED":
+                self._drop(object_key(obj))
+            else:
+                self._put(obj)
+            if rv:
+                self._resource_version = rv
+            self.events += 1
+            self._bump()
+
+    # -- store (callers hold self._changed) ----------------------------------
+
+    def _put(self, obj: Any) -> None:
+        key = object_key(obj)
+        self._drop(key)
+        self._store[key] = obj
+        for label in object_labels(obj).items():
+            self._label_index.setdefault(label, set()).add(key)
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        previous = self._store.pop(key, None)
+        if previous is None:
+            return
+        for label in object_labels(previous).items():
+            keys = self._label_index.get(label)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._label_index[label]
+
+    def _bump(self) -> None:
+        self._version += 1
+        self._changed.notify_all()
+
+    # -- reads ---------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, name: str, namespace: str | None = None) -> Any | None:
+        with self._changed:
+            return self._store.get((namespace or "", name))
+
+    def list(self, label_selector: str | None = None, namespace: str | None = None) -> Listing:
+        terms = parse_label_selector(label_selector)
+        with self._changed:
+            equalities = [(key, value) for op, key, value in terms if op == "="]
+            if equalities:
+                candidates: set[tuple[str, str]] | None = None
+                for label in equalities:
+                    keys = self._label_index.get(label, set())
+                    candidates = set(keys) if candidates is None else candidates & keys
+                keys = sorted(candidates or ())
+            else:
+                keys = sorted(self._store)
+            items = [
+                self._store[key]
+                for key in keys
+                if (namespace is None or key[0] == namespace)
+                and _matches(object_labels(self._store[key]), terms)
+            ]
+        return Listing(items)
+
+    def wait_for_change(self, since: int, timeout: float) -> int:
+        """Block until the store changes after ``since`` (or timeout); return the version."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._changed:
+            while self._version == since and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return self._version
+
+
+class InformerRegistry:
+    """Lazily started informers keyed by scope, bounded by least-recent use.
+
+    ``factories`` maps a resource kind (``"pods"``) to a function building the
+    ``Informer`` for ``(namespace, label_selector)``.  ``get`` returns None when
+    informers are disabled or the initial list has not completed, so every
+    caller keeps its direct API read as the fallback.
+    """
+
+    def __init__(
+        self,
+        factories: dict[str, Callable[[str | None, str | None], Informer]],
+        *,
+        max_informers: int | None = None,
+    ) -> None:
+        self._factories = factories
+        self._max = max_informers or int(_env_float("SANDBOX_K8S_INFORMERS_MAX", 64))
+        self._informers: OrderedDict[tuple[str, str, str], Informer] = OrderedDict()
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    def enable(self) -> None:
+        self._enabled = informers_enabled()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._enabled = False
+            informers = list(self._informers.values())
+            self._informers.clear()
+        for informer in informers:
+            informer.stop()
+
+    def get(
+        self,
+        kind: str,
+        namespace: str | None = None,
+        label_selector: str | None = None,
+        *,
+        sync_timeout: float | None = None,
+    ) -> Informer | None:
+        if not self._enabled:
+            return None
+        key = (kind, namespace or "", label_selector or "")
+        evicted: list[Informer] = []
+        with self._lock:
+            informer = self._informers.get(key)
+            if informer is None:
+                try:
+                    informer = self._factories[kind](namespace, label_selector)
+                except Exception as exc:
+                    logger.warning("informer %s/%s: unavailable: %s", kind, namespace, exc)
+                    return None
+                self._informers[key] = informer.start()
+                while len(self._informers) > self._max:
+                    evicted.append(self._informers.popitem(last=False)[1])
+            self._informers.move_to_end(key)
+        for stale in evicted:
+            stale.stop()
+        if sync_timeout is None:
+            sync_timeout = _env_float("SANDBOX_K8S_INFORMER_SYNC_SECONDS", 5.0)
+        return informer if informer.wait_synced(sync_timeout) else None
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "kind": kind,
+                    "namespace": namespace or None,
+                    "labelSelector": selector or None,
+                    "synced": informer.synced,
+                    "objects": len(informer._store),
+                    "events": informer.events,
+                    "relists": informer.relists,
+                }
+                for (kind, namespace, selector), informer in self._informers.items()
+            ]
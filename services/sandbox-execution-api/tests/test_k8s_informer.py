@@ -0,0 +1,196 @@
+"""List+watch informer cache against an in-process fake API server."""
+
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.k8s_informer import Informer, InformerRegistry, parse_label_selector
+
+
+def _pod(name: str, *, namespace: str = "ns", ready: bool = False, **labels: str):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            name=name, namespace=namespace, labels=labels, resource_version=None
+        ),
+        status=SimpleNamespace(phase="Running" if ready else "Pending", ready=ready),
+    )
+
+
+class _FakeApiServer:
+    """Serves list calls and fans object changes out to open watches."""
+
+    def __init__(self, *objects) -> None:
+        self._objects = {(o.metadata.namespace, o.metadata.name): o for o in objects}
+        self._rv = 1
+        self._watches: list[queue.Queue] = []
+        self.list_calls = 0
+        self.lock = threading.Lock()
+
+    def list_namespaced_pod(self, namespace, label_selector=None, **_kwargs):
+        with self.lock:
+            self.list_calls += 1
+            terms = parse_label_selector(label_selector)
+            items = [
+                o
+                for (ns, _name), o in self._objects.items()
+                if ns == namespace
+                and all(o.metadata.labels.get(k) == v for _op, k, v in terms)
+            ]
+            return SimpleNamespace(
+                items=items, metadata=SimpleNamespace(resource_version=str(self._rv))
+            )
+
+    def emit(self, kind: str, obj) -> None:
+        with self.lock:
+            self._rv += 1
+            obj.metadata.resource_version = str(self._rv)
+            key = (obj.metadata.namespace, obj.metadata.name)
+            if kind == "DELETED":
+                self._objects.pop(key, None)
+            else:
+                self._objects[key] = obj
+            for events in self._watches:
+                events.put({"type": kind, "object": obj})
+
+    def expire_watches(self) -> None:
+        for events in self._watches:
+            events.put({"type": "ERROR", "object": {"code": 410}})
+
+    def watch(self):
+        server = self
+        events: queue.Queue = queue.Queue()
+
+        class _Watch:
+            def stream(self, fn, **kwargs):
+                with server.lock:
+                    server._watches.append(events)
+                while True:
+                    event = events.get()
+                    if event is None:
+                        return
+                    yield event
+
+            def stop(self):
+                events.put(None)
+
+        return _Watch()
+
+
+def _informer(server: _FakeApiServer, **kwargs) -> Informer:
+    informer = Informer(
+        "pods/ns",
+        server.list_namespaced_pod,
+        watch_factory=server.watch,
+        namespace="ns",
+        **kwargs,
+    ).start()
+    assert informer.wait_synced(2)
+    return informer
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_informer_lists_once_then_follows_the_watch() -> None:
+    server = _FakeApiServer(_pod("a", app="host", svc="x"), _pod("b", app="other"))
+    informer = _informer(server)
+    try:
+        assert [p.metadata.name for p in informer.list("app=host").items] == ["a"]
+
+        server.emit("ADDED", _pod("c", app="host", svc="y"))
+        server.emit("DELETED", _pod("a", app="host", svc="x"))
+        _wait_until(lambda: informer.get("a", "ns") is None)
+
+        assert [p.metadata.name for p in informer.list("app=host").items] == ["c"]
+        assert [p.metadata.name for p in informer.list("app=host,svc!=y").items] == []
+        assert [p.metadata.name for p in informer.list("!svc").items] == ["b"]
+        assert server.list_calls == 1
+    finally:
+        informer.stop()
+
+
+def test_label_index_follows_relabelled_objects() -> None:
+    server = _FakeApiServer(_pod("a", app="host"))
+    informer = _informer(server)
+    try:
+        server.emit("MODIFIED", _pod("a", app="moved"))
+        _wait_until(lambda: not informer.list("app=host").items)
+        assert [p.metadata.name for p in informer.list("app=moved").items] == ["a"]
+    finally:
+        informer.stop()
+
+
+def test_waiters_wake_on_watch_events_instead_of_polling() -> None:
+    server = _FakeApiServer(_pod("a", app="host"))
+    informer = _informer(server)
+    try:
+        seen = informer.version
+        threading.Timer(0.05, lambda: server.emit("MODIFIED", _pod("a", ready=True, app="host"))).start()
+
+        started = time.monotonic()
+        version = informer.wait_for_change(seen, timeout=5)
+
+        assert version > seen
+        assert time.monotonic() - started < 2
+        assert informer.get("a", "ns").status.ready is True
+        assert informer.wait_for_change(version, timeout=0.01) == version
+    finally:
+        informer.stop()
+
+
+def test_expired_watch_relists() -> None:
+    server = _FakeApiServer(_pod("a", app="host"))
+    informer = _informer(server)
+    try:
+        server.expire_watches()
+        _wait_until(lambda: server.list_calls == 2)
+        _wait_until(lambda: informer.relists == 2)
+        assert [p.metadata.name for p in informer.list().items] == ["a"]
+    finally:
+        informer.stop()
+
+
+def test_registry_is_off_until_enabled_and_bounded(monkeypatch) -> None:
+    server = _FakeApiServer(_pod("a", app="host"))
+    built: list[Informer] = []
+
+    def pods(namespace, label_selector):
+        informer = Informer(
+            f"pods/{namespace}",
+            server.list_namespaced_pod,
+            watch_factory=server.watch,
+            namespace="ns",
+        )
+        built.append(informer)
+        return informer
+
+    registry = InformerRegistry({"pods": pods}, max_informers=1)
+    assert registry.get("pods", "ns") is None
+
+    registry.enable()
+    first = registry.get("pods", "ns", sync_timeout=2)
+    assert first is not None and first.list().items
+    assert registry.get("pods", "ns", sync_timeout=2) is first
+
+    registry.get("pods", "other", sync_timeout=2)
+    assert len(registry.stats()) == 1
+    assert not first.synced  # evicted informers stop watching
+
+    registry.shutdown()
+    assert registry.get("pods", "ns") is None
+
+    monkeypatch.setenv("SANDBOX_K8S_INFORMERS", "false")
+    registry.enable()
+    assert registry.get("pods", "ns") is None
+
+
+def test_set_based_selectors_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        parse_label_selector("app in (a,b)")
@@ -2,6 +2,8 @@
  * script-evaluator HTTP server.
  *
  * Stateless Node service that re-runs dynamic workflow scripts in a vm sandbox.
+ * (The per-run journal replay cache is an optimization only: a miss answers
+ * 409 journal_cache_miss and the caller re-sends the full journal.)
  * Called over plain HTTP by the workflow-orchestrator's evaluate_script activity
  * (no Dapr sidecar).
  *
@@ -10,11 +12,13 @@
  *   HOST                    (default 0.0.0.0)
  *   SCRIPT_MAX_BYTES        (default 262144) — /evaluate + /validate script cap
  *   SCRIPT_EVAL_TIMEOUT_MS  (default 10000)  — per-evaluation host deadline
+ *   SCRIPT_JOURNAL_CACHE_MAX_ENTRIES (default 256) — journal replay cache
  *   OTEL_*                  — standard OpenTelemetry exporter config
  */
 import "./otel.js";
 
 import http from "node:http";
+import { journalCache } from "./journal-cache.js";
 import {
 	EVALUATOR_VERSION,
 	evaluateScript,
@@ -93,8 +97,17 @@ async function handleEvaluate(
 		return;
 	}
 
+	const resolved = journalCache.resolve(body);
+	if (!resolved.hit) {
+		sendJson(res, 409, { error: "journal_cache_miss" });
+		return;
+	}
+
 	try {
-		const result = await evaluateScript(body);
+		const result = await evaluateScript(resolved.request);
+		const kept = journalCache.commit(resolved.cacheKey, resolved.request, result.status);
+		// Only acknowledge a cursor a follow-up delta can actually build on.
+		if (body.journal) result.journal = { cursor: kept ? (body.journal.cursor ?? null) : null };
 		sendJson(res, 200, result);
 	} catch (err) {
 		// Unexpected evaluator crash → 5xx (retryable per contract).
@@ -0,0 +1,90 @@
+import { describe, expect, it } from "vitest";
+import { JournalCache } from "./journal-cache.js";
+import type { EvaluateRequest } from "./sandbox.js";
+
+function req(o: Partial<EvaluateRequest> = {}): EvaluateRequest {
+	return {
+		script: "export default 1",
+		scriptSha256: "sha-a",
+		executionId: "exec-1",
+		completedResults: {},
+		knownCallIds: [],
+		...o,
+	};
+}
+
+function seed(cache: JournalCache): void {
+	const full = req({
+		completedResults: { c1: { status: "done", value: "one" } },
+		journal: { mode: "full", cursor: "t1" },
+	});
+	const resolved = cache.resolve(full);
+	if (!resolved.hit) throw new Error("full request must not miss");
+	cache.commit(resolved.cacheKey, resolved.request, "need");
+}
+
+describe("journal replay cache", () => {
+	it("passes requests without a journal descriptor through untouched", () => {
+		const cache = new JournalCache(4);
+		const plain = req();
+		expect(cache.resolve(plain)).toEqual({ hit: true, request: plain, cacheKey: null });
+	});
+
+	it("merges a delta onto the committed map and unions knownCallIds", () => {
+		const cache = new JournalCache(4);
+		seed(cache);
+		const resolved = cache.resolve(
+			req({
+				completedResults: { c2: { status: "null", value: null } },
+				knownCallIds: ["c3"],
+				journal: { mode: "delta", baseCursor: "t1", cursor: "t2" },
+			}),
+		);
+		expect(resolved.hit).toBe(true);
+		if (!resolved.hit) return;
+		expect(Object.keys(resolved.request.completedResults ?? {}).sort()).toEqual(["c1", "c2"]);
+		expect(resolved.request.knownCallIds).toEqual(["c1", "c2", "c3"]);
+	});
+
+	it("drops retracted callIds before merging", () => {
+		const cache = new JournalCache(4);
+		seed(cache);
+		const resolved = cache.resolve(
+			req({ journal: { mode: "delta", baseCursor: "t1", cursor: "t2", retracted: ["c1"] } }),
+		);
+		if (!resolved.hit) throw new Error("expected hit");
+		expect(resolved.request.completedResults).toEqual({});
+	});
+
+	it("misses on an unknown run, a stale cursor or an edited script", () => {
+		const cache = new JournalCache(4);
+		seed(cache);
+		const delta = { mode: "delta" as const, baseCursor: "t1", cursor: "t2" };
+		expect(cache.resolve(req({ executionId: "exec-2", journal: delta })).hit).toBe(false);
+		expect(cache.resolve(req({ journal: { ...delta, baseCursor: "t0" } })).hit).toBe(false);
+		expect(cache.resolve(req({ scriptSha256: "sha-b", journal: delta })).hit).toBe(false);
+		expect(cache.resolve(req({ journal: { ...delta, key: "nested" } })).hit).toBe(false);
+	});
+
+	it("forgets finished runs and evicts the least recently committed run", () => {
+		const cache = new JournalCache(1);
+		seed(cache);
+		const other = req({ executionId: "exec-2", journal: { mode: "full", cursor: "t9" } });
+		expect(cache.commit("exec-2\u0000", other, "need")).toBe(true);
+		expect(cache.size).toBe(1);
+		expect(
+			cache.resolve(req({ journal: { mode: "delta", baseCursor: "t1", cursor: "t2" } })).hit,
+		).toBe(false);
+		expect(cache.commit("exec-2\u0000", other, "done")).toBe(false);
+		expect(cache.size).toBe(0);
+	});
+
+	it("reports an entry the bound evicts immediately as not kept", () => {
+		const cache = new JournalCache(0);
+		const full = req({ journal: { mode: "full", cursor: "t1" } });
+		const resolved = cache.resolve(full);
+		if (!resolved.hit) throw new Error("full request must not miss");
+		expect(cache.commit(resolved.cacheKey, resolved.request, "need")).toBe(false);
+		expect(cache.size).toBe(0);
+	});
+});
@@ -0,0 +1,111 @@
+/**
+ * Per-run replay cache — lets the pump ship journal DELTAS instead of the
+ * whole `completedResults` map on every /evaluate.
+ *
+ * The service stays stateless for correctness: the cache only remembers the
+ * merged `completedResults` a previous evaluation of the same run saw, keyed
+ * by `(executionId, journal.key)` and tagged with the orchestrator's journal
+ * cursor. A `delta` request names the cursor it builds on (`baseCursor`); any
+ * mismatch (different replica, eviction, restart, script edit) is a miss and
+ * the caller re-sends the full journal. Entries are only committed after a
+ * successful evaluation, so a crashed run never advances the cursor.
+ *
+ * ENV:
+ *   SCRIPT_JOURNAL_CACHE_MAX_ENTRIES (default 256) — LRU bound (runs)
+ */
+import type { CompletedResult, EvaluateRequest } from "./sandbox.js";
+
+export interface EvaluateJournal {
+	/** `full`: completedResults is the whole journal. `delta`: only rows
+	 * changed after `baseCursor`, merged onto the cached map. */
+	mode: "full" | "delta";
+	/** Distinguishes concurrent pumps sharing one executionId (nested runs). */
+	key?: string | null;
+	baseCursor?: string | null;
+	cursor: string | null;
+	/** callIds whose journal row went non-terminal (e.g. a structured-output
+	 * retry re-armed a call) — dropped from the cached map before merging. */
+	retracted?: string[];
+}
+
+interface JournalCacheEntry {
+	scriptSha256: string;
+	cursor: string | null;
+	completedResults: Record<string, CompletedResult>;
+}
+
+export type JournalResolution =
+	| { hit: true; request: EvaluateRequest; cacheKey: string | null }
+	| { hit: false };
+
+function cacheKeyOf(req: EvaluateRequest): string | null {
+	const executionId = typeof req.executionId === "string" ? req.executionId : "";
+	if (!executionId || !req.journal) return null;
+	return `${executionId}\u0000${req.journal.key ?? ""}`;
+}
+
+export class JournalCache {
+	private readonly entries = new Map<string, JournalCacheEntry>();
+
+	constructor(private readonly maxEntries: number) {}
+
+	get size(): number {
+		return this.entries.size;
+	}
+
+	/**
+	 * Expand a request into the full-journal request the sandbox evaluates.
+	 * Requests without a journal descriptor pass through untouched.
+	 */
+	resolve(req: EvaluateRequest): JournalResolution {
+		const cacheKey = cacheKeyOf(req);
+		const journal = req.journal;
+		if (!cacheKey || !journal || journal.mode !== "delta") {
+			return { hit: true, request: req, cacheKey };
+		}
+		const entry = this.entries.get(cacheKey);
+		if (
+			!entry ||
+			entry.scriptSha256 !== (req.scriptSha256 ?? "") ||
+			entry.cursor !== (journal.baseCursor ?? null)
+		) {
+			return { hit: false };
+		}
+		const completedResults = { ...entry.completedResults };
+		for (const callId of journal.retracted ?? []) delete completedResults[callId];
+		Object.assign(completedResults, req.completedResults ?? {});
+		const knownCallIds = new Set(req.knownCallIds ?? []);
+		for (const callId of Object.keys(completedResults)) knownCallIds.add(callId);
+		return {
+			hit: true,
+			cacheKey,
+			request: { ...req, completedResults, knownCallIds: [...knownCallIds].sort() },
+		};
+	}
+
+	/**
+	 * Remember the map a successful evaluation saw (or forget a finished run).
+	 * Returns whether the entry is still cached afterwards — false for finished
+	 * runs and when the LRU bound evicted it straight away.
+	 */
+	commit(cacheKey: string | null, req: EvaluateRequest, status: string): boolean {
+		if (!cacheKey || !req.journal) return false;
+		this.entries.delete(cacheKey);
+		if (status !== "need") return false;
+		this.entries.set(cacheKey, {
+			scriptSha256: req.scriptSha256 ?? "",
+			cursor: req.journal.cursor ?? null,
+			completedResults: req.completedResults ?? {},
+		});
+		while (this.entries.size > this.maxEntries) {
+			const oldest = this.entries.keys().next().value;
+			if (oldest === undefined) break;
+			this.entries.delete(oldest);
+		}
+		return this.entries.has(cacheKey);
+	}
+}
+
+export const journalCache = new JournalCache(
+	Math.max(0, parseInt(process.env.SCRIPT_JOURNAL_CACHE_MAX_ENTRIES || "256", 10) || 0),
+);
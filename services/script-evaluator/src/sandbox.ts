@@ -32,6 +32,7 @@ import {
 	sleepSemanticOpts,
 	workflowSemanticOpts,
 } from "./call-id.js";
+import type { EvaluateJournal } from "./journal-cache.js";
 import { extractMeta } from "./meta.js";
 
 export { extractMeta } from "./meta.js";
@@ -72,6 +73,11 @@ export interface EvaluateRequest {
 	 * only when DYNAMIC_SCRIPT_ACTIONS_ENABLED, so a flag-off deployment fails
 	 * scripts that reference them with a clear ReferenceError. */
 	features?: { actions?: boolean };
+	/** Journal delta descriptor (see journal-cache.ts). The HTTP handler
+	 * expands `delta` requests before evaluation; the sandbox only ever sees a
+	 * full `completedResults` map. */
+	executionId?: string;
+	journal?: EvaluateJournal;
 }
 
 export interface TaskOpts {
@@ -134,6 +140,11 @@ export interface EvaluateResponse {
 	logCount: number;
 	counts: { totalCallsSeen: number };
 	evaluatorVersion: string;
+	/** Journal acknowledgement. Present whenever the descriptor was applied;
+	 * `cursor` echoes the request cursor only when the replay cache kept this
+	 * evaluation's map (null otherwise) — the pump only sends deltas on top of
+	 * an acknowledged cursor. */
+	journal?: { cursor: string | null };
 }
 
 export interface ValidateResponse {
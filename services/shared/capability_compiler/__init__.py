@@ -33,6 +33,7 @@ from .skills import (
     render_skills_index,
     safe_package_relative_path,
     safe_skill_segment,
+    skill_package_digest,
     skill_package_entries,
 )
 
@@ -49,5 +50,6 @@ __all__ = [
     "render_skills_index",
     "safe_package_relative_path",
     "safe_skill_segment",
+    "skill_package_digest",
     "skill_package_entries",
 ]
@@ -27,6 +27,7 @@ from capability_compiler.skills import (
     compose_instruction_file,
     materialize_skills_local,
     render_skills_index,
+    skill_package_digest,
     skill_package_entries,
 )
 
@@ -284,3 +285,16 @@ def test_compose_skills_only_and_both_and_idempotent():
     # Idempotent: composing again from the same inputs yields the same bytes
     # (the instruction file is rewritten, never appended).
     assert compose_instruction_file("SYS", idx) == both
+
+
+def test_package_digest_is_content_addressed():
+    a = [{"path": "SKILL.md", "content": "x"}, {"path": "ref/a.md", "content": "y"}]
+    digest = skill_package_digest(a)
+    assert len(digest) == 64
+    assert skill_package_digest(list(reversed(a))) == digest
+    assert skill_package_digest([dict(e) for e in a]) == digest
+    assert skill_package_digest([a[0], {"path": "ref/a.md", "content": "z"}]) != digest
+    # Length-prefixed: moving bytes between path and content changes the digest.
+    assert skill_package_digest([{"path": "ab", "content": "c"}]) != skill_package_digest(
+        [{"path": "a", "content": "bc"}]
+    )
@@ -19,6 +19,7 @@ from __future__ import annotations
 import json
 import logging
 import re
+import threading
 from pathlib import Path
 
 import httpx
@@ -74,6 +75,24 @@ _DEFAULT_SANDBOX_PROFILE_CATALOG: dict[str, dict[str, object]] = {
 }
 
 
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
+
+
+def _shared_http_client() -> httpx.Client:
+    """Keep-alive HTTP client shared by the workspace lifecycle calls.
+
+    Built lazily and never closed per call, so cleanup/retention requests reuse
+    pooled connections instead of opening a fresh client (and TCP connection)
+    every time.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(timeout=15.0)
+        return _http_client
+
+
 def _post_json_with_details(
     *,
     client: httpx.Client,
@@ -400,17 +419,16 @@ def cleanup_execution_workspaces(ctx, input_data: dict) -> dict:
 
     with start_activity_span("activity.cleanup_execution_workspaces", otel, attrs):
         try:
-            with httpx.Client(timeout=15.0) as client:
-                payload = {
-                    "executionId": execution_id,
-                    "dbExecutionId": db_execution_id,
-                }
-                return _post_json_with_details(
-                    client=client,
-                    url=url,
-                    payload=payload,
-                    service_label="Workspace cleanup",
-                )
+            payload = {
+                "executionId": execution_id,
+                "dbExecutionId": db_execution_id,
+            }
+            return _post_json_with_details(
+                client=_shared_http_client(),
+                url=url,
+                payload=payload,
+                service_label="Workspace cleanup",
+            )
         except Exception as e:
             logger.error(f"[Cleanup Workspaces] Failed: {e}")
             return {"success": False, "error": str(e)}
@@ -462,22 +480,21 @@ def arm_execution_workspace_retention(ctx, input_data: dict) -> dict:
     }
 
     with start_activity_span("activity.arm_execution_workspace_retention", otel, attrs):
-        with httpx.Client(timeout=15.0) as client:
-            result = _post_json_with_details(
-                client=client,
-                url=url,
-                payload=payload,
-                service_label="Workspace retention arming",
+        result = _post_json_with_details(
+            client=_shared_http_client(),
+            url=url,
+            payload=payload,
+            service_label="Workspace retention arming",
+        )
+        if result.get("success") is False:
+            detail = str(result.get("error") or result.get("message") or result)
+            raise RuntimeError(
+                f"Workspace retention arming was rejected: {detail[:1200]}"
             )
-            if result.get("success") is False:
-                detail = str(result.get("error") or result.get("message") or result)
-                raise RuntimeError(
-                    f"Workspace retention arming was rejected: {detail[:1200]}"
-                )
-            if result.get("success") is not True and not isinstance(
-                result.get("results"), list
-            ):
-                raise RuntimeError(
-                    "Workspace retention arming returned no positive acknowledgement"
-                )
-            return result
+        if result.get("success") is not True and not isinstance(
+            result.get("results"), list
+        ):
+            raise RuntimeError(
+                "Workspace retention arming returned no positive acknowledgement"
+            )
+        return result
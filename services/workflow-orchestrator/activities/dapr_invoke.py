@@ -2,15 +2,321 @@
 
 Wraps DaprClient().invoke_method() to return a (status_code, json_body, raw_text)
 tuple, mirroring the httpx/requests response signature callers already expect.
+
+All activities share ONE process-wide DaprClient (one gRPC channel to the
+sidecar, reused across calls) via `shared_dapr_client()`, instead of paying
+channel setup per call — parallel fork branches used to open dozens of
+channels at once. Per target app-id:
+
+  - concurrent in-flight calls are bounded (DAPR_INVOKE_MAX_CONCURRENT_PER_APP,
+    default 32); a caller that cannot get a slot within its timeout fails with
+    a TimeoutError instead of piling more streams onto a saturated target;
+  - latency and errors are recorded as OTel histograms/counters
+    (`dapr.invoke.duration`, `dapr.invoke.errors`) and in an in-process
+    snapshot (`invocation_stats()`).
+
+A call that fails because the local sidecar connection broke (the client
+could not reach the sidecar, its socket closed, its channel was closed) swaps
+in a fresh client so the next call reconnects to the restarted sidecar;
+`reset_dapr_client()` does the same explicitly. Errors the sidecar relays
+from the invoked app — including UNAVAILABLE when the target is down — keep
+the client. A swapped-out client is closed only after the calls still using
+it return. Set DAPR_INVOKE_SHARED_CLIENT=false to go back to a client per
+call.
 """
 
 from __future__ import annotations
 
+import bisect
 import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
 
 from dapr.clients import DaprClient
 from content_tracing import io_attributes
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_PER_APP = 32
+
+# Histogram bucket upper bounds, milliseconds (last bucket is +inf).
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+# Failures of the client's own connection to the sidecar, as gRPC (and the
+# HTTP invocation client) word them locally.
+_SIDECAR_CONNECTION_MARKERS = (
+    "failed to connect to all addresses",
+    "connection refused",
+    "connection reset",
+    "socket closed",
+    "broken pipe",
+    "cannot invoke rpc on closed channel",
+    "cannot connect to host",
+)
+# The sidecar answered, relaying a failure of the invoked app (daprd's
+# ERR_DIRECT_INVOKE "fail to invoke, id: <app>, err: ..." and friends). These
+# can quote the app's own "connection refused" and must not reset the client.
+_INVOKED_APP_ERROR_MARKERS = (
+    "err_direct_invoke",
+    "fail to invoke",
+    "failed to invoke",
+    "error invoking app",
+    "app channel",
+)
+
+
+def _shared_client_enabled() -> bool:
+    raw = os.environ.get("DAPR_INVOKE_SHARED_CLIENT")
+    if raw is None:
+        return True
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _max_concurrent_per_app() -> int:
+    raw = os.environ.get("DAPR_INVOKE_MAX_CONCURRENT_PER_APP")
+    if raw and raw.strip():
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    return DEFAULT_MAX_CONCURRENT_PER_APP
+
+
+def _is_sidecar_unavailable(exc: BaseException) -> bool:
+    """True only for a broken connection to the local sidecar."""
+    code = getattr(exc, "code", None)
+    details = getattr(exc, "details", None)
+    message = str(exc)
+    if callable(code):
+        try:
+            if getattr(code(), "name", "") != "UNAVAILABLE":
+                return False
+            if callable(details):
+                message = str(details() or message)
+        except Exception:
+            return False
+    lowered = message.lower()
+    if any(marker in lowered for marker in _INVOKED_APP_ERROR_MARKERS):
+        return False
+    return any(marker in lowered for marker in _SIDECAR_CONNECTION_MARKERS)
+
+
+class _TargetStats:
+    __slots__ = ("calls", "errors", "in_flight", "total_ms", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "inFlight": self.in_flight,
+            "meanMs": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "latencyBucketsMs": {
+                **{
+                    str(bound): count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+                },
+                "+Inf": self.buckets[-1],
+            },
+        }
+
+
+_lock = threading.Lock()
+_client: Any = None
+_client_factory: Any = None
+# Callers inside shared_dapr_client per client (by id), and swapped-out
+# clients waiting for their last caller before they are closed.
+_client_users: dict[int, int] = {}
+_retired_clients: dict[int, Any] = {}
+_target_slots: dict[str, threading.BoundedSemaphore] = {}
+_target_stats: dict[str, _TargetStats] = {}
+_instruments: tuple[Any, Any] | None = None
+
+
+def _otel_instruments() -> tuple[Any, Any] | tuple[None, None]:
+    global _instruments
+    if _instruments is None:
+        try:
+            from opentelemetry import metrics
+
+            meter = metrics.get_meter("workflow-orchestrator.dapr-invoke")
+            _instruments = (
+                meter.create_histogram(
+                    "dapr.invoke.duration",
+                    unit="ms",
+                    description="Dapr service invocation latency per target app-id.",
+                ),
+                meter.create_counter(
+                    "dapr.invoke.errors",
+                    description="Failed Dapr service invocations per target app-id.",
+                ),
+            )
+        except Exception:
+            _instruments = (None, None)
+    return _instruments
+
+
+def _retire_locked(client: Any) -> Any:
+    """Take ``client`` out of service (``_lock`` held). Returns it when it can
+    be closed now; otherwise its last caller closes it on release."""
+    if client is None:
+        return None
+    if _client_users.get(id(client)):
+        _retired_clients[id(client)] = client
+        return None
+    return client
+
+
+def _acquire_shared_client() -> Any:
+    global _client, _client_factory
+    idle = None
+    with _lock:
+        # DaprClient is looked up at call time so a swapped factory (tests,
+        # reloads) never keeps serving a client built by the old one.
+        if _client is None or _client_factory is not DaprClient:
+            idle = _retire_locked(_client)
+            _client = DaprClient()
+            _client_factory = DaprClient
+        client = _client
+        _client_users[id(client)] = _client_users.get(id(client), 0) + 1
+    _close_client(idle)
+    return client
+
+
+def _release_shared_client(client: Any) -> None:
+    with _lock:
+        users = _client_users.get(id(client), 1) - 1
+        if users > 0:
+            _client_users[id(client)] = users
+            return
+        _client_users.pop(id(client), None)
+        retired = _retired_clients.pop(id(client), None)
+    _close_client(retired)
+
+
+def _close_client(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+def reset_dapr_client(reason: str = "", *, client: Any = None) -> None:
+    """Swap out the shared client; the next call opens a fresh channel.
+
+    With ``client``, only that client is swapped out (a no-op when another
+    caller already replaced it). Calls still using it finish on it; it is
+    closed after the last one returns.
+    """
+    global _client, _client_factory
+    with _lock:
+        if _client is None or (client is not None and client is not _client):
+            return
+        dropped, _client, _client_factory = _client, None, None
+        idle = _retire_locked(dropped)
+    logger.warning(
+        "[Dapr Invoke] Resetting shared Dapr client%s",
+        f": {reason[:200]}" if reason else "",
+    )
+    _close_client(idle)
+
+
+def _slot_for(app_id: str) -> threading.BoundedSemaphore:
+    with _lock:
+        slot = _target_slots.get(app_id)
+        if slot is None:
+            slot = _target_slots[app_id] = threading.BoundedSemaphore(
+                _max_concurrent_per_app()
+            )
+        return slot
+
+
+def _record(app_id: str, elapsed_ms: float, failed: bool) -> None:
+    with _lock:
+        stats = _target_stats.setdefault(app_id, _TargetStats())
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        if failed:
+            stats.errors += 1
+    histogram, errors = _otel_instruments()
+    attributes = {"dapr.target_service": app_id, "error": failed}
+    try:
+        if histogram is not None:
+            histogram.record(elapsed_ms, attributes)
+        if failed and errors is not None:
+            errors.add(1, {"dapr.target_service": app_id})
+    except Exception:
+        pass
+
+
+def invocation_stats() -> dict[str, dict[str, Any]]:
+    """Per-target call/error counts and latency histogram snapshot."""
+    with _lock:
+        return {app_id: stats.snapshot() for app_id, stats in _target_stats.items()}
+
+
+@contextmanager
+def shared_dapr_client(
+    app_id: str | None = None,
+    *,
+    timeout: float | None = None,
+) -> Iterator[Any]:
+    """Yield the process-wide DaprClient.
+
+    With `app_id`, the block counts against that target's concurrency bound
+    (waiting at most `timeout` seconds for a slot) and its latency/error
+    stats. Sidecar-connectivity errors reset the shared client before they
+    propagate.
+    """
+    if not _shared_client_enabled():
+        with DaprClient() as client:
+            yield client
+        return
+
+    slot = _slot_for(app_id) if app_id else None
+    if slot is not None and not slot.acquire(timeout=timeout if timeout else None):
+        raise TimeoutError(
+            f"Dapr invocation to {app_id} timed out waiting for one of "
+            f"{_max_concurrent_per_app()} concurrent slots"
+        )
+    started = time.perf_counter()
+    failed = False
+    if app_id:
+        with _lock:
+            _target_stats.setdefault(app_id, _TargetStats()).in_flight += 1
+    client = None
+    try:
+        client = _acquire_shared_client()
+        yield client
+    except BaseException as exc:
+        failed = True
+        if client is not None and _is_sidecar_unavailable(exc):
+            reset_dapr_client(str(exc), client=client)
+        raise
+    finally:
+        if client is not None:
+            _release_shared_client(client)
+        if app_id:
+            with _lock:
+                _target_stats[app_id].in_flight -= 1
+            _record(app_id, (time.perf_counter() - started) * 1000.0, failed)
+        if slot is not None:
+            slot.release()
+
 
 def _set_span_attrs(span, attributes: dict | None) -> None:
     if not span or not attributes:
@@ -79,7 +385,7 @@ def dapr_invoke(
         else None
     )
     try:
-        with DaprClient() as client:
+        with shared_dapr_client(app_id, timeout=timeout) as client:
             response = client.invoke_method(
                 app_id=app_id,
                 method_name=method_name,
@@ -7,6 +7,15 @@ seenLogCount, limits}``); the potentially-large ``completedResults`` map is load
 from the BFF journal HERE and forwarded over HTTP, never journaled into Dapr
 history.
 
+Journal cursor: a pump iteration that carries ``journalCursor`` (returned by
+the previous evaluation) loads only rows changed after that cursor and sends
+them as a ``journal: {mode: "delta"}`` request; the evaluator merges them onto
+the map it cached for the run. A ``409 journal_cache_miss`` (other replica,
+eviction, restart) or an evaluator that does not acknowledge the cursor falls
+back to the full journal, so the per-iteration cost tracks the rows that
+changed rather than the length of the journal. ``SCRIPT_JOURNAL_DELTA_ENABLED=false``
+restores the full load on every iteration.
+
 Error classification mirrors the AP-piece convention (``execute_action.py``):
   * transport / 5xx  -> RAISE (retried by ``_SCRIPT_EVAL_RETRY_POLICY`` in the
     workflow module),
@@ -38,6 +47,52 @@ def _evaluator_url() -> str:
     return os.environ.get("SCRIPT_EVALUATOR_URL", DEFAULT_SCRIPT_EVALUATOR_URL).rstrip("/")
 
 
+def _journal_delta_enabled() -> bool:
+    raw = os.environ.get("SCRIPT_JOURNAL_DELTA_ENABLED", "true").strip().lower()
+    return raw not in ("0", "false", "no", "off")
+
+
+def _change_seq(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value >= 0 else None
+    if isinstance(value, str) and value.strip().isdecimal():
+        return int(value.strip())
+    return None
+
+
+def _journal_cursor(rows: list[dict[str, Any]], previous: str | None) -> str | None:
+    """Highest ``changeSeq`` across ``rows`` (never lower than ``previous``).
+
+    ``changeSeq`` is the per-execution journal version the BFF assigns under the
+    execution row lock, so it becomes visible in commit order: every row written
+    after the read carries a higher value and ``changedAfter`` cannot skip it.
+    Rows without one (a BFF that predates the counter) yield no cursor, so the
+    next iteration loads the full journal.
+    """
+    newest = _change_seq(previous)
+    for row in rows:
+        seq = _change_seq(row.get("changeSeq"))
+        if seq is None:
+            return None
+        if newest is None or seq > newest:
+            newest = seq
+    return None if newest is None else str(newest)
+
+
+def _retracted_call_ids(rows: list[dict[str, Any]]) -> list[str]:
+    """Delta rows that are no longer terminal (e.g. a structured-output retry)."""
+    return sorted(
+        {
+            str(row.get("callId") or "").strip()
+            for row in rows
+            if str(row.get("callId") or "").strip()
+            and str(row.get("status") or "").strip() not in _TERMINAL_JOURNAL_STATUSES
+        }
+    )
+
+
 def _completed_results_from_journal(rows: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
     """Build the ``completedResults`` map the evaluator consumes.
 
@@ -74,11 +129,41 @@ def _script_error_response(message: str, *, stack: str | None = None) -> dict[st
     }
 
 
+def _post_evaluate(request_body: dict[str, Any]) -> requests.Response:
+    endpoint = f"{_evaluator_url()}/evaluate"
+    try:
+        return requests.post(
+            endpoint,
+            json=request_body,
+            timeout=30,
+        )
+    except requests.exceptions.RequestException as exc:
+        # Transport failure -> retryable (RAISE so the workflow RetryPolicy fires).
+        logger.warning("[evaluate_script] transport error calling %s: %s", endpoint, exc)
+        raise RuntimeError(f"evaluate_script: request failed: {exc}") from exc
+
+
+def _acknowledges(response: requests.Response, cursor: str | None) -> bool:
+    """Whether the evaluator applied the journal descriptor (pre-cursor builds ignore it).
+
+    An evaluator that applied it but did not cache the result acknowledges with
+    a null cursor; the response is still valid, only the next iteration is full.
+    """
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    ack = body.get("journal") if isinstance(body, dict) else None
+    return isinstance(ack, dict) and ack.get("cursor") in (cursor, None)
+
+
 def evaluate_script(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
     """Load the journal, POST ``/evaluate``, return the evaluator response body.
 
     Input keys: ``executionId, script, scriptSha256, meta, args, nested, budget,
-    knownCallIds, seenLogCount, limits``.
+    knownCallIds, seenLogCount, limits`` plus the optional journal cursor
+    (``journalCursor``, ``journalKey``). The returned body carries
+    ``journalCursor`` for the next iteration when the evaluator cached the run.
     """
     execution_id = str(input_data.get("executionId") or "").strip()
     if not execution_id:
@@ -95,52 +180,86 @@ def evaluate_script(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
     }
 
     with start_activity_span("activity.evaluate_script", otel, attrs):
-        # 1. Load journal rows (BFF) -> completedResults. This is the ONLY place
-        #    the full result map materializes; it is forwarded over HTTP, not
-        #    journaled into Dapr history.
-        rows = script_journal_client.list_script_calls(execution_id)
-        completed_results = _completed_results_from_journal(rows)
-        # Journal-authoritative known set (includes journal-imported done rows the
-        # pump never dispatched). Union with the pump's view for safety.
         pump_known = {
             str(c).strip()
             for c in (input_data.get("knownCallIds") or [])
             if str(c).strip()
         }
-        known_call_ids = sorted(set(completed_results.keys()) | pump_known)
-
-        request_body = {
+        base_request = {
             "script": input_data.get("script") or "",
             "scriptSha256": input_data.get("scriptSha256") or "",
             "meta": input_data.get("meta") or {},
             "nested": bool(input_data.get("nested")),
             "budget": input_data.get("budget")
             or {"total": None, "spent": 0, "exhausted": False, "lifetimeExceeded": False},
-            "completedResults": completed_results,
-            "knownCallIds": known_call_ids,
             "seenLogCount": int(input_data.get("seenLogCount") or 0),
             "limits": input_data.get("limits") or {},
         }
         # args is verbatim any-JSON; key-absence propagates so the script's
         # `args` global is undefined when no input was provided.
         if "args" in input_data:
-            request_body["args"] = input_data.get("args")
+            base_request["args"] = input_data.get("args")
         # Deployment capabilities (contract 1.2.0): features.actions installs the
         # action()/sleep()/approve()/waitForEvent() sandbox globals.
         if isinstance(input_data.get("features"), dict):
-            request_body["features"] = input_data["features"]
+            base_request["features"] = input_data["features"]
 
-        endpoint = f"{_evaluator_url()}/evaluate"
-        try:
-            response = requests.post(
-                endpoint,
-                json=request_body,
-                timeout=30,
+        delta_enabled = _journal_delta_enabled()
+        journal_key = str(input_data.get("journalKey") or "")
+        base_cursor = str(input_data.get("journalCursor") or "").strip() or None
+        changed_after = _change_seq(base_cursor) if base_cursor and delta_enabled else None
+
+        response = None
+        cursor: str | None = None
+        if changed_after is not None:
+            # Delta: only rows changed after the previous evaluation's cursor.
+            rows = script_journal_client.list_script_calls(
+                execution_id, changed_after=changed_after
             )
-        except requests.exceptions.RequestException as exc:
-            # Transport failure -> retryable (RAISE so the workflow RetryPolicy fires).
-            logger.warning("[evaluate_script] transport error calling %s: %s", endpoint, exc)
-            raise RuntimeError(f"evaluate_script: request failed: {exc}") from exc
+            completed_results = _completed_results_from_journal(rows)
+            cursor = _journal_cursor(rows, base_cursor)
+            request_body = {
+                **base_request,
+                "completedResults": completed_results,
+                "knownCallIds": sorted(set(completed_results.keys()) | pump_known),
+                "executionId": execution_id,
+                "journal": {
+                    "mode": "delta",
+                    "key": journal_key,
+                    "baseCursor": base_cursor,
+                    "cursor": cursor,
+                    "retracted": _retracted_call_ids(rows),
+                },
+            }
+            response = _post_evaluate(request_body)
+            if response.status_code == 409 or (
+                response.status_code < 400 and not _acknowledges(response, cursor)
+            ):
+                logger.info(
+                    "[evaluate_script] journal delta not applied (HTTP %s); "
+                    "re-sending full journal",
+                    response.status_code,
+                )
+                response = None
+
+        if response is None:
+            # 1. Load journal rows (BFF) -> completedResults. This is the ONLY
+            #    place the full result map materializes; it is forwarded over
+            #    HTTP, not journaled into Dapr history.
+            rows = script_journal_client.list_script_calls(execution_id)
+            completed_results = _completed_results_from_journal(rows)
+            cursor = _journal_cursor(rows, None)
+            # Journal-authoritative known set (includes journal-imported done rows the
+            # pump never dispatched). Union with the pump's view for safety.
+            request_body = {
+                **base_request,
+                "completedResults": completed_results,
+                "knownCallIds": sorted(set(completed_results.keys()) | pump_known),
+            }
+            if delta_enabled:
+                request_body["executionId"] = execution_id
+                request_body["journal"] = {"mode": "full", "key": journal_key, "cursor": cursor}
+            response = _post_evaluate(request_body)
 
         if response.status_code >= 500:
             body_preview = response.text[:400] if response.text else "<empty>"
@@ -194,4 +313,9 @@ def evaluate_script(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
             )
         if not isinstance(body.get("tasks"), list):
             body["tasks"] = []
+        # Only hand the cursor back when the evaluator cached this journal view;
+        # without it the next iteration loads the full journal again.
+        ack = body.pop("journal", None)
+        if delta_enabled and isinstance(ack, dict) and ack.get("cursor") == cursor and cursor:
+            body["journalCursor"] = cursor
         return body
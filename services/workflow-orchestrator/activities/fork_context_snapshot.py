@@ -0,0 +1,123 @@
+"""
+Fork Context Snapshot Activities
+
+Content-addressed parent-context snapshots for ``fork_branch_workflow``
+children. The SW interpreter hands each branch only the task outputs and
+state vars its body statically reads; a branch whose reads cannot be bounded
+(whole-context jq, ``keys``/``to_entries`` walks, dynamic indexing) instead
+receives a reference to a snapshot saved here once per wave, so the full
+context lands in Dapr history once rather than once per branch.
+
+Snapshots are keyed by the SHA-256 of their canonical JSON, which makes the
+save idempotent across activity retries and workflow replays.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any
+
+from activities.dapr_invoke import shared_dapr_client
+from core.config import config
+from tracing import start_activity_span
+
+logger = logging.getLogger(__name__)
+
+STATE_STORE_NAME = config.STATE_STORE_NAME
+SNAPSHOT_KEY_PREFIX = "sw-fork-context:"
+
+
+def snapshot_digest(snapshot: Any) -> str:
+    """SHA-256 of the snapshot's canonical JSON encoding."""
+    encoded = json.dumps(
+        snapshot, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def snapshot_key(digest: str) -> str:
+    return f"{SNAPSHOT_KEY_PREFIX}{digest}"
+
+
+def _snapshot_ttl_seconds() -> str:
+    return os.environ.get("SW_FORK_CONTEXT_SNAPSHOT_TTL_SECONDS", "604800")
+
+
+def save_fork_context_snapshot(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Save a parent context snapshot under its content digest.
+
+    Args:
+        ctx: Dapr workflow context (not used but required by Dapr)
+        input_data: Dict with keys: digest, snapshot
+
+    Returns:
+        Dict with success status, digest and state key
+    """
+    digest = str(input_data.get("digest") or "")
+    snapshot = input_data.get("snapshot")
+    otel = input_data.get("_otel") or {}
+    key = snapshot_key(digest)
+
+    attrs = {"state.key": key, "action.type": "state/fork-context-save"}
+
+    with start_activity_span("activity.save_fork_context_snapshot", otel, attrs):
+        try:
+            if not digest or snapshot_digest(snapshot) != digest:
+                raise ValueError("snapshot does not match its digest")
+            with shared_dapr_client() as client:
+                client.save_state(
+                    store_name=STATE_STORE_NAME,
+                    key=key,
+                    value=json.dumps(snapshot, default=str),
+                    state_metadata={"ttlInSeconds": _snapshot_ttl_seconds()},
+                )
+            logger.info("[Fork Context] Saved snapshot %s", key)
+            return {"success": True, "digest": digest, "key": key}
+        except Exception as e:
+            logger.error(f"[Fork Context] Failed to save snapshot {key}: {e}")
+            return {
+                "success": False,
+                "digest": digest,
+                "key": key,
+                "error": f"Failed to save fork context snapshot: {e}",
+            }
+
+
+def load_fork_context_snapshot(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Load a parent context snapshot and verify it against its digest.
+
+    Args:
+        ctx: Dapr workflow context (not used but required by Dapr)
+        input_data: Dict with key: digest
+
+    Returns:
+        Dict with success status, digest and snapshot
+    """
+    digest = str(input_data.get("digest") or "")
+    otel = input_data.get("_otel") or {}
+    key = snapshot_key(digest)
+
+    attrs = {"state.key": key, "action.type": "state/fork-context-load"}
+
+    with start_activity_span("activity.load_fork_context_snapshot", otel, attrs):
+        try:
+            with shared_dapr_client() as client:
+                result = client.get_state(store_name=STATE_STORE_NAME, key=key)
+            if not result.data:
+                raise LookupError("snapshot not found")
+            snapshot = json.loads(result.data)
+            if snapshot_digest(snapshot) != digest:
+                raise ValueError("snapshot digest mismatch")
+            return {"success": True, "digest": digest, "snapshot": snapshot}
+        except Exception as e:
+            logger.error(f"[Fork Context] Failed to load snapshot {key}: {e}")
+            return {
+                "success": False,
+                "digest": digest,
+                "error": f"Failed to load fork context snapshot: {e}",
+            }
@@ -15,8 +15,8 @@ from typing import Any, Literal
 import json
 
 import requests
-from dapr.clients import DaprClient
 
+from activities.dapr_invoke import shared_dapr_client
 from core.config import config
 
 logger = logging.getLogger(__name__)
@@ -70,7 +70,7 @@ def log_external_event(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
             key: value for key, value in request_payload.items() if value is not None
         }
 
-        with DaprClient() as dapr_client:
+        with shared_dapr_client(FUNCTION_ROUTER_APP_ID, timeout=30) as dapr_client:
             resp = dapr_client.invoke_method(
                 app_id=FUNCTION_ROUTER_APP_ID,
                 method_name="external-event",
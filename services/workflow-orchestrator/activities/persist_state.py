@@ -11,8 +11,7 @@ import json
 import logging
 from typing import Any
 
-from dapr.clients import DaprClient
-
+from activities.dapr_invoke import shared_dapr_client
 from core.config import config
 from tracing import start_activity_span
 
@@ -47,7 +46,7 @@ def persist_state(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
             if not isinstance(value, str):
                 value = json.dumps(value)
 
-            with DaprClient() as client:
+            with shared_dapr_client() as client:
                 client.save_state(
                     store_name=STATE_STORE_NAME,
                     key=key,
@@ -93,7 +92,7 @@ def get_state(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
 
     with start_activity_span("activity.get_state", otel, attrs):
         try:
-            with DaprClient() as client:
+            with shared_dapr_client() as client:
                 result = client.get_state(store_name=STATE_STORE_NAME, key=key)
 
             logger.info(f"[Get State] Successfully retrieved state: {key}")
@@ -135,7 +134,7 @@ def delete_state(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
 
     with start_activity_span("activity.delete_state", otel, attrs):
         try:
-            with DaprClient() as client:
+            with shared_dapr_client() as client:
                 client.delete_state(store_name=STATE_STORE_NAME, key=key)
 
             logger.info(f"[Delete State] Successfully deleted state: {key}")
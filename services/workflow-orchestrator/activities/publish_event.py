@@ -13,10 +13,10 @@ import os
 from datetime import datetime, timezone
 from typing import Any
 
-from dapr.clients import DaprClient
-
 from content_tracing import io_attributes
+from activities.dapr_invoke import shared_dapr_client
 from core.config import config
+from core.instance_index import instance_index
 from activities.workflow_data_client import workflow_data_client
 from .metadata import (
     activity_metadata,
@@ -98,6 +98,7 @@ PUBLISH_WORKFLOW_STARTED_INPUT_SCHEMA = schema_object(
         "workflowId": schema_string(description="Workflow identifier."),
         "executionId": schema_string(description="Workflow execution identifier."),
         "workflowName": schema_string(description="Human-readable workflow name."),
+        "traceId": schema_string(description="OpenTelemetry trace ID of the run."),
     },
     required=["workflowId", "executionId", "workflowName"],
     description="Payload for workflow.started.",
@@ -164,6 +165,30 @@ class WorkflowEventTypes:
     APPROVAL_RECEIVED = "workflow.approval.received"
 
 
+def _index_lifecycle_event(event_type: str, input_data: dict[str, Any]) -> None:
+    """Feed the list endpoint's instance index; never fails the publish."""
+    instance_id = str(input_data.get("executionId") or "")
+    if not instance_id:
+        return
+    try:
+        if event_type == WorkflowEventTypes.WORKFLOW_STARTED:
+            instance_index.record_started(
+                instance_id,
+                workflow_id=input_data.get("workflowId"),
+                workflow_name=input_data.get("workflowName"),
+                trace_id=input_data.get("traceId"),
+            )
+        else:
+            failed = event_type == WorkflowEventTypes.WORKFLOW_FAILED
+            instance_index.record_finished(
+                instance_id,
+                phase="failed" if failed else "completed",
+                error=input_data.get("error") if failed else None,
+            )
+    except Exception as e:
+        logger.warning(f"[Publish Event] Instance index update failed for {instance_id}: {e}")
+
+
 def _persist_execution_phase(
     execution_id: str | None,
     phase: Any,
@@ -214,7 +239,7 @@ def publish_event(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
 
     with start_activity_span("activity.publish_event", otel, attrs):
         try:
-            with DaprClient() as client:
+            with shared_dapr_client() as client:
                 # Propagate trace context via CloudEvent extensions so downstream
                 # consumers can join traces even if they are not HTTP-invoked.
                 trace_ctx = inject_current_context()
@@ -280,6 +305,7 @@ def publish_event(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
 )
 def publish_workflow_started(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
     """Publish a workflow started event."""
+    _index_lifecycle_event(WorkflowEventTypes.WORKFLOW_STARTED, input_data)
     return publish_event(ctx, {
         "topic": WORKFLOW_EVENTS_TOPIC,
         "eventType": WorkflowEventTypes.WORKFLOW_STARTED,
@@ -287,6 +313,7 @@ def publish_workflow_started(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
             "workflowId": input_data.get("workflowId"),
             "executionId": input_data.get("executionId"),
             "workflowName": input_data.get("workflowName"),
+            "traceId": input_data.get("traceId"),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         },
     })
@@ -304,6 +331,7 @@ def publish_workflow_started(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
 )
 def publish_workflow_completed(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
     """Publish a workflow completed event."""
+    _index_lifecycle_event(WorkflowEventTypes.WORKFLOW_COMPLETED, input_data)
     return publish_event(ctx, {
         "topic": WORKFLOW_EVENTS_TOPIC,
         "eventType": WorkflowEventTypes.WORKFLOW_COMPLETED,
@@ -328,6 +356,7 @@ def publish_workflow_completed(ctx, input_data: dict[str, Any]) -> dict[str, Any
 )
 def publish_workflow_failed(ctx, input_data: dict[str, Any]) -> dict[str, Any]:
     """Publish a workflow failed event."""
+    _index_lifecycle_event(WorkflowEventTypes.WORKFLOW_FAILED, input_data)
     return publish_event(ctx, {
         "topic": WORKFLOW_EVENTS_TOPIC,
         "eventType": WorkflowEventTypes.WORKFLOW_FAILED,
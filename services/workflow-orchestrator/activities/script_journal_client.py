@@ -9,10 +9,12 @@ via WS3's internal BFF routes, and is the SOLE forwarder of results into the
 Route contract (internal-token; mirrors the artifacts-endpoint pattern — distinct
 from ``activities.workflow_data_client`` which targets ``/api/internal/workflow-data``):
 
-  GET  /api/internal/workflows/executions/{executionId}/script-calls
+  GET  /api/internal/workflows/executions/{executionId}/script-calls[?changedAfter=<changeSeq>]
        -> { "scriptCalls": [ { callId, kind, seq, baseHash, occurrence, label,
               phase, promptSha256, status, sessionId, result, errorCode, retries,
-              tokensUsed } ], "logCount"?: int }
+              tokensUsed, changeSeq, updatedAt } ], "logCount"?: int }
+       ``changeSeq`` is the per-execution journal version assigned by the write
+       (monotonic in commit order); ``changedAfter`` returns rows above it.
   PUT  /api/internal/workflows/executions/{executionId}/script-calls/{callId}
        body { seq, kind, baseHash, occurrence, label, phase, promptSha256, status,
               sessionId?, result?, errorCode?, retries, tokensUsed? }  (idempotent upsert)
@@ -132,11 +134,13 @@ class ScriptJournalClient:
         return payload
 
     # ---- journal rows --------------------------------------------------
-    def list_script_calls(self, execution_id: str) -> list[dict[str, Any]]:
-        payload = self._request(
-            "GET",
-            f"/api/internal/workflows/executions/{quote(execution_id, safe='')}/script-calls",
-        )
+    def list_script_calls(
+        self, execution_id: str, *, changed_after: int | None = None
+    ) -> list[dict[str, Any]]:
+        path = f"/api/internal/workflows/executions/{quote(execution_id, safe='')}/script-calls"
+        if changed_after is not None:
+            path += f"?changedAfter={int(changed_after)}"
+        payload = self._request("GET", path)
         rows = payload.get("scriptCalls")
         return [row for row in rows if isinstance(row, dict)] if isinstance(rows, list) else []
 
@@ -26,6 +26,7 @@ import threading
 import time
 import urllib.parse
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from functools import wraps
@@ -44,6 +45,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from core.config import config
+from core.instance_index import (
+    backfill_concurrency,
+    decode_cursor,
+    instance_index,
+    max_scan,
+)
 from core.resume_event_resolver import (
     ResumeEventResolutionError,
     resolve_resume_event,
@@ -77,6 +84,7 @@ from content_tracing import (
     activity_output_for_trace,
     io_attributes,
 )
+import content_capture
 import workflow_data_postgres_rollback
 
 REQUESTS_TIMEOUT = getattr(requests, "Timeout", TimeoutError)
@@ -891,6 +899,7 @@ def _schedule_new_workflow_instance(
     result_id = str(getattr(response, "instanceId", "") or "").strip()
     if not result_id:
         raise RuntimeError("workflow runtime returned an empty instance ID")
+    _workflow_instance_index.invalidate(result_id)
     return result_id
 
 
@@ -1357,6 +1366,7 @@ class WorkflowListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    nextCursor: str | None = None
 
 
 class WorkflowHistoryEventResponse(BaseModel):
@@ -1459,11 +1469,19 @@ _activity_registry_seen: set[str] = set()
 
 
 def _activity_with_content_io(fn: Any) -> Any:
-    """Enrich durabletask's outer activity span with activity input/output."""
+    """Enrich durabletask's outer activity span with activity input/output.
+
+    With tracing set up the payloads are handed to ``content_capture`` (the
+    input as a shallow copy taken before the activity runs) and serialized
+    off the activity thread; otherwise the attributes are stamped inline.
+    """
 
     @wraps(fn)
     def wrapped(*args: Any, **kwargs: Any):
         data = args[1] if len(args) > 1 else kwargs.get("data", kwargs.get("input_data"))
+        pipeline = content_capture.active()
+        if pipeline is not None:
+            return _run_with_background_capture(pipeline, fn, data, args, kwargs)
         set_current_span_attrs(
             io_attributes("input", activity_input_for_trace(fn.__name__, data))
         )
@@ -1488,6 +1506,51 @@ def _activity_with_content_io(fn: Any) -> Any:
     return wrapped
 
 
+def _run_with_background_capture(
+    pipeline: content_capture.CapturePipeline,
+    fn: Any,
+    data: Any,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    span = _current_otel_span()
+    span_context = span.get_span_context() if span is not None else None
+    if (
+        span_context is None
+        or not getattr(span_context, "is_valid", False)
+        or not span.is_recording()
+    ):
+        return fn(*args, **kwargs)
+
+    # The worker serializes the input after the activity ran; snapshot it
+    # first so keys the activity adds or replaces are not captured as input.
+    input_data = dict(data) if isinstance(data, dict) else data
+
+    def submit(output: Any) -> None:
+        workflow_id = None
+        if isinstance(input_data, dict):
+            workflow_id = input_data.get("workflowId") or input_data.get("workflow_id")
+        try:
+            pipeline.submit(
+                span_id=span_context.span_id,
+                trace_id=span_context.trace_id,
+                activity=fn.__name__,
+                input_data=input_data,
+                output=output,
+                workflow_id=str(workflow_id) if workflow_id else None,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("[Content Capture] submit failed for %s: %s", fn.__name__, exc)
+
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as exc:
+        submit({"error": str(exc), "errorType": exc.__class__.__name__})
+        raise
+    submit(result)
+    return result
+
+
 def _register_activity(fn: Any) -> None:
     """Register an activity with both Dapr and the introspection registry."""
     wfr.register_activity(_activity_with_content_io(fn))
@@ -2936,87 +2999,158 @@ def _workflow_payload_matches_filters(
     return True
 
 
-def _list_workflows_from_taskhub_instance_ids(
-    *,
-    status_filter: set[str] | None,
-    search_filter: str,
-    limit: int,
-    offset: int,
-) -> WorkflowListResponse:
+def _orchestration_state_from_get_instance(response: Any) -> Any:
+    orchestration_state_missing = object()
+    for attr in (
+        "orchestrationState",
+        "orchestration_state",
+        "workflowState",
+        "workflow_state",
+    ):
+        orchestration_state = getattr(response, attr, orchestration_state_missing)
+        if orchestration_state is not orchestration_state_missing:
+            return orchestration_state
+    raise AttributeError("GetInstance response did not include orchestration state")
+
+
+def _hydrate_workflow_list_row(instance_id: str) -> dict[str, Any] | None:
+    """List row for one instance from GetInstance, without inputs/outputs."""
+    response = _taskhub_call(
+        "GetInstance",
+        pb.GetInstanceRequest(instanceId=instance_id, getInputsAndOutputs=False),
+    )
+    if not getattr(response, "exists", False):
+        return None
+    return _build_workflow_status_payload(
+        instance_id, _orchestration_state_from_get_instance(response)
+    )
+
+
+_workflow_instance_index = instance_index
+
+
+def _refresh_workflow_instance_index() -> None:
     """
-    List workflow instances using Dapr's Task Hub ListInstanceIDs protocol.
+    Backfill the instance index from Task Hub ListInstanceIDs.
 
     QueryInstances is unimplemented in the current Dapr workflow runtime, but
     ListInstanceIDs is implemented and documented for management-tool pagination.
-    Hydrate each returned ID with GetInstance so the response still contains
-    normalized status, timestamps, custom status, trace IDs, and outputs.
+    Only IDs the index cannot answer for (see InstanceIndex.needs_hydration) are
+    read with GetInstance, in parallel and without inputs/outputs. Rows whose
+    instance disappeared from a complete scan are dropped.
     """
+    index = _workflow_instance_index
+    token = index.begin_refresh()
+    known_before = index.ids()
+    scan_limit = max_scan()
     instance_ids: list[str] = []
     continuation_token: str | None = None
-    max_scan = 5000
 
-    while len(instance_ids) < max_scan:
+    while len(instance_ids) < scan_limit:
         page_ids, continuation_token = _list_instance_ids(
             continuation_token=continuation_token,
             page_size=200,
         )
         if not page_ids:
+            continuation_token = None
             break
         instance_ids.extend(page_ids)
         if not continuation_token:
             break
+    instance_ids = instance_ids[:scan_limit]
+
+    stale = index.needs_hydration(instance_ids)
+    if stale:
+        read_at = index.now()
+        with ThreadPoolExecutor(
+            max_workers=min(backfill_concurrency(), len(stale)),
+            thread_name_prefix="instance-index",
+        ) as pool:
+            for payload in pool.map(_hydrate_workflow_list_row, stale):
+                if payload is not None:
+                    index.record_payload(payload, read_at=read_at)
+    if not continuation_token:
+        index.discard(known_before.difference(instance_ids))
+    index.mark_refreshed(token)
+    logger.debug(
+        "[Workflow Routes] Instance index refreshed: scanned=%s hydrated=%s rows=%s",
+        len(instance_ids),
+        len(stale),
+        len(index),
+    )
 
-    items: list[dict[str, Any]] = []
 
-    for instance_id in instance_ids[:max_scan]:
-        response = _taskhub_call(
-            "GetInstance",
-            pb.GetInstanceRequest(instanceId=instance_id, getInputsAndOutputs=True),
-        )
-        if not getattr(response, "exists", False):
-            continue
+def _refresh_workflow_instance_index_in_background() -> None:
+    index = _workflow_instance_index
+    if not index.refresh_lock.acquire(blocking=False):
+        return
 
-        orchestration_state_missing = object()
-        orchestration_state = getattr(
-            response, "orchestrationState", orchestration_state_missing
-        )
-        if orchestration_state is orchestration_state_missing:
-            orchestration_state = getattr(
-                response, "orchestration_state", orchestration_state_missing
-            )
-        if orchestration_state is orchestration_state_missing:
-            orchestration_state = getattr(
-                response, "workflowState", orchestration_state_missing
-            )
-        if orchestration_state is orchestration_state_missing:
-            orchestration_state = getattr(
-                response, "workflow_state", orchestration_state_missing
-            )
-        if orchestration_state is orchestration_state_missing:
-            raise AttributeError(
-                "GetInstance response did not include orchestration state"
-            )
-        payload = _build_workflow_status_payload(instance_id, orchestration_state)
-        if _workflow_payload_matches_filters(
-            payload,
+    def run() -> None:
+        try:
+            _refresh_workflow_instance_index()
+        except Exception as e:
+            logger.warning(f"[Workflow Routes] Instance index refresh failed: {e}")
+        finally:
+            index.refresh_lock.release()
+
+    threading.Thread(target=run, name="instance-index-refresh", daemon=True).start()
+
+
+def _ensure_workflow_instance_index() -> None:
+    """Cold index: backfill inline. Warm but due: refresh behind the response."""
+    index = _workflow_instance_index
+    if index.is_cold:
+        with index.refresh_lock:
+            if index.is_cold:
+                _refresh_workflow_instance_index()
+        return
+    if index.refresh_due():
+        _refresh_workflow_instance_index_in_background()
+
+
+def _list_workflows_from_taskhub_instance_ids(
+    *,
+    status_filter: set[str] | None,
+    search_filter: str,
+    limit: int,
+    offset: int,
+    cursor: str | None = None,
+) -> WorkflowListResponse:
+    """
+    List workflow instances from the materialized instance index.
+
+    The index is fed by the lifecycle activities and backfilled from the Task
+    Hub (see _refresh_workflow_instance_index); filtering, ordering (startedAt
+    desc) and pagination run in memory. Pass the previous page's nextCursor for
+    stable keyset pagination; offset is honored when no cursor is given.
+    """
+    _ensure_workflow_instance_index()
+
+    def matches(row: dict[str, Any]) -> bool:
+        return _workflow_payload_matches_filters(
+            row,
             status_filter=status_filter,
             search_filter=search_filter,
-        ):
-            items.append(payload)
+        )
 
-    items.sort(
-        key=lambda item: str(item.get("startedAt") or ""),
-        reverse=True,
+    page, total, next_cursor = _workflow_instance_index.query(
+        predicate=matches if status_filter or search_filter else None,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
     )
-    total = len(items)
-    page = items[offset : offset + limit]
-    workflows = [WorkflowListItemResponse(**item) for item in page]
+    # A row created by a finished event that arrived before its started event
+    # has no workflowId until the next backfill hydrates it.
+    workflows = [
+        WorkflowListItemResponse(**item) for item in page if item.get("workflowId")
+    ]
 
     return WorkflowListResponse(
         workflows=workflows,
         total=total,
         limit=limit,
-        offset=offset,
+        offset=offset if not cursor else 0,
+        nextCursor=next_cursor,
     )
 
 
@@ -3539,12 +3673,18 @@ def list_workflows(
     search: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ):
     """
     List workflow instances.
 
     GET /api/v2/workflows
     """
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     try:
         normalized_limit = max(1, min(limit, 200))
         normalized_offset = max(0, offset)
@@ -3559,6 +3699,7 @@ def list_workflows(
             search_filter=search_filter,
             limit=normalized_limit,
             offset=normalized_offset,
+            cursor=cursor or None,
         )
     except Exception as e:
         logger.error(f"[Workflow Routes] Failed to list workflows: {e}")
@@ -3657,6 +3798,7 @@ def rerun_workflow(instance_id: str, request: RerunWorkflowRequest = RerunWorkfl
         new_instance_id = str(getattr(rerun_response, "newInstanceID", "") or "")
         if not new_instance_id:
             raise RuntimeError("Rerun succeeded but no newInstanceID was returned")
+        _workflow_instance_index.invalidate(new_instance_id)
 
         logger.info(
             "[Workflow Routes] Rerun scheduled: source=%s event_id=%s new=%s reason=%s",
@@ -3731,6 +3873,7 @@ def resume_workflow(instance_id: str, request: ResumeWorkflowRequest = ResumeWor
         new_instance_id = str(getattr(rerun_response, "newInstanceID", "") or "")
         if not new_instance_id:
             raise RuntimeError("Resume succeeded but no newInstanceID was returned")
+        _workflow_instance_index.invalidate(new_instance_id)
 
         logger.info(
             "[Workflow Routes] Resume scheduled: source=%s node=%s event_id=%s new=%s reason=%s",
@@ -3901,6 +4044,7 @@ def terminate_workflow(instance_id: str, request: TerminateRequest = TerminateRe
         # per-app-id fan-out. The retired terminate_durable_runs_by_parent_execution
         # path (claude-code-agent only) is no longer invoked here; same-task-hub
         # child workflows are still covered by Dapr's native parent-child cascade.
+        _workflow_instance_index.invalidate(instance_id)
         response_metadata["childTermination"] = external_child_cleanup
         response_metadata["externalChildCleanup"] = external_child_cleanup
         return response_metadata
@@ -3947,6 +4091,7 @@ def purge_workflow(
         try:
             _workflow_http_post(instance_id, "/purge", purge_params)
         except FileNotFoundError:
+            _workflow_instance_index.remove(instance_id, recursive=recursive)
             logger.info(
                 "[Workflow Routes] Purge skipped for %s: already gone",
                 instance_id,
@@ -3961,6 +4106,7 @@ def purge_workflow(
                 "childCleanup": child_cleanup,
             }
 
+        _workflow_instance_index.remove(instance_id, recursive=recursive)
         return {
             "success": True,
             "instanceId": instance_id,
@@ -3989,6 +4135,7 @@ def suspend_workflow(instance_id: str):
         logger.info(f"[Workflow Routes] Suspending workflow: {instance_id}")
 
         client.suspend_workflow(instance_id=instance_id)
+        _workflow_instance_index.invalidate(instance_id)
 
         return {
             "success": True,
@@ -4013,6 +4160,7 @@ def resume_workflow(instance_id: str):
         logger.info(f"[Workflow Routes] Resuming workflow: {instance_id}")
 
         client.resume_workflow(instance_id=instance_id)
+        _workflow_instance_index.invalidate(instance_id)
 
         return {
             "success": True,
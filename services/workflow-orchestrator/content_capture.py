@@ -0,0 +1,375 @@
+"""Background content capture for durabletask activity spans.
+
+``_activity_with_content_io`` (app.py) used to build the ``input.value`` /
+``output.value`` attributes of every activity span inline: recursive
+redaction, JSON serialization up to 60 KB and SHA-256 of materialized file
+bodies ran inside the activity, before it returned to the Dapr worker.
+
+With tracing set up, the wrapper now only hands the payloads to this module:
+
+  - **head sampling per workflow** — whether a run's activities are captured
+    is decided once per trace id (a stable hash, so every activity of a run
+    and every pod agree). ``CONTENT_CAPTURE_SAMPLE_RATE`` sets the default
+    rate and ``CONTENT_CAPTURE_SAMPLE_RATES`` (``wf_a=0.1,wf_b=1``) overrides
+    it per workflow id;
+  - **snapshot by reference** — the input dict is shallow-copied and the
+    output kept as-is: no serialization on the activity thread;
+  - a bounded queue feeds a worker thread that builds the attributes. Spans
+    are enriched in the span exporter (``CaptureSpanExporter``), which runs on
+    the BatchSpanProcessor thread; a capture the worker has not reached yet is
+    built there. When the backlog is full, the oldest pending capture is
+    evicted (and counted as dropped): spans the exporter never takes — dropped
+    by the BatchSpanProcessor, never ended — cannot pin the map and starve
+    new captures;
+  - **per-trace dedup** — a payload whose digest was already captured in the
+    same trace is exported as ``<prefix>.value_digest`` +
+    ``<prefix>.value_deduplicated`` instead of the full value.
+
+Capture cost per activity is reported as the ``orchestrator.content_capture.duration``
+histogram (ms) and by ``capture_stats()``.
+
+Without the exporter installed (tracing off, tests) ``active()`` is False and
+the wrapper keeps stamping attributes inline.
+
+ENV:
+  CONTENT_CAPTURE_ASYNC          (default true)
+  CONTENT_CAPTURE_SAMPLE_RATE    (default 1.0)
+  CONTENT_CAPTURE_SAMPLE_RATES   (per-workflow overrides, default empty)
+  CONTENT_CAPTURE_QUEUE_SIZE     (default 1024)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any
+
+from content_tracing import (
+    activity_input_for_trace,
+    activity_output_for_trace,
+    io_attributes,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 1024
+_SEEN_DIGESTS_MAX = 8192
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _parse_rate(raw: str | None, default: float) -> float:
+    try:
+        return min(1.0, max(0.0, float(raw))) if raw and raw.strip() else default
+    except ValueError:
+        return default
+
+
+def sample_rate_for(workflow_id: str | None) -> float:
+    default = _parse_rate(os.environ.get("CONTENT_CAPTURE_SAMPLE_RATE"), 1.0)
+    overrides = os.environ.get("CONTENT_CAPTURE_SAMPLE_RATES") or ""
+    if workflow_id and overrides:
+        for part in overrides.split(","):
+            key, sep, value = part.partition("=")
+            if sep and key.strip() == workflow_id:
+                return _parse_rate(value, default)
+    return default
+
+
+def head_sampled(trace_id: int, workflow_id: str | None) -> bool:
+    """Stable per-run decision: every activity of a trace gets the same answer."""
+    rate = sample_rate_for(workflow_id)
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    digest = hashlib.blake2b(trace_id.to_bytes(16, "big"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64 < rate
+
+
+class _Capture:
+    __slots__ = ("activity", "trace_id", "input", "output", "attrs", "lock")
+
+    def __init__(self, activity: str, trace_id: int, input_data: Any, output: Any):
+        self.activity = activity
+        self.trace_id = trace_id
+        self.input = input_data
+        self.output = output
+        self.attrs: dict[str, Any] | None = None
+        self.lock = threading.Lock()
+
+
+class CapturePipeline:
+    """Bounded span-id -> pending capture map plus its background worker."""
+
+    def __init__(self, *, queue_size: int | None = None) -> None:
+        if queue_size is None:
+            try:
+                queue_size = int(os.environ.get("CONTENT_CAPTURE_QUEUE_SIZE") or DEFAULT_QUEUE_SIZE)
+            except ValueError:
+                queue_size = DEFAULT_QUEUE_SIZE
+        size = queue_size
+        self._max_pending = max(1, size)
+        self._queue: queue.Queue[_Capture] = queue.Queue(maxsize=self._max_pending)
+        self._pending: OrderedDict[int, _Capture] = OrderedDict()
+        self._seen: OrderedDict[tuple[int, str, str], None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._stats: dict[str, list[float]] = {}
+        self.dropped = 0
+        self.sampled_out = 0
+        self.deduplicated = 0
+        self._histogram: Any = None
+        self._histogram_ready = False
+
+    # -- hot path ------------------------------------------------------------
+
+    def submit(
+        self,
+        *,
+        span_id: int,
+        trace_id: int,
+        activity: str,
+        input_data: Any,
+        output: Any,
+        workflow_id: str | None = None,
+    ) -> bool:
+        """Queue a capture for the span; False when sampled out.
+
+        A full backlog evicts the oldest pending capture instead of refusing
+        this one.
+        """
+        if not head_sampled(trace_id, workflow_id):
+            self.sampled_out += 1
+            return False
+        if isinstance(input_data, dict):
+            input_data = dict(input_data)
+        capture = _Capture(activity, trace_id, input_data, output)
+        evicted: list[_Capture] = []
+        with self._lock:
+            self._pending[span_id] = capture
+            while len(self._pending) > self._max_pending:
+                evicted.append(self._pending.popitem(last=False)[1])
+            self.dropped += len(evicted)
+        for stale in evicted:
+            self._discard(stale)
+        try:
+            self._queue.put_nowait(capture)
+        except queue.Full:
+            pass  # still pending: the exporter builds it
+        self._ensure_worker()
+        return True
+
+    @staticmethod
+    def _discard(capture: _Capture) -> None:
+        """Release an evicted capture's payloads (the worker may still dequeue it)."""
+        with capture.lock:
+            if capture.attrs is None:
+                capture.attrs = {}
+            capture.input = capture.output = None
+
+    # -- background ------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="content-capture", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            capture = self._queue.get()
+            try:
+                self._build(capture)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("[Content Capture] build failed: %s", exc)
+
+    def _dedup(self, capture: _Capture, prefix: str, attrs: dict[str, Any]) -> dict[str, Any]:
+        value = attrs.get(f"{prefix}.value")
+        if not isinstance(value, str):
+            return attrs
+        digest = hashlib.sha256(value.encode("utf-8")).hexdigest()
+        key = (capture.trace_id, prefix, digest)
+        with self._lock:
+            seen = key in self._seen
+            self._seen[key] = None
+            self._seen.move_to_end(key)
+            while len(self._seen) > _SEEN_DIGESTS_MAX:
+                self._seen.popitem(last=False)
+        if not seen:
+            return {**attrs, f"{prefix}.value_digest": digest}
+        self.deduplicated += 1
+        return {
+            f"{prefix}.mime_type": attrs.get(f"{prefix}.mime_type", "application/json"),
+            f"{prefix}.value_digest": digest,
+            f"{prefix}.value_deduplicated": True,
+        }
+
+    def _build(self, capture: _Capture) -> dict[str, Any]:
+        with capture.lock:
+            if capture.attrs is not None:
+                return capture.attrs
+            started = time.perf_counter()
+            attrs = self._dedup(
+                capture,
+                "input",
+                io_attributes("input", activity_input_for_trace(capture.activity, capture.input)),
+            )
+            attrs.update(
+                self._dedup(
+                    capture,
+                    "output",
+                    io_attributes(
+                        "output", activity_output_for_trace(capture.activity, capture.output)
+                    ),
+                )
+            )
+            capture.attrs = attrs
+            capture.input = capture.output = None
+            self._record_cost(capture.activity, (time.perf_counter() - started) * 1000.0)
+            return attrs
+
+    def _record_cost(self, activity: str, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(activity, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+        if not self._histogram_ready:
+            self._histogram_ready = True
+            try:
+                from opentelemetry import metrics
+
+                self._histogram = metrics.get_meter(
+                    "workflow-orchestrator.content-capture"
+                ).create_histogram(
+                    "orchestrator.content_capture.duration",
+                    unit="ms",
+                    description="Time spent building activity span content attributes.",
+                )
+            except Exception:
+                self._histogram = None
+        if self._histogram is not None:
+            try:
+                self._histogram.record(elapsed_ms, {"workflow.activity": activity})
+            except Exception:
+                pass
+
+    # -- exporter side ---------------------------------------------------------
+
+    def take(self, span_id: int) -> dict[str, Any] | None:
+        """Attributes for a finished span (built here if the worker lags)."""
+        with self._lock:
+            capture = self._pending.pop(span_id, None)
+        if capture is None:
+            return None
+        return self._build(capture)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            per_activity = {
+                name: {
+                    "captures": int(count),
+                    "meanMs": round(total / count, 3) if count else 0.0,
+                    "maxMs": round(peak, 3),
+                }
+                for name, (count, total, peak) in self._stats.items()
+            }
+            pending = len(self._pending)
+        return {
+            "activities": per_activity,
+            "pending": pending,
+            "dropped": self.dropped,
+            "sampledOut": self.sampled_out,
+            "deduplicated": self.deduplicated,
+        }
+
+
+class CaptureSpanExporter:
+    """SpanExporter wrapper that merges pending captures into finished spans."""
+
+    def __init__(self, inner: Any, pipeline: CapturePipeline) -> None:
+        self._inner = inner
+        self._pipeline = pipeline
+
+    def export(self, spans: Sequence[Any]) -> Any:
+        return self._inner.export([self._enrich(span) for span in spans])
+
+    def _enrich(self, span: Any) -> Any:
+        try:
+            attrs = self._pipeline.take(span.context.span_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("[Content Capture] enrich failed: %s", exc)
+            return span
+        if not attrs:
+            return span
+        from opentelemetry.sdk.trace import ReadableSpan
+
+        return ReadableSpan(
+            name=span.name,
+            context=span.context,
+            parent=span.parent,
+            resource=span.resource,
+            attributes={**(span.attributes or {}), **attrs},
+            events=span.events,
+            links=span.links,
+            kind=span.kind,
+            status=span.status,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            instrumentation_scope=span.instrumentation_scope,
+        )
+
+    def shutdown(self) -> None:
+        self._inner.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._inner.force_flush(timeout_millis)
+
+
+_pipeline: CapturePipeline | None = None
+
+
+def install(exporter: Any) -> Any:
+    """Wrap the span exporter and activate background capture (tracing.py)."""
+    global _pipeline
+    if not _env_bool("CONTENT_CAPTURE_ASYNC", True):
+        return exporter
+    if _pipeline is None:
+        _pipeline = CapturePipeline()
+    return CaptureSpanExporter(exporter, _pipeline)
+
+
+def active() -> CapturePipeline | None:
+    """The installed pipeline, or None when captures must be stamped inline."""
+    return _pipeline
+
+
+def capture_stats() -> dict[str, Any]:
+    return _pipeline.stats() if _pipeline is not None else {}
+
+
+__all__ = [
+    "CapturePipeline",
+    "CaptureSpanExporter",
+    "active",
+    "capture_stats",
+    "head_sampled",
+    "install",
+    "sample_rate_for",
+]
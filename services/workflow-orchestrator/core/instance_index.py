@@ -0,0 +1,467 @@
+"""Materialized workflow instance index for the list endpoint (no FastAPI/Dapr deps).
+
+`GET /api/v2/workflows` used to page every instance ID out of the TaskHub and
+hydrate each one with a serial `GetInstance(getInputsAndOutputs=True)` call on
+every request. This index keeps one list row per instance in memory, ordered
+by startedAt (newest first):
+
+  - the lifecycle activities (`publish_workflow_started/completed/failed`)
+    upsert rows as runs progress, so a finished event-fed row never needs a
+    TaskHub read;
+  - app.py backfills what no lifecycle event will tell us — instance IDs the
+    index has not seen yet, non-terminal rows that were not event-fed
+    (lifecycle events off, runs started before this pod), rows invalidated
+    by terminate/suspend/resume, and non-terminal event-fed rows not updated
+    for a refresh interval (a run that crashed or was failed by the runtime
+    never emits its finished event) — with `GetInstance` in parallel batches,
+    without inputs/outputs, at most once per refresh interval.
+
+List, filter and search run against the rows. Pages are addressed by an
+opaque cursor (sort key of the last row returned), so deep pages do not shift
+when new runs start; `offset` keeps working for existing callers.
+
+The index is per process and rebuilt by backfill after a restart, so it never
+holds state that the TaskHub does not.
+
+ENV:
+  WORKFLOW_INSTANCE_INDEX_REFRESH_SECONDS      (default 10)
+  WORKFLOW_INSTANCE_INDEX_BACKFILL_CONCURRENCY (default 16)
+  WORKFLOW_INSTANCE_INDEX_MAX_SCAN             (default 5000)
+"""
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+TERMINAL_STATUSES = frozenset({"COMPLETED", "FAILED", "TERMINATED", "CANCELED"})
+
+# Columns kept per row: the WorkflowListItemResponse fields. Outputs and stack
+# traces are only served by the per-instance status endpoint.
+LIST_FIELDS = (
+    "instanceId",
+    "workflowId",
+    "workflowName",
+    "workflowVersion",
+    "workflowNameVersioned",
+    "runtimeStatus",
+    "traceId",
+    "phase",
+    "progress",
+    "message",
+    "currentNodeId",
+    "currentNodeName",
+    "error",
+    "startedAt",
+    "completedAt",
+)
+
+
+def _env_number(name: str, default: float, minimum: float) -> float:
+    raw = os.environ.get(name)
+    if raw and raw.strip():
+        try:
+            return max(minimum, float(raw))
+        except ValueError:
+            pass
+    return default
+
+
+def refresh_interval_seconds() -> float:
+    return _env_number("WORKFLOW_INSTANCE_INDEX_REFRESH_SECONDS", 10.0, 0.0)
+
+
+def backfill_concurrency() -> int:
+    return int(_env_number("WORKFLOW_INSTANCE_INDEX_BACKFILL_CONCURRENCY", 16, 1))
+
+
+def max_scan() -> int:
+    return int(_env_number("WORKFLOW_INSTANCE_INDEX_MAX_SCAN", 5000, 1))
+
+
+def utc_now_iso() -> str:
+    """Current time in the naive-UTC ISO form GetInstance timestamps use."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _order_key(started_at: Any) -> str:
+    """Sortable startedAt: naive UTC ISO, '' (sorts oldest) when unknown."""
+    if not isinstance(started_at, str) or not started_at:
+        return ""
+    try:
+        parsed = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+    except ValueError:
+        return started_at
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat(timespec="microseconds")
+
+
+def encode_cursor(key: tuple[str, str]) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:  # noqa: BLE001
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    if (
+        not isinstance(value, list)
+        or len(value) != 2
+        or not all(isinstance(part, str) for part in value)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return value[0], value[1]
+
+
+@dataclass(slots=True)
+class _Entry:
+    row: dict[str, Any]
+    key: tuple[str, str]
+    # True once a lifecycle event has touched the row: its status is then kept
+    # current by events, and backfill only re-reads it while it is
+    # non-terminal and older than the refresh interval.
+    event_fed: bool = False
+    # Set by invalidate(): re-read on the next refresh even if terminal.
+    stale: bool = False
+    # Index clock time of the last write to the row.
+    updated_at: float = 0.0
+
+
+class InstanceIndex:
+    """Thread-safe, startedAt-ordered rows for every known workflow instance."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        self._order: list[tuple[str, str]] = []  # ascending; iterate from the end
+        self._clock = clock
+        self._refreshed_at: float | None = None
+        # invalidate() bumps the first; a refresh covers invalidations up to
+        # the count it saw when it started.
+        self._invalidations = 0
+        self._refreshed_invalidations = 0
+        # Serializes backfills; list requests never wait on a warm index.
+        self.refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def now(self) -> float:
+        """Index clock time; pass it as record_payload's read_at."""
+        return self._clock()
+
+    def get(self, instance_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(instance_id)
+            return dict(entry.row) if entry is not None else None
+
+    # -- writes ----------------------------------------------------------------
+
+    def _place(self, instance_id: str, row: dict[str, Any]) -> _Entry:
+        key = (_order_key(row.get("startedAt")), instance_id)
+        entry = self._entries.get(instance_id)
+        if entry is None:
+            entry = self._entries[instance_id] = _Entry(row=row, key=key)
+            bisect.insort(self._order, key)
+            return entry
+        entry.row = row
+        if entry.key != key:
+            del self._order[bisect.bisect_left(self._order, entry.key)]
+            bisect.insort(self._order, key)
+            entry.key = key
+        return entry
+
+    def _merge(
+        self,
+        instance_id: str,
+        fields: dict[str, Any],
+        *,
+        event_fed: bool,
+        defaults: dict[str, Any] | None = None,
+        read_at: float | None = None,
+        partial: bool = False,
+    ) -> None:
+        with self._lock:
+            entry = self._entries.get(instance_id)
+            if (
+                not event_fed
+                and entry is not None
+                and entry.event_fed
+                and (read_at is None or entry.updated_at >= read_at)
+            ):
+                # A lifecycle event landed while the backfill read was in
+                # flight; the event is newer.
+                return
+            created = entry is None
+            row = dict(entry.row) if entry is not None else {
+                "instanceId": instance_id,
+                "runtimeStatus": "UNKNOWN",
+                "progress": 0,
+            }
+            if (
+                event_fed
+                and row.get("runtimeStatus") in TERMINAL_STATUSES
+                and fields.get("runtimeStatus") not in TERMINAL_STATUSES
+            ):
+                # A started event delivered after the finished one must not
+                # move the row back to RUNNING.
+                fields = {
+                    name: value
+                    for name, value in fields.items()
+                    if name not in ("runtimeStatus", "phase")
+                }
+            row.update(fields)
+            for name, value in (defaults or {}).items():
+                if not row.get(name):
+                    row[name] = value
+            entry = self._place(instance_id, row)
+            entry.updated_at = self._clock()
+            if partial and created:
+                # Only a GetInstance can supply workflowId and startedAt; keep
+                # the row due for hydration even though it is terminal.
+                entry.stale = True
+                self._invalidations += 1
+                return
+            if event_fed:
+                entry.event_fed = True
+            entry.stale = False
+
+    def record_started(
+        self,
+        instance_id: str,
+        *,
+        workflow_id: str | None,
+        workflow_name: str | None,
+        trace_id: str | None = None,
+        started_at: str | None = None,
+    ) -> None:
+        """workflow.started: the run is RUNNING. Keeps a backfilled startedAt."""
+        fields: dict[str, Any] = {"runtimeStatus": "RUNNING", "phase": "running"}
+        if workflow_id:
+            fields["workflowId"] = workflow_id
+        if workflow_name:
+            fields["workflowName"] = workflow_name
+        if trace_id:
+            fields["traceId"] = trace_id
+        defaults = {
+            "startedAt": started_at or utc_now_iso(),
+            "workflowNameVersioned": workflow_name,
+        }
+        self._merge(instance_id, fields, event_fed=True, defaults=defaults)
+
+    def record_finished(
+        self,
+        instance_id: str,
+        *,
+        phase: str,
+        error: str | None = None,
+        completed_at: str | None = None,
+    ) -> None:
+        """workflow.completed / workflow.failed.
+
+        Both are emitted right before the interpreter returns normally, so the
+        TaskHub reports COMPLETED either way; the outcome is carried by phase
+        and error, exactly as a GetInstance backfill of the same run shows it.
+        A row this creates (the started event has not been seen) carries no
+        workflowId or startedAt, so it stays due for hydration.
+        """
+        fields: dict[str, Any] = {
+            "runtimeStatus": "COMPLETED",
+            "phase": phase,
+            "completedAt": completed_at or utc_now_iso(),
+        }
+        if phase == "completed":
+            fields["progress"] = 100
+        if error:
+            fields["error"] = error
+        self._merge(instance_id, fields, event_fed=True, partial=True)
+
+    def record_payload(
+        self, payload: dict[str, Any], *, read_at: float | None = None
+    ) -> None:
+        """Backfilled GetInstance status payload; replaces the row's columns.
+
+        `read_at` is the index clock (`now()`) taken before the read: an
+        event-fed row is only overwritten when no lifecycle event landed after
+        it. Without it, event-fed rows are never overwritten.
+        """
+        instance_id = str(payload.get("instanceId") or "")
+        if not instance_id:
+            return
+        self._merge(
+            instance_id,
+            {name: payload.get(name) for name in LIST_FIELDS},
+            event_fed=False,
+            read_at=read_at,
+        )
+
+    def invalidate(self, instance_id: str) -> None:
+        """Status changed outside the lifecycle events (terminate, suspend, ...).
+
+        The row is re-read on the next refresh, which is made due now.
+        """
+        with self._lock:
+            entry = self._entries.get(instance_id)
+            if entry is not None:
+                entry.event_fed = False
+                entry.stale = True
+            self._invalidations += 1
+
+    def remove(self, instance_id: str, *, recursive: bool = False) -> int:
+        """Drop a purged instance (and, if recursive, its `__sub__` children)."""
+        child_prefix = f"{instance_id}__sub__"
+        with self._lock:
+            doomed = [
+                key
+                for key in self._entries
+                if key == instance_id or (recursive and key.startswith(child_prefix))
+            ]
+            for key in doomed:
+                self._drop(key)
+            return len(doomed)
+
+    def ids(self) -> set[str]:
+        with self._lock:
+            return set(self._entries)
+
+    def discard(self, instance_ids: Iterable[str]) -> int:
+        """Drop rows the TaskHub no longer lists (after a complete ID scan)."""
+        with self._lock:
+            doomed = [key for key in instance_ids if key in self._entries]
+            for key in doomed:
+                self._drop(key)
+            return len(doomed)
+
+    def _drop(self, instance_id: str) -> None:
+        entry = self._entries.pop(instance_id)
+        del self._order[bisect.bisect_left(self._order, entry.key)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._order.clear()
+            self._refreshed_at = None
+
+    # -- backfill bookkeeping --------------------------------------------------
+
+    @property
+    def is_cold(self) -> bool:
+        """No backfill has completed yet: event-fed rows alone are not a full list."""
+        return self._refreshed_at is None
+
+    def refresh_due(self) -> bool:
+        refreshed_at = self._refreshed_at
+        return (
+            refreshed_at is None
+            or self._invalidations != self._refreshed_invalidations
+            or self._clock() - refreshed_at >= refresh_interval_seconds()
+        )
+
+    def begin_refresh(self) -> int:
+        """Token for mark_refreshed: the invalidations this refresh will cover."""
+        return self._invalidations
+
+    def mark_refreshed(self, token: int) -> None:
+        self._refreshed_at = self._clock()
+        self._refreshed_invalidations = token
+
+    def needs_hydration(self, instance_ids: Iterable[str]) -> list[str]:
+        """IDs whose row only a GetInstance can produce or update."""
+        now = self._clock()
+        interval = refresh_interval_seconds()
+        with self._lock:
+            stale: list[str] = []
+            for instance_id in instance_ids:
+                entry = self._entries.get(instance_id)
+                if entry is None or entry.stale or (
+                    entry.row.get("runtimeStatus") not in TERMINAL_STATUSES
+                    and (not entry.event_fed or now - entry.updated_at >= interval)
+                ):
+                    stale.append(instance_id)
+            return stale
+
+    # -- reads -----------------------------------------------------------------
+
+    def query(
+        self,
+        *,
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], int, str | None]:
+        """Newest-first page of matching rows: (rows, total matches, next cursor).
+
+        With a cursor, the page starts right after the row the cursor names and
+        `offset` is ignored.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        with self._lock:
+            order = self._order
+            entries = self._entries
+            if after is None:
+                start = len(order)
+                skip = offset
+            else:
+                start = bisect.bisect_left(order, after)
+                skip = 0
+            total = 0
+            if predicate is None:
+                total = len(order)
+            page: list[dict[str, Any]] = []
+            last_key: tuple[str, str] | None = None
+            more = False
+            # Rows after the cursor position (newer rows) only count toward
+            # the total; the page walks strictly older rows.
+            if predicate is not None:
+                for key in order[start:]:
+                    if predicate(entries[key[1]].row):
+                        total += 1
+            for index in range(start - 1, -1, -1):
+                key = order[index]
+                row = entries[key[1]].row
+                if predicate is not None and not predicate(row):
+                    continue
+                if predicate is not None:
+                    total += 1
+                if skip:
+                    skip -= 1
+                    continue
+                if len(page) < limit:
+                    page.append(dict(row))
+                    last_key = key
+                    continue
+                more = True
+                if predicate is None:
+                    break
+        next_cursor = encode_cursor(last_key) if more and last_key is not None else None
+        return page, total, next_cursor
+
+
+instance_index = InstanceIndex()
+
+
+__all__ = [
+    "InstanceIndex",
+    "LIST_FIELDS",
+    "TERMINAL_STATUSES",
+    "backfill_concurrency",
+    "decode_cursor",
+    "encode_cursor",
+    "instance_index",
+    "max_scan",
+    "refresh_interval_seconds",
+    "utc_now_iso",
+]
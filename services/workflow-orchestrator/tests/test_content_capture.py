@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+import content_capture  # noqa: E402
+
+
+def _traced(pipeline: content_capture.CapturePipeline):
+    memory = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(
+        SimpleSpanProcessor(content_capture.CaptureSpanExporter(memory, pipeline))
+    )
+    return provider.get_tracer("test"), memory
+
+
+def test_exporter_merges_capture_built_off_the_activity_thread():
+    pipeline = content_capture.CapturePipeline()
+    tracer, memory = _traced(pipeline)
+    payload = {"workflowId": "wf", "nodeId": "n1"}
+
+    with tracer.start_as_current_span("activity||persist_state") as span:
+        ctx = span.get_span_context()
+        assert pipeline.submit(
+            span_id=ctx.span_id,
+            trace_id=ctx.trace_id,
+            activity="persist_state",
+            input_data=payload,
+            output={"success": True},
+        )
+        payload["nodeId"] = "mutated-after-submit"
+
+    (exported,) = memory.get_finished_spans()
+    assert '"nodeId": "n1"' in exported.attributes["input.value"]
+    assert '"success": true' in exported.attributes["output.value"]
+    assert len(exported.attributes["output.value_digest"]) == 64
+    assert pipeline.stats()["activities"]["persist_state"]["captures"] == 1
+    assert pipeline.stats()["pending"] == 0
+
+
+def test_repeated_payloads_in_one_trace_are_exported_as_digests():
+    pipeline = content_capture.CapturePipeline()
+    tracer, memory = _traced(pipeline)
+    big = {"workflowId": "wf", "blob": "x" * 2000}
+
+    with tracer.start_as_current_span("workflow"):
+        for _ in range(2):
+            with tracer.start_as_current_span("activity||call_agent_service") as span:
+                ctx = span.get_span_context()
+                pipeline.submit(
+                    span_id=ctx.span_id,
+                    trace_id=ctx.trace_id,
+                    activity="call_agent_service",
+                    input_data=big,
+                    output={"ok": True},
+                )
+
+    first, second = memory.get_finished_spans()[:2]
+    assert "input.value" in first.attributes
+    assert "input.value" not in second.attributes
+    assert second.attributes["input.value_deduplicated"] is True
+    assert second.attributes["input.value_digest"] == first.attributes["input.value_digest"]
+    assert pipeline.stats()["deduplicated"] == 2
+
+
+def test_head_sampling_is_stable_per_trace_and_overridable_per_workflow(monkeypatch):
+    monkeypatch.setenv("CONTENT_CAPTURE_SAMPLE_RATE", "0.5")
+    monkeypatch.setenv("CONTENT_CAPTURE_SAMPLE_RATES", "always=1, never=0")
+
+    decisions = [content_capture.head_sampled(trace_id, "wf") for trace_id in range(1, 400)]
+    assert 120 < sum(decisions) < 280
+    assert decisions == [content_capture.head_sampled(t, "wf") for t in range(1, 400)]
+    assert all(content_capture.head_sampled(t, "always") for t in range(1, 50))
+    assert not any(content_capture.head_sampled(t, "never") for t in range(1, 50))
+
+    pipeline = content_capture.CapturePipeline()
+    assert not pipeline.submit(
+        span_id=1, trace_id=1, activity="a", input_data={}, output={}, workflow_id="never"
+    )
+    assert pipeline.stats()["sampledOut"] == 1
+
+
+def test_backlog_is_bounded_and_evicts_the_oldest_captures():
+    pipeline = content_capture.CapturePipeline(queue_size=2)
+    pipeline._ensure_worker = lambda: None  # keep captures pending
+
+    accepted = [
+        pipeline.submit(span_id=i, trace_id=7, activity="a", input_data={"i": i}, output=None)
+        for i in range(1, 5)
+    ]
+
+    assert accepted == [True, True, True, True]
+    assert pipeline.stats()["dropped"] == 2
+    assert pipeline.take(1) is None
+    assert '"i": 3' in pipeline.take(3)["input.value"]
+
+
+def test_captures_never_taken_do_not_block_new_ones():
+    # Spans the exporter never sees (dropped by the batch processor, never
+    # ended) must not pin the backlog.
+    pipeline = content_capture.CapturePipeline(queue_size=4)
+    pipeline._ensure_worker = lambda: None
+    for i in range(1, 101):
+        assert pipeline.submit(
+            span_id=i, trace_id=7, activity="a", input_data={"i": i}, output=None
+        )
+
+    stats = pipeline.stats()
+    assert (stats["pending"], stats["dropped"]) == (4, 96)
+    # Evicted captures release their payloads even while still queued.
+    stale = pipeline._queue.get_nowait()
+    assert (stale.input, stale.attrs) == (None, {})
+    assert '"i": 100' in pipeline.take(100)["input.value"]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from activities import dapr_invoke  # noqa: E402
+
+
+class _Unavailable(Exception):
+    class _Code:
+        name = "UNAVAILABLE"
+
+    def code(self):
+        return self._Code()
+
+    def details(self):
+        return str(self)
+
+
+_SIDECAR_DOWN = (
+    "failed to connect to all addresses; last error: UNKNOWN: "
+    "ipv4:127.0.0.1:50001: Failed to connect to remote host: Connection refused"
+)
+
+
+class _FakeResponse:
+    def __init__(self, body):
+        self._body = body
+
+    def text(self):
+        return json.dumps(self._body)
+
+
+class _CountingDaprClient:
+    created = 0
+    closed = 0
+    fail_with: Exception | None = None
+    gate: threading.Event | None = None
+
+    def __init__(self):
+        type(self).created += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return None
+
+    def close(self):
+        type(self).closed += 1
+
+    def invoke_method(self, **kwargs):
+        gate = type(self).gate
+        if gate is not None:
+            gate.wait(5)
+        if type(self).fail_with is not None:
+            raise type(self).fail_with
+        return _FakeResponse({"method": kwargs["method_name"]})
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    class Client(_CountingDaprClient):
+        created = 0
+        closed = 0
+        fail_with = None
+        gate = None
+
+    monkeypatch.setattr(dapr_invoke, "DaprClient", Client)
+    monkeypatch.setattr(dapr_invoke, "_target_slots", {})
+    monkeypatch.setattr(dapr_invoke, "_target_stats", {})
+    yield Client
+    dapr_invoke.reset_dapr_client()
+
+
+def test_calls_share_one_client_and_record_per_target_stats(fake_client):
+    for _ in range(5):
+        status, body, _ = dapr_invoke.dapr_invoke("function-router", "execute", {})
+        assert (status, body) == (200, {"method": "execute"})
+    dapr_invoke.dapr_invoke("workspace-runtime", "api/x", {})
+
+    assert fake_client.created == 1
+    stats = dapr_invoke.invocation_stats()
+    assert stats["function-router"]["calls"] == 5
+    assert stats["function-router"]["errors"] == 0
+    assert stats["function-router"]["inFlight"] == 0
+    assert sum(stats["function-router"]["latencyBucketsMs"].values()) == 5
+    assert stats["workspace-runtime"]["calls"] == 1
+
+
+def test_sidecar_unavailable_resets_the_shared_client(fake_client):
+    dapr_invoke.dapr_invoke("function-router", "execute", {})
+    fake_client.fail_with = _Unavailable(_SIDECAR_DOWN)
+
+    status, body, _ = dapr_invoke.dapr_invoke("function-router", "execute", {})
+
+    assert status == 500 and "127.0.0.1:50001" in body["error"]
+    assert fake_client.closed == 1
+    assert dapr_invoke.invocation_stats()["function-router"]["errors"] == 1
+
+    fake_client.fail_with = None
+    assert dapr_invoke.dapr_invoke("function-router", "execute", {})[0] == 200
+    assert fake_client.created == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        RuntimeError("HTTP 422 from target"),
+        # The sidecar is fine; the invoked app is down.
+        _Unavailable(
+            "fail to invoke, id: function-router, err: rpc error: code = Unavailable "
+            "desc = connection error: dial tcp 10.0.4.7:8080: connect: connection refused"
+        ),
+        _Unavailable("ERR_DIRECT_INVOKE: target app is shutting down"),
+    ],
+)
+def test_application_errors_keep_the_shared_client(fake_client, error):
+    fake_client.fail_with = error
+
+    assert dapr_invoke.dapr_invoke("function-router", "execute", {})[0] == 500
+    assert dapr_invoke.dapr_invoke("function-router", "execute", {})[0] == 500
+    assert (fake_client.created, fake_client.closed) == (1, 0)
+
+
+def test_reset_never_closes_a_client_with_calls_in_flight(fake_client):
+    fake_client.gate = threading.Event()
+    slow_result: list[int] = []
+    slow = threading.Thread(
+        target=lambda: slow_result.append(
+            dapr_invoke.dapr_invoke("workspace-runtime", "api/x", {})[0]
+        )
+    )
+    slow.start()
+    while dapr_invoke.invocation_stats().get("workspace-runtime", {}).get("inFlight") != 1:
+        pass
+
+    # Another call on the same client sees the sidecar connection drop.
+    with pytest.raises(_Unavailable):
+        with dapr_invoke.shared_dapr_client("function-router"):
+            raise _Unavailable(_SIDECAR_DOWN)
+    assert fake_client.closed == 0
+    # New calls get a fresh client while the slow one keeps the old.
+    with dapr_invoke.shared_dapr_client("function-router") as client:
+        assert fake_client.created == 2
+    dapr_invoke.reset_dapr_client("stale", client=object())
+    assert fake_client.created == 2 and fake_client.closed == 0
+
+    fake_client.gate.set()
+    slow.join(5)
+    assert slow_result == [200] and fake_client.closed == 1
+    with dapr_invoke.shared_dapr_client("function-router") as again:
+        assert again is client
+
+
+def test_concurrent_calls_per_target_are_bounded(fake_client, monkeypatch):
+    monkeypatch.setenv("DAPR_INVOKE_MAX_CONCURRENT_PER_APP", "2")
+    fake_client.gate = threading.Event()
+    results: list[int] = []
+    workers = [
+        threading.Thread(
+            target=lambda: results.append(
+                dapr_invoke.dapr_invoke("function-router", "execute", {})[0]
+            )
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    while dapr_invoke.invocation_stats().get("function-router", {}).get("inFlight") != 2:
+        pass
+
+    with pytest.raises(TimeoutError, match="2 concurrent slots"):
+        with dapr_invoke.shared_dapr_client("function-router", timeout=0.05):
+            pass
+    # Other targets are not affected by a saturated one.
+    with dapr_invoke.shared_dapr_client("workspace-runtime", timeout=0.05) as client:
+        assert isinstance(client, fake_client)
+
+    fake_client.gate.set()
+    for worker in workers:
+        worker.join(5)
+    assert results == [200, 200]
+
+
+def test_shared_client_can_be_disabled(fake_client, monkeypatch):
+    monkeypatch.setenv("DAPR_INVOKE_SHARED_CLIENT", "false")
+
+    dapr_invoke.dapr_invoke("function-router", "execute", {})
+    dapr_invoke.dapr_invoke("function-router", "execute", {})
+
+    assert fake_client.created == 2
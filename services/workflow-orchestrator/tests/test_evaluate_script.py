@@ -0,0 +1,255 @@
+"""evaluate_script journal cursor: pump iterations ship journal deltas, fall
+back to the full journal on an evaluator cache miss, and per-iteration request
+size stays flat as the journal grows."""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from activities import evaluate_script as es
+
+T0 = datetime(2026, 7, 9, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _stamp(seconds: float) -> str:
+    return (T0 + timedelta(seconds=seconds)).isoformat().replace("+00:00", "Z")
+
+
+class _Journal:
+    """The BFF journal: every write bumps the execution's change counter."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, dict] = {}
+        self.reads: list[int | None] = []
+        self.version = 0
+
+    def write(self, call_id: str, status: str, at: float = 0, result="ok") -> None:
+        self.version += 1
+        self.rows[call_id] = {
+            "callId": call_id,
+            "status": status,
+            "result": result,
+            "errorCode": None,
+            "changeSeq": self.version,
+            "updatedAt": _stamp(at),
+        }
+
+    def list_script_calls(self, execution_id, *, changed_after=None):
+        self.reads.append(changed_after)
+        rows = list(self.rows.values())
+        if changed_after is not None:
+            rows = [r for r in rows if r["changeSeq"] > changed_after]
+        return rows
+
+
+class _Response:
+    def __init__(self, status_code: int, body: dict) -> None:
+        self.status_code = status_code
+        self._body = body
+        self.text = json.dumps(body)
+
+    def json(self):
+        return self._body
+
+
+class _Evaluator:
+    """Mirrors script-evaluator's journal replay cache (journal-cache.ts)."""
+
+    def __init__(self, *, journal_aware: bool = True) -> None:
+        self.journal_aware = journal_aware
+        self.max_entries = 256
+        self.cache: dict[str, dict] = {}
+        self.requests: list[dict] = []
+        self.seen: list[dict] = []
+
+    def post(self, url, *, json=None, timeout=None):
+        body = json
+        self.requests.append(body)
+        completed = dict(body.get("completedResults") or {})
+        journal = body.get("journal") if self.journal_aware else None
+        key = f"{body.get('executionId')}:{(journal or {}).get('key')}"
+        if journal and journal["mode"] == "delta":
+            entry = self.cache.get(key)
+            if not entry or entry["cursor"] != journal.get("baseCursor"):
+                return _Response(409, {"error": "journal_cache_miss"})
+            merged = dict(entry["completed"])
+            for call_id in journal.get("retracted") or []:
+                merged.pop(call_id, None)
+            merged.update(completed)
+            completed = merged
+        self.seen.append(completed)
+        response = {"status": "need", "tasks": [], "returnValue": None}
+        if journal:
+            self.cache.pop(key, None)
+            if self.max_entries > 0:
+                self.cache[key] = {"cursor": journal["cursor"], "completed": completed}
+            kept = key in self.cache
+            response["journal"] = {"cursor": journal["cursor"] if kept else None}
+        return _Response(200, response)
+
+
+@pytest.fixture
+def harness(monkeypatch):
+    journal = _Journal()
+    evaluator = _Evaluator()
+    monkeypatch.setattr(es.script_journal_client, "list_script_calls", journal.list_script_calls)
+    monkeypatch.setattr(es.requests, "post", evaluator.post)
+    return journal, evaluator
+
+
+def _evaluate(cursor: str | None = None) -> dict:
+    return es.evaluate_script(
+        None,
+        {
+            "executionId": "exec-1",
+            "script": "export default 1",
+            "scriptSha256": "sha",
+            "knownCallIds": [],
+            "journalKey": "dsw-1",
+            "journalCursor": cursor,
+        },
+    )
+
+
+def test_first_iteration_sends_full_journal_and_returns_cursor(harness):
+    journal, evaluator = harness
+    journal.write("c1", "done")
+    journal.write("c2", "done")
+
+    plan = _evaluate()
+
+    assert journal.reads == [None]
+    assert evaluator.requests[0]["journal"]["mode"] == "full"
+    assert set(evaluator.requests[0]["completedResults"]) == {"c1", "c2"}
+    assert plan["journalCursor"] == "2"
+    assert "journal" not in plan
+
+
+def test_next_iteration_sends_only_rows_changed_after_cursor(harness):
+    journal, evaluator = harness
+    journal.write("c0", "done")
+    journal.write("c1", "done")
+    cursor = _evaluate()["journalCursor"]
+    journal.write("c2", "done")
+    journal.write("c3", "running")
+
+    plan = _evaluate(cursor)
+
+    request = evaluator.requests[-1]
+    assert journal.reads[-1] == 2
+    assert request["journal"]["mode"] == "delta"
+    assert request["journal"]["baseCursor"] == cursor
+    # The bound is exclusive: rows at or below the cursor are not re-sent.
+    assert set(request["completedResults"]) == {"c2"}
+    assert request["journal"]["retracted"] == ["c3"]
+    assert set(evaluator.seen[-1]) == {"c0", "c1", "c2"}
+    assert plan["journalCursor"] == "4"
+
+
+def test_cursor_ignores_wall_clock_skew(harness):
+    journal, evaluator = harness
+    journal.write("c1", "done", 10)
+    cursor = _evaluate()["journalCursor"]
+    # Committed after the previous read but stamped well before it (a writer
+    # with a slow clock, or one that stamped before a long commit).
+    journal.write("c0", "done", -60)
+
+    _evaluate(cursor)
+
+    assert evaluator.requests[-1]["journal"]["mode"] == "delta"
+    assert set(evaluator.requests[-1]["completedResults"]) == {"c0"}
+    assert set(evaluator.seen[-1]) == {"c0", "c1"}
+
+
+def test_rows_without_change_counter_fall_back_to_full_loads(harness):
+    journal, evaluator = harness
+    journal.write("c1", "done")
+    del journal.rows["c1"]["changeSeq"]  # a BFF that predates the counter
+
+    plan = _evaluate()
+    assert "journalCursor" not in plan
+
+    # A timestamp cursor from before the counter is not a delta base either.
+    plan = _evaluate(_stamp(1))
+    assert journal.reads == [None, None]
+    assert evaluator.requests[-1]["journal"]["mode"] == "full"
+    assert "journalCursor" not in plan
+
+
+def test_cache_miss_falls_back_to_full_journal(harness):
+    journal, evaluator = harness
+    journal.write("c1", "done")
+    cursor = _evaluate()["journalCursor"]
+    evaluator.cache.clear()  # another replica / restart
+
+    plan = _evaluate(cursor)
+
+    assert [r["journal"]["mode"] for r in evaluator.requests] == ["full", "delta", "full"]
+    assert journal.reads[-1] is None
+    assert plan["journalCursor"] == "1"
+
+
+def test_evaluator_that_keeps_no_entry_gets_no_cursor(harness):
+    journal, evaluator = harness
+    evaluator.max_entries = 0  # SCRIPT_JOURNAL_CACHE_MAX_ENTRIES=0
+    journal.write("c1", "done")
+
+    plan = _evaluate()
+    journal.write("c2", "done")
+    plan = _evaluate(plan.get("journalCursor"))
+
+    assert "journalCursor" not in plan
+    assert journal.reads == [None, None]
+    assert [r["journal"]["mode"] for r in evaluator.requests] == ["full", "full"]
+
+
+def test_evaluator_without_journal_support_never_gets_deltas(harness):
+    journal, evaluator = harness
+    evaluator.journal_aware = False
+    journal.write("c1", "done")
+
+    plan = _evaluate()
+    assert "journalCursor" not in plan
+
+    # A stale cursor (e.g. from before a rollback) is re-sent in full.
+    plan = _evaluate("1")
+    assert evaluator.requests[-1]["journal"]["mode"] == "full"
+    assert set(evaluator.seen[-1]) == {"c1"}
+    assert "journalCursor" not in plan
+
+
+def test_kill_switch_restores_full_load(harness, monkeypatch):
+    monkeypatch.setenv("SCRIPT_JOURNAL_DELTA_ENABLED", "false")
+    journal, evaluator = harness
+    journal.write("c1", "done")
+
+    plan = _evaluate("1")
+
+    assert journal.reads == [None]
+    assert "journal" not in evaluator.requests[0]
+    assert "journalCursor" not in plan
+
+
+@pytest.mark.parametrize("journal_length", [10, 100, 400])
+def test_pump_iteration_bytes_stay_flat_as_journal_grows(harness, journal_length):
+    """Benchmark: bytes sent per pump iteration vs journal length.
+
+    The full load grows linearly with the journal; the cursor delta only
+    carries the calls that resolved since the previous iteration.
+    """
+    journal, evaluator = harness
+    result = "x" * 512
+    for i in range(journal_length):
+        journal.write(f"c{i}", "done", i, result)
+    cursor = _evaluate()["journalCursor"]
+    full_bytes = len(json.dumps(evaluator.requests[-1]))
+
+    journal.write("next", "done", journal_length + 1, result)
+    _evaluate(cursor)
+    delta_bytes = len(json.dumps(evaluator.requests[-1]))
+
+    assert len(evaluator.seen[-1]) == journal_length + 1
+    assert delta_bytes < 2048
+    assert full_bytes > journal_length * 512
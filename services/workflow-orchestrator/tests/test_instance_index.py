@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+SERVICE_ROOT = Path(__file__).resolve().parent.parent
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVICE_ROOT))
+
+from core import instance_index as INDEX  # noqa: E402
+
+InstanceIndex = INDEX.InstanceIndex
+
+
+def _payload(instance_id: str, status: str, started_at: str, **extra) -> dict:
+    return {
+        "instanceId": instance_id,
+        "workflowId": instance_id.split("-exec-")[0],
+        "runtimeStatus": status,
+        "startedAt": started_at,
+        "outputs": {"large": "x" * 100},
+        **extra,
+    }
+
+
+def _ids(rows: list[dict]) -> list[str]:
+    return [row["instanceId"] for row in rows]
+
+
+def test_rows_are_newest_first_across_timestamp_formats():
+    index = InstanceIndex()
+    index.record_payload(_payload("a-exec-1", "COMPLETED", "2026-01-01T10:00:00"))
+    index.record_payload(_payload("a-exec-2", "RUNNING", "2026-01-01T12:00:00.500000"))
+    index.record_started(
+        "a-exec-3",
+        workflow_id="a",
+        workflow_name="a",
+        started_at="2026-01-01T13:00:00+02:00",  # 11:00 UTC
+    )
+    index.record_payload(_payload("a-exec-0", "PENDING", None))
+
+    rows, total, next_cursor = index.query(limit=10)
+
+    assert _ids(rows) == ["a-exec-2", "a-exec-3", "a-exec-1", "a-exec-0"]
+    assert total == 4
+    assert next_cursor is None
+    assert "outputs" not in rows[0]
+
+
+def test_cursor_pages_do_not_shift_when_runs_start():
+    index = InstanceIndex()
+    for i in range(5):
+        index.record_payload(_payload(f"a-exec-{i}", "COMPLETED", f"2026-01-01T10:00:0{i}"))
+
+    first, _, cursor = index.query(limit=2)
+    index.record_started("a-exec-new", workflow_id="a", workflow_name="a")
+    second, total, cursor = index.query(limit=2, cursor=cursor)
+    third, _, last_cursor = index.query(limit=2, cursor=cursor)
+
+    assert _ids(first) == ["a-exec-4", "a-exec-3"]
+    assert _ids(second) == ["a-exec-2", "a-exec-1"]
+    assert _ids(third) == ["a-exec-0"]
+    assert total == 6
+    assert last_cursor is None
+
+
+def test_predicate_filters_count_and_offset():
+    index = InstanceIndex()
+    for i in range(6):
+        status = "FAILED" if i % 3 == 0 else "COMPLETED"
+        index.record_payload(_payload(f"a-exec-{i}", status, f"2026-01-01T10:00:0{i}"))
+
+    rows, total, next_cursor = index.query(
+        predicate=lambda row: row["runtimeStatus"] == "COMPLETED", limit=2, offset=1
+    )
+
+    assert _ids(rows) == ["a-exec-4", "a-exec-2"]
+    assert total == 4
+    assert next_cursor is not None
+
+
+def test_lifecycle_events_win_over_an_in_flight_backfill():
+    index = InstanceIndex()
+    index.record_started("a-exec-1", workflow_id="a", workflow_name="a", trace_id="t")
+    index.record_finished("a-exec-1", phase="failed", error="boom")
+    index.record_payload(_payload("a-exec-1", "RUNNING", "2026-01-01T10:00:00"))
+
+    row = index.get("a-exec-1")
+    assert (row["runtimeStatus"], row["phase"], row["error"]) == ("COMPLETED", "failed", "boom")
+    assert row["traceId"] == "t"
+    assert index.needs_hydration(["a-exec-1", "a-exec-2"]) == ["a-exec-2"]
+
+
+def test_backfilled_running_rows_need_hydration_until_terminal():
+    index = InstanceIndex()
+    index.record_payload(_payload("a-exec-1", "RUNNING", "2026-01-01T10:00:00"))
+    index.record_payload(_payload("a-exec-2", "COMPLETED", "2026-01-01T10:00:01"))
+
+    assert index.needs_hydration(["a-exec-1", "a-exec-2"]) == ["a-exec-1"]
+
+
+def test_started_only_row_is_rehydrated_after_the_refresh_interval(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_INSTANCE_INDEX_REFRESH_SECONDS", "30")
+    clock = [100.0]
+    index = InstanceIndex(clock=lambda: clock[0])
+    # The run crashed after workflow.started: no finished event will come.
+    index.record_started("a-exec-1", workflow_id="a", workflow_name="a")
+    index.record_started("a-exec-2", workflow_id="a", workflow_name="a")
+    index.record_finished("a-exec-2", phase="completed")
+    clock[0] += 29
+    assert index.needs_hydration(["a-exec-1", "a-exec-2"]) == []
+
+    clock[0] += 1
+    assert index.needs_hydration(["a-exec-1", "a-exec-2"]) == ["a-exec-1"]
+    read_at = index.now()
+    index.record_payload(
+        _payload("a-exec-1", "FAILED", "2026-01-01T10:00:00", error="worker lost"),
+        read_at=read_at,
+    )
+
+    row = index.get("a-exec-1")
+    assert (row["runtimeStatus"], row["error"]) == ("FAILED", "worker lost")
+    assert index.needs_hydration(["a-exec-1"]) == []
+
+
+def test_event_after_the_backfill_read_started_wins(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_INSTANCE_INDEX_REFRESH_SECONDS", "30")
+    clock = [100.0]
+    index = InstanceIndex(clock=lambda: clock[0])
+    index.record_started("a-exec-1", workflow_id="a", workflow_name="a")
+    clock[0] += 30
+    read_at = index.now()
+    clock[0] += 1
+    index.record_finished("a-exec-1", phase="completed")
+    index.record_payload(
+        _payload("a-exec-1", "RUNNING", "2026-01-01T10:00:00"), read_at=read_at
+    )
+
+    assert index.get("a-exec-1")["phase"] == "completed"
+
+
+def test_finished_event_before_started_event_stays_due_for_hydration():
+    clock = [100.0]
+    index = InstanceIndex(clock=lambda: clock[0])
+    index.mark_refreshed(index.begin_refresh())
+
+    index.record_finished("a-exec-1", phase="completed")
+
+    row = index.get("a-exec-1")
+    assert row["runtimeStatus"] == "COMPLETED" and "workflowId" not in row
+    assert index.needs_hydration(["a-exec-1"]) == ["a-exec-1"]
+    assert index.refresh_due()
+
+    # The late started event fills in the columns without reviving the run.
+    index.record_started("a-exec-1", workflow_id="a", workflow_name="a")
+    row = index.get("a-exec-1")
+    assert (row["runtimeStatus"], row["phase"]) == ("COMPLETED", "completed")
+    assert row["workflowId"] == "a" and row["startedAt"]
+    assert index.needs_hydration(["a-exec-1"]) == []
+
+
+def test_finished_only_row_is_replaced_by_the_backfill():
+    index = InstanceIndex()
+    read_at = index.now()
+    index.record_finished("a-exec-1", phase="failed", error="boom")
+    index.record_payload(
+        _payload("a-exec-1", "COMPLETED", "2026-01-01T10:00:00", phase="failed"),
+        read_at=read_at,
+    )
+
+    row = index.get("a-exec-1")
+    assert (row["workflowId"], row["startedAt"]) == ("a", "2026-01-01T10:00:00")
+    assert index.needs_hydration(["a-exec-1"]) == []
+
+
+def test_invalidate_makes_the_row_and_the_refresh_due():
+    clock = [100.0]
+    index = InstanceIndex(clock=lambda: clock[0])
+    index.record_started("a-exec-1", workflow_id="a", workflow_name="a")
+    index.mark_refreshed(index.begin_refresh())
+    assert not index.refresh_due()
+
+    index.invalidate("a-exec-1")
+    token = index.begin_refresh()
+    index.invalidate("a-exec-1")  # lands while that refresh is running
+    index.mark_refreshed(token)
+
+    assert index.refresh_due()
+    assert index.needs_hydration(["a-exec-1"]) == ["a-exec-1"]
+    assert index.get("a-exec-1")["runtimeStatus"] == "RUNNING"
+
+
+def test_refresh_interval_gates_refresh(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_INSTANCE_INDEX_REFRESH_SECONDS", "30")
+    clock = [100.0]
+    index = InstanceIndex(clock=lambda: clock[0])
+    assert index.is_cold and index.refresh_due()
+
+    index.mark_refreshed(index.begin_refresh())
+    clock[0] += 29
+    assert not index.is_cold and not index.refresh_due()
+    clock[0] += 1
+    assert index.refresh_due()
+
+
+def test_remove_is_recursive_over_child_instances():
+    index = InstanceIndex()
+    for instance_id in ("p-exec-1", "p-exec-1__sub__n__0", "p-exec-10"):
+        index.record_payload(_payload(instance_id, "COMPLETED", "2026-01-01T10:00:00"))
+
+    assert index.remove("p-exec-1", recursive=True) == 2
+    assert index.ids() == {"p-exec-10"}
+    assert index.discard(["p-exec-10", "missing"]) == 1
+    assert index.query(limit=5) == ([], 0, None)
+
+
+def test_malformed_cursor_raises_value_error():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        InstanceIndex().query(limit=5, cursor="bm90LWpzb24")
+    assert INDEX.decode_cursor(INDEX.encode_cursor(("2026", "a"))) == ("2026", "a")
@@ -299,6 +299,7 @@ def _load_module(name: str, relative_path: str):
 
 
 APP = _load_module("workflow_orchestrator_app", "app.py")
+INSTANCE_INDEX = sys.modules["core.instance_index"]
 SW_WORKFLOW = _load_module(
     "workflow_orchestrator_sw_workflow", "workflows/sw_workflow.py"
 )
@@ -444,6 +445,7 @@ def test_taskhub_list_accepts_dapr_118_workflow_state(monkeypatch):
         ),
     )
     monkeypatch.setattr(APP, "_taskhub_call", lambda *_args, **_kwargs: _Response())
+    monkeypatch.setattr(APP, "_workflow_instance_index", INSTANCE_INDEX.InstanceIndex())
 
     result = APP._list_workflows_from_taskhub_instance_ids(
         status_filter={"RUNNING"},
@@ -458,6 +460,151 @@ def test_taskhub_list_accepts_dapr_118_workflow_state(monkeypatch):
     assert result.workflows[0].currentNodeId == "solve"
 
 
+def test_taskhub_list_skips_rows_only_a_finished_event_created(monkeypatch):
+    index = INSTANCE_INDEX.InstanceIndex()
+    index.record_started("wf-exec-1", workflow_id="wf", workflow_name="wf")
+    index.record_finished("wf-exec-2", phase="completed")
+    monkeypatch.setattr(APP, "_workflow_instance_index", index)
+    monkeypatch.setattr(APP, "_ensure_workflow_instance_index", lambda: None)
+
+    result = APP._list_workflows_from_taskhub_instance_ids(
+        status_filter=None,
+        search_filter="",
+        limit=10,
+        offset=0,
+    )
+
+    assert [item.instanceId for item in result.workflows] == ["wf-exec-1"]
+
+
+class _ListState:
+    def __init__(self, instance_id, status, created_seconds, custom_status=None):
+        self.name = "sw_workflow_v1"
+        self.workflowStatus = status
+        self.customStatus = types.SimpleNamespace(
+            value=json.dumps(custom_status or {"traceId": f"trace-{instance_id}"})
+        )
+        self.version = types.SimpleNamespace(value="")
+        self.parentInstanceId = None
+        self.input = None
+        self.output = None
+        self.failureDetails = None
+        self.createdTimestamp = types.SimpleNamespace(
+            seconds=created_seconds,
+            nanos=0,
+            ToDatetime=lambda: datetime(2026, 1, 1) + timedelta(seconds=created_seconds),
+        )
+        self.completedTimestamp = None
+        self.lastUpdatedTimestamp = None
+
+
+def _install_list_taskhub(monkeypatch, states):
+    """Fake ListInstanceIDs/GetInstance over {instance_id: _ListState}."""
+    calls = {"GetInstance": [], "ListInstanceIDs": 0}
+    index = INSTANCE_INDEX.InstanceIndex()
+
+    def list_instance_ids(*, continuation_token=None, page_size=200):
+        calls["ListInstanceIDs"] += 1
+        ids = list(states)
+        start = int(continuation_token or 0)
+        page = ids[start : start + page_size]
+        more = start + page_size < len(ids)
+        return page, str(start + page_size) if more else None
+
+    def taskhub_call(method, request):
+        assert method == "GetInstance"
+        calls["GetInstance"].append(request)
+        state = states.get(request.instanceId)
+        return types.SimpleNamespace(exists=state is not None, workflowState=state)
+
+    monkeypatch.setattr(APP, "_list_instance_ids", list_instance_ids)
+    monkeypatch.setattr(APP, "_taskhub_call", taskhub_call)
+    monkeypatch.setattr(APP, "_workflow_instance_index", index)
+    return calls, index
+
+
+def test_workflow_list_backfills_index_once_without_inputs_and_outputs(monkeypatch):
+    states = {
+        f"wf_a-exec-{i}": _ListState(
+            f"wf_a-exec-{i}",
+            "ORCHESTRATION_STATUS_COMPLETED" if i % 2 else "ORCHESTRATION_STATUS_RUNNING",
+            i,
+        )
+        for i in range(450)
+    }
+    calls, index = _install_list_taskhub(monkeypatch, states)
+
+    first = APP.list_workflows(limit=5)
+
+    assert first.total == 450
+    assert [item.instanceId for item in first.workflows] == [
+        f"wf_a-exec-{i}" for i in range(449, 444, -1)
+    ]
+    assert first.workflows[0].traceId == "trace-wf_a-exec-449"
+    assert calls["ListInstanceIDs"] == 3
+    assert len(calls["GetInstance"]) == 450
+    assert all(req.getInputsAndOutputs is False for req in calls["GetInstance"])
+
+    # Warm index: filters, search and pages are answered without the TaskHub.
+    calls["GetInstance"].clear()
+    calls["ListInstanceIDs"] = 0
+    completed = APP.list_workflows(status="completed", search="exec-44", limit=3)
+    assert completed.total == 5  # 441, 443, 445, 447, 449
+    assert [item.instanceId for item in completed.workflows] == [
+        "wf_a-exec-449",
+        "wf_a-exec-447",
+        "wf_a-exec-445",
+    ]
+    rest = APP.list_workflows(
+        status="completed", search="exec-44", limit=3, cursor=completed.nextCursor
+    )
+    assert [item.instanceId for item in rest.workflows] == ["wf_a-exec-443", "wf_a-exec-441"]
+    assert rest.nextCursor is None
+    assert calls == {"GetInstance": [], "ListInstanceIDs": 0}
+    assert len(index) == 450
+
+
+def test_workflow_list_serves_lifecycle_events_and_rehydrates_only_unknown_rows(monkeypatch):
+    states = {
+        "wf_a-exec-1": _ListState("wf_a-exec-1", "ORCHESTRATION_STATUS_COMPLETED", 1),
+        "wf_a-exec-2": _ListState("wf_a-exec-2", "ORCHESTRATION_STATUS_RUNNING", 2),
+    }
+    calls, index = _install_list_taskhub(monkeypatch, states)
+    APP.list_workflows()
+    calls["GetInstance"].clear()
+
+    # A new run reports itself through the lifecycle activities.
+    states["wf_b-exec-3"] = _ListState("wf_b-exec-3", "ORCHESTRATION_STATUS_RUNNING", 3)
+    index.record_started(
+        "wf_b-exec-3", workflow_id="wf_b", workflow_name="b", trace_id="t-3"
+    )
+    index.record_finished("wf_b-exec-3", phase="failed", error="boom")
+    APP._refresh_workflow_instance_index()
+
+    # Only the running, not event-fed row is re-read; the event-fed and the
+    # terminal rows are not.
+    assert [req.instanceId for req in calls["GetInstance"]] == ["wf_a-exec-2"]
+    result = APP.list_workflows(search="wf_b")
+    assert result.workflows[0].runtimeStatus == "COMPLETED"
+    assert result.workflows[0].phase == "failed"
+    assert result.workflows[0].error == "boom"
+    assert result.workflows[0].traceId == "t-3"
+
+    # Purged instances drop out on the next complete scan.
+    del states["wf_a-exec-1"]
+    APP._refresh_workflow_instance_index()
+    assert index.get("wf_a-exec-1") is None
+
+
+def test_workflow_list_rejects_malformed_cursor(monkeypatch):
+    _install_list_taskhub(monkeypatch, {})
+
+    with pytest.raises(APP.HTTPException) as exc_info:
+        APP.list_workflows(cursor="not-a-cursor")
+
+    assert exc_info.value.status_code == 400
+
+
 def _install_terminal_workflow_model_fakes(monkeypatch):
     class _FakeDocument:
         def __init__(self, data):
@@ -3074,6 +3221,427 @@ def test_resolve_native_agent_args_renders_trigger_templates_before_child_workfl
     assert resolved["body"]["input"]["repo"] == "repo-test-1"
 
 
+def _expression_context_tc(dump_calls=None):
+    def _model_dump(**_kwargs):
+        if dump_calls is not None:
+            dump_calls.append(_kwargs)
+        return {"document": {"name": "test-workflow"}}
+
+    workflow = types.SimpleNamespace(
+        document=types.SimpleNamespace(name="test-workflow"),
+        model_dump=_model_dump,
+    )
+    return SW_WORKFLOW.TaskContext(
+        workflow=workflow,
+        workflow_id="test-workflow",
+        trigger_data={"owner": "giteaadmin"},
+        execution_id="exec_123",
+        db_execution_id="db_exec_123",
+        integrations=None,
+    )
+
+
+def test_expression_context_reuses_workflow_dump_and_output_views():
+    dump_calls = []
+    tc = _expression_context_tc(dump_calls)
+    SW_WORKFLOW._store_task_output(
+        tc, "fetch", "http", {"success": True, "data": {"status": 200}}
+    )
+    SW_WORKFLOW._store_task_output(tc, "count", "set", 3)
+    tc.state_vars["count"] = "shadowed"
+    tc.task_outputs["__trigger__"] = {"data": {"ignored": True}}
+
+    first = SW_WORKFLOW._build_expression_context(tc)
+    overlay = SW_WORKFLOW._build_expression_context(
+        tc,
+        task_input={"q": 1},
+        has_task_input=True,
+        task_output={"success": True, "data": "done"},
+        has_task_output=True,
+    )
+
+    assert len(dump_calls) == 1
+    assert first["workflow"] == {"document": {"name": "test-workflow"}}
+    assert first["fetch"] == {"status": 200, "result": {"status": 200}}
+    assert first["count"] == 3
+    assert first["trigger"]["owner"] == "giteaadmin"
+    assert "__trigger__" not in first
+    assert first["input"] == {"owner": "giteaadmin"}
+    assert overlay["input"] == overlay["taskInput"] == {"q": 1}
+    assert overlay["task"] == overlay["output"] == "done"
+    # The per-task overlay never leaks into the shared base.
+    assert "taskInput" not in SW_WORKFLOW._build_expression_context(tc)
+
+
+def test_expression_context_tracks_replacements_and_live_state():
+    tc = _expression_context_tc()
+    SW_WORKFLOW._store_task_output(tc, "review", "agent", {"content": "ok"})
+    assert SW_WORKFLOW._build_expression_context(tc)["review"]["content"] == "ok"
+
+    tc.task_outputs["review"]["data"] = {"content": '{"meets_criteria": true}'}
+    SW_WORKFLOW._apply_parse_json_affordance(tc, "review")
+    assert SW_WORKFLOW._build_expression_context(tc)["review"]["meets_criteria"] is True
+
+    SW_WORKFLOW._store_task_output(
+        tc, "state", "state", {"success": True, "data": tc.state_vars}, label="State"
+    )
+    tc.state_vars["item"] = "a"
+    assert SW_WORKFLOW._build_expression_context(tc)["state"]["item"] == "a"
+    tc.state_vars["item"] = "b"
+    assert SW_WORKFLOW._build_expression_context(tc)["state"]["item"] == "b"
+
+    tc.task_outputs = {"branch": {"data": {"value": 1}}}
+    assert SW_WORKFLOW._build_expression_context(tc)["branch"]["value"] == 1
+    tc.task_outputs["late"] = {"data": 7}
+    assert SW_WORKFLOW._build_expression_context(tc)["late"] == 7
+
+
+def test_expression_context_benchmark_per_task_cost_is_flat(monkeypatch):
+    """Benchmark: unwrap work per task stays constant as workflows grow.
+
+    Simulates the interpreter's access pattern (input.from, if, output.as per
+    task) for workflows of increasing length. Each stored output is unwrapped
+    exactly once, and the workflow document is dumped once, regardless of
+    length; wall-clock per task is reported for reference.
+    """
+    import time
+
+    original_unwrap = SW_WORKFLOW._unwrap_standardized_output
+    per_length = {}
+    for length in (25, 200):
+        unwrap_calls = []
+
+        def _counting_unwrap(value, _calls=unwrap_calls):
+            _calls.append(1)
+            return original_unwrap(value)
+
+        monkeypatch.setattr(SW_WORKFLOW, "_unwrap_standardized_output", _counting_unwrap)
+        dump_calls = []
+        tc = _expression_context_tc(dump_calls)
+        started = time.perf_counter()
+        for index in range(length):
+            for _ in range(3):
+                SW_WORKFLOW._build_expression_context(tc)
+            SW_WORKFLOW._store_task_output(
+                tc,
+                f"task_{index}",
+                "http",
+                {"success": True, "data": {"index": index, "body": "x" * 256}},
+            )
+        elapsed = time.perf_counter() - started
+        per_length[length] = (len(unwrap_calls) / length, elapsed / length)
+        assert len(dump_calls) == 1
+    monkeypatch.setattr(SW_WORKFLOW, "_unwrap_standardized_output", original_unwrap)
+
+    print(
+        "expression context per-task cost: "
+        + ", ".join(
+            f"{length} tasks -> {unwraps:.2f} unwraps, {seconds * 1e6:.1f}us"
+            for length, (unwraps, seconds) in per_length.items()
+        )
+    )
+    # Rebuilding from scratch would do O(length) unwraps per build; the
+    # incremental views keep it at O(1): one per stored output plus the live
+    # state node on each of the three builds.
+    assert per_length[200][0] <= per_length[25][0]
+    assert per_length[200][0] <= 4.1
+
+
+class _FakeChildWorkflowCtx:
+    instance_id = "parent-wf-1"
+    is_replaying = True
+
+    def __init__(self):
+        self.children = []
+
+    def call_child_workflow(self, name, input=None, instance_id=None):
+        self.children.append({"name": name, "input": input, "instance_id": instance_id})
+        return len(self.children) - 1
+
+    def call_activity(self, activity, input=None, retry_policy=None):
+        return {
+            "kind": "call_activity",
+            "activity": getattr(activity, "__name__", str(activity)),
+            "input": input,
+        }
+
+
+def _for_child_result(idx, item):
+    return {
+        "success": True,
+        "result": {"last": {"fetch": {"item": item}}, "accepted": idx == 0},
+        "taskOutputs": {
+            f"each/fetch[{idx}]": {"label": "fetch", "actionType": "set", "data": item}
+        },
+        "stateVars": {"repo": item, "i": idx, "loop": {"index": idx}},
+        "completedTasks": [f"each/fetch[{idx}]"],
+        "taskExecutionCounts": {},
+    }
+
+
+def test_for_max_concurrent_dispatches_iterations_in_waves(monkeypatch):
+    monkeypatch.setattr(SW_WORKFLOW, "wf_when_all", lambda tasks: ("when_all", tasks))
+    ctx = _FakeChildWorkflowCtx()
+    tc = _expression_context_tc()
+    tc.trigger_data = {"repos": ["a", "b", "c"]}
+    task_data = {
+        "for": {"each": "repo", "at": "i", "in": "${ .input.repos }", "maxConcurrent": 2},
+        "do": [{"fetch": {"set": {"repo": "${ .repo }"}}}],
+    }
+
+    gen = SW_WORKFLOW._handle_for_task(ctx, "each", task_data, tc)
+    first_wave = next(gen)
+    assert first_wave == ("when_all", [0, 1])
+    second_wave = gen.send([_for_child_result(0, "a"), _for_child_result(1, "b")])
+    assert second_wave == ("when_all", [2])
+    with pytest.raises(StopIteration) as stop:
+        gen.send([_for_child_result(2, "c")])
+
+    assert stop.value.value == {"success": True, "data": {"iterations": 3}}
+    assert [child["instance_id"] for child in ctx.children] == [
+        "parent-wf-1__for__each__0",
+        "parent-wf-1__for__each__1",
+        "parent-wf-1__for__each__2",
+    ]
+    iteration = ctx.children[1]["input"]["forIteration"]
+    assert iteration["item"] == "b" and iteration["index"] == 1
+    assert iteration["each"] == "repo" and iteration["at"] == "i"
+    assert tc.state_vars["repo"] == "c" and tc.state_vars["i"] == 2
+    assert tc.state_vars["loop"] == {
+        "last": {"fetch": {"item": "c"}},
+        "index": 2,
+        "accepted": True,
+        "iterations": 3,
+    }
+    assert [key for key in tc.task_outputs if key.startswith("each/")] == [
+        "each/fetch[0]",
+        "each/fetch[1]",
+        "each/fetch[2]",
+    ]
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        {"while": "${ .loop.accepted | not }"},
+        {"do": [{"fix": {"set": {"feedback": "${ .loop.last.review.feedback }"}}}]},
+    ],
+)
+def test_for_max_concurrent_refuses_loop_dependent_bodies(extra):
+    tc = _expression_context_tc()
+    task_data = {
+        "for": {"each": "item", "in": "${ [1, 2] }", "maxConcurrent": 2},
+        "do": [{"noop": {"set": {"x": 1}}}],
+        **extra,
+    }
+
+    with pytest.raises(RuntimeError, match="maxConcurrent"):
+        next(SW_WORKFLOW._handle_for_task(_FakeChildWorkflowCtx(), "each", task_data, tc))
+    assert "loop" not in tc.state_vars
+
+
+def test_fork_branch_workflow_runs_single_for_iteration(monkeypatch):
+    _install_terminal_workflow_model_fakes(monkeypatch)
+    monkeypatch.setattr(sys.modules["core.sw_types"], "Workflow", SW_WORKFLOW.Workflow)
+    fork_branch = _load_module(
+        "workflow_orchestrator_fork_branch_workflow", "workflows/fork_branch_workflow.py"
+    )
+    gen = fork_branch.fork_branch_workflow(
+        _FakeChildWorkflowCtx(),
+        {
+            "workflow": _minimal_sw_workflow(),
+            "workflowId": "wf_test",
+            "triggerData": {},
+            "stateVars": {"seed": True},
+            "taskOutputs": {},
+            "branchTaskName": "each[1]",
+            "forIteration": {
+                "forTaskName": "each",
+                "each": "repo",
+                "at": "i",
+                "item": "b",
+                "index": 1,
+                "subTasks": [{"fetch": {"set": {"seen": "${ .repo }"}}}],
+            },
+        },
+    )
+    with pytest.raises(StopIteration) as stop:
+        next(gen)
+
+    result = stop.value.value
+    assert result["result"]["index"] == 1
+    assert result["result"]["last"]["fetch"]["seen"] == "b"
+    assert "each/fetch[1]" in result["taskOutputs"]
+    assert result["stateVars"]["seen"] == "b" and result["stateVars"]["i"] == 1
+
+
+def _fork_context_tc(output_count=4, output_bytes=64):
+    tc = _expression_context_tc()
+    for index in range(output_count):
+        SW_WORKFLOW._store_task_output(
+            tc,
+            f"research_{index}",
+            "agent",
+            {"success": True, "data": {"content": "x" * output_bytes}},
+            label=f"Research {index}",
+        )
+    tc.state_vars.update({"ticket": "T-1", "unused": "y" * output_bytes})
+    return tc
+
+
+def test_child_context_reads_forward_only_referenced_keys():
+    tc = _fork_context_tc()
+
+    reads = SW_WORKFLOW._child_context_reads(
+        {
+            "set": {
+                "summary": "${ .research_0.content + .ticket }",
+                "legacy": "{{Research 2.content}}",
+            }
+        },
+        tc,
+    )
+
+    assert reads["outputs"] == {"trigger", "state", "research_0", "research_2"}
+    assert reads["state"] == {"ticket"}
+    assert reads["workflow"] is False
+    for unbounded in (
+        "${ . }",
+        "${ keys }",
+        "${ .[$name] }",
+        "${ .. | .content? }",
+        "${ {all: .} }",
+        "${ [.] }",
+        "${ .research_0 | tojson as $r | . }",
+        "${ .state[$k] }",
+        "${ .research_0[.ticket] }",
+        "${ .[] }",
+    ):
+        assert SW_WORKFLOW._child_context_reads({"set": {"v": unbounded}}, tc) is None
+    bounded = SW_WORKFLOW._child_context_reads(
+        {"set": {"v": '${ [.research_1["content"], .research_3[0]] | length }'}}, tc
+    )
+    assert bounded["outputs"] == {"trigger", "state", "research_1", "research_3"}
+
+
+def test_fork_hands_off_context_by_reference_and_subset(monkeypatch):
+    monkeypatch.setattr(SW_WORKFLOW, "wf_when_all", lambda tasks: ("when_all", tasks))
+    ctx = _FakeChildWorkflowCtx()
+    tc = _fork_context_tc()
+    task_data = {
+        "fork": {
+            "branches": [
+                {"narrow": {"set": {"a": "${ .research_1.content }"}}},
+                {"wide": {"set": {"b": "${ . }"}}},
+            ]
+        }
+    }
+
+    gen = SW_WORKFLOW._handle_fork_task(ctx, "fan", task_data, tc)
+    save = next(gen)
+    assert save["activity"] == "save_fork_context_snapshot"
+    digest = save["input"]["digest"]
+    assert digest == SW_WORKFLOW.snapshot_digest(save["input"]["snapshot"])
+    assert set(save["input"]["snapshot"]["taskOutputs"]) == set(tc.task_outputs)
+
+    wave = gen.send({"success": True, "digest": digest})
+    assert wave == ("when_all", [0, 1])
+    narrow, wide = (child["input"] for child in ctx.children)
+    assert set(narrow["taskOutputs"]) == {"trigger", "state", "research_1"}
+    assert narrow["stateVars"] == {}
+    assert narrow["workflow"]["do"] == []
+    assert "contextRef" not in narrow
+    assert wide["contextRef"] == {"digest": digest}
+    assert "taskOutputs" not in wide and "stateVars" not in wide
+
+    with pytest.raises(StopIteration):
+        gen.send(
+            [
+                {"result": 1, "taskOutputs": {"fan/narrow": {"data": 1}}, "stateVars": {"a": 1}},
+                {"result": 2, "taskOutputs": {"fan/wide": {"data": 2}}, "stateVars": {"b": 2}},
+            ]
+        )
+    assert tc.state_vars["a"] == 1 and tc.state_vars["b"] == 2
+    assert tc.state_vars["ticket"] == "T-1"
+    assert tc.task_outputs["fan"]["data"]["data"] == {"narrow": 1, "wide": 2}
+
+
+def test_fork_branch_workflow_loads_context_ref_and_returns_deltas(monkeypatch):
+    _install_terminal_workflow_model_fakes(monkeypatch)
+    monkeypatch.setattr(sys.modules["core.sw_types"], "Workflow", SW_WORKFLOW.Workflow)
+    fork_branch = _load_module(
+        "workflow_orchestrator_fork_branch_workflow", "workflows/fork_branch_workflow.py"
+    )
+    snapshot = {
+        "workflow": _minimal_sw_workflow(),
+        "stateVars": {"ticket": "T-1", "untouched": True},
+        "taskOutputs": {"research": {"label": "research", "actionType": "agent", "data": "notes"}},
+    }
+    gen = fork_branch.fork_branch_workflow(
+        _FakeChildWorkflowCtx(),
+        {
+            "workflow": {**_minimal_sw_workflow(), "do": []},
+            "workflowId": "wf_test",
+            "triggerData": {},
+            "contextRef": {"digest": "abc"},
+            "branchTaskName": "fan/wide",
+            "branchTask": {"set": {"ticket": "${ .research + \"-\" + .ticket }"}},
+        },
+    )
+    load = next(gen)
+    assert load["activity"] == "load_fork_context_snapshot"
+    assert load["input"]["digest"] == "abc"
+    with pytest.raises(StopIteration) as stop:
+        gen.send({"success": True, "digest": "abc", "snapshot": snapshot})
+
+    result = stop.value.value
+    assert result["stateVars"] == {"ticket": "notes-T-1"}
+    assert set(result["taskOutputs"]) == {"fan/wide", "state"}
+    assert result["completedTasks"] == ["fan/wide"]
+
+
+@pytest.mark.parametrize("branch_count", [3, 8, 32])
+def test_fork_context_history_size_benchmark(monkeypatch, branch_count):
+    """Benchmark: Dapr history bytes for a fork over 20 large upstream outputs.
+
+    Legacy hand-off froze the full context into every child input; the delta
+    hand-off forwards only what each branch reads (one upstream output here),
+    so history grows with branch count times the read set, not the context.
+    """
+    monkeypatch.setattr(SW_WORKFLOW, "wf_when_all", lambda tasks: ("when_all", tasks))
+    monkeypatch.setenv("SW_FORK_MAX_PARALLEL_BRANCHES", "64")
+    ctx = _FakeChildWorkflowCtx()
+    tc = _fork_context_tc(output_count=20, output_bytes=20_000)
+    legacy_child_bytes = len(
+        json.dumps(
+            {
+                "workflow": tc.workflow.model_dump(),
+                "stateVars": tc.state_vars,
+                "taskOutputs": tc.task_outputs,
+                "completedTasks": sorted(tc.completed_tasks),
+            }
+        )
+    )
+    task_data = {
+        "fork": {
+            "branches": [
+                {f"b{index}": {"set": {f"v{index}": f"${{ .research_{index % 20}.content }}"}}}
+                for index in range(branch_count)
+            ]
+        }
+    }
+
+    gen = SW_WORKFLOW._handle_fork_task(ctx, "fan", task_data, tc)
+    next(gen)
+    history_bytes = sum(len(json.dumps(child["input"])) for child in ctx.children)
+    legacy_bytes = legacy_child_bytes * branch_count
+    print(
+        f"fork history: {branch_count} branches -> {history_bytes} bytes "
+        f"(legacy {legacy_bytes}, {legacy_bytes / history_bytes:.1f}x smaller)"
+    )
+    assert history_bytes * 10 < legacy_bytes
+
+
 def test_native_run_prompt_keeps_relative_root_guidance_by_default():
     prompt = SW_WORKFLOW._build_native_run_prompt(
         "Create a validation marker",
@@ -4832,6 +5400,43 @@ def test_activity_wrapper_stamps_error_output(monkeypatch):
     }
 
 
+def test_background_capture_snapshots_input_before_the_activity_runs(monkeypatch):
+    submitted: list[dict[str, object]] = []
+
+    class FakePipeline:
+        def submit(self, **capture):
+            submitted.append(capture)
+            return True
+
+    class FakeSpanContext:
+        is_valid = True
+        span_id = 1
+        trace_id = 2
+
+    class FakeSpan:
+        def get_span_context(self):
+            return FakeSpanContext()
+
+        def is_recording(self):
+            return True
+
+    monkeypatch.setattr(APP.content_capture, "active", lambda: FakePipeline())
+    monkeypatch.setattr(APP, "_current_otel_span", lambda: FakeSpan())
+
+    def activity(_ctx, data):
+        data["nodeId"] = "rewritten"
+        data["scratch"] = "x" * 100
+        return {"ok": True}
+
+    data = {"workflowId": "wf", "nodeId": "n1"}
+    assert APP._activity_with_content_io(activity)(None, data) == {"ok": True}
+
+    (capture,) = submitted
+    assert capture["input_data"] == {"workflowId": "wf", "nodeId": "n1"}
+    assert capture["workflow_id"] == "wf"
+    assert data["nodeId"] == "rewritten"  # the activity's own dict is untouched
+
+
 def test_agent_events_subscription_stamps_output_on_server_span(monkeypatch):
     stamped: list[dict[str, object]] = []
     monkeypatch.setattr(APP, "set_current_span_attrs", lambda attrs: stamped.append(attrs))
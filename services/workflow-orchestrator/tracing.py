@@ -283,6 +283,16 @@ def setup_logging_json(otel_handler: logging.Handler | None = None) -> None:
         root.addHandler(otel_handler)
 
 
+def _with_content_capture(exporter: Any) -> Any:
+    """Route activity span content capture through the span exporter."""
+    try:
+        import content_capture
+    except Exception as e:
+        logger.warning(f"[Tracing] Content capture unavailable, stamping inline: {e}")
+        return exporter
+    return content_capture.install(exporter)
+
+
 def setup_tracing(service_name: str, app: Any | None = None) -> bool:
     """
     Initialize OpenTelemetry (traces + metrics) and enable log/trace correlation.
@@ -353,9 +363,11 @@ def setup_tracing(service_name: str, app: Any | None = None) -> bool:
         tracer_provider = TracerProvider(resource=resource)
         tracer_provider.add_span_processor(
             BatchSpanProcessor(
-                OTLPSpanExporter(
-                    endpoint=_otlp_endpoint_for("traces"),
-                    headers=headers,
+                _with_content_capture(
+                    OTLPSpanExporter(
+                        endpoint=_otlp_endpoint_for("traces"),
+                        headers=headers,
+                    )
                 )
             )
         )
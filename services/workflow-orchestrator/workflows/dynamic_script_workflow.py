@@ -358,6 +358,9 @@ def dynamic_script_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> di
     task_specs: dict[str, dict[str, Any]] = {}  # callId -> spec (kind/opts/retries/feedback/...)
     resolved: set[str] = set()        # terminally journaled callIds
     seen_log_count = 0
+    # Evaluator journal cursor (activity output, so replay-stable): lets the
+    # next evaluate_script ship only journal rows updated since the last one.
+    journal_cursor: str | None = None
     dispatched = 0
     dispatched_actions = 0
     dispatched_compensation = 0
@@ -435,6 +438,8 @@ def dynamic_script_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> di
             "knownCallIds": sorted(resolved),
             "seenLogCount": seen_log_count,
             "limits": {"maxItemsPerCall": limits["maxItemsPerCall"]},
+            "journalKey": ctx.instance_id,
+            "journalCursor": journal_cursor,
             "_otel": otel,
         }
         if has_args:
@@ -618,6 +623,8 @@ def dynamic_script_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> di
             "knownCallIds": sorted(resolved),
             "seenLogCount": seen_log_count,
             "limits": {"maxItemsPerCall": limits["maxItemsPerCall"]},
+            "journalKey": ctx.instance_id,
+            "journalCursor": journal_cursor,
             "_otel": otel,
         }
         if has_args:
@@ -635,6 +642,7 @@ def dynamic_script_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> di
         if _task_is_complete(cancel_task):
             return (yield from _cancel_with_compensation(budget))
         plan = plan if isinstance(plan, dict) else {}
+        journal_cursor = plan.get("journalCursor") or None
         status = plan.get("status")
         phases = plan.get("phases") if isinstance(plan.get("phases"), dict) else {}
         if isinstance(phases.get("declared"), list):
@@ -14,15 +14,27 @@ and runs exactly one branch task via ``_dispatch_task`` — so nested composites
 ``durable/run`` agents, and expression contexts behave as they did inline. It
 returns the branch result plus the context deltas the parent merges back.
 
+The same child also runs one iteration of a ``for`` task opted into
+``for.maxConcurrent``: the input then carries ``forIteration`` (item, index,
+loop variable names, sub-tasks) instead of ``branchTask``, and the result is
+the iteration's ``.loop`` view so the parent can aggregate ``last``/``accepted``.
+
+Context hand-off is delta-only in both directions. The parent forwards just the
+task outputs and state vars the branch body reads (by name, see
+``_child_context_reads``); a body whose reads cannot be bounded instead gets a
+``contextRef`` digest and loads the full snapshot through
+``load_fork_context_snapshot``. The child returns only the outputs, state vars
+and completed tasks it wrote.
+
 Caveats (accepted for the prototype):
   * Branches see a SNAPSHOT of parent state taken at fork time; concurrent
     branches cannot observe each other's writes (they could not meaningfully
     do so under the sequential order either, which was spec-order dependent).
     Cross-branch writes to the same state var / task output merge last-wins in
     deterministic wave order.
-  * The snapshot (including accumulated task outputs) rides the child-workflow
-    input through the actor state store — very large upstream outputs count
-    against the 16 MiB gRPC ceiling per branch.
+  * The forwarded subset (or, for unbounded reads, the one shared snapshot)
+    still rides through the actor state store — very large upstream outputs a
+    branch actually reads count against the 16 MiB gRPC ceiling.
   * A branch failure fails its child workflow; the parent's ``when_all``
     re-raises it, matching the sequential path's exception propagation (other
     branches in the wave run to completion first).
@@ -30,6 +42,7 @@ Caveats (accepted for the prototype):
 
 from __future__ import annotations
 
+import copy
 import logging
 from typing import Any
 
@@ -44,13 +57,27 @@ def fork_branch_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
     # Local import: this module is imported by app.py for registration while
     # sw_workflow dispatches the child by name string, so the import direction
     # stays acyclic (fork_branch_workflow -> sw_workflow only).
+    from activities.fork_context_snapshot import load_fork_context_snapshot
     from core.sw_types import Workflow
     from workflows.sw_workflow import (
         TaskContext,
         _dispatch_task,
+        _run_for_iteration,
         _trace_id_from_otel,
     )
 
+    otel = input_data.get("_otel") if isinstance(input_data.get("_otel"), dict) else {}
+    context_ref = input_data.get("contextRef")
+    if isinstance(context_ref, dict) and context_ref.get("digest"):
+        loaded = yield ctx.call_activity(
+            load_fork_context_snapshot,
+            input={"digest": context_ref["digest"], "_otel": otel},
+        )
+        if not isinstance(loaded, dict) or not loaded.get("success"):
+            error = loaded.get("error") if isinstance(loaded, dict) else None
+            raise RuntimeError(error or "Failed to load fork context snapshot")
+        input_data = {**input_data, **(loaded.get("snapshot") or {})}
+
     workflow = Workflow.model_validate(input_data.get("workflow", {}))
     trigger_data = input_data.get("triggerData")
     tc = TaskContext(
@@ -61,7 +88,6 @@ def fork_branch_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
         db_execution_id=input_data.get("dbExecutionId"),
         integrations=input_data.get("integrations"),
     )
-    otel = input_data.get("_otel") if isinstance(input_data.get("_otel"), dict) else {}
     tc.otel_ctx = otel
     tc.workflow_otel_ctx = otel
     tc.trace_id = _trace_id_from_otel(otel)
@@ -82,9 +108,11 @@ def fork_branch_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
     state_vars = input_data.get("stateVars")
     if isinstance(state_vars, dict):
         tc.state_vars = dict(state_vars)
+    state_snapshot = copy.deepcopy(tc.state_vars)
     completed_tasks = input_data.get("completedTasks")
     if isinstance(completed_tasks, list):
         tc.completed_tasks = {str(item) for item in completed_tasks}
+    completed_snapshot = set(tc.completed_tasks)
 
     branch_task_name = str(input_data.get("branchTaskName") or "branch")
     branch_task = (
@@ -93,7 +121,26 @@ def fork_branch_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
         else {}
     )
 
-    result = yield from _dispatch_task(ctx, branch_task_name, branch_task, tc)
+    for_iteration = input_data.get("forIteration")
+    if isinstance(for_iteration, dict):
+        index = int(for_iteration.get("index") or 0)
+        loop_state = {"last": {}, "index": index, "accepted": False, "iterations": 0}
+        tc.state_vars["loop"] = loop_state
+        tc.state_vars[str(for_iteration.get("each") or "item")] = for_iteration.get("item")
+        tc.state_vars[str(for_iteration.get("at") or "index")] = index
+        sub_tasks = for_iteration.get("subTasks")
+        yield from _run_for_iteration(
+            ctx,
+            str(for_iteration.get("forTaskName") or branch_task_name),
+            sub_tasks if isinstance(sub_tasks, list) else [],
+            index,
+            tc,
+            loop_state,
+        )
+        loop_state["iterations"] = 1
+        result = loop_state
+    else:
+        result = yield from _dispatch_task(ctx, branch_task_name, branch_task, tc)
 
     snapshot = parent_outputs if isinstance(parent_outputs, dict) else {}
     changed_outputs = {
@@ -106,7 +153,11 @@ def fork_branch_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
         "branchTaskName": branch_task_name,
         "result": result,
         "taskOutputs": changed_outputs,
-        "stateVars": tc.state_vars,
-        "completedTasks": sorted(tc.completed_tasks),
+        "stateVars": {
+            key: value
+            for key, value in tc.state_vars.items()
+            if key not in state_snapshot or state_snapshot[key] != value
+        },
+        "completedTasks": sorted(tc.completed_tasks - completed_snapshot),
         "taskExecutionCounts": tc.task_execution_counts,
     }
@@ -46,6 +46,7 @@ from core.sw_expressions import (
     SWExpressionError,
     evaluate_condition,
     evaluate_structure,
+    is_expression_string,
     resolve_input_definition,
     resolve_output_definition,
 )
@@ -56,6 +57,10 @@ from activities.crawl4ai import crawl4ai_get_job_status, crawl4ai_start_job
 from activities.environment_build import check_environment_build, ensure_environment
 from activities.persist_artifact import persist_workflow_artifact
 from activities.persist_state import persist_state
+from activities.fork_context_snapshot import (
+    save_fork_context_snapshot,
+    snapshot_digest,
+)
 from activities.publish_event import (
     EMIT_LIFECYCLE_EVENTS,
     publish_phase_changed,
@@ -646,6 +651,9 @@ def _finalize_otel_trace(ctx: wf.DaprWorkflowContext, payload: dict[str, Any]):
         )
 
 
+_NO_EXPRESSION_VIEW = object()
+
+
 def _unwrap_standardized_output(value: Any) -> Any:
     if (
         isinstance(value, dict)
@@ -709,11 +717,30 @@ def _apply_parse_json_affordance(tc: "TaskContext", task_name: str) -> None:
         parsed = _coerce_parse_json(inner)
         if parsed is not None:
             data["data"] = {**inner, **parsed} if isinstance(inner, dict) else parsed
+            tc.refresh_task_output(task_name)
         return
     # Already-unwrapped output: merge into it directly.
     parsed = _coerce_parse_json(data)
     if parsed is not None:
         stored["data"] = {**data, **parsed} if isinstance(data, dict) else parsed
+        tc.refresh_task_output(task_name)
+
+
+def _expression_output_view(key: str, output: Any) -> Any:
+    """Unwrapped expression-context view of one stored task output.
+
+    Returns ``_NO_EXPRESSION_VIEW`` for entries that are not exposed to
+    expressions (the ``__trigger__`` alias and non-envelope values).
+    """
+    if key == "__trigger__" or not isinstance(output, dict):
+        return _NO_EXPRESSION_VIEW
+    normalized_output = _unwrap_standardized_output(output.get("data", output))
+    if isinstance(normalized_output, dict) and "result" not in normalized_output:
+        return {
+            **normalized_output,
+            "result": normalized_output,
+        }
+    return normalized_output
 
 
 def _build_expression_context(
@@ -724,10 +751,14 @@ def _build_expression_context(
     task_output: Any = None,
     has_task_output: bool = False,
 ) -> dict[str, Any]:
+    # The workflow dump and per-task output views are cached on the TaskContext
+    # and maintained incrementally by _store_task_output, so building a context is
+    # a shallow merge rather than a re-unwrap of every upstream output. Only the
+    # per-task input/output overlay below is specific to this call.
     context: dict[str, Any] = {
         "input": tc.trigger_data,
         "state": tc.state_vars,
-        "workflow": tc.workflow.model_dump(mode="json"),
+        "workflow": tc.workflow_json(),
         "runtime": {
             "executionId": tc.execution_id,
             "dbExecutionId": tc.db_execution_id,
@@ -739,18 +770,7 @@ def _build_expression_context(
         },
     }
     context.update(tc.state_vars)
-    for key, output in tc.task_outputs.items():
-        if key == "__trigger__":
-            continue
-        if isinstance(output, dict):
-            normalized_output = _unwrap_standardized_output(output.get("data", output))
-            if isinstance(normalized_output, dict) and "result" not in normalized_output:
-                context[key] = {
-                    **normalized_output,
-                    "result": normalized_output,
-                }
-            else:
-                context[key] = normalized_output
+    context.update(tc.expression_outputs())
     if has_task_input:
         context["input"] = task_input
         context["taskInput"] = task_input
@@ -815,11 +835,14 @@ def _store_task_output(
     label: str | None = None,
 ) -> None:
     """Store task output in the legacy NodeOutputs-compatible envelope."""
-    tc.task_outputs[task_name] = {
-        "label": label or task_name,
-        "actionType": action_type,
-        "data": result,
-    }
+    tc.set_task_output(
+        task_name,
+        {
+            "label": label or task_name,
+            "actionType": action_type,
+            "data": result,
+        },
+    )
 
 
 def _call_task_uses_direct_node_logging(
@@ -916,9 +939,17 @@ class TaskContext:
         self.workflow_otel_ctx: dict[str, str] = {}
         self.trace_id: str | None = None
 
+        # Expression-context caches (see workflow_json / expression_outputs).
+        self._workflow_json: dict[str, Any] | None = None
+        self._workflow_json_source: Any = None
+        self._workflow_doc: dict[str, Any] | None = None
+        self._workflow_doc_source: Any = None
+        self._output_views: dict[str, Any] = {}
+        self._output_view_keys: set[str] = set()
+
         # Runtime state - NodeOutputs format for resolve_templates compatibility
         # Each entry: {label: str, actionType: str, data: Any}
-        self.task_outputs: dict[str, Any] = {
+        self.task_outputs = {
             "trigger": {
                 "label": "Trigger",
                 "actionType": "",
@@ -934,6 +965,68 @@ class TaskContext:
         self.completed_tasks: set[str] = set()
         self.task_execution_counts: dict[str, int] = {}
 
+    @property
+    def task_outputs(self) -> dict[str, Any]:
+        return self._task_outputs
+
+    @task_outputs.setter
+    def task_outputs(self, value: dict[str, Any]) -> None:
+        # Wholesale replacement (e.g. a fork branch hydrating the parent snapshot)
+        # invalidates every cached view; they are rebuilt on next use.
+        self._task_outputs = value
+        self._output_views = {}
+        self._output_view_keys = set()
+
+    def set_task_output(self, key: str, envelope: Any) -> None:
+        """Store a task output envelope and refresh its expression view."""
+        self._task_outputs[key] = envelope
+        self.refresh_task_output(key)
+
+    def refresh_task_output(self, key: str) -> None:
+        """Re-derive the expression view for ``key`` after an in-place mutation."""
+        if key not in self._task_outputs:
+            self._output_views.pop(key, None)
+            self._output_view_keys.discard(key)
+            return
+        view = _expression_output_view(key, self._task_outputs[key])
+        self._output_view_keys.add(key)
+        if view is _NO_EXPRESSION_VIEW:
+            self._output_views.pop(key, None)
+        else:
+            self._output_views[key] = view
+
+    def expression_outputs(self) -> dict[str, Any]:
+        """Unwrapped task outputs keyed by task name, each unwrapped once.
+
+        Entries written straight into ``task_outputs`` (bypassing
+        ``set_task_output``) are picked up by a full rebuild when the key sets
+        drift apart.
+        """
+        if len(self._output_view_keys) != len(self._task_outputs):
+            self._output_views = {}
+            self._output_view_keys = set()
+            for key in list(self._task_outputs):
+                self.refresh_task_output(key)
+        elif "state" in self._task_outputs:
+            # The state virtual node aliases state_vars, which set/for tasks
+            # mutate in place, so its view is always re-derived.
+            self.refresh_task_output("state")
+        return self._output_views
+
+    def workflow_json_by_alias(self) -> dict[str, Any]:
+        """Alias-keyed workflow dump used to re-hydrate child workflows."""
+        if self._workflow_doc is None or self._workflow_doc_source is not self.workflow:
+            self._workflow_doc = self.workflow.model_dump(by_alias=True, exclude_none=True)
+            self._workflow_doc_source = self.workflow
+        return self._workflow_doc
+
+    def workflow_json(self) -> dict[str, Any]:
+        """JSON dump of the workflow document, computed once per workflow object."""
+        if self._workflow_json is None or self._workflow_json_source is not self.workflow:
+            self._workflow_json = self.workflow.model_dump(mode="json")
+            self._workflow_json_source = self.workflow
+        return self._workflow_json
+
 
 # ---------------------------------------------------------------------------
 # Task dispatchers
@@ -3344,11 +3437,13 @@ def _handle_set_task(
     )
     _store_task_output(tc, task_name, "set", result)
     # Keep state virtual node updated
-    tc.task_outputs["state"] = {
-        "label": "State",
-        "actionType": "state",
-        "data": {"success": True, "data": tc.state_vars},
-    }
+    _store_task_output(
+        tc,
+        "state",
+        "state",
+        {"success": True, "data": tc.state_vars},
+        label="State",
+    )
     tc.completed_tasks.add(task_name)
     return result
 
@@ -3544,19 +3639,332 @@ def _handle_listen_task(
     return result
 
 
+_LOOP_STATE_REFERENCE = re.compile(
+    r"\.loop\b|\$loop\b|\bloop\.(?:last|index|accepted|iterations)\b"
+)
+
+
+def _for_max_concurrent(for_config: dict[str, Any]) -> int | None:
+    """Parse the opt-in ``for.maxConcurrent`` wave size (None = sequential)."""
+    value = for_config.get("maxConcurrent")
+    if value is None or not _as_bool(
+        os.environ.get("SW_FOR_PARALLEL_ENABLED", "true"), True
+    ):
+        return None
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _ensure_for_iterations_independent(task_name: str, task_data: dict[str, Any]) -> None:
+    """Refuse ``for.maxConcurrent`` when iterations depend on each other.
+
+    Concurrent iterations cannot observe the previous iteration's outputs, so
+    a ``while`` guard or any read of the ``.loop`` handle in the body makes the
+    mode unsafe. Checked before any iteration is dispatched.
+    """
+    if task_data.get("while") is not None:
+        raise RuntimeError(
+            f"for task '{task_name}': maxConcurrent cannot be combined with a while guard"
+        )
+    body = json.dumps(task_data.get("do", []), default=str)
+    if _LOOP_STATE_REFERENCE.search(body):
+        raise RuntimeError(
+            f"for task '{task_name}': maxConcurrent requires iterations that do not read .loop state"
+        )
+
+
+def _run_for_iteration(
+    ctx: wf.DaprWorkflowContext,
+    task_name: str,
+    sub_tasks: list[dict[str, Any]],
+    idx: int,
+    tc: TaskContext,
+    loop_state: dict[str, Any],
+) -> Any:
+    """Run one iteration's sub-tasks, publishing outputs to ``loop_state``."""
+    # After each sub-task, publish its unwrapped output to .loop.last.<subtask>
+    # for the next iteration (and the verdict convenience flag .loop.accepted).
+    for sub_item in sub_tasks:
+        for sub_name, sub_data in sub_item.items():
+            iter_task_name = f"{task_name}/{sub_name}[{idx}]"
+            yield from _dispatch_task(ctx, iter_task_name, sub_data, tc)
+            stored = tc.task_outputs.get(iter_task_name)
+            sub_output = (
+                _unwrap_standardized_output(stored.get("data", stored))
+                if isinstance(stored, dict)
+                else stored
+            )
+            loop_state["last"][sub_name] = sub_output
+            if isinstance(sub_output, dict) and sub_output.get("meets_criteria") is True:
+                loop_state["accepted"] = True
+
+
+def _merge_child_context(tc: TaskContext, child_result: Any) -> Any:
+    """Merge a fork_branch_workflow child's context deltas into ``tc``.
+
+    Returns the child's own result. Non-dict child results carry no deltas.
+    """
+    if not isinstance(child_result, dict):
+        return child_result
+    child_outputs = child_result.get("taskOutputs")
+    if isinstance(child_outputs, dict):
+        for key, value in child_outputs.items():
+            if key != "trigger":
+                tc.set_task_output(key, value)
+    child_state = child_result.get("stateVars")
+    if isinstance(child_state, dict):
+        tc.state_vars.update(child_state)
+    child_completed = child_result.get("completedTasks")
+    if isinstance(child_completed, list):
+        tc.completed_tasks.update(str(item) for item in child_completed)
+    child_counts = child_result.get("taskExecutionCounts")
+    if isinstance(child_counts, dict):
+        for key, value in child_counts.items():
+            try:
+                count = int(value)
+            except (TypeError, ValueError):
+                continue
+            tc.task_execution_counts[key] = max(
+                tc.task_execution_counts.get(key, 0), count
+            )
+    return child_result.get("result")
+
+
+# Task outputs every child receives regardless of its reads: the trigger and
+# state virtual nodes plus the code-checkpoint restore marker agent runs consult.
+_ALWAYS_FORWARDED_OUTPUTS = ("trigger", "state", "codeCheckpointRestore")
+# jq constructs whose context reads cannot be bounded by key names: the whole
+# context (a bare `.` anywhere — `. | ...`, `{all: .}`, `[.]`, `f(.)`), key
+# enumeration, recursive descent, and any index or iteration that is not a
+# string/number literal (`.[$k]`, `.state[$k]`, `.x[]`, slices).
+_UNBOUNDED_CONTEXT_READ = re.compile(
+    r"(?<![\w.])\.(?![\w\"\[.])"
+    r"|\b(?:to_entries|with_entries|keys|keys_unsorted|paths|leaf_paths|getpath)\b"
+    r"|\.\."
+    r"|(?<=[\w\]\)\"?.])\[(?!\s*(?:\"(?:[^\"\\]|\\.)*\"|-?\d+)\s*\])"
+)
+_TEMPLATE_HEAD = re.compile(r"\{\{\s*[@$]?\s*([^.:}]+)")
+
+
+def _normalize_template_key(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", value.lower()).strip("_")
+
+
+def _collect_strings(value: Any, out: list[str]) -> None:
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            out.append(str(key))
+            _collect_strings(item, out)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_strings(item, out)
+
+
+def _child_context_reads(body: Any, tc: TaskContext) -> dict[str, Any] | None:
+    """Task-output and state keys a child body can read, or None if unbounded.
+
+    Over-approximates by name: a key is forwarded when it appears anywhere in
+    the body's strings (jq paths, ``{{node.field}}`` templates, sub-task
+    names), or when a legacy template head matches its label/actionType.
+    """
+    strings: list[str] = []
+    _collect_strings(body, strings)
+    for value in strings:
+        if is_expression_string(value) and _UNBOUNDED_CONTEXT_READ.search(
+            value.strip()[2:-1]
+        ):
+            return None
+    text = "\n".join(strings)
+    template_heads = {
+        _normalize_template_key(head) for head in _TEMPLATE_HEAD.findall(text)
+    }
+    outputs = set()
+    for key, envelope in tc.task_outputs.items():
+        if key in _ALWAYS_FORWARDED_OUTPUTS or key in text:
+            outputs.add(key)
+        elif template_heads and isinstance(envelope, dict) and any(
+            _normalize_template_key(str(envelope.get(field) or "")) in template_heads
+            for field in ("label", "actionType")
+        ):
+            outputs.add(key)
+    return {
+        "outputs": outputs,
+        "state": {key for key in tc.state_vars if key in text},
+        "workflow": "workflow" in text,
+    }
+
+
+def _slim_workflow_doc(workflow_doc: dict[str, Any]) -> dict[str, Any]:
+    """Workflow document without its task list (children get their task inline)."""
+    return {**workflow_doc, "do": []}
+
+
+def _child_context_inputs(
+    ctx: wf.DaprWorkflowContext,
+    tc: TaskContext,
+    bodies: list[Any],
+) -> Any:
+    """Build the context hand-off for one wave of fork_branch_workflow children.
+
+    Each child gets only the outputs/state keys its body reads. Children whose
+    reads are unbounded get a content-addressed ``contextRef`` to a snapshot
+    saved once for the wave; if that save fails they fall back to an inline
+    full snapshot.
+    """
+    workflow_doc = tc.workflow_json_by_alias()
+    common = {
+        "workflowId": tc.workflow_id,
+        "triggerData": tc.trigger_data,
+        "dbExecutionId": tc.db_execution_id,
+        "integrations": tc.integrations,
+        "workspaceExecutionId": tc.workspace_execution_id,
+        "seedWorkspaceFrom": tc.seed_workspace_from,
+        "resumable": tc.resumable,
+        "_otel": tc.otel_ctx,
+    }
+    reads = [_child_context_reads(body, tc) for body in bodies]
+    context_ref = None
+    full_snapshot = None
+    if any(read is None for read in reads):
+        full_snapshot = _freeze(
+            {
+                "workflow": workflow_doc,
+                "stateVars": tc.state_vars,
+                "taskOutputs": tc.task_outputs,
+            }
+        )
+        digest = snapshot_digest(full_snapshot)
+        saved = yield ctx.call_activity(
+            save_fork_context_snapshot,
+            input={"digest": digest, "snapshot": full_snapshot, "_otel": tc.otel_ctx},
+        )
+        if isinstance(saved, dict) and saved.get("success"):
+            context_ref = {"digest": digest}
+
+    inputs = []
+    for read in reads:
+        if read is None and context_ref is not None:
+            inputs.append(
+                {**common, "workflow": _slim_workflow_doc(workflow_doc), "contextRef": context_ref}
+            )
+        elif read is None:
+            inputs.append({**common, **full_snapshot})
+        else:
+            inputs.append(
+                {
+                    **common,
+                    "workflow": workflow_doc if read["workflow"] else _slim_workflow_doc(workflow_doc),
+                    "stateVars": {
+                        key: tc.state_vars[key] for key in tc.state_vars if key in read["state"]
+                    },
+                    "taskOutputs": {
+                        key: tc.task_outputs[key]
+                        for key in tc.task_outputs
+                        if key in read["outputs"]
+                    },
+                }
+            )
+    return inputs
+
+
+def _instance_token(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "-", value)
+
+
+def _run_for_iterations_concurrently(
+    ctx: wf.DaprWorkflowContext,
+    task_name: str,
+    items: list[Any],
+    for_config: dict[str, Any],
+    sub_tasks: list[dict[str, Any]],
+    max_concurrent: int,
+    tc: TaskContext,
+    loop_state: dict[str, Any],
+) -> Any:
+    """Dispatch independent iterations as fork_branch_workflow children in waves.
+
+    Each child runs one iteration against a snapshot of the parent context;
+    deltas merge back in index order, so the final state (item/index vars,
+    per-iteration outputs) matches what the sequential loop would leave.
+    """
+    from workflows.fork_branch_workflow import FORK_BRANCH_WORKFLOW_NAME
+
+    each_var = for_config.get("each", "item")
+    at_var = for_config.get("at", "index")
+    iteration_loops: list[Any] = []
+    for wave_start in range(0, len(items), max_concurrent):
+        wave_indexes = range(wave_start, min(wave_start + max_concurrent, len(items)))
+        context_inputs = yield from _child_context_inputs(
+            ctx, tc, [sub_tasks for _ in wave_indexes]
+        )
+        wave_tasks = []
+        for idx, context_input in zip(wave_indexes, context_inputs):
+            child_input = {
+                **context_input,
+                "branchTaskName": f"{task_name}[{idx}]",
+                "forIteration": {
+                    "forTaskName": task_name,
+                    "each": each_var,
+                    "at": at_var,
+                    "item": items[idx],
+                    "index": idx,
+                    "subTasks": sub_tasks,
+                },
+            }
+            wave_tasks.append(
+                ctx.call_child_workflow(
+                    FORK_BRANCH_WORKFLOW_NAME,
+                    input=_freeze(child_input),
+                    instance_id=(
+                        f"{ctx.instance_id}__for__{_instance_token(task_name)}__{idx}"
+                    ),
+                )
+            )
+        wave_results = yield wf_when_all(wave_tasks)
+        for child_result in wave_results:
+            iteration_loops.append(_merge_child_context(tc, child_result))
+
+    # Children overwrite "loop" with their own single-iteration view; restore
+    # the parent handle with the aggregate the sequential loop would produce.
+    last_loop = iteration_loops[-1] if iteration_loops else None
+    loop_state["index"] = len(items) - 1
+    loop_state["last"] = (
+        dict(last_loop.get("last") or {}) if isinstance(last_loop, dict) else {}
+    )
+    loop_state["accepted"] = any(
+        isinstance(item, dict) and item.get("accepted") is True
+        for item in iteration_loops
+    )
+    loop_state["iterations"] = len(items)
+    tc.state_vars["loop"] = loop_state
+
+
 def _handle_for_task(
     ctx: wf.DaprWorkflowContext,
     task_name: str,
     task_data: dict[str, Any],
     tc: TaskContext,
 ) -> Any:
-    """Execute a for task: iterate over items and run sub-tasks."""
+    """Execute a for task: iterate over items and run sub-tasks.
+
+    Iterations run in sequence by default. ``for.maxConcurrent`` opts into
+    dispatching them as ``fork_branch_workflow`` children in waves of that
+    size; it is refused when the body reads ``.loop`` state or has a
+    ``while`` guard (kill switch: SW_FOR_PARALLEL_ENABLED=false).
+    """
     for_config = task_data.get("for", {})
     each_var = for_config.get("each", "item")
     in_expr = for_config.get("in", "[]")
     at_var = for_config.get("at", "index")
     sub_tasks = task_data.get("do", [])
     while_expr = task_data.get("while")
+    max_concurrent = _for_max_concurrent(for_config)
+    if max_concurrent is not None:
+        _ensure_for_iterations_independent(task_name, task_data)
     task_input = _resolve_task_input(task_data, tc)
     expr_context = _build_expression_context(tc, task_input=task_input, has_task_input=True)
 
@@ -3579,38 +3987,29 @@ def _handle_for_task(
     tc.state_vars["loop"] = loop_state
 
     iteration_results = []
-    for idx, item in enumerate(items):
-        # Set iteration variables in state
-        tc.state_vars[each_var] = item
-        tc.state_vars[at_var] = idx
-        loop_state["index"] = idx
-
-        # `while` is a per-iteration BREAK guard, re-evaluated against current
-        # state (incl. the previous iteration's verdict via .loop.last/.loop.accepted).
-        if while_expr is not None:
-            loop_context = _build_expression_context(tc, task_input=task_input, has_task_input=True)
-            if not evaluate_condition(while_expr, loop_context):
-                break
+    if max_concurrent is not None and len(items) > 1:
+        yield from _run_for_iterations_concurrently(
+            ctx, task_name, items, for_config, sub_tasks, max_concurrent, tc, loop_state
+        )
+        iteration_results = list(items)
+    else:
+        for idx, item in enumerate(items):
+            # Set iteration variables in state
+            tc.state_vars[each_var] = item
+            tc.state_vars[at_var] = idx
+            loop_state["index"] = idx
 
-        # Execute sub-tasks; after each, publish its unwrapped output to
-        # .loop.last.<subtask> for the next iteration (and the verdict convenience
-        # flag .loop.accepted).
-        for sub_item in sub_tasks:
-            for sub_name, sub_data in sub_item.items():
-                iter_task_name = f"{task_name}/{sub_name}[{idx}]"
-                yield from _dispatch_task(ctx, iter_task_name, sub_data, tc)
-                stored = tc.task_outputs.get(iter_task_name)
-                sub_output = (
-                    _unwrap_standardized_output(stored.get("data", stored))
-                    if isinstance(stored, dict)
-                    else stored
-                )
-                loop_state["last"][sub_name] = sub_output
-                if isinstance(sub_output, dict) and sub_output.get("meets_criteria") is True:
-                    loop_state["accepted"] = True
+            # `while` is a per-iteration BREAK guard, re-evaluated against current
+            # state (incl. the previous iteration's verdict via .loop.last/.loop.accepted).
+            if while_expr is not None:
+                loop_context = _build_expression_context(tc, task_input=task_input, has_task_input=True)
+                if not evaluate_condition(while_expr, loop_context):
+                    break
+
+            yield from _run_for_iteration(ctx, task_name, sub_tasks, idx, tc, loop_state)
 
-        iteration_results.append(item)
-        loop_state["iterations"] = len(iteration_results)
+            iteration_results.append(item)
+            loop_state["iterations"] = len(iteration_results)
 
     result = _apply_task_output_definition(
         task_data,
@@ -3674,31 +4073,18 @@ def _handle_fork_task(
             max_parallel = 8
         max_parallel = max(1, max_parallel)
 
-        workflow_doc = tc.workflow.model_dump(by_alias=True, exclude_none=True)
-
-        def _instance_token(value: str) -> str:
-            return re.sub(r"[^A-Za-z0-9_-]", "-", value)
-
         for wave_start in range(0, len(branch_items), max_parallel):
             wave = branch_items[wave_start : wave_start + max_parallel]
+            context_inputs = yield from _child_context_inputs(
+                ctx, tc, [branch_data for _, branch_data in wave]
+            )
             wave_tasks = []
-            for branch_name, branch_data in wave:
+            for (branch_name, branch_data), context_input in zip(wave, context_inputs):
                 branch_task_name = f"{task_name}/{branch_name}"
                 child_input = {
-                    "workflow": workflow_doc,
-                    "workflowId": tc.workflow_id,
-                    "triggerData": tc.trigger_data,
-                    "dbExecutionId": tc.db_execution_id,
-                    "integrations": tc.integrations,
-                    "workspaceExecutionId": tc.workspace_execution_id,
-                    "seedWorkspaceFrom": tc.seed_workspace_from,
-                    "resumable": tc.resumable,
+                    **context_input,
                     "branchTaskName": branch_task_name,
                     "branchTask": branch_data,
-                    "stateVars": tc.state_vars,
-                    "taskOutputs": tc.task_outputs,
-                    "completedTasks": sorted(tc.completed_tasks),
-                    "_otel": tc.otel_ctx,
                 }
                 wave_tasks.append(
                     (
@@ -3716,31 +4102,7 @@ def _handle_fork_task(
                 )
             wave_results = yield wf_when_all([task for _, task in wave_tasks])
             for (branch_name, _), child_result in zip(wave_tasks, wave_results):
-                if not isinstance(child_result, dict):
-                    branch_results[branch_name] = child_result
-                    continue
-                branch_results[branch_name] = child_result.get("result")
-                child_outputs = child_result.get("taskOutputs")
-                if isinstance(child_outputs, dict):
-                    for key, value in child_outputs.items():
-                        if key != "trigger":
-                            tc.task_outputs[key] = value
-                child_state = child_result.get("stateVars")
-                if isinstance(child_state, dict):
-                    tc.state_vars.update(child_state)
-                child_completed = child_result.get("completedTasks")
-                if isinstance(child_completed, list):
-                    tc.completed_tasks.update(str(item) for item in child_completed)
-                child_counts = child_result.get("taskExecutionCounts")
-                if isinstance(child_counts, dict):
-                    for key, value in child_counts.items():
-                        try:
-                            count = int(value)
-                        except (TypeError, ValueError):
-                            continue
-                        tc.task_execution_counts[key] = max(
-                            tc.task_execution_counts.get(key, 0), count
-                        )
+                branch_results[branch_name] = _merge_child_context(tc, child_result)
 
     fork_result = _apply_task_output_definition(
         task_data,
@@ -4347,6 +4709,7 @@ def sw_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
     if not isinstance(tc.trigger_data, dict):
         tc.trigger_data = {"value": tc.trigger_data}
     tc.task_outputs["trigger"]["data"] = tc.trigger_data
+    tc.refresh_task_output("trigger")
 
     if not _is_replaying(ctx):
         try:
@@ -4378,11 +4741,13 @@ def sw_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
         except Exception as exc:  # noqa: BLE001
             logger.warning("[SW Workflow] workflow.init trace span failed: %s", exc)
     if code_checkpoint_restore:
-        tc.task_outputs["codeCheckpointRestore"] = {
-            "label": "Code checkpoint restore",
-            "actionType": "code_checkpoint_restore",
-            "data": code_checkpoint_restore,
-        }
+        _store_task_output(
+            tc,
+            "codeCheckpointRestore",
+            "code_checkpoint_restore",
+            code_checkpoint_restore,
+            label="Code checkpoint restore",
+        )
 
     # Unwrap the top-level task list
     tasks = workflow.unwrap_tasks()
@@ -4413,6 +4778,7 @@ def sw_workflow(ctx: wf.DaprWorkflowContext, input_data: dict) -> dict:
                     "workflowId": workflow_id,
                     "executionId": execution_id,
                     "workflowName": workflow_name,
+                    "traceId": trace_id,
                 }),
             )
 
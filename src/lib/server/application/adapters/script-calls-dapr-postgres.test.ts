@@ -19,6 +19,7 @@ const row = [
 	{ line: 7, column: 23 },
 	"2026-07-09T12:00:00.000Z",
 	"2026-07-09T12:00:01.000Z",
+	5,
 ];
 
 function mockClient() {
@@ -61,6 +62,7 @@ describe("DaprPostgresScriptCallsStore", () => {
 				retries: 1,
 				tokensUsed: 42,
 				callSite: { line: 7, column: 23 },
+				changeSeq: 5,
 				createdAt: "2026-07-09T12:00:00.000Z",
 				updatedAt: "2026-07-09T12:00:01.000Z",
 			},
@@ -75,6 +77,26 @@ describe("DaprPostgresScriptCallsStore", () => {
 		);
 	});
 
+	it("narrows the list to rows changed after the journal cursor", async () => {
+		client.query.mockResolvedValueOnce({
+			metadata: {},
+			rows: [row],
+			rowsAffected: null,
+		});
+
+		const calls = await store.listScriptCalls("exec-1", { changedAfter: 4 });
+
+		expect(calls.map((call) => call.callId)).toEqual(["call-1"]);
+		expect(client.query).toHaveBeenCalledWith(
+			expect.objectContaining({
+				summary: "workflow_script_calls.select_by_execution_changed_after",
+				params: ["exec-1", 4],
+				paramNames: ["workflow_execution_id", "changed_after"],
+			}),
+		);
+		expect(client.query.mock.calls[0][0].sql).toContain("change_seq > $2");
+	});
+
 	it("upserts with exec and then reads the row by primary key", async () => {
 		client.query.mockResolvedValueOnce({
 			metadata: {},
@@ -107,6 +129,13 @@ describe("DaprPostgresScriptCallsStore", () => {
 				]),
 			}),
 		);
+		// change_seq comes from the execution's journal version, bumped in the
+		// same statement.
+		const upsertSql = client.exec.mock.calls[0][0].sql;
+		expect(upsertSql).toContain(
+			"SET script_journal_version = script_journal_version + 1",
+		);
+		expect(upsertSql).toContain("change_seq = EXCLUDED.change_seq");
 		expect(client.query).toHaveBeenCalledWith(
 			expect.objectContaining({
 				summary: "workflow_script_calls.select_by_pk",
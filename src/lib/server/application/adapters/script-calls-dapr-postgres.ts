@@ -8,6 +8,7 @@ import {
 } from "$lib/server/application/adapters/dapr-postgres-rows";
 import {
 	type ScriptCallRecord,
+	type ScriptCallsListOptions,
 	type ScriptCallsStore,
 	type ScriptCallUpsertInput,
 } from "$lib/server/application/adapters/script-calls-store";
@@ -30,7 +31,8 @@ const SCRIPT_CALL_COLUMNS = `
 	tokens_used,
 	call_site,
 	created_at,
-	updated_at
+	updated_at,
+	change_seq
 `;
 
 function rowToScriptCall(row: unknown[]): ScriptCallRecord {
@@ -50,6 +52,7 @@ function rowToScriptCall(row: unknown[]): ScriptCallRecord {
 		retries: numberValue(row[12]),
 		tokensUsed: numberValue(row[13]),
 		callSite: (row[14] ?? null) as { line: number; column: number } | null,
+		changeSeq: numberValue(row[17]),
 		createdAt: isoTimestamp(row[15]),
 		updatedAt: isoTimestamp(row[16]),
 	};
@@ -63,7 +66,26 @@ export class DaprPostgresScriptCallsStore implements ScriptCallsStore {
 		> = new DaprPostgresBindingClient(),
 	) {}
 
-	async listScriptCalls(executionId: string): Promise<ScriptCallRecord[]> {
+	async listScriptCalls(
+		executionId: string,
+		options: ScriptCallsListOptions = {},
+	): Promise<ScriptCallRecord[]> {
+		if (options.changedAfter != null) {
+			const result = await this.client.query({
+				summary: "workflow_script_calls.select_by_execution_changed_after",
+				collection: "workflow_script_calls",
+				sql: `
+					SELECT ${SCRIPT_CALL_COLUMNS}
+					FROM workflow_script_calls
+					WHERE workflow_execution_id = $1
+						AND change_seq > $2
+					ORDER BY seq ASC
+				`,
+				params: [executionId, options.changedAfter],
+				paramNames: ["workflow_execution_id", "changed_after"],
+			});
+			return result.rows.map(rowToScriptCall);
+		}
 		const result = await this.client.query({
 			summary: "workflow_script_calls.select_by_execution",
 			collection: "workflow_script_calls",
@@ -121,10 +143,18 @@ export class DaprPostgresScriptCallsStore implements ScriptCallsStore {
 			"tokens_used",
 			"call_site",
 		];
+		// One statement: the version bump holds the execution row lock until
+		// commit, so change_seq values for a run become visible in counter order.
 		await this.client.exec({
 			summary: "workflow_script_calls.upsert",
 			collection: "workflow_script_calls",
 			sql: `
+				WITH bump AS (
+					UPDATE workflow_executions
+					SET script_journal_version = script_journal_version + 1
+					WHERE id = $1
+					RETURNING script_journal_version
+				)
 				INSERT INTO workflow_script_calls (
 					workflow_execution_id,
 					call_id,
@@ -142,12 +172,14 @@ export class DaprPostgresScriptCallsStore implements ScriptCallsStore {
 					retries,
 					tokens_used,
 					call_site,
+					change_seq,
 					updated_at
 				)
-				VALUES (
+				SELECT
 					$1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11,
-					CAST($12 AS jsonb), $13, $14, $15, CAST($16 AS jsonb), now()
-				)
+					CAST($12 AS jsonb), $13, $14, $15, CAST($16 AS jsonb),
+					bump.script_journal_version, now()
+				FROM bump
 				ON CONFLICT (workflow_execution_id, call_id)
 				DO UPDATE SET
 					seq = EXCLUDED.seq,
@@ -164,6 +196,7 @@ export class DaprPostgresScriptCallsStore implements ScriptCallsStore {
 					retries = EXCLUDED.retries,
 					tokens_used = EXCLUDED.tokens_used,
 					call_site = EXCLUDED.call_site,
+					change_seq = EXCLUDED.change_seq,
 					updated_at = now()
 			`,
 			params,
@@ -10,11 +10,12 @@
  * session events for every session linked to the execution.
  */
 
-import { and, asc, eq } from "drizzle-orm";
+import { and, asc, eq, gt, sql } from "drizzle-orm";
 import { db } from "$lib/server/db";
 import {
 	sessionEvents,
 	sessions,
+	workflowExecutions,
 	workflowScriptCalls,
 } from "$lib/server/db/schema";
 import { tokensFromUsage } from "$lib/server/goals/goal-loop";
@@ -39,6 +40,8 @@ export type ScriptCallRecord = {
 	tokensUsed: number;
 	/** Advisory call-site {line, column} in stored-source coordinates (P2). */
 	callSite: { line: number; column: number } | null;
+	/** Per-execution change counter; the journal read cursor (`changedAfter`). */
+	changeSeq: number;
 	createdAt: string;
 	updatedAt: string;
 };
@@ -61,8 +64,20 @@ export type ScriptCallUpsertInput = {
 	callSite?: { line: number; column: number } | null;
 };
 
+/**
+ * Journal read filter. `changedAfter` (a `changeSeq`, exclusive) narrows the
+ * read to rows written after that change — the evaluate_script journal
+ * cursor, so each pump iteration only ships rows the evaluator has not seen.
+ */
+export type ScriptCallsListOptions = {
+	changedAfter?: number | null;
+};
+
 export interface ScriptCallsStore {
-	listScriptCalls(executionId: string): Promise<ScriptCallRecord[]>;
+	listScriptCalls(
+		executionId: string,
+		options?: ScriptCallsListOptions,
+	): Promise<ScriptCallRecord[]>;
 	upsertScriptCall(
 		executionId: string,
 		callId: string,
@@ -99,19 +114,29 @@ function toRecord(row: Row): ScriptCallRecord {
 		retries: row.retries,
 		tokensUsed: row.tokensUsed,
 		callSite: row.callSite ?? null,
+		changeSeq: row.changeSeq,
 		createdAt: row.createdAt.toISOString(),
 		updatedAt: row.updatedAt.toISOString(),
 	};
 }
 
-/** All journal rows for an execution, ordered by issue order (seq). */
+/**
+ * Journal rows for an execution, ordered by issue order (seq). With
+ * `changedAfter`, only rows whose `changeSeq` is greater.
+ */
 export async function listScriptCalls(
 	executionId: string,
+	options: ScriptCallsListOptions = {},
 ): Promise<ScriptCallRecord[]> {
+	const byExecution = eq(workflowScriptCalls.workflowExecutionId, executionId);
 	const rows = await requireDb()
 		.select()
 		.from(workflowScriptCalls)
-		.where(eq(workflowScriptCalls.workflowExecutionId, executionId))
+		.where(
+			options.changedAfter != null
+				? and(byExecution, gt(workflowScriptCalls.changeSeq, options.changedAfter))
+				: byExecution,
+		)
 		.orderBy(asc(workflowScriptCalls.seq));
 	return rows.map(toRecord);
 }
@@ -119,7 +144,9 @@ export async function listScriptCalls(
 /**
  * Idempotent upsert of one journal row (composite PK). Dapr activity retries land
  * on the same row → UPSERT. `updated_at` is always bumped; `created_at` is left to
- * its default on first insert.
+ * its default on first insert. `change_seq` takes the bumped
+ * `workflow_executions.script_journal_version` in the same transaction; the
+ * execution row lock makes concurrent writers commit in counter order.
  */
 export async function upsertScriptCall(
 	executionId: string,
@@ -146,33 +173,44 @@ export async function upsertScriptCall(
 		callSite: input.callSite ?? null,
 		updatedAt: now,
 	};
-	const rows = await requireDb()
-		.insert(workflowScriptCalls)
-		.values(values)
-		.onConflictDoUpdate({
-			target: [
-				workflowScriptCalls.workflowExecutionId,
-				workflowScriptCalls.callId,
-			],
-			set: {
-				seq: values.seq,
-				kind: values.kind,
-				baseHash: values.baseHash,
-				occurrence: values.occurrence,
-				label: values.label,
-				phase: values.phase,
-				promptSha256: values.promptSha256,
-				status: values.status,
-				sessionId: values.sessionId,
-				result: values.result,
-				errorCode: values.errorCode,
-				retries: values.retries,
-				tokensUsed: values.tokensUsed,
-				callSite: values.callSite,
-				updatedAt: now,
-			},
-		})
-		.returning();
+	const rows = await requireDb().transaction(async (tx) => {
+		const [bumped] = await tx
+			.update(workflowExecutions)
+			.set({
+				scriptJournalVersion: sql`${workflowExecutions.scriptJournalVersion} + 1`,
+			})
+			.where(eq(workflowExecutions.id, executionId))
+			.returning({ version: workflowExecutions.scriptJournalVersion });
+		const changeSeq = bumped?.version ?? 0;
+		return tx
+			.insert(workflowScriptCalls)
+			.values({ ...values, changeSeq })
+			.onConflictDoUpdate({
+				target: [
+					workflowScriptCalls.workflowExecutionId,
+					workflowScriptCalls.callId,
+				],
+				set: {
+					seq: values.seq,
+					kind: values.kind,
+					baseHash: values.baseHash,
+					occurrence: values.occurrence,
+					label: values.label,
+					phase: values.phase,
+					promptSha256: values.promptSha256,
+					status: values.status,
+					sessionId: values.sessionId,
+					result: values.result,
+					errorCode: values.errorCode,
+					retries: values.retries,
+					tokensUsed: values.tokensUsed,
+					callSite: values.callSite,
+					updatedAt: now,
+					changeSeq,
+				},
+			})
+			.returning();
+	});
 	return toRecord(rows[0]);
 }
 
@@ -251,8 +289,11 @@ export async function sumExecutionLlmUsage(
 }
 
 export class PostgresScriptCallsStore implements ScriptCallsStore {
-	listScriptCalls(executionId: string): Promise<ScriptCallRecord[]> {
-		return listScriptCalls(executionId);
+	listScriptCalls(
+		executionId: string,
+		options?: ScriptCallsListOptions,
+	): Promise<ScriptCallRecord[]> {
+		return listScriptCalls(executionId, options);
 	}
 
 	upsertScriptCall(
@@ -504,13 +504,27 @@ export type WorkflowRunDiffStats = {
 	deletions: number;
 };
 
+export type WorkflowRunDiffFileDelta = {
+	path: string;
+	oldPath?: string | null;
+	status?: string | null;
+	oldBlob?: string | null;
+	newBlob?: string | null;
+	patch: string;
+};
+
 export type PersistWorkflowRunDiffInput = {
 	executionId: string;
 	userId: string;
 	projectId?: string | null;
 	nodeId?: string | null;
 	title?: string;
-	patch: string;
+	/** Unified patch; ignored when `files` is given. */
+	patch?: string;
+	/** Per-file deltas keyed by blob hash (incremental capture). */
+	files?: WorkflowRunDiffFileDelta[] | null;
+	/** True when the capture rebuilt a lost baseline index. */
+	full?: boolean;
 	baseRef?: string | null;
 	headRef?: string | null;
 	stats?: Partial<WorkflowRunDiffStats> | null;
@@ -23,6 +23,7 @@ function call(status: string): ScriptCallRecord {
 		retries: 0,
 		tokensUsed: 0,
 		callSite: null,
+		changeSeq: 1,
 		createdAt: "2026-07-22T12:00:00.000Z",
 		updatedAt: "2026-07-22T12:00:00.000Z",
 	};
@@ -14,6 +14,7 @@ import type {
 import {
 	postgresScriptCallsStore,
 	type ScriptCallRecord,
+	type ScriptCallsListOptions,
 	type ScriptCallsStore,
 	type ScriptCallUpsertInput,
 } from "$lib/server/application/adapters/script-calls-store";
@@ -36,8 +37,11 @@ export class ApplicationScriptCallsService {
 	}
 
 	/** Internal (orchestrator) read — no scope check. */
-	async listInternal(executionId: string): Promise<ScriptCallRecord[]> {
-		return this.store.listScriptCalls(executionId);
+	async listInternal(
+		executionId: string,
+		options?: ScriptCallsListOptions,
+	): Promise<ScriptCallRecord[]> {
+		return this.store.listScriptCalls(executionId, options);
 	}
 
 	/** Internal idempotent upsert of one journal row. */
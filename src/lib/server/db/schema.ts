@@ -571,6 +571,10 @@ export const workflowExecutions = pgTable(
     // — well before Dapr's 24h workflow-history purge + ClickHouse's ~7d TTL.
     // NULL = not yet archived (a terminal run is a candidate on the next scan).
     archivedAt: timestamp("archived_at"),
+    // Script-journal change counter: bumped by every workflow_script_calls
+    // upsert for this run (the row lock orders concurrent writers), and
+    // stamped on the written row as `change_seq`.
+    scriptJournalVersion: integer("script_journal_version").notNull().default(0),
   },
   (table) => ({
     workflowStartedIdx: index("idx_workflow_executions_workflow_started").on(
@@ -714,11 +718,18 @@ export const workflowScriptCalls = pgTable(
       line: number;
       column: number;
     } | null>(),
+    // Per-execution change counter (workflow_executions.script_journal_version
+    // at write time). Monotonic in commit order: the evaluate_script journal
+    // cursor reads `change_seq > cursor`.
+    changeSeq: integer("change_seq").notNull().default(0),
     createdAt: timestamp("created_at").notNull().defaultNow(),
     updatedAt: timestamp("updated_at").notNull().defaultNow(),
   },
   (table) => ({
     pk: primaryKey({ columns: [table.workflowExecutionId, table.callId] }),
+    executionChangeSeqIdx: index(
+      "idx_workflow_script_calls_execution_change_seq",
+    ).on(table.workflowExecutionId, table.changeSeq),
   }),
 );
 
@@ -13,6 +13,11 @@
  * `fileId`, keeping only stats inline. Capture is best-effort and runtime-local
  * (cli-agent-py / dapr-agent-py compute `git diff` in-pod at session end); this
  * module owns storage + read-back so both runtimes share one shape.
+ *
+ * dapr-agent-py sends per-file deltas instead of one patch: each entry carries
+ * its own patch plus the pre/post blob hashes from the sandbox's baseline index.
+ * They are reassembled here into the stored patch, and the blob manifest (no
+ * patch text) is kept inline next to it.
  */
 
 import { createHash } from "node:crypto";
@@ -28,6 +33,9 @@ export const RUN_DIFF_INLINE_MAX_BYTES = 256 * 1024;
 /** Hard ceiling on the patch we keep at all (truncate beyond this). */
 export const RUN_DIFF_MAX_BYTES = 8 * 1024 * 1024;
 
+/** Cap on manifest entries kept inline; the patch itself is unaffected. */
+export const RUN_DIFF_MANIFEST_MAX_FILES = 1000;
+
 export const RUN_DIFF_KIND = "diff";
 const DEFAULT_TITLE = "Workspace changes";
 
@@ -37,6 +45,21 @@ export type RunDiffStats = {
 	deletions: number;
 };
 
+/** One changed path from an incremental capture, keyed by blob hash. */
+export type RunDiffFileDelta = {
+	path: string;
+	/** Source path of a rename. */
+	oldPath?: string | null;
+	status?: string | null;
+	/** Baseline blob; null for added files and pure renames/mode changes. */
+	oldBlob?: string | null;
+	/** Captured blob; null for deleted files and pure renames/mode changes. */
+	newBlob?: string | null;
+	patch: string;
+};
+
+export type RunDiffManifestEntry = Omit<RunDiffFileDelta, "patch">;
+
 export type RunDiffInlinePayload = {
 	/** Present when stored inline (small patch). */
 	patch?: string;
@@ -47,6 +70,10 @@ export type RunDiffInlinePayload = {
 	truncated: boolean;
 	/** True when the patch is gzip-offloaded to `fileId` (patch omitted inline). */
 	gzip?: boolean;
+	/** Per-file blob manifest when the capture sent file deltas. */
+	files?: RunDiffManifestEntry[];
+	/** True when the capture rebuilt a lost baseline index (full resync). */
+	full?: boolean;
 };
 
 export type PersistRunDiffInput = {
@@ -55,7 +82,10 @@ export type PersistRunDiffInput = {
 	projectId?: string | null;
 	nodeId?: string | null;
 	title?: string;
-	patch: string;
+	/** Unified patch; ignored when `files` is given. */
+	patch?: string;
+	files?: RunDiffFileDelta[] | null;
+	full?: boolean;
 	baseRef?: string | null;
 	headRef?: string | null;
 	stats?: Partial<RunDiffStats> | null;
@@ -85,6 +115,11 @@ export function computeDiffStats(patch: string): RunDiffStats {
 	return { files, additions, deletions };
 }
 
+/** Concatenate per-file deltas back into one unified patch, in capture order. */
+export function assembleRunDiffPatch(files: readonly RunDiffFileDelta[]): string {
+	return files.map((file) => file.patch).join("");
+}
+
 /**
  * Persist a per-run diff as a `diff` workflow artifact. Inline when small;
  * gzip → `files` when large. Idempotent on the deterministic artifact id.
@@ -96,7 +131,8 @@ export async function persistRunDiff(
 	const title = input.title?.trim() || DEFAULT_TITLE;
 	const id = runDiffArtifactId(input.executionId, input.nodeId ?? null, title);
 
-	let patch = input.patch ?? "";
+	const files = input.files ?? null;
+	let patch = files ? assembleRunDiffPatch(files) : (input.patch ?? "");
 	let truncated = false;
 	if (Buffer.byteLength(patch, "utf8") > RUN_DIFF_MAX_BYTES) {
 		// Cap at the ceiling on a line boundary so diff2html still parses it.
@@ -121,6 +157,18 @@ export async function persistRunDiff(
 	const patchBytes = Buffer.byteLength(patch, "utf8");
 	let fileId: string | null = null;
 	let payload: RunDiffInlinePayload;
+	const manifest: Pick<RunDiffInlinePayload, "files" | "full"> = files
+		? {
+				files: files.slice(0, RUN_DIFF_MANIFEST_MAX_FILES).map((file) => ({
+					path: file.path,
+					oldPath: file.oldPath ?? null,
+					status: file.status ?? null,
+					oldBlob: file.oldBlob ?? null,
+					newBlob: file.newBlob ?? null,
+				})),
+				full: !!input.full,
+			}
+		: {};
 
 	if (patchBytes > RUN_DIFF_INLINE_MAX_BYTES) {
 		const gz = gzipSync(Buffer.from(patch, "utf8"));
@@ -134,9 +182,9 @@ export async function persistRunDiff(
 			bytes: gz,
 		});
 		fileId = file.id;
-		payload = { baseRef: input.baseRef ?? null, headRef: input.headRef ?? null, stats, truncated, gzip: true };
+		payload = { baseRef: input.baseRef ?? null, headRef: input.headRef ?? null, stats, truncated, gzip: true, ...manifest };
 	} else {
-		payload = { patch, baseRef: input.baseRef ?? null, headRef: input.headRef ?? null, stats, truncated };
+		payload = { patch, baseRef: input.baseRef ?? null, headRef: input.headRef ?? null, stats, truncated, ...manifest };
 	}
 
 	await persistence.upsertWorkflowArtifact({
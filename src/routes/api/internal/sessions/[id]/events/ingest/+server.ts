@@ -8,26 +8,17 @@ function isRecord(value: unknown): value is Record<string, unknown> {
 	return typeof value === "object" && value !== null && !Array.isArray(value);
 }
 
-/**
- * Internal endpoint called by `dapr-agent-py`'s session_workflow to persist a
- * CMA-shape session event. Body:
- *   { type: string, data: object, sourceEventId?: string }
- *
- * Server-side persistence assigns the monotonic sequence. Concurrent writers
- * serialize via the unique constraint on (session_id, sequence).
- *
- * This is the durability + replay backing for the SSE stream — NATS pub/sub
- * is the real-time transport; this endpoint persists for reconnect replay
- * and for clients that never subscribed.
- */
-export const POST: RequestHandler = async ({ params, request }) => {
-	if (!validateInternalToken(request)) return error(401, "Unauthorized");
-	const body = (await request.json().catch(() => ({}))) as Record<
-		string,
-		unknown
-	>;
+type IngestEnvelope = {
+	type: string;
+	data: Record<string, unknown>;
+	sourceEventId: string | null;
+	producerId: string | null;
+	producerEpoch: string | null;
+};
+
+function parseEnvelope(body: Record<string, unknown>): IngestEnvelope | null {
 	const type = typeof body.type === "string" ? body.type : "";
-	if (!type) return error(400, "type is required");
+	if (!type) return null;
 	const data =
 		body.data && typeof body.data === "object"
 			? (body.data as Record<string, unknown>)
@@ -43,20 +34,56 @@ export const POST: RequestHandler = async ({ params, request }) => {
 		typeof body.producerEpoch === "string" && body.producerEpoch
 			? body.producerEpoch
 			: null;
+	return { type, data, sourceEventId, producerId, producerEpoch };
+}
+
+/**
+ * Internal endpoint called by the agent runtimes' session-event publisher to
+ * persist CMA-shape session events. Body is either one envelope:
+ *   { type: string, data: object, sourceEventId?: string }
+ * or an ordered batch from the publisher's ingest worker:
+ *   { events: [{ type, data, sourceEventId? }, ...] }  -> { events: [...] }
+ *
+ * Server-side persistence assigns the monotonic sequence; batch events are
+ * appended one at a time in array order. Concurrent writers serialize via the
+ * unique constraint on (session_id, sequence).
+ *
+ * This is the durability + replay backing for the SSE stream — NATS pub/sub
+ * is the real-time transport; this endpoint persists for reconnect replay
+ * and for clients that never subscribed.
+ */
+export const POST: RequestHandler = async ({ params, request }) => {
+	if (!validateInternalToken(request)) return error(401, "Unauthorized");
+	const body = (await request.json().catch(() => ({}))) as Record<
+		string,
+		unknown
+	>;
+	const batch = Array.isArray(body.events);
+	const raw = batch ? (body.events as unknown[]) : [body];
+	const envelopes: IngestEnvelope[] = [];
+	for (const item of raw) {
+		const envelope = isRecord(item) ? parseEnvelope(item) : null;
+		if (!envelope) return error(400, "type is required");
+		envelopes.push(envelope);
+	}
+	if (envelopes.length === 0) return error(400, "events must not be empty");
+
 	const { workflowData, sessionRuntimeHostCleanup } = getApplicationAdapters();
-	const result = await workflowData.ingestSessionEvent({
-		sessionId: params.id,
-		type,
-		data,
-		sourceEventId,
-		producerId,
-		producerEpoch,
-	});
+	const events: unknown[] = [];
+	let cleanup = false;
+	for (const envelope of envelopes) {
+		const result = await workflowData.ingestSessionEvent({
+			sessionId: params.id,
+			...envelope,
+		});
+		events.push(result.event);
+		cleanup ||= result.cleanupSessionSandbox;
+	}
 
-	if (result.cleanupSessionSandbox) {
+	if (cleanup) {
 		void cleanupSessionSandbox(params.id);
 		sessionRuntimeHostCleanup.requestReap();
 	}
 
-	return json({ event: result.event });
+	return json(batch ? { events } : { event: events[0] });
 };
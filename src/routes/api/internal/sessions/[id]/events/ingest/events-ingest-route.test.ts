@@ -163,6 +163,36 @@ describe("internal session event ingest route", () => {
 		expect(mocks.cleanupSessionSandbox).not.toHaveBeenCalled();
 	});
 
+	it("ingests a publisher batch in order and returns every event", async () => {
+		const response = (await POST(
+			event({
+				events: [
+					{ type: "agent.message", data: { i: 1 }, sourceEventId: "source-1" },
+					{ type: "agent.tool_use", data: { i: 2 }, sourceEventId: "source-2" },
+				],
+			}) as never,
+		)) as Response;
+
+		expect(response.status).toBe(200);
+		const body = (await response.json()) as { events: unknown[] };
+		expect(body.events).toHaveLength(2);
+		expect(
+			mocks.workflowData.ingestSessionEvent.mock.calls.map(
+				(call) => (call as unknown as [{ sourceEventId: string }])[0].sourceEventId,
+			),
+		).toEqual(["source-1", "source-2"]);
+	});
+
+	it("rejects a batch containing an envelope without a type", async () => {
+		await expectHttpStatus(
+			Promise.resolve(
+				POST(event({ events: [{ type: "agent.message" }, { data: {} }] }) as never),
+			),
+			400,
+		);
+		expect(mocks.workflowData.ingestSessionEvent).not.toHaveBeenCalled();
+	});
+
 	it("eagerly reaps a naturally completed Pydantic host", async () => {
 		mocks.workflowData.ingestSessionEvent.mockResolvedValueOnce({
 			event: {
@@ -7,6 +7,10 @@
  * ≤256 KB else gzip → files) via `persistRunDiff`, so the diff survives sandbox
  * reap. Mirrors the browser_video_sync → browser-artifacts ingest pattern.
  *
+ * Body: either `patch` (one unified diff) or `files` — per-file deltas keyed by
+ * blob hash from dapr-agent-py's baseline index, with `full` set when the index
+ * was lost and the capture resynced from scratch.
+ *
  * Auth: requires INTERNAL_API_TOKEN. Best-effort on the caller's side.
  */
 
@@ -16,8 +20,19 @@ import { getApplicationAdapters } from "$lib/server/application";
 import { requireInternal } from "$lib/server/internal-auth";
 import type { RunDiffStats } from "$lib/server/workflows/run-diff";
 
+type IncomingFileDelta = {
+	path: string;
+	oldPath?: string | null;
+	status?: string | null;
+	oldBlob?: string | null;
+	newBlob?: string | null;
+	patch: string;
+};
+
 type IncomingRunDiff = {
 	patch?: string;
+	files?: unknown;
+	full?: boolean;
 	baseRef?: string | null;
 	headRef?: string | null;
 	stats?: Partial<RunDiffStats> | null;
@@ -37,8 +52,9 @@ export const POST: RequestHandler = async ({ params, request }) => {
 	} catch {
 		return error(400, "invalid JSON body");
 	}
-	if (typeof body.patch !== "string") {
-		return error(400, "patch (string) is required");
+	const files = Array.isArray(body.files) ? body.files.filter(isFileDelta) : null;
+	if (typeof body.patch !== "string" && !files) {
+		return error(400, "patch (string) or files (array) is required");
 	}
 
 	const workflowData = getApplicationAdapters().workflowData;
@@ -54,7 +70,7 @@ export const POST: RequestHandler = async ({ params, request }) => {
 	if (!exec) return error(404, `execution ${executionId} not found`);
 
 	// Empty patch = no changes; record nothing (keeps the UI clean).
-	if (!body.patch.trim()) {
+	if (files ? !files.some((file) => file.patch.trim()) : !body.patch?.trim()) {
 		return json({ ok: true, empty: true });
 	}
 
@@ -64,7 +80,7 @@ export const POST: RequestHandler = async ({ params, request }) => {
 		projectId: exec.projectId ?? null,
 		nodeId: body.nodeId ?? null,
 		title: body.title ?? undefined,
-		patch: body.patch,
+		...(files ? { files, full: body.full === true } : { patch: body.patch }),
 		baseRef: body.baseRef ?? null,
 		headRef: body.headRef ?? null,
 		stats: body.stats ?? null,
@@ -72,3 +88,9 @@ export const POST: RequestHandler = async ({ params, request }) => {
 
 	return json({ ok: true, ...result });
 };
+
+function isFileDelta(value: unknown): value is IncomingFileDelta {
+	if (!value || typeof value !== "object") return false;
+	const file = value as Partial<IncomingFileDelta>;
+	return typeof file.path === "string" && typeof file.patch === "string";
+}
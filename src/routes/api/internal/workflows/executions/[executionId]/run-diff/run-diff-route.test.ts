@@ -141,4 +141,41 @@ describe("internal workflow execution run-diff ingest route", () => {
 			stats: { files: 1, additions: 2, deletions: 0 },
 		});
 	});
+
+	it("forwards per-file deltas keyed by blob hash instead of a patch", async () => {
+		const files = [
+			{
+				path: "src/a.ts",
+				status: "modified",
+				oldBlob: "1".repeat(40),
+				newBlob: "2".repeat(40),
+				patch: "diff --git a/src/a.ts b/src/a.ts\n",
+			},
+			{ bogus: true },
+		];
+		const response = (await POST(
+			event({ files, full: true, nodeId: "agent" }) as never,
+		)) as Response;
+
+		expect(response.status).toBe(200);
+		expect(mocks.workflowData.persistRunDiffArtifact).toHaveBeenCalledWith(
+			expect.objectContaining({ files: [files[0]], full: true, nodeId: "agent" }),
+		);
+		expect(mocks.workflowData.persistRunDiffArtifact.mock.calls[0]).not.toHaveProperty(
+			"0.patch",
+		);
+	});
+
+	it("treats deltas without patch text as an empty diff", async () => {
+		const response = (await POST(
+			event({ files: [{ path: "a", patch: "" }] }) as never,
+		)) as Response;
+
+		await expect(response.json()).resolves.toEqual({ ok: true, empty: true });
+		expect(mocks.workflowData.persistRunDiffArtifact).not.toHaveBeenCalled();
+	});
+
+	it("rejects a body with neither patch nor files", async () => {
+		await expectHttpStatus(Promise.resolve(POST(event({ nodeId: "agent" }) as never)), 400);
+	});
 });
@@ -5,6 +5,9 @@
  * (dynamic-script call results) from here to forward to the script-evaluator.
  * Returns { scriptCalls: ScriptCallRecord[] } ordered by issue order (seq).
  *
+ * `?changedAfter=<changeSeq>` returns only rows whose `changeSeq` is greater
+ * (exclusive) — the evaluate_script journal cursor.
+ *
  * Auth: requires INTERNAL_API_TOKEN.
  */
 
@@ -13,12 +16,19 @@ import type { RequestHandler } from "./$types";
 import { requireInternal } from "$lib/server/internal-auth";
 import { getApplicationAdapters } from "$lib/server/application";
 
-export const GET: RequestHandler = async ({ params, request }) => {
+export const GET: RequestHandler = async ({ params, request, url }) => {
 	requireInternal(request);
 	const { executionId } = params;
 	if (!executionId) return error(400, "executionId required");
+	const changedAfterParam = url.searchParams.get("changedAfter");
+	const changedAfter = changedAfterParam === null ? null : Number(changedAfterParam);
+	if (changedAfter !== null && (!Number.isSafeInteger(changedAfter) || changedAfter < 0)) {
+		return error(400, "changedAfter must be a non-negative integer");
+	}
 	try {
-		const calls = await getApplicationAdapters().scriptCalls.listInternal(executionId);
+		const calls = await getApplicationAdapters().scriptCalls.listInternal(executionId, {
+			changedAfter,
+		});
 		return json({ scriptCalls: calls });
 	} catch (err) {
 		const message = err instanceof Error ? err.message : "script-calls read failed";